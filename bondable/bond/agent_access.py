@@ -0,0 +1,166 @@
+"""
+Per-user agent access index.
+
+Authorization on the chat and agent routes asks two questions for every
+request: can this user access the agent, and with which permission. Answering
+them directly costs an outer join across agents, agent_groups and group_users
+plus a couple of follow-up lookups. This module materializes the effective
+permission map for a user once and answers subsequent checks from memory.
+
+Entries are invalidated explicitly by the code paths that change ownership,
+group membership or agent-group associations (Groups, AgentProvider, Users).
+Invalidation is in-process only: when the API runs with several worker
+processes, a revocation made through one worker is seen by the others only
+once their cached entry expires, so AGENT_ACCESS_CACHE_TTL is the upper bound
+on how long a removed user can keep reaching an agent. Set it to 0 to disable
+the cache where that window is not acceptable.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Dict, FrozenSet, Iterable, Optional
+
+from sqlalchemy import case, func
+
+from bondable.bond.providers.metadata import Metadata, AgentRecord, AgentGroup, GroupUser, EVERYONE_GROUP_ID
+
+LOGGER = logging.getLogger(__name__)
+
+# Use numeric mapping: can_edit=2, can_use=1, then take max
+# (string max would give wrong result: 'can_use' > 'can_edit' alphabetically)
+_RANK_TO_PERMISSION = {2: "can_edit", 1: "can_use", 0: "can_use_read_only"}
+
+
+class UserAgentAccess:
+    """Snapshot of the agents a single user can reach and the permission on each."""
+
+    __slots__ = ("permissions", "default_agent_ids", "loaded_at")
+
+    def __init__(self, permissions: Dict[str, str], default_agent_ids: FrozenSet[str], loaded_at: float):
+        self.permissions = permissions
+        self.default_agent_ids = default_agent_ids
+        self.loaded_at = loaded_at
+
+    def can_access(self, agent_id: str) -> bool:
+        return agent_id in self.permissions
+
+    def get_permission(self, agent_id: str) -> Optional[str]:
+        permission = self.permissions.get(agent_id)
+        if permission is None and agent_id in self.default_agent_ids:
+            # Default agent is accessible to everyone as can_use
+            return "can_use"
+        return permission
+
+
+class AgentAccessIndex:
+    """
+    Thread-safe, in-memory map of user_id -> UserAgentAccess.
+
+    A user's entry is built with a fixed number of queries the first time it is
+    needed and then reused until it expires or is invalidated.
+    """
+
+    def __init__(self, metadata: Metadata, ttl_seconds: Optional[float] = None, max_users: Optional[int] = None):
+        self.metadata = metadata
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.environ.get('AGENT_ACCESS_CACHE_TTL', '30'))
+        self.max_users = max_users if max_users is not None else int(os.environ.get('AGENT_ACCESS_CACHE_MAX_USERS', '5000'))
+        self._entries: Dict[str, UserAgentAccess] = {}
+        self._lock = threading.Lock()
+        # Bumped on every invalidation so a load that raced with a write is not cached
+        self._generation = 0
+
+    def get_user_access(self, user_id: str) -> UserAgentAccess:
+        """Return the access snapshot for a user, loading it if missing or expired."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and now - entry.loaded_at < self.ttl_seconds:
+                return entry
+            generation = self._generation
+
+        entry = self._load(user_id)
+
+        with self._lock:
+            if generation == self._generation and self.ttl_seconds > 0:
+                if len(self._entries) >= self.max_users:
+                    self._prune(now)
+                self._entries[user_id] = entry
+        return entry
+
+    def can_access(self, user_id: str, agent_id: str) -> bool:
+        return self.get_user_access(user_id).can_access(agent_id)
+
+    def get_permission(self, user_id: str, agent_id: str) -> Optional[str]:
+        return self.get_user_access(user_id).get_permission(agent_id)
+
+    def invalidate(self, user_ids: Optional[Iterable[str]] = None) -> None:
+        """Drop cached entries for the given users, or for everyone when user_ids is None."""
+        if user_ids is None:
+            self.invalidate_all()
+        else:
+            self.invalidate_users(user_ids)
+
+    def invalidate_user(self, user_id: str) -> None:
+        self.invalidate_users([user_id])
+
+    def invalidate_users(self, user_ids: Iterable[str]) -> None:
+        with self._lock:
+            self._generation += 1
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+    def invalidate_all(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+        LOGGER.debug("Invalidated agent access index for all users")
+
+    def _prune(self, now: float) -> None:
+        """Drop expired entries, then the oldest ones if still over capacity. Caller holds the lock."""
+        expired = [k for k, v in self._entries.items() if now - v.loaded_at >= self.ttl_seconds]
+        for k in expired:
+            del self._entries[k]
+        overflow = len(self._entries) - self.max_users + 1
+        if overflow > 0:
+            oldest = sorted(self._entries.items(), key=lambda item: item[1].loaded_at)[:overflow]
+            for k, _ in oldest:
+                del self._entries[k]
+
+    def _load(self, user_id: str) -> UserAgentAccess:
+        with self.metadata.get_db_session() as session:
+            owned = session.query(AgentRecord.agent_id).filter(AgentRecord.owner_user_id == user_id).all()
+
+            shared = (
+                session.query(
+                    AgentGroup.agent_id,
+                    func.max(
+                        case(
+                            (AgentGroup.permission == 'can_edit', 2),
+                            (AgentGroup.permission == 'can_use', 1),
+                            else_=0
+                        )
+                    ).label('max_permission_rank')
+                )
+                .join(AgentRecord, AgentRecord.agent_id == AgentGroup.agent_id)
+                .outerjoin(GroupUser, AgentGroup.group_id == GroupUser.group_id)
+                .filter(
+                    (GroupUser.user_id == user_id) | (AgentGroup.group_id == EVERYONE_GROUP_ID)
+                )
+                .group_by(AgentGroup.agent_id)
+                .all()
+            )
+
+            defaults = session.query(AgentRecord.agent_id).filter(AgentRecord.is_default == True).all()
+
+        permissions = {agent_id: _RANK_TO_PERMISSION.get(max_rank, "can_use") for agent_id, max_rank in shared}
+        # Ownership always wins over any group-granted permission
+        permissions.update({row.agent_id: "owner" for row in owned})
+
+        LOGGER.debug(f"Loaded agent access for user {user_id}: {len(permissions)} agents")
+        return UserAgentAccess(
+            permissions=permissions,
+            default_agent_ids=frozenset(row.agent_id for row in defaults),
+            loaded_at=time.monotonic(),
+        )
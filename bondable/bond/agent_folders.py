@@ -1,11 +1,37 @@
 from bondable.bond.providers.metadata import Metadata, AgentFolder, AgentFolderAssignment, UserAgentSortOrder
 from typing import List, Dict, Optional
-from sqlalchemy import func
+from sqlalchemy import func, case, update
+from sqlalchemy.dialects import postgresql, sqlite
 import logging
 import uuid
 
 LOGGER = logging.getLogger(__name__)
 
+# Gap left between sort keys when a user's order is respaced, so that moving one
+# item can usually take a key between its new neighbours and write a single row
+SORT_ORDER_STEP = 1024
+# Rows per INSERT ... ON CONFLICT statement
+UPSERT_BATCH_SIZE = 500
+
+_UPSERT_DIALECTS = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}
+
+
+def _key_after(sorted_keys: List[int], after_key: Optional[int]) -> Optional[int]:
+    """
+    Pick a sort key that lands right after after_key (or first, if None) in
+    sorted_keys. Returns None when the neighbouring keys leave no gap.
+    """
+    if not sorted_keys:
+        return 0
+    if after_key is None:
+        return sorted_keys[0] - SORT_ORDER_STEP
+    following = [k for k in sorted_keys if k > after_key]
+    if not following:
+        return after_key + SORT_ORDER_STEP
+    if following[0] - after_key < 2:
+        return None
+    return (after_key + following[0]) // 2
+
 
 class AgentFolders:
 
@@ -236,37 +262,106 @@ class AgentFolders:
         """Set sort_order for a list of agents. agent_ids[0] gets sort_order=0, etc."""
         with self.metadata.get_db_session() as session:
             try:
-                for index, agent_id in enumerate(agent_ids):
-                    existing = session.query(UserAgentSortOrder).filter(
-                        UserAgentSortOrder.user_id == user_id,
-                        UserAgentSortOrder.agent_id == agent_id
-                    ).first()
-                    if existing:
-                        existing.sort_order = index
-                    else:
-                        session.add(UserAgentSortOrder(
-                            user_id=user_id,
-                            agent_id=agent_id,
-                            sort_order=index,
-                        ))
+                self._upsert_agent_sort_orders(session, user_id, {agent_id: index for index, agent_id in enumerate(agent_ids)})
                 session.commit()
             except Exception as e:
                 session.rollback()
                 LOGGER.error(f"Error reordering agents for user {user_id}: {e}")
                 raise
 
+    def move_agent(self, user_id: str, agent_id: str, after_agent_id: Optional[str] = None) -> int:
+        """
+        Move one agent to just after after_agent_id (or to the front if None) and
+        return its new sort_order. Only the moved agent's row is written unless
+        its new neighbours have adjacent keys, in which case the user's agents are
+        respaced SORT_ORDER_STEP apart first. Raises KeyError if after_agent_id
+        has no sort order.
+        """
+        with self.metadata.get_db_session() as session:
+            try:
+                rows = session.query(UserAgentSortOrder.agent_id, UserAgentSortOrder.sort_order).filter(
+                    UserAgentSortOrder.user_id == user_id,
+                    UserAgentSortOrder.agent_id != agent_id
+                ).order_by(UserAgentSortOrder.sort_order, UserAgentSortOrder.agent_id).all()
+                orders = {row.agent_id: row.sort_order for row in rows}
+                if after_agent_id is not None and after_agent_id not in orders:
+                    raise KeyError(f"Agent has no sort order: {after_agent_id}")
+
+                new_key = _key_after([row.sort_order for row in rows], orders.get(after_agent_id))
+                if new_key is None:
+                    orders = {row.agent_id: index * SORT_ORDER_STEP for index, row in enumerate(rows)}
+                    self._upsert_agent_sort_orders(session, user_id, orders)
+                    new_key = _key_after(sorted(orders.values()), orders.get(after_agent_id))
+
+                self._upsert_agent_sort_orders(session, user_id, {agent_id: new_key})
+                session.commit()
+                return new_key
+            except KeyError:
+                session.rollback()
+                raise
+            except Exception as e:
+                session.rollback()
+                LOGGER.error(f"Error moving agent {agent_id} for user {user_id}: {e}")
+                raise
+
+    def _upsert_agent_sort_orders(self, session, user_id: str, orders: Dict[str, int]) -> None:
+        """
+        Write many sort orders in bulk: INSERT ... ON CONFLICT DO UPDATE where the
+        dialect supports it, otherwise one CASE-based UPDATE plus one INSERT for
+        the agents that have no row yet.
+        """
+        if not orders:
+            return
+        items = list(orders.items())
+        insert = _UPSERT_DIALECTS.get(session.get_bind().dialect.name)
+        for start in range(0, len(items), UPSERT_BATCH_SIZE):
+            batch = dict(items[start:start + UPSERT_BATCH_SIZE])
+            if insert is not None:
+                stmt = insert(UserAgentSortOrder).values([
+                    {"user_id": user_id, "agent_id": agent_id, "sort_order": sort_order}
+                    for agent_id, sort_order in batch.items()
+                ])
+                session.execute(stmt.on_conflict_do_update(
+                    index_elements=[UserAgentSortOrder.user_id, UserAgentSortOrder.agent_id],
+                    set_={"sort_order": stmt.excluded.sort_order}
+                ))
+                continue
+
+            existing = {row[0] for row in session.query(UserAgentSortOrder.agent_id).filter(
+                UserAgentSortOrder.user_id == user_id,
+                UserAgentSortOrder.agent_id.in_(list(batch))
+            ).all()}
+            if existing:
+                session.execute(
+                    update(UserAgentSortOrder)
+                    .where(UserAgentSortOrder.user_id == user_id, UserAgentSortOrder.agent_id.in_(existing))
+                    .values(sort_order=case({agent_id: batch[agent_id] for agent_id in existing}, value=UserAgentSortOrder.agent_id))
+                )
+            session.add_all([
+                UserAgentSortOrder(user_id=user_id, agent_id=agent_id, sort_order=sort_order)
+                for agent_id, sort_order in batch.items() if agent_id not in existing
+            ])
+            session.flush()
+
     def reorder_folders(self, user_id: str, folder_ids: List[str]) -> None:
         """Set sort_order for a list of folders. folder_ids[0] gets sort_order=0, etc."""
         with self.metadata.get_db_session() as session:
             try:
-                for index, folder_id in enumerate(folder_ids):
-                    folder = session.query(AgentFolder).filter(
-                        AgentFolder.id == folder_id,
-                        AgentFolder.user_id == user_id
-                    ).first()
-                    if not folder:
-                        raise KeyError(f"Folder not found: {folder_id}")
-                    folder.sort_order = index
+                orders = {folder_id: index for index, folder_id in enumerate(folder_ids)}
+                if not orders:
+                    return
+                owned = {row[0] for row in session.query(AgentFolder.id).filter(
+                    AgentFolder.user_id == user_id,
+                    AgentFolder.id.in_(list(orders))
+                ).all()}
+                missing = [folder_id for folder_id in orders if folder_id not in owned]
+                if missing:
+                    raise KeyError(f"Folder not found: {missing[0]}")
+                session.execute(
+                    update(AgentFolder)
+                    .where(AgentFolder.user_id == user_id, AgentFolder.id.in_(list(orders)))
+                    .values(sort_order=case(orders, value=AgentFolder.id))
+                )
                 session.commit()
             except KeyError:
                 session.rollback()
@@ -275,3 +370,45 @@ class AgentFolders:
                 session.rollback()
                 LOGGER.error(f"Error reordering folders for user {user_id}: {e}")
                 raise
+
+    def move_folder(self, user_id: str, folder_id: str, after_folder_id: Optional[str] = None) -> int:
+        """
+        Move one folder to just after after_folder_id (or to the front if None) and
+        return its new sort_order. Like move_agent, only the moved folder is
+        written unless its neighbours have adjacent keys. Raises KeyError if
+        either folder does not belong to the user.
+        """
+        with self.metadata.get_db_session() as session:
+            try:
+                folders = session.query(AgentFolder.id, AgentFolder.sort_order).filter(
+                    AgentFolder.user_id == user_id
+                ).order_by(AgentFolder.sort_order, AgentFolder.name).all()
+                orders = {row.id: row.sort_order or 0 for row in folders if row.id != folder_id}
+                if len(orders) == len(folders):
+                    raise KeyError(f"Folder not found: {folder_id}")
+                if after_folder_id is not None and after_folder_id not in orders:
+                    raise KeyError(f"Folder not found: {after_folder_id}")
+
+                new_key = _key_after(sorted(orders.values()), orders.get(after_folder_id))
+                if new_key is None:
+                    orders = {fid: index * SORT_ORDER_STEP for index, fid in enumerate(orders)}
+                    session.execute(
+                        update(AgentFolder)
+                        .where(AgentFolder.user_id == user_id, AgentFolder.id.in_(list(orders)))
+                        .values(sort_order=case(orders, value=AgentFolder.id))
+                    )
+                    new_key = _key_after(sorted(orders.values()), orders.get(after_folder_id))
+
+                session.query(AgentFolder).filter(
+                    AgentFolder.id == folder_id,
+                    AgentFolder.user_id == user_id
+                ).update({"sort_order": new_key}, synchronize_session=False)
+                session.commit()
+                return new_key
+            except KeyError:
+                session.rollback()
+                raise
+            except Exception as e:
+                session.rollback()
+                LOGGER.error(f"Error moving folder {folder_id} for user {user_id}: {e}")
+                raise
@@ -0,0 +1,71 @@
+"""add_thread_activity_columns
+
+Revision ID: 0b9d6e4c2a71
+Revises: f1a7c3e95d20
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b9d6e4c2a71'
+down_revision: Union[str, None] = 'f1a7c3e95d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('threads', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('has_user_message', sa.Boolean(), nullable=False, server_default=sa.false()))
+        batch_op.add_column(sa.Column('message_count', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('last_message_at', sa.DateTime(), nullable=True))
+        # Thread listings order and page by (updated_at, thread_id); include thread_id
+        # so each page is a range scan of one index
+        batch_op.create_index('ix_threads_user_recent', ['user_id', 'updated_at', 'thread_id'], unique=False)
+        batch_op.create_index('ix_threads_user_active_recent',
+                              ['user_id', 'has_user_message', 'updated_at', 'thread_id'], unique=False)
+
+    # Pre-Alembic databases stamped at an older revision may not have the
+    # Bedrock tables; their threads have no stored messages to count.
+    if 'bedrock_messages' not in sa.inspect(op.get_bind()).get_table_names():
+        return
+
+    threads = sa.table('threads',
+                       sa.column('thread_id', sa.String()),
+                       sa.column('has_user_message', sa.Boolean()),
+                       sa.column('message_count', sa.Integer()),
+                       sa.column('last_message_at', sa.DateTime()),
+                       sa.column('updated_at', sa.DateTime()))
+    messages = sa.table('bedrock_messages',
+                        sa.column('thread_id', sa.String()),
+                        sa.column('role', sa.String()),
+                        sa.column('created_at', sa.DateTime()),
+                        sa.column('message_metadata', sa.JSON()))
+    of_thread = messages.c.thread_id == threads.c.thread_id
+    # Hidden messages (agent introductions) are not user activity
+    is_hidden = sa.or_(
+        messages.c.message_metadata['hidden'].as_boolean() == True,
+        messages.c.message_metadata['hidden'].as_string() == 'true',
+        messages.c.message_metadata['override_role'].as_string() == 'system',
+    )
+    op.execute(threads.update().values(
+        message_count=sa.select(sa.func.count()).where(of_thread).scalar_subquery(),
+        last_message_at=sa.select(sa.func.max(messages.c.created_at)).where(of_thread).scalar_subquery(),
+        has_user_message=sa.exists().where(
+            of_thread & (messages.c.role == 'user') & sa.case((is_hidden, False), else_=True)),
+        # Keep listing order unchanged by the backfill
+        updated_at=threads.c.updated_at,
+    ))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('threads', schema=None) as batch_op:
+        batch_op.drop_index('ix_threads_user_active_recent')
+        batch_op.drop_index('ix_threads_user_recent')
+        batch_op.drop_column('last_message_at')
+        batch_op.drop_column('message_count')
+        batch_op.drop_column('has_user_message')
@@ -0,0 +1,37 @@
+"""add_description_model_to_bedrock_agent_options
+
+Revision ID: e6f4a0b32c9d
+Revises: d5e3f9a21b8c
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6f4a0b32c9d'
+down_revision: Union[str, None] = 'd5e3f9a21b8c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Pre-Alembic databases stamped at an older revision may not have the
+    # Bedrock tables at all; there is nothing to extend in that case.
+    if 'bedrock_agent_options' not in sa.inspect(op.get_bind()).get_table_names():
+        return
+    # Nullable: existing rows are backfilled lazily from Bedrock on first read
+    with op.batch_alter_table('bedrock_agent_options') as batch_op:
+        batch_op.add_column(sa.Column('description', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('model', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    if 'bedrock_agent_options' not in sa.inspect(op.get_bind()).get_table_names():
+        return
+    with op.batch_alter_table('bedrock_agent_options') as batch_op:
+        batch_op.drop_column('model')
+        batch_op.drop_column('description')
@@ -0,0 +1,41 @@
+"""add_background_jobs
+
+Revision ID: f1a7c3e95d20
+Revises: e6f4a0b32c9d
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a7c3e95d20'
+down_revision: Union[str, None] = 'e6f4a0b32c9d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('background_jobs',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('subject_id', sa.String(), nullable=True),
+        sa.Column('status', sa.String(), nullable=False, server_default='PENDING'),
+        sa.Column('error', sa.String(), nullable=True),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_background_jobs_user_id'), 'background_jobs', ['user_id'], unique=False)
+    op.create_index(op.f('ix_background_jobs_subject_id'), 'background_jobs', ['subject_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_background_jobs_subject_id'), table_name='background_jobs')
+    op.drop_index(op.f('ix_background_jobs_user_id'), table_name='background_jobs')
+    op.drop_table('background_jobs')
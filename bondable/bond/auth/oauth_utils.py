@@ -43,7 +43,7 @@ def resolve_client_secret(oauth_config: dict) -> Optional[str]:
         return None
 
     try:
-        import boto3
+        from bondable.bond.aws_clients import get_secret_string
 
         # Determine region from ARN or environment
         if secret_arn.startswith('arn:aws:secretsmanager:'):
@@ -57,9 +57,7 @@ def resolve_client_secret(oauth_config: dict) -> Optional[str]:
             region = os.environ.get('AWS_REGION', 'us-west-2')
             secret_id = secret_arn
 
-        client = boto3.client('secretsmanager', region_name=region)
-        response = client.get_secret_value(SecretId=secret_id)
-        secret_data = json.loads(response['SecretString'])
+        secret_data = json.loads(get_secret_string(secret_id, region))
 
         client_secret = secret_data.get('client_secret')
         if client_secret:
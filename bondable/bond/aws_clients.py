@@ -0,0 +1,229 @@
+"""
+Shared AWS clients.
+
+boto3 clients are thread-safe and each keeps its own connection pool, so a
+process needs one client per (service, region, role), not one per call.
+aws_client() creates it on first use and returns the same client afterwards.
+
+Each client belongs to a workload, which sets its pool size, retries and
+timeouts. Every setting can be overridden per workload from the
+environment, e.g. AWS_STREAMING_MAX_POOL_CONNECTIONS:
+
+    default     control-plane calls (Bedrock management, STS, Secrets Manager)
+    streaming   bedrock-runtime and bedrock-agent-runtime; one long-lived
+                connection per concurrent chat stream
+    bulk        S3 and bedrock-agent, used in bursts by file uploads and
+                Knowledge Base sync
+
+    AWS_<WORKLOAD>_MAX_POOL_CONNECTIONS      Connections per client
+    AWS_<WORKLOAD>_RETRY_MODE                standard, adaptive or legacy (default: AWS_RETRY_MODE)
+    AWS_<WORKLOAD>_MAX_ATTEMPTS              Attempts per call, including the first (default: AWS_MAX_ATTEMPTS)
+    AWS_<WORKLOAD>_CONNECT_TIMEOUT_SECONDS
+    AWS_<WORKLOAD>_READ_TIMEOUT_SECONDS
+
+Clients for a role_arn use credentials from STS AssumeRole, refreshed before
+they expire. Every call is timed into bond_aws_call_seconds.
+
+get_secret_string() reads Secrets Manager through the shared client and keeps
+values for AWS_SECRET_CACHE_TTL_SECONDS (default 300).
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+import boto3
+from botocore.config import Config as BotoConfig
+from botocore.credentials import DeferredRefreshableCredentials
+from botocore.session import get_session
+
+from bondable.bond.cache import CacheNamespace
+from bondable.bond.metrics import AWS_CALL_LATENCY
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_WORKLOAD = "default"
+STREAMING_WORKLOAD = "streaming"
+BULK_WORKLOAD = "bulk"
+
+
+class WorkloadSettings(NamedTuple):
+    max_pool_connections: int
+    retry_mode: str
+    max_attempts: int
+    connect_timeout: float
+    read_timeout: float
+
+
+_WORKLOAD_DEFAULTS: Dict[str, WorkloadSettings] = {
+    DEFAULT_WORKLOAD: WorkloadSettings(25, "standard", 3, 10, 60),
+    STREAMING_WORKLOAD: WorkloadSettings(100, "standard", 3, 10, 300),
+    BULK_WORKLOAD: WorkloadSettings(50, "adaptive", 5, 10, 120),
+}
+
+
+def workload_settings(workload: str) -> WorkloadSettings:
+    defaults = _WORKLOAD_DEFAULTS.get(workload, _WORKLOAD_DEFAULTS[DEFAULT_WORKLOAD])
+    prefix = f"AWS_{workload.upper()}_"
+    # An explicit retries config takes precedence over the SDK's own AWS_RETRY_MODE and
+    # AWS_MAX_ATTEMPTS, so fall back to them before the workload's defaults
+    retry_mode = os.environ.get('AWS_RETRY_MODE', defaults.retry_mode)
+    max_attempts = os.environ.get('AWS_MAX_ATTEMPTS', str(defaults.max_attempts))
+    return WorkloadSettings(
+        max_pool_connections=int(os.environ.get(prefix + 'MAX_POOL_CONNECTIONS', str(defaults.max_pool_connections))),
+        retry_mode=os.environ.get(prefix + 'RETRY_MODE', retry_mode),
+        max_attempts=int(os.environ.get(prefix + 'MAX_ATTEMPTS', max_attempts)),
+        connect_timeout=float(os.environ.get(prefix + 'CONNECT_TIMEOUT_SECONDS', str(defaults.connect_timeout))),
+        read_timeout=float(os.environ.get(prefix + 'READ_TIMEOUT_SECONDS', str(defaults.read_timeout))),
+    )
+
+
+def _boto_config(settings: WorkloadSettings) -> BotoConfig:
+    return BotoConfig(
+        max_pool_connections=settings.max_pool_connections,
+        retries={'mode': settings.retry_mode, 'total_max_attempts': settings.max_attempts},
+        connect_timeout=settings.connect_timeout,
+        read_timeout=settings.read_timeout,
+        tcp_keepalive=True,
+    )
+
+
+def _config_key(config: Optional[BotoConfig]) -> Tuple:
+    """Hashable summary of a caller's config overrides; botocore Configs do not compare by value."""
+    if config is None:
+        return ()
+    options = vars(config).get('_user_provided_options', {})
+    return tuple(sorted((name, repr(value)) for name, value in options.items()))
+
+
+def _default_session(region: Optional[str]) -> boto3.Session:
+    aws_profile = os.getenv('AWS_PROFILE', None)
+    if aws_profile:
+        return boto3.Session(profile_name=aws_profile, region_name=region)
+    return boto3.Session(
+        aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID', None),
+        aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY', None),
+        region_name=region,
+    )
+
+
+def _instrument(client) -> None:
+    """Time every call the client makes into AWS_CALL_LATENCY."""
+    service = client.meta.service_model.service_name
+
+    def started(model, context, **kwargs):
+        context['bond_call_started'] = (time.perf_counter(), model.name)
+
+    def finished(outcome, context):
+        started_at = context.pop('bond_call_started', None)
+        if started_at is not None:
+            AWS_CALL_LATENCY.observe(time.perf_counter() - started_at[0],
+                                     service=service, operation=started_at[1], outcome=outcome)
+
+    def after_call(http_response, context, **kwargs):
+        finished('ok' if http_response.status_code < 400 else 'error', context)
+
+    def after_call_error(context, **kwargs):
+        finished('error', context)
+
+    # Ahead of handlers that answer the call themselves (e.g. botocore's Stubber)
+    client.meta.events.register_first('before-call.*.*', started)
+    client.meta.events.register('after-call', after_call)
+    client.meta.events.register('after-call-error', after_call_error)
+
+
+class AwsClientFactory:
+    """Creates and caches clients; thread-safe."""
+
+    def __init__(self):
+        self._clients: Dict[Tuple, Any] = {}
+        self._sessions: Dict[Tuple[Optional[str], Optional[str]], boto3.Session] = {}
+        # boto3 sessions are not thread-safe, so clients are created under this lock
+        self._lock = threading.RLock()
+
+    def client(self, service: str, region: Optional[str] = None, role_arn: Optional[str] = None,
+               workload: str = DEFAULT_WORKLOAD, config: Optional[BotoConfig] = None):
+        """
+        The shared client for a service. config, if given, overrides the
+        workload's settings for this client only.
+        """
+        region = region or os.getenv('AWS_REGION') or None
+        key = (service, region, role_arn, workload, _config_key(config))
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                boto_config = _boto_config(workload_settings(workload))
+                if config is not None:
+                    boto_config = boto_config.merge(config)
+                client = self._session(region, role_arn).client(service, region_name=region, config=boto_config)
+                _instrument(client)
+                self._clients[key] = client
+                LOGGER.debug(f"Created {service} client for region={region} workload={workload}"
+                             f"{' role=' + role_arn if role_arn else ''}")
+        return client
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clients.clear()
+            self._sessions.clear()
+
+    def _session(self, region: Optional[str], role_arn: Optional[str]) -> boto3.Session:
+        """Caller holds the lock."""
+        key = (region, role_arn)
+        session = self._sessions.get(key)
+        if session is None:
+            session = self._assume_role_session(region, role_arn) if role_arn else _default_session(region)
+            self._sessions[key] = session
+        return session
+
+    def _assume_role_session(self, region: Optional[str], role_arn: str) -> boto3.Session:
+        sts = self.client('sts', region)
+
+        def refresh() -> Dict[str, str]:
+            credentials = sts.assume_role(RoleArn=role_arn, RoleSessionName='bond-ai')['Credentials']
+            return {
+                'access_key': credentials['AccessKeyId'],
+                'secret_key': credentials['SecretAccessKey'],
+                'token': credentials['SessionToken'],
+                'expiry_time': credentials['Expiration'].isoformat(),
+            }
+
+        botocore_session = get_session()
+        botocore_session._credentials = DeferredRefreshableCredentials(
+            refresh_using=refresh, method='sts-assume-role')
+        return boto3.Session(botocore_session=botocore_session, region_name=region)
+
+
+_factory = AwsClientFactory()
+
+
+def aws_client(service: str, region: Optional[str] = None, role_arn: Optional[str] = None,
+               workload: str = DEFAULT_WORKLOAD, config: Optional[BotoConfig] = None):
+    """Shorthand for the process-wide factory's client()."""
+    return _factory.client(service, region, role_arn=role_arn, workload=workload, config=config)
+
+
+def clear_clients() -> None:
+    """Drop every cached client and secret, e.g. after credentials change."""
+    _factory.clear()
+    _secrets.clear()
+
+
+_secrets = CacheNamespace(
+    "aws_secrets",
+    max_entries=256,
+    ttl_seconds=float(os.environ.get('AWS_SECRET_CACHE_TTL_SECONDS', '300')),
+)
+
+
+def get_secret_string(secret_id: str, region: Optional[str] = None) -> str:
+    """SecretString of a Secrets Manager secret, cached for AWS_SECRET_CACHE_TTL_SECONDS."""
+    region = region or os.getenv('AWS_REGION') or None
+    return _secrets.get_or_load(
+        (secret_id, region),
+        lambda: aws_client('secretsmanager', region).get_secret_value(SecretId=secret_id)['SecretString'])
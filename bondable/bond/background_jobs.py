@@ -0,0 +1,139 @@
+"""
+Background jobs for work that should not hold an HTTP request open.
+
+Agent provisioning waits on Bedrock prepare/alias state transitions and can take
+close to a minute; user offboarding fans out over every agent, thread and file a
+user owns. Both are submitted here: the caller gets a job id immediately, the
+work runs on a small per-process thread pool, and progress is written to the
+background_jobs table so any worker can answer a status poll.
+
+A job only runs in the process that accepted it. If that process exits, the row
+stays in a non-final state; get_job() reports such rows as FAILED once they have
+not been updated for BACKGROUND_JOB_STALE_SECONDS.
+"""
+
+import datetime
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from bondable.bond.providers.metadata import Metadata, BackgroundJob
+
+LOGGER = logging.getLogger(__name__)
+
+# Job states. Agent provisioning uses PENDING -> PREPARING -> READY; other
+# kinds use PENDING -> RUNNING -> COMPLETED. Any kind can end in FAILED.
+PENDING = "PENDING"
+PREPARING = "PREPARING"
+RUNNING = "RUNNING"
+READY = "READY"
+COMPLETED = "COMPLETED"
+FAILED = "FAILED"
+FINAL_STATUSES = frozenset({READY, COMPLETED, FAILED})
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_STALE_SECONDS = 3600
+
+
+class BackgroundJobs:
+    """Runs callables off the request thread and records their status in the database."""
+
+    def __init__(self, metadata: Metadata, max_workers: Optional[int] = None):
+        self.metadata = metadata
+        self._max_workers = max_workers or int(os.getenv('BACKGROUND_JOB_MAX_WORKERS', str(DEFAULT_MAX_WORKERS)))
+        self._stale_seconds = int(os.getenv('BACKGROUND_JOB_STALE_SECONDS', str(DEFAULT_STALE_SECONDS)))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def submit(self, kind: str, user_id: str, work: Callable[[str], Optional[Dict[str, Any]]],
+               subject_id: Optional[str] = None, done_status: str = COMPLETED) -> str:
+        """
+        Record a PENDING job and run work(job_id) in the background.
+
+        work may call set_status() to report intermediate states. Its return value
+        is stored as the job result and the job moves to done_status; an exception
+        moves it to FAILED with the error message.
+        """
+        job_id = f"job_{uuid.uuid4().hex}"
+        with self.metadata.get_db_session() as session:
+            session.add(BackgroundJob(id=job_id, kind=kind, user_id=user_id, subject_id=subject_id, status=PENDING))
+            session.commit()
+
+        self._get_executor().submit(self._run, job_id, kind, work, done_status)
+        LOGGER.info(f"Submitted background job {job_id} ({kind}) for user {user_id}")
+        return job_id
+
+    def set_status(self, job_id: str, status: str, subject_id: Optional[str] = None,
+                   error: Optional[str] = None, result: Optional[Dict[str, Any]] = None) -> None:
+        values: Dict[str, Any] = {"status": status, "updated_at": datetime.datetime.now()}
+        if subject_id is not None:
+            values["subject_id"] = subject_id
+        if error is not None:
+            values["error"] = error
+        if result is not None:
+            values["result"] = result
+        with self.metadata.get_db_session() as session:
+            session.query(BackgroundJob).filter(BackgroundJob.id == job_id).update(values, synchronize_session=False)
+            session.commit()
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self.metadata.get_db_session() as session:
+            job = session.query(BackgroundJob).filter(BackgroundJob.id == job_id).first()
+            if job is None:
+                return None
+            job_dict = {
+                "job_id": job.id,
+                "kind": job.kind,
+                "user_id": job.user_id,
+                "subject_id": job.subject_id,
+                "status": job.status,
+                "error": job.error,
+                "result": job.result,
+                "created_at": job.created_at,
+                "updated_at": job.updated_at,
+            }
+        if self._is_stale(job_dict):
+            job_dict["status"] = FAILED
+            job_dict["error"] = job_dict["error"] or "Job was interrupted before it finished"
+        return job_dict
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+    def _is_stale(self, job: Dict[str, Any]) -> bool:
+        if job["status"] in FINAL_STATUSES:
+            return False
+        updated_at = job["updated_at"] or job["created_at"]
+        if updated_at is None:
+            return False
+        return (datetime.datetime.now() - updated_at).total_seconds() > self._stale_seconds
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="background-job")
+            return self._executor
+
+    def _run(self, job_id: str, kind: str, work: Callable[[str], Optional[Dict[str, Any]]], done_status: str) -> None:
+        try:
+            result = work(job_id)
+            self.set_status(job_id, done_status, result=result or {})
+            LOGGER.info(f"Background job {job_id} ({kind}) finished with status {done_status}")
+        except Exception as e:
+            LOGGER.error(f"Background job {job_id} ({kind}) failed: {e}", exc_info=True)
+            try:
+                self.set_status(job_id, FAILED, error=str(e) or e.__class__.__name__)
+            except Exception as status_error:
+                LOGGER.error(f"Could not record failure for background job {job_id}: {status_error}")
+        finally:
+            # Worker threads reuse the thread-local scoped session; don't leak it between jobs
+            try:
+                self.metadata.get_db_session().close()
+            except Exception:  # nosec B110
+                pass
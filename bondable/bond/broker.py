@@ -1,7 +1,12 @@
 import logging
+import os
 import queue
-import re
+import threading
+from typing import Optional
+from bondable.bond.broker_backends import BrokerBackend, BrokerEvent, InMemoryBrokerBackend
 from bondable.bond.cache import bond_cache
+from bondable.bond.message_stream import BondMessageParser, MessageEnd, MessageStart, MessageText
+from bondable.bond.response_buffer import ResponseBuffer
 
 LOGGER = logging.getLogger(__name__)
 
@@ -11,10 +16,14 @@ class BondMessageClob:
     def __init__(self, content=None):
         if content is not None:
             self.queue = None
-            self.content = content
+            self.buffer = ResponseBuffer(content)
         else:
             self.queue = queue.Queue()
-            self.content = ""
+            self.buffer = ResponseBuffer()
+
+    @property
+    def content(self) -> str:
+        return self.buffer.getvalue()
 
     def generate(self):
         while True:
@@ -24,7 +33,7 @@ class BondMessageClob:
                 text = self.queue.get(timeout=5)
                 if text is None:
                     break
-                self.content += text
+                self.buffer.append(text)
                 yield text
             except queue.Empty:
                 continue
@@ -42,7 +51,7 @@ class BondMessageClob:
         while not self.queue.empty():
             chunk = self.queue.get()
             if chunk is not None:
-                self.content += chunk
+                self.buffer.append(chunk)
             else:
                 break
         self.queue = None
@@ -68,6 +77,9 @@ class BondMessage:
     is_error: bool = False
     is_done: bool = False
     clob: BondMessageClob = None
+    # Sequence number of the closing tag in the thread's event log, set once the
+    # message is complete; connect(last_event_id=...) with it resumes after this message
+    event_id: Optional[int] = None
 
     def __init__(self, thread_id, message_id, agent_id, type, role, is_error=False, is_done=False, content=None):
         self.message_id = message_id
@@ -94,54 +106,59 @@ class BrokerConnectionEmpty(Exception):
 
 class BrokerConnection:
 
-    def __init__(self, broker, thread_id, subscriber_id):
+    def __init__(self, broker, thread_id, subscriber_id, last_event_id=0):
         self.thread_id = thread_id
         self.subscriber_id = subscriber_id
         self.msg_queue = queue.Queue()
         self.current_msg: BondMessage = None
+        self.parser = BondMessageParser()
         self.broker = broker
+        # Sequence number of the last event from the thread's log delivered here
+        self.last_event_id = last_event_id
         LOGGER.debug(f"Created connection with queue")
 
-    def is_bondmessage_start_tag(self, message:str):
-        pattern = r'^<\s*_bondmessage(?:\s+[\w:-]+="[^"]*")*\s*/?>$'
-        return bool(re.match(pattern, message.strip()))
-
-    def parse_bondmessage_start_tag(self, message:str):
-        pattern = r'^<\s*_bondmessage(?:\s+([\w:-]+)="([^"]*)")*\s*/?>$'
-        if not re.match(pattern, message.strip()):
-            return None
-        attributes = dict(re.findall(r'([\w:-]+)="([^"]*)"', message))
-        return attributes
-
-    def is_bondmessage_end_tag(self, message:str):
-        pattern = r'^</\s*_bondmessage\s*>$'
-        return bool(re.match(pattern, message.strip()))
-
-    def publish(self, message:str):
-        if self.is_bondmessage_start_tag(message):
-            LOGGER.debug(f"Received start message: {message[0:200]}")
-            if self.current_msg is not None:
-                raise ValueError(f"Received new message before closing previous message: {message}")
-            attributes = self.parse_bondmessage_start_tag(message)
-            self.current_msg = BondMessage(
-                thread_id=attributes.get('thread_id'),
-                message_id=attributes.get('id'),
-                agent_id=attributes.get('agent_id'),
-                type=attributes.get('type'),
-                role=attributes.get('role'),
-                is_error=str(attributes.get('is_error')).lower() == 'true',
-                is_done=str(attributes.get('is_done')).lower() == 'true'
-            )
-            self.msg_queue.put(self.current_msg)
-        elif self.is_bondmessage_end_tag(message):
-            LOGGER.debug(f"Received end message")
-            if self.current_msg is None:
-                raise ValueError(f"Received end message before start message: {message}")
-            self.current_msg.clob.close()
-            self.current_msg = None
-        else:
-            LOGGER.debug(f"Received body message")
+    def publish(self, message:str, seq: Optional[int] = None):
+        if self.current_msg is not None and message and '<' not in message and not self.parser.has_pending:
+            # Body chunk with no possible tag in it: skip the tokenizer
             self.current_msg.clob.put(message)
+            return
+        for event in self.parser.feed(message):
+            if isinstance(event, MessageText):
+                if self.current_msg is not None:
+                    self.current_msg.clob.put(event.text)
+                elif event.text.strip():
+                    # Normal when resuming from a log that starts mid-message
+                    LOGGER.debug(f"Dropping text outside a message: {event.text[0:200]}")
+            elif isinstance(event, MessageStart):
+                LOGGER.debug(f"Received start message: {event.attributes}")
+                if self.current_msg is not None:
+                    raise ValueError(f"Received new message before closing previous message: {event.attributes}")
+                attributes = event.attributes
+                self.current_msg = BondMessage(
+                    thread_id=attributes.get('thread_id'),
+                    message_id=attributes.get('id'),
+                    agent_id=attributes.get('agent_id'),
+                    type=attributes.get('type'),
+                    role=attributes.get('role'),
+                    is_error=event.flag('is_error'),
+                    is_done=event.flag('is_done')
+                )
+                self.msg_queue.put(self.current_msg)
+            else:
+                LOGGER.debug(f"Received end message")
+                if self.current_msg is None:
+                    LOGGER.debug(f"Ignoring end message without a start message")
+                    continue
+                self.current_msg.event_id = seq
+                self.current_msg.clob.close()
+                self.current_msg = None
+
+    def deliver(self, event: BrokerEvent):
+        """Publish an event from the thread's log, unless this connection has already seen it."""
+        if event.seq <= self.last_event_id:
+            return
+        self.last_event_id = event.seq
+        self.publish(event.message, seq=event.seq)
 
     def stop(self):
         self.msg_queue.put(None)
@@ -163,41 +180,169 @@ class BrokerConnection:
             raise BrokerConnectionEmpty("No message received")
 
 class Broker:
-    # This needs to be a singleton
-    # TODO: can route this through ZMQ later
+    """
+    Fans out messages published to a thread to every connection subscribed to it.
+
+    Messages go through the backend's per-thread event log first (see
+    broker_backends), which gives each one a sequence number. A connection can
+    start from an earlier point in the log with connect(last_event_id=...), and
+    with a shared backend each worker process polls the log, so subscribers
+    in one worker receive what is published in another. The log assumes one
+    publisher per thread at a time, which is how chat turns are streamed.
+    """
 
-    def __init__(self):
+    THREAD_LOCK_STRIPES = 64
+
+    def __init__(self, backend: Optional[BrokerBackend] = None):
         self.topics = {} # thread_id -> subscriber_id -> connection]
-        LOGGER.info("Created Broker instance")
+        self.backend = backend if backend is not None else InMemoryBrokerBackend()
+        self.poll_interval = float(os.environ.get('BROKER_POLL_INTERVAL_MS', '100')) / 1000
+        # Guards the subscriber map only; never held across backend I/O
+        self._lock = threading.RLock()
+        # Held per thread (striped by thread id) while appending, replaying and delivering,
+        # so a thread's connections see its events in log order without blocking other threads
+        self._thread_locks = [threading.RLock() for _ in range(self.THREAD_LOCK_STRIPES)]
+        self._poller: Optional[threading.Thread] = None
+        self._poller_stop = threading.Event()
+        LOGGER.info(f"Created Broker instance with {type(self.backend).__name__}")
 
     @classmethod
     @bond_cache
     def broker(cls):
-        return Broker()
+        from bondable.bond.config import Config
+        backend_class = Config.config().get_class_from_env(
+            'BROKER_BACKEND_CLASS', 'bondable.bond.broker_backends.InMemoryBrokerBackend', BrokerBackend)
+        return Broker(backend=backend_class.from_env())
 
     def stop(self):
-        for thread_id, conns in self.topics.items():
-            for subscriber_id, connection in conns.items():
-                connection.stop()
-        LOGGER.info("Closed all connections")
-        self.topics = {}
-
-    def publish(self, thread_id, message):
-        if thread_id in self.topics:
-            for subscriber_id, connection in self.topics[thread_id].items():
-                connection.publish(message)
-        else:
-            LOGGER.warning(f"Thread {thread_id} not found - no subscribers")
-
-    def connect(self, thread_id, subscriber_id) -> BrokerConnection:
-        if thread_id not in self.topics:
-            self.topics[thread_id] = {}
-        if subscriber_id not in self.topics[thread_id]:
-            self.topics[thread_id][subscriber_id] = BrokerConnection(broker=self, thread_id=thread_id, subscriber_id=subscriber_id)
-        return self.topics[thread_id][subscriber_id]
+        with self._lock:
+            for thread_id, conns in self.topics.items():
+                for subscriber_id, connection in conns.items():
+                    connection.stop()
+            LOGGER.info("Closed all connections")
+            self.topics = {}
+            self._poller_stop.set()
+            self._poller = None
+
+    def _thread_lock(self, thread_id) -> threading.RLock:
+        return self._thread_locks[hash(thread_id) % len(self._thread_locks)]
+
+    def _subscribers(self, thread_id):
+        with self._lock:
+            return list(self.topics.get(thread_id, {}).values())
+
+    def publish(self, thread_id, message) -> int:
+        """Append a message to the thread's log, deliver it to local subscribers and return its sequence number."""
+        with self._thread_lock(thread_id):
+            event = BrokerEvent(self.backend.append(thread_id, message), message)
+            connections = self._subscribers(thread_id)
+            if not connections:
+                LOGGER.warning(f"Thread {thread_id} not found - no subscribers")
+            for connection in connections:
+                connection.deliver(event)
+        return event.seq
+
+    def connect(self, thread_id, subscriber_id, last_event_id: Optional[int] = None) -> BrokerConnection:
+        """
+        Subscribe to a thread. A new connection receives messages published from
+        now on or, when last_event_id is given, everything after that point
+        still in the log. If last_event_id falls inside a message, that whole
+        message is replayed, so a client that dropped mid-response gets it again.
+        """
+        with self._thread_lock(thread_id):
+            with self._lock:
+                connection = self.topics.get(thread_id, {}).get(subscriber_id)
+            if connection is None:
+                # Publishes to this thread wait on its lock, so none can slip in between
+                # reading the log position and registering the connection
+                connection = BrokerConnection(broker=self, thread_id=thread_id, subscriber_id=subscriber_id,
+                                              last_event_id=self.backend.last_seq(thread_id))
+                if last_event_id is not None:
+                    self._replay(connection, last_event_id)
+                with self._lock:
+                    connection = self.topics.setdefault(thread_id, {}).setdefault(subscriber_id, connection)
+        if self.backend.shared:
+            self._start_poller()
+        return connection
 
     def disconnect(self, thread_id, subscriber_id):
-        if thread_id in self.topics and subscriber_id in self.topics[thread_id]:
-            del self.topics[thread_id][subscriber_id]
+        with self._lock:
+            if thread_id in self.topics and subscriber_id in self.topics[thread_id]:
+                del self.topics[thread_id][subscriber_id]
+            else:
+                LOGGER.warning(f"Thread {thread_id} not found - no subscribers")
+
+    def poll(self) -> int:
+        """
+        Deliver events that other processes appended to threads this process has
+        subscribers for. Runs in the background with a shared backend; returns
+        the number of events read.
+        """
+        with self._lock:
+            cursors = {
+                thread_id: min(connection.last_event_id for connection in conns.values())
+                for thread_id, conns in self.topics.items() if conns
+            }
+        if not cursors:
+            return 0
+        batches = self.backend.read_many(cursors)
+        for thread_id, events in batches.items():
+            with self._thread_lock(thread_id):
+                for connection in self._subscribers(thread_id):
+                    try:
+                        for event in events:
+                            connection.deliver(event)
+                    except ValueError as e:
+                        LOGGER.error(f"Dropping malformed stream for subscriber {connection.subscriber_id} "
+                                     f"on thread {thread_id}: {e}")
+        return sum(len(events) for events in batches.values())
+
+    def _replay(self, connection: BrokerConnection, last_event_id: int):
+        events = self.backend.read(connection.thread_id)
+        if events and events[0].seq > last_event_id + 1:
+            LOGGER.warning(f"Thread {connection.thread_id}: events {last_event_id + 1}-{events[0].seq - 1} "
+                           f"are no longer retained, resuming from {events[0].seq}")
+
+        # Find where the message still open at last_event_id (if any) began
+        parser = BondMessageParser()
+        open_from = None
+        pending_from = None
+        for event in events:
+            if event.seq > last_event_id:
+                break
+            began = pending_from if pending_from is not None else event.seq
+            for parsed in parser.feed(event.message):
+                if isinstance(parsed, MessageStart):
+                    open_from = began
+                elif isinstance(parsed, MessageEnd):
+                    open_from = None
+            pending_from = began if parser.has_pending else None
+        if open_from is not None:
+            start = open_from
+        elif pending_from is not None:
+            start = pending_from
         else:
-            LOGGER.warning(f"Thread {thread_id} not found - no subscribers")
+            start = last_event_id + 1
+
+        # Text before the first start tag (a message whose start has left the log) is dropped by the parser
+        connection.last_event_id = start - 1
+        for event in events:
+            connection.deliver(event)
+        if events:
+            connection.last_event_id = max(connection.last_event_id, events[-1].seq)
+
+    def _start_poller(self):
+        with self._lock:
+            if self._poller is not None and self._poller.is_alive():
+                return
+            self._poller_stop = threading.Event()
+            self._poller = threading.Thread(target=self._poll_loop, args=(self._poller_stop,),
+                                            name="broker-poller", daemon=True)
+            self._poller.start()
+
+    def _poll_loop(self, stop: threading.Event):
+        while not stop.wait(self.poll_interval):
+            try:
+                self.poll()
+            except Exception as e:
+                LOGGER.error(f"Broker poll failed: {e}")
@@ -0,0 +1,273 @@
+"""
+Event logs behind the Broker.
+
+Every message published to a thread is appended to that thread's log and
+given a sequence number, increasing by one per event within a thread. A new
+log starts numbering at the current time in milliseconds, so numbers keep
+increasing when an expired log is recreated. Subscribers track the last
+sequence number they have seen, so a client that reconnects can ask for
+everything after it, and a broker in another worker process can tail the
+log and deliver the same stream to its own subscribers.
+
+Logs are bounded: each thread keeps its last BROKER_LOG_MAX_EVENTS events,
+and threads with no new events for BROKER_LOG_TTL_SECONDS are dropped.
+
+The backend is chosen with BROKER_BACKEND_CLASS:
+
+    bondable.bond.broker_backends.InMemoryBrokerBackend  (default) single process only
+    bondable.bond.broker_backends.SqlBrokerBackend       shared through BROKER_DB_URL,
+                                                         e.g. Postgres, or a SQLite file
+                                                         for workers on one host
+"""
+
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Deque, Dict, List, NamedTuple, Optional
+
+from sqlalchemy import (BigInteger, Column, Float, MetaData, String, Table, Text, and_, create_engine, delete,
+                        event, func, or_, select)
+from sqlalchemy.exc import IntegrityError
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_EVENTS = 1000
+DEFAULT_TTL_SECONDS = 3600
+
+
+def _initial_seq() -> int:
+    return int(time.time() * 1000)
+
+
+class BrokerEvent(NamedTuple):
+    seq: int
+    message: Optional[str]
+
+
+class BrokerBackend(ABC):
+    """
+    Ordered, bounded, per-thread event log. Implementations must be thread-safe.
+
+    shared is True when other processes see the same log; the Broker then
+    polls it for events published elsewhere.
+    """
+
+    shared = False
+
+    @classmethod
+    def from_env(cls) -> "BrokerBackend":
+        return cls()
+
+    @abstractmethod
+    def append(self, thread_id: str, message: Optional[str]) -> int:
+        """Add a message to the thread's log and return its sequence number."""
+
+    @abstractmethod
+    def read(self, thread_id: str, after_seq: int = 0) -> List[BrokerEvent]:
+        """Retained events with seq > after_seq, oldest first."""
+
+    def read_many(self, cursors: Dict[str, int]) -> Dict[str, List[BrokerEvent]]:
+        """read() for several threads at once; thread_id -> after_seq in, thread_id -> events out."""
+        return {thread_id: self.read(thread_id, after_seq) for thread_id, after_seq in cursors.items()}
+
+    @abstractmethod
+    def last_seq(self, thread_id: str) -> int:
+        """Sequence number of the newest event, or 0 if the thread has none."""
+
+    def close(self) -> None:
+        pass
+
+
+class _ThreadLog:
+    __slots__ = ("events", "next_seq", "touched")
+
+    def __init__(self, max_events: int):
+        self.events: Deque[BrokerEvent] = deque(maxlen=max_events)
+        self.next_seq = _initial_seq()
+        self.touched = time.monotonic()
+
+
+class InMemoryBrokerBackend(BrokerBackend):
+    """Logs kept in this process. Reconnects are supported; other workers see nothing."""
+
+    def __init__(self, max_events: int = DEFAULT_MAX_EVENTS, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.max_events = max_events
+        self.ttl_seconds = ttl_seconds
+        self._logs: Dict[str, _ThreadLog] = {}
+        self._lock = threading.Lock()
+        self._next_sweep = time.monotonic() + ttl_seconds
+
+    @classmethod
+    def from_env(cls) -> "InMemoryBrokerBackend":
+        return cls(
+            max_events=int(os.environ.get('BROKER_LOG_MAX_EVENTS', str(DEFAULT_MAX_EVENTS))),
+            ttl_seconds=float(os.environ.get('BROKER_LOG_TTL_SECONDS', str(DEFAULT_TTL_SECONDS))),
+        )
+
+    def append(self, thread_id: str, message: Optional[str]) -> int:
+        with self._lock:
+            now = time.monotonic()
+            if now >= self._next_sweep:
+                self._sweep(now)
+            log = self._logs.get(thread_id)
+            if log is None:
+                log = self._logs[thread_id] = _ThreadLog(self.max_events)
+            seq = log.next_seq
+            log.next_seq += 1
+            log.events.append(BrokerEvent(seq, message))
+            log.touched = now
+            return seq
+
+    def read(self, thread_id: str, after_seq: int = 0) -> List[BrokerEvent]:
+        with self._lock:
+            log = self._logs.get(thread_id)
+            if log is None:
+                return []
+            # Sequence numbers are contiguous, so the start index follows from the first one
+            first = log.events[0].seq if log.events else log.next_seq
+            skip = max(after_seq - first + 1, 0)
+            return [log.events[i] for i in range(skip, len(log.events))]
+
+    def last_seq(self, thread_id: str) -> int:
+        with self._lock:
+            log = self._logs.get(thread_id)
+            return log.next_seq - 1 if log is not None else 0
+
+    def _sweep(self, now: float) -> None:
+        """Drop logs idle for longer than the TTL. Caller holds the lock."""
+        idle = [thread_id for thread_id, log in self._logs.items() if now - log.touched >= self.ttl_seconds]
+        for thread_id in idle:
+            del self._logs[thread_id]
+        self._next_sweep = now + self.ttl_seconds
+
+
+_sql_metadata = MetaData()
+
+broker_events = Table(
+    "broker_events", _sql_metadata,
+    Column("thread_id", String, primary_key=True),
+    Column("seq", BigInteger, primary_key=True, autoincrement=False),
+    Column("message", Text, nullable=True),
+    Column("created_at", Float, nullable=False, index=True),
+)
+
+
+def _use_immediate_transactions(engine) -> None:
+    """
+    Make SQLite take the write lock when a transaction starts. The default
+    deferred transactions fail with "database is locked" when two processes
+    read max(seq) and then both try to insert.
+    """
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        dbapi_connection.execute("PRAGMA journal_mode=WAL")
+
+    @event.listens_for(engine, "begin")
+    def _begin(connection):
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+class SqlBrokerBackend(BrokerBackend):
+    """
+    Logs kept in a SQL table, shared by every worker that points at the same
+    database. The table is a transient log owned by the broker, so it is
+    created on first use rather than through the metadata migrations.
+    """
+
+    shared = True
+    # Concurrent appends to one thread from different processes can pick the same seq
+    _APPEND_ATTEMPTS = 5
+    # Expired events are purged every this many appends
+    _PURGE_EVERY = 500
+
+    def __init__(self, url: str, max_events: int = DEFAULT_MAX_EVENTS, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.max_events = max_events
+        self.ttl_seconds = ttl_seconds
+        if url.startswith("sqlite"):
+            self.engine = create_engine(url, connect_args={"timeout": 30})
+            _use_immediate_transactions(self.engine)
+        else:
+            self.engine = create_engine(url, pool_pre_ping=True)
+        _sql_metadata.create_all(self.engine, checkfirst=True)
+        self._appends = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "SqlBrokerBackend":
+        url = os.getenv('BROKER_DB_URL')
+        if not url:
+            raise ValueError("BROKER_DB_URL must be set to use SqlBrokerBackend")
+        return cls(
+            url,
+            max_events=int(os.environ.get('BROKER_LOG_MAX_EVENTS', str(DEFAULT_MAX_EVENTS))),
+            ttl_seconds=float(os.environ.get('BROKER_LOG_TTL_SECONDS', str(DEFAULT_TTL_SECONDS))),
+        )
+
+    def append(self, thread_id: str, message: Optional[str]) -> int:
+        for attempt in range(self._APPEND_ATTEMPTS):
+            try:
+                with self.engine.begin() as conn:
+                    seq = conn.execute(
+                        select(func.coalesce(func.max(broker_events.c.seq), _initial_seq() - 1) + 1)
+                        .where(broker_events.c.thread_id == thread_id)
+                    ).scalar_one()
+                    conn.execute(broker_events.insert().values(
+                        thread_id=thread_id, seq=seq, message=message, created_at=time.time()))
+                    conn.execute(delete(broker_events).where(and_(
+                        broker_events.c.thread_id == thread_id,
+                        broker_events.c.seq <= seq - self.max_events)))
+                break
+            except IntegrityError:
+                if attempt == self._APPEND_ATTEMPTS - 1:
+                    raise
+                LOGGER.debug(f"Broker seq conflict on thread {thread_id}, retrying")
+
+        with self._lock:
+            self._appends += 1
+            purge = self._appends % self._PURGE_EVERY == 0
+        if purge:
+            self._purge_expired()
+        return seq
+
+    def read(self, thread_id: str, after_seq: int = 0) -> List[BrokerEvent]:
+        return self.read_many({thread_id: after_seq}).get(thread_id, [])
+
+    def read_many(self, cursors: Dict[str, int]) -> Dict[str, List[BrokerEvent]]:
+        if not cursors:
+            return {}
+        condition = or_(*[
+            and_(broker_events.c.thread_id == thread_id, broker_events.c.seq > after_seq)
+            for thread_id, after_seq in cursors.items()
+        ])
+        results: Dict[str, List[BrokerEvent]] = {}
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                select(broker_events.c.thread_id, broker_events.c.seq, broker_events.c.message)
+                .where(condition)
+                .order_by(broker_events.c.thread_id, broker_events.c.seq)
+            )
+            for thread_id, seq, message in rows:
+                results.setdefault(thread_id, []).append(BrokerEvent(seq, message))
+        return results
+
+    def last_seq(self, thread_id: str) -> int:
+        with self.engine.connect() as conn:
+            return conn.execute(
+                select(func.coalesce(func.max(broker_events.c.seq), 0))
+                .where(broker_events.c.thread_id == thread_id)
+            ).scalar_one()
+
+    def close(self) -> None:
+        self.engine.dispose()
+
+    def _purge_expired(self) -> None:
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(delete(broker_events).where(
+                    broker_events.c.created_at < time.time() - self.ttl_seconds))
+        except Exception as e:
+            LOGGER.warning(f"Could not purge expired broker events: {e}")
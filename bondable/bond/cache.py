@@ -1,16 +1,57 @@
+"""
+Process cache for Bond.
+
+Values are cached in namespaces, each with its own policy:
+
+    max_entries   least recently used entries are evicted beyond this (None: unbounded)
+    ttl_seconds   entries are reloaded once this old (None: kept until evicted)
+
+Loads are single-flight: when several threads miss on the same key at once,
+one runs the loader and the others wait for its result. A loader that raises
+caches nothing and every waiter gets the exception.
+
+invalidate(key) and clear() drop entries explicitly, and hooks registered
+with on_invalidate() are told, so holders of derived state can drop it too.
+
+A namespace with a shared tier also reads and writes a table shared by every
+worker that points at BOND_CACHE_SHARED_DB_URL, so one worker's load warms
+the others. Only JSON-serializable values are shared; anything else stays
+local. Invalidation removes the shared copy, but other workers keep their
+local copy until it expires, so shared namespaces should have a TTL.
+
+@bond_cache memoizes a function in a namespace of its own. It backs the
+process-wide singletons (Config.config(), Broker.broker(), the providers),
+so by default its entries never expire.
+
+    BOND_CACHE_MAX_ENTRIES      Entries kept per @bond_cache function (default 128)
+    BOND_CACHE_SHARED_DB_URL    Database for the shared tier (optional)
+"""
+
+import json
 import logging
+import os
 import threading
-from functools import wraps
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future
 from enum import Enum
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from sqlalchemy import Column, Float, MetaData, String, Table, Text, and_, create_engine, delete, event, select, update
+
+from bondable.bond.metrics import CACHE_EVICTIONS, CACHE_LOOKUPS
 
 LOGGER = logging.getLogger(__name__)
 
+DEFAULT_MAX_ENTRIES = 128
+
+
 class CacheType(Enum):
     STREAMLIT = 1
     BOND = 2
 
-_GLOBAL_CACHE = {}
-_CACHE_LOCK = threading.Lock()
 _CACHE_TYPE: CacheType = CacheType.BOND
 
 def configure_cache(type: CacheType):
@@ -18,46 +59,368 @@ def configure_cache(type: CacheType):
     global _CACHE_TYPE
     _CACHE_TYPE = type
 
-def bond_cache(func):
-    """A decorator that provides a simple, thread-safe, global cache."""
-    if _CACHE_TYPE == CacheType.STREAMLIT:
-        LOGGER.debug("Using Streamlit cache")
-        import streamlit as st
 
-        @st.cache_resource
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            return func(*args, **kwargs)
+_shared_metadata = MetaData()
 
-        return wrapper  # 🔥 This was missing!
+cache_entries = Table(
+    "bond_cache_entries", _shared_metadata,
+    Column("namespace", String, primary_key=True),
+    Column("key", String, primary_key=True),
+    Column("value", Text, nullable=False),
+    Column("expires_at", Float, nullable=True, index=True),
+)
 
 
-    elif _CACHE_TYPE == CacheType.BOND:
-        LOGGER.debug("Using Bond cache")
+class SharedCacheTier:
+    """
+    Cache entries in a SQL table, shared by every worker using the same
+    database. Like the broker's event log, the table is transient and created
+    on first use rather than through the metadata migrations. Values are JSON
+    text; expiry is wall-clock time so all workers agree on it.
+    """
 
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            key = (func, args, frozenset(kwargs.items()))
+    # Expired rows are purged every this many writes
+    _PURGE_EVERY = 500
 
-            with _CACHE_LOCK:
-                if key in _GLOBAL_CACHE:
-                    return _GLOBAL_CACHE[key]
+    def __init__(self, url: str):
+        if url.startswith("sqlite"):
+            self.engine = create_engine(url, connect_args={"timeout": 30})
 
-            result = func(*args, **kwargs)
+            @event.listens_for(self.engine, "connect")
+            def _connect(dbapi_connection, connection_record):
+                dbapi_connection.execute("PRAGMA journal_mode=WAL")
+        else:
+            self.engine = create_engine(url, pool_pre_ping=True)
+        _shared_metadata.create_all(self.engine, checkfirst=True)
+        self._writes = 0
+        self._lock = threading.Lock()
 
-            with _CACHE_LOCK:
-                _GLOBAL_CACHE[key] = result
+    def get(self, namespace: str, key: str) -> Optional[Tuple[str, Optional[float]]]:
+        """(value, expires_at) if the key is present and not expired."""
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                select(cache_entries.c.value, cache_entries.c.expires_at)
+                .where(and_(cache_entries.c.namespace == namespace, cache_entries.c.key == key))
+            ).first()
+        if row is None or (row.expires_at is not None and row.expires_at <= time.time()):
+            return None
+        return row.value, row.expires_at
 
-            return result
+    def set(self, namespace: str, key: str, value: str, expires_at: Optional[float]) -> None:
+        where = and_(cache_entries.c.namespace == namespace, cache_entries.c.key == key)
+        with self.engine.begin() as conn:
+            # Write first so SQLite takes the write lock before anything is read
+            updated = conn.execute(update(cache_entries).where(where).values(value=value, expires_at=expires_at))
+            if updated.rowcount == 0:
+                conn.execute(cache_entries.insert().values(
+                    namespace=namespace, key=key, value=value, expires_at=expires_at))
+        with self._lock:
+            self._writes += 1
+            purge = self._writes % self._PURGE_EVERY == 0
+        if purge:
+            with self.engine.begin() as conn:
+                conn.execute(delete(cache_entries).where(cache_entries.c.expires_at < time.time()))
 
-        return wrapper
-    else:
-        raise ValueError(f"Unknown cache type: {_CACHE_TYPE}")
+    def delete(self, namespace: str, key: Optional[str] = None) -> None:
+        """Remove one key, or the whole namespace when key is None."""
+        where = cache_entries.c.namespace == namespace
+        if key is not None:
+            where = and_(where, cache_entries.c.key == key)
+        with self.engine.begin() as conn:
+            conn.execute(delete(cache_entries).where(where))
 
-def bond_cache_clear():
-    with _CACHE_LOCK:
+    def close(self) -> None:
+        self.engine.dispose()
+
+
+_shared_tier: Optional[SharedCacheTier] = None
+_shared_tier_lock = threading.Lock()
+
+
+def shared_tier() -> Optional[SharedCacheTier]:
+    """The tier configured by BOND_CACHE_SHARED_DB_URL, or None if it is not set."""
+    global _shared_tier
+    url = os.getenv('BOND_CACHE_SHARED_DB_URL')
+    if not url:
+        return None
+    with _shared_tier_lock:
+        if _shared_tier is None:
+            _shared_tier = SharedCacheTier(url)
+        return _shared_tier
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at")
+
+    def __init__(self, value: Any, expires_at: Optional[float]):
+        self.value = value
+        self.expires_at = expires_at
+
+
+class _Load:
+    __slots__ = ("future", "owner", "generation")
+
+    def __init__(self, generation: int):
+        self.future: Future = Future()
+        self.owner = threading.get_ident()
+        self.generation = generation
+
+
+# Every live namespace, so bond_cache_clear() and cache_stats() can reach them
+_namespaces: "weakref.WeakSet[CacheNamespace]" = weakref.WeakSet()
+_namespaces_lock = threading.Lock()
+
+
+class CacheNamespace:
+    """A named, thread-safe cache with its own size and age limits."""
+
+    def __init__(self, name: str, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None,
+                 shared_tier: Optional[SharedCacheTier] = None):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.shared_tier = shared_tier
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._loading: Dict[Hashable, _Load] = {}
+        self._hooks: List[Callable[[Optional[Hashable]], None]] = []
+        # Bumped by invalidate() and clear() so a load that started earlier does not store a stale value
+        self._generation = 0
+        self._stats = {"hit": 0, "shared_hit": 0, "miss": 0, "lru": 0, "expired": 0, "invalidated": 0}
+        self._lock = threading.Lock()
+        with _namespaces_lock:
+            _namespaces.add(self)
+
+    @property
+    def enabled(self) -> bool:
+        return (self.max_entries is None or self.max_entries > 0) and \
+            (self.ttl_seconds is None or self.ttl_seconds > 0)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """The cached value for key, calling loader() once if there is none."""
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                self._count("hit", CACHE_LOOKUPS, "result")
+                return entry.value
+            load = self._loading.get(key)
+            leader = load is None
+            if leader:
+                load = self._loading[key] = _Load(self._generation)
+
+        if not leader:
+            if load.owner == threading.get_ident():
+                # The loader needs its own key; waiting for ourselves would deadlock
+                return loader()
+            return load.future.result()
+
+        try:
+            value = self._load(key, loader, load.generation)
+        except BaseException as e:
+            # Waiters must be released even if the leader is interrupted
+            load.future.set_exception(e)
+            raise
+        else:
+            load.future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._loading.pop(key, None)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._store(key, value, self._expiry(None))
+        self._share(key, value)
+
+    def invalidate(self, key: Hashable) -> bool:
+        """Drop key here and in the shared tier. Returns True if it was cached locally."""
+        with self._lock:
+            found = self._entries.pop(key, None) is not None
+            self._generation += 1
+            if found:
+                self._count("invalidated", CACHE_EVICTIONS, "reason")
+        if self.shared_tier is not None:
+            try:
+                self.shared_tier.delete(self.name, repr(key))
+            except Exception as e:
+                LOGGER.warning(f"Could not invalidate {self.name} entry in the shared cache: {e}")
+        self._notify(key)
+        return found
+
+    def clear(self) -> None:
+        """Drop every entry here and in the shared tier."""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+        if self.shared_tier is not None:
+            try:
+                self.shared_tier.delete(self.name)
+            except Exception as e:
+                LOGGER.warning(f"Could not clear {self.name} in the shared cache: {e}")
+        self._notify(None)
+
+    def on_invalidate(self, hook: Callable[[Optional[Hashable]], None]) -> None:
+        """Call hook(key) after invalidate(key), and hook(None) after clear()."""
+        with self._lock:
+            self._hooks.append(hook)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"namespace": self.name, "size": len(self._entries), **self._stats}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: Hashable) -> Optional[_Entry]:
+        """Live entry for key, or None. Caller holds the lock."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at is not None and entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            self._count("expired", CACHE_EVICTIONS, "reason")
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _load(self, key: Hashable, loader: Callable[[], Any], generation: int) -> Any:
+        shared = self._shared_get(key)
+        if shared is not None:
+            value, expires_at = shared
+            result = "shared_hit"
+        else:
+            value = loader()
+            expires_at = None
+            result = "miss"
+        with self._lock:
+            self._count(result, CACHE_LOOKUPS, "result")
+            if generation != self._generation:
+                # Invalidated while loading: hand the value to this round of callers only
+                return value
+            self._store(key, value, self._expiry(expires_at))
+        if shared is None:
+            self._share(key, value)
+        return value
+
+    def _expiry(self, shared_expires_at: Optional[float]) -> Optional[float]:
+        """Monotonic expiry for a new entry, no later than its shared copy's."""
+        now = time.monotonic()
+        expiry = now + self.ttl_seconds if self.ttl_seconds is not None else None
+        if shared_expires_at is not None:
+            shared_expiry = now + shared_expires_at - time.time()
+            expiry = shared_expiry if expiry is None else min(expiry, shared_expiry)
+        return expiry
+
+    def _store(self, key: Hashable, value: Any, expires_at: Optional[float]) -> None:
+        """Caller holds the lock."""
+        if not self.enabled:
+            return
+        self._entries[key] = _Entry(value, expires_at)
+        self._entries.move_to_end(key)
+        if self.max_entries is not None:
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._count("lru", CACHE_EVICTIONS, "reason")
+
+    def _shared_get(self, key: Hashable) -> Optional[Tuple[Any, Optional[float]]]:
+        if self.shared_tier is None or not self.enabled:
+            return None
+        try:
+            found = self.shared_tier.get(self.name, repr(key))
+        except Exception as e:
+            LOGGER.warning(f"Shared cache read failed for {self.name}; loading locally: {e}")
+            return None
+        if found is None:
+            return None
+        return json.loads(found[0]), found[1]
+
+    def _share(self, key: Hashable, value: Any) -> None:
+        if self.shared_tier is None or not self.enabled:
+            return
+        try:
+            text = json.dumps(value)
+        except (TypeError, ValueError):
+            LOGGER.debug(f"Not sharing {self.name} entry {key!r}: value is not JSON-serializable")
+            return
+        expires_at = time.time() + self.ttl_seconds if self.ttl_seconds is not None else None
+        try:
+            self.shared_tier.set(self.name, repr(key), text, expires_at)
+        except Exception as e:
+            LOGGER.warning(f"Shared cache write failed for {self.name}: {e}")
+
+    def _count(self, outcome: str, counter, label: str) -> None:
+        """Caller holds the lock."""
+        self._stats[outcome] += 1
+        counter.inc(namespace=self.name, **{label: outcome})
+
+    def _notify(self, key: Optional[Hashable]) -> None:
+        with self._lock:
+            hooks = list(self._hooks)
+        for hook in hooks:
+            try:
+                hook(key)
+            except Exception as e:
+                LOGGER.error(f"Invalidation hook for cache {self.name} failed: {e}", exc_info=True)
+
+
+def cache_stats() -> List[Dict[str, Any]]:
+    """stats() of every live namespace."""
+    with _namespaces_lock:
+        namespaces = list(_namespaces)
+    return sorted((ns.stats() for ns in namespaces), key=lambda s: s["namespace"])
+
+
+def _call_key(args: tuple, kwargs: dict) -> Hashable:
+    return (args, frozenset(kwargs.items()))
+
+
+def bond_cache(func: Optional[Callable] = None, *, max_entries: Optional[int] = None,
+               ttl_seconds: Optional[float] = None, shared: bool = False):
+    """
+    Memoize a function by its arguments. Use as @bond_cache, or as
+    @bond_cache(max_entries=..., ttl_seconds=..., shared=True) to set the policy.
+
+    The wrapper exposes its namespace as wrapper.cache, and
+    wrapper.cache_invalidate(*args, **kwargs) drops the result for one call.
+    For a classmethod the arguments include the class.
+    """
+    def decorate(func: Callable) -> Callable:
         if _CACHE_TYPE == CacheType.STREAMLIT:
+            LOGGER.debug("Using Streamlit cache")
             import streamlit as st
-            st.cache_resource.clear()
+
+            @st.cache_resource
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                return func(*args, **kwargs)
+
+            return wrapper
+
+        elif _CACHE_TYPE == CacheType.BOND:
+            LOGGER.debug("Using Bond cache")
+            limit = max_entries if max_entries is not None else \
+                int(os.environ.get('BOND_CACHE_MAX_ENTRIES', str(DEFAULT_MAX_ENTRIES)))
+            namespace = CacheNamespace(
+                f"{func.__module__}.{func.__qualname__}", max_entries=limit, ttl_seconds=ttl_seconds,
+                shared_tier=shared_tier() if shared else None)
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                return namespace.get_or_load(_call_key(args, kwargs), lambda: func(*args, **kwargs))
+
+            wrapper.cache = namespace
+            wrapper.cache_invalidate = lambda *args, **kwargs: namespace.invalidate(_call_key(args, kwargs))
+            return wrapper
         else:
-            _GLOBAL_CACHE.clear()
+            raise ValueError(f"Unknown cache type: {_CACHE_TYPE}")
+
+    return decorate(func) if func is not None else decorate
+
+def bond_cache_clear():
+    if _CACHE_TYPE == CacheType.STREAMLIT:
+        import streamlit as st
+        st.cache_resource.clear()
+    else:
+        with _namespaces_lock:
+            namespaces = list(_namespaces)
+        for namespace in namespaces:
+            namespace.clear()
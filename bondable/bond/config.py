@@ -7,12 +7,14 @@ import atexit
 import json
 import base64
 import importlib
+import threading
 from urllib.parse import quote_plus
 from google.cloud import secretmanager
 from google.oauth2 import service_account
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from bondable.bond.cache import bond_cache
+from bondable.bond.mcp_snapshot import McpConfigSnapshot, publish as publish_mcp_snapshot
 import google.auth
 
 load_dotenv()
@@ -25,6 +27,8 @@ class Config:
     provider = None
     secrets = None
     project_id = None
+    _mcp_snapshot = None
+    _mcp_snapshot_lock = threading.Lock()
 
     def __init__(self):
         atexit.register(self.__del__)
@@ -101,10 +105,8 @@ class Config:
         if aws_region:
             # Use AWS Secrets Manager
             try:
-                import boto3
-                client = boto3.client('secretsmanager', region_name=aws_region)
-                response = client.get_secret_value(SecretId=secret_id)
-                return response['SecretString']
+                from bondable.bond.aws_clients import get_secret_string
+                return get_secret_string(secret_id, aws_region)
             except Exception as e:
                 LOGGER.error(f"Error getting AWS secret value")
                 return default
@@ -462,10 +464,39 @@ class Config:
             }
         }'
 
+        The returned dict is shared by every caller and must not be modified.
+
         Returns:
             Dict in fastmcp config format
         """
-        return self._overlay_discovered_mcps(self._load_static_mcp_config())
+        return self.get_mcp_snapshot().config
+
+    def get_mcp_snapshot(self) -> McpConfigSnapshot:
+        """
+        The effective MCP config with its lookup indexes. The merge is redone
+        only when the static config or the discovery results have changed
+        since the last call.
+        """
+        app_mcp_config = self._load_app_config().get('bond_mcp_config')
+        static_source = app_mcp_config if app_mcp_config else os.getenv('BOND_MCP_CONFIG')
+        try:
+            from bondable.bond.mcp_discovery import get_discovered_mcps
+            discovered = get_discovered_mcps()
+        except Exception as e:  # never let discovery break config loading
+            LOGGER.warning(f"MCP discovery overlay skipped due to error: {e}")
+            discovered = []
+
+        snapshot = self._mcp_snapshot
+        if snapshot is not None and snapshot.built_from(static_source, discovered):
+            return snapshot
+        with self._mcp_snapshot_lock:
+            snapshot = self._mcp_snapshot
+            if snapshot is None or not snapshot.built_from(static_source, discovered):
+                config = self._overlay_discovered_mcps(self._load_static_mcp_config(), discovered)
+                snapshot = McpConfigSnapshot(config, static_source, discovered)
+                self._mcp_snapshot = snapshot
+                publish_mcp_snapshot(snapshot)
+        return snapshot
 
     def _load_static_mcp_config(self):
         """Load the static MCP config (Secrets Manager first, then env var)."""
@@ -503,7 +534,7 @@ class Config:
             LOGGER.error(f"Error parsing BOND_MCP_CONFIG: {e}")
             return {"mcpServers": {}}
 
-    def _overlay_discovered_mcps(self, mcp_config):
+    def _overlay_discovered_mcps(self, mcp_config, discovered=None):
         """Overlay bond-mcps discovery results onto the static MCP config.
 
         For each discovered MCP (``{name, display_name, url}``) the merged server
@@ -514,13 +545,15 @@ class Config:
         preserved; a stale inline ``oauth_config`` is dropped. Servers not present
         in discovery (user-defined live in the DB, not here; ``command`` servers
         like ``hello``) are left untouched. No-op when discovery is disabled.
+        Discovery is queried unless its results are passed in.
         """
-        try:
-            from bondable.bond.mcp_discovery import get_discovered_mcps
-            discovered = get_discovered_mcps()
-        except Exception as e:  # never let discovery break config loading
-            LOGGER.warning(f"MCP discovery overlay skipped due to error: {e}")
-            return mcp_config
+        if discovered is None:
+            try:
+                from bondable.bond.mcp_discovery import get_discovered_mcps
+                discovered = get_discovered_mcps()
+            except Exception as e:  # never let discovery break config loading
+                LOGGER.warning(f"MCP discovery overlay skipped due to error: {e}")
+                return mcp_config
 
         if not discovered:
             return mcp_config
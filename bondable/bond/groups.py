@@ -1,15 +1,20 @@
-from bondable.bond.providers.metadata import Metadata, Group as GroupModel, GroupUser as GroupUserModel, AgentGroup as AgentGroupModel, User as UserModel
-from typing import List, Dict, Optional
+from bondable.bond.providers.metadata import Metadata, Group as GroupModel, GroupUser as GroupUserModel, AgentGroup as AgentGroupModel, AgentRecord, User as UserModel, EVERYONE_GROUP_ID
+from bondable.bond.agent_access import AgentAccessIndex
+from sqlalchemy import String, and_, case, column, tuple_, update, values
+from typing import Any, Iterable, List, Dict, Optional, Tuple
 import logging
 import uuid
 
 LOGGER = logging.getLogger(__name__)
 
+AGENT_GROUP_PERMISSIONS = ('can_use_read_only', 'can_use', 'can_edit')
+
 
 class Groups:
 
-    def __init__(self, metadata: Metadata):
+    def __init__(self, metadata: Metadata, access_index: Optional[AgentAccessIndex] = None):
         self.metadata = metadata
+        self.access_index = access_index
 
     def _get_group_dict(self, group: GroupModel) -> Dict:
         """Convert GroupModel to dictionary."""
@@ -148,6 +153,8 @@ class Groups:
                 db_session.query(AgentGroupModel).filter(AgentGroupModel.group_id == group_id).delete()
                 db_session.delete(group)
                 db_session.commit()
+                if self.access_index is not None:
+                    self.access_index.invalidate()
 
                 LOGGER.info(f"Deleted group '{group_id}' by user '{user_id}'")
                 return True
@@ -194,6 +201,8 @@ class Groups:
                     return False
 
                 db_session.commit()
+                if self.access_index is not None:
+                    self.access_index.invalidate([member_user_id])
                 LOGGER.info(f"{action.capitalize()}ed user '{member_user_id}' {'to' if action == 'add' else 'from'} group '{group_id}' by user '{user_id}'")
                 return True
             except Exception as e:
@@ -201,6 +210,84 @@ class Groups:
                 LOGGER.error(f"Error {action}ing user '{member_user_id}' {'to' if action == 'add' else 'from'} group '{group_id}': {e}")
                 raise e
 
+    def apply_member_changes(self, user_id: str, changes: List[Dict[str, str]]) -> Dict[str, List]:
+        """Add or remove many (group, member) pairs in one transaction.
+
+        Each change is {"group_id", "user_id", "action": "add" | "remove"}. Only
+        groups owned by user_id can be changed; other changes are skipped with a
+        reason instead of failing the whole batch.
+
+        Returns {"added": [...], "removed": [...], "skipped": [...]}, each a list
+        of {"group_id", "user_id", ...} dicts.
+        """
+        diff: Dict[str, List] = {"added": [], "removed": [], "skipped": []}
+        if not changes:
+            return diff
+        with self.metadata.get_db_session() as db_session:
+            try:
+                group_ids = {c["group_id"] for c in changes}
+                member_ids = {c["user_id"] for c in changes}
+                owners = {
+                    row.id: row.owner_user_id for row in
+                    db_session.query(GroupModel.id, GroupModel.owner_user_id).filter(GroupModel.id.in_(group_ids)).all()
+                }
+                known_users = {
+                    row.id for row in db_session.query(UserModel.id).filter(UserModel.id.in_(member_ids)).all()
+                }
+                memberships = {
+                    (row.group_id, row.user_id) for row in
+                    db_session.query(GroupUserModel.group_id, GroupUserModel.user_id).filter(
+                        GroupUserModel.group_id.in_(group_ids),
+                        GroupUserModel.user_id.in_(member_ids)
+                    ).all()
+                }
+
+                to_add: List[Tuple[str, str]] = []
+                to_remove: List[Tuple[str, str]] = []
+                for change in changes:
+                    pair = (change["group_id"], change["user_id"])
+                    action = change.get("action")
+                    entry = {"group_id": pair[0], "user_id": pair[1]}
+                    if pair[0] not in owners:
+                        diff["skipped"].append({**entry, "reason": "group_not_found"})
+                    elif owners[pair[0]] != user_id:
+                        diff["skipped"].append({**entry, "reason": "forbidden"})
+                    elif action == "add":
+                        if pair[1] not in known_users:
+                            diff["skipped"].append({**entry, "reason": "user_not_found"})
+                        elif pair in memberships or pair in to_add:
+                            diff["skipped"].append({**entry, "reason": "already_member"})
+                        else:
+                            to_add.append(pair)
+                    elif action == "remove":
+                        if pair not in memberships or pair in to_remove:
+                            diff["skipped"].append({**entry, "reason": "not_member"})
+                        else:
+                            to_remove.append(pair)
+                    else:
+                        diff["skipped"].append({**entry, "reason": "invalid_action"})
+
+                db_session.add_all([GroupUserModel(group_id=g, user_id=u) for g, u in to_add])
+                if to_remove:
+                    db_session.query(GroupUserModel).filter(
+                        tuple_(GroupUserModel.group_id, GroupUserModel.user_id).in_(to_remove)
+                    ).delete(synchronize_session=False)
+                db_session.commit()
+
+                if self.access_index is not None and (to_add or to_remove):
+                    self.access_index.invalidate({u for _, u in to_add + to_remove})
+                diff["added"] = [{"group_id": g, "user_id": u} for g, u in to_add]
+                diff["removed"] = [{"group_id": g, "user_id": u} for g, u in to_remove]
+                LOGGER.info(
+                    f"Applied member changes by user '{user_id}': added {len(to_add)}, "
+                    f"removed {len(to_remove)}, skipped {len(diff['skipped'])}"
+                )
+                return diff
+            except Exception as e:
+                db_session.rollback()
+                LOGGER.error(f"Error applying member changes by user '{user_id}': {e}")
+                raise e
+
     def get_available_groups_for_agent(self, user_id: str, agent_id: Optional[str] = None) -> List[Dict]:
         """Get groups available for agent association."""
         with self.metadata.get_db_session() as db_session:
@@ -254,12 +341,16 @@ class Groups:
                     if existing.permission != permission:
                         existing.permission = permission
                         db_session.commit()
+                        if self.access_index is not None:
+                            self.access_index.invalidate()
                         LOGGER.info(f"Updated permission for agent '{agent_id}' group '{group_id}' to '{permission}'")
                     return True
 
                 agent_group = AgentGroupModel(agent_id=agent_id, group_id=group_id, permission=permission)
                 db_session.add(agent_group)
                 db_session.commit()
+                if self.access_index is not None:
+                    self.access_index.invalidate()
 
                 LOGGER.info(f"Associated agent '{agent_id}' with group '{group_id}' (permission: {permission})")
                 return True
@@ -278,58 +369,208 @@ class Groups:
 
     def sync_agent_groups(self, agent_id: str, desired_group_ids: List[str],
                           preserve_group_ids: Optional[List[str]] = None,
-                          group_permissions: Optional[Dict[str, str]] = None) -> None:
+                          group_permissions: Optional[Dict[str, str]] = None) -> Dict[str, List]:
         """Synchronize agent-group associations to match the desired set.
 
         Groups in preserve_group_ids will not be removed even if not in desired_group_ids.
         This is used to protect the default group from accidental removal.
         group_permissions is an optional {group_id: permission} dict to set permissions.
+
+        Returns the diff that was applied: {"added": [group_id, ...],
+        "removed": [group_id, ...], "updated": [group_id, ...]}.
         """
         with self.metadata.get_db_session() as db_session:
             try:
-                current = set(
-                    row.group_id for row in
-                    db_session.query(AgentGroupModel.group_id).filter(
+                current = {
+                    row.group_id: row.permission for row in
+                    db_session.query(AgentGroupModel.group_id, AgentGroupModel.permission).filter(
                         AgentGroupModel.agent_id == agent_id
                     ).all()
-                )
+                }
                 desired = set(desired_group_ids)
                 protected = set(preserve_group_ids or [])
                 perms = group_permissions or {}
 
-                to_add = desired - current
-                to_remove = (current - desired) - protected
-
-                for group_id in to_add:
-                    perm = perms.get(group_id, 'can_use')
-                    db_session.add(AgentGroupModel(agent_id=agent_id, group_id=group_id, permission=perm))
+                to_add = sorted(desired - set(current))
+                to_remove = sorted((set(current) - desired) - protected)
+                # Permissions for existing groups that are staying
+                to_update = sorted(
+                    group_id for group_id in desired & set(current)
+                    if group_id in perms and perms[group_id] != current[group_id]
+                )
 
+                db_session.add_all([
+                    AgentGroupModel(agent_id=agent_id, group_id=group_id, permission=perms.get(group_id, 'can_use'))
+                    for group_id in to_add
+                ])
                 if to_remove:
                     db_session.query(AgentGroupModel).filter(
                         AgentGroupModel.agent_id == agent_id,
                         AgentGroupModel.group_id.in_(to_remove)
-                    ).delete(synchronize_session='fetch')
-
-                # Update permissions for existing groups that are staying
-                for group_id in (desired & current):
-                    if group_id in perms:
-                        existing = db_session.query(AgentGroupModel).filter(
-                            AgentGroupModel.agent_id == agent_id,
-                            AgentGroupModel.group_id == group_id
-                        ).first()
-                        if existing and existing.permission != perms[group_id]:
-                            existing.permission = perms[group_id]
+                    ).delete(synchronize_session=False)
+                self._update_agent_group_permissions(
+                    db_session, [(agent_id, group_id, perms[group_id]) for group_id in to_update]
+                )
 
                 db_session.commit()
+                self._invalidate_group_members(db_session, to_add + to_remove + to_update)
                 LOGGER.info(
                     f"Synced groups for agent '{agent_id}': "
-                    f"added {len(to_add)}, removed {len(to_remove)}"
+                    f"added {len(to_add)}, removed {len(to_remove)}, updated {len(to_update)}"
                 )
+                return {"added": to_add, "removed": to_remove, "updated": to_update}
             except Exception as e:
                 db_session.rollback()
                 LOGGER.error(f"Error syncing groups for agent '{agent_id}': {e}")
                 raise e
 
+    def apply_agent_group_changes(self, user_id: str, changes: List[Dict[str, Any]]) -> Dict[str, List]:
+        """Add, remove or re-permission many (agent, group) pairs in one transaction.
+
+        Each change is {"agent_id", "group_id", "action": "add" | "remove" | "set_permission",
+        "permission"}. New pairs default to can_use. "add" on an existing pair only
+        updates its permission if one is given; "set_permission" and "remove" on a
+        missing pair are skipped. Changes to groups user_id neither owns nor belongs
+        to, to the Everyone group and to an agent's default group are skipped as
+        "forbidden". Callers are responsible for checking the user may edit each agent.
+
+        Returns {"added": [...], "removed": [...], "updated": [...], "skipped": [...]},
+        each a list of {"agent_id", "group_id", ...} dicts.
+        """
+        diff: Dict[str, List] = {"added": [], "removed": [], "updated": [], "skipped": []}
+        if not changes:
+            return diff
+        with self.metadata.get_db_session() as db_session:
+            try:
+                pairs = {(c["agent_id"], c["group_id"]) for c in changes}
+                current = {
+                    (row.agent_id, row.group_id): row.permission for row in
+                    db_session.query(AgentGroupModel.agent_id, AgentGroupModel.group_id, AgentGroupModel.permission)
+                    .filter(tuple_(AgentGroupModel.agent_id, AgentGroupModel.group_id).in_(list(pairs))).all()
+                }
+                group_ids = {c["group_id"] for c in changes}
+                existing_groups = {
+                    row.id for row in db_session.query(GroupModel.id).filter(GroupModel.id.in_(group_ids)).all()
+                }
+                accessible_groups = {
+                    row.id for row in db_session.query(GroupModel.id).outerjoin(
+                        GroupUserModel, GroupModel.id == GroupUserModel.group_id
+                    ).filter(
+                        GroupModel.id.in_(group_ids),
+                        (GroupModel.owner_user_id == user_id) | (GroupUserModel.user_id == user_id)
+                    ).distinct().all()
+                }
+                # Everyone and each agent's default group are managed by agent create/update, not batches
+                protected = {(a, EVERYONE_GROUP_ID) for a, _ in pairs} | {
+                    (row.agent_id, row.default_group_id) for row in
+                    db_session.query(AgentRecord.agent_id, AgentRecord.default_group_id).filter(
+                        AgentRecord.agent_id.in_({a for a, _ in pairs}),
+                        AgentRecord.default_group_id.isnot(None)
+                    ).all()
+                }
+
+                to_add: Dict[Tuple[str, str], str] = {}
+                to_remove: List[Tuple[str, str]] = []
+                to_update: Dict[Tuple[str, str], str] = {}
+                for change in changes:
+                    pair = (change["agent_id"], change["group_id"])
+                    action = change.get("action")
+                    permission = change.get("permission")
+                    entry = {"agent_id": pair[0], "group_id": pair[1]}
+
+                    if action not in ("add", "remove", "set_permission"):
+                        diff["skipped"].append({**entry, "reason": "invalid_action"})
+                    elif (permission is None and action == "set_permission") or \
+                            (permission is not None and permission not in AGENT_GROUP_PERMISSIONS):
+                        diff["skipped"].append({**entry, "reason": "invalid_permission"})
+                    elif pair[1] not in existing_groups:
+                        diff["skipped"].append({**entry, "reason": "group_not_found"})
+                    elif pair[1] not in accessible_groups or pair in protected:
+                        diff["skipped"].append({**entry, "reason": "forbidden"})
+                    elif action == "remove":
+                        if pair in current and pair not in to_remove:
+                            to_remove.append(pair)
+                        else:
+                            diff["skipped"].append({**entry, "reason": "not_associated"})
+                    elif pair not in current:
+                        if action == "add":
+                            to_add[pair] = permission or 'can_use'
+                        else:
+                            diff["skipped"].append({**entry, "reason": "not_associated"})
+                    elif permission is not None and current[pair] != permission:
+                        # "add" on an existing pair only changes an explicitly given permission
+                        to_update[pair] = permission
+
+                db_session.add_all([
+                    AgentGroupModel(agent_id=agent_id, group_id=group_id, permission=permission)
+                    for (agent_id, group_id), permission in to_add.items()
+                ])
+                if to_remove:
+                    db_session.query(AgentGroupModel).filter(
+                        tuple_(AgentGroupModel.agent_id, AgentGroupModel.group_id).in_(to_remove)
+                    ).delete(synchronize_session=False)
+                self._update_agent_group_permissions(
+                    db_session, [(agent_id, group_id, permission) for (agent_id, group_id), permission in to_update.items()]
+                )
+                db_session.commit()
+
+                diff["added"] = [{"agent_id": a, "group_id": g, "permission": p} for (a, g), p in to_add.items()]
+                diff["removed"] = [{"agent_id": a, "group_id": g} for a, g in to_remove]
+                diff["updated"] = [{"agent_id": a, "group_id": g, "permission": p} for (a, g), p in to_update.items()]
+                self._invalidate_group_members(
+                    db_session, [g for _, g in list(to_add) + to_remove + list(to_update)]
+                )
+                LOGGER.info(
+                    f"Applied agent-group changes by user '{user_id}': added {len(to_add)}, removed {len(to_remove)}, "
+                    f"updated {len(to_update)}, skipped {len(diff['skipped'])}"
+                )
+                return diff
+            except Exception as e:
+                db_session.rollback()
+                LOGGER.error(f"Error applying agent-group changes by user '{user_id}': {e}")
+                raise e
+
+    def _update_agent_group_permissions(self, db_session, updates: List[Tuple[str, str, str]]) -> None:
+        """Set permissions for many (agent_id, group_id, permission) rows in one UPDATE."""
+        if not updates:
+            return
+        if db_session.get_bind().dialect.name == 'postgresql':
+            # UPDATE agent_groups SET permission = v.permission FROM (VALUES ...) AS v WHERE ...
+            changes = values(
+                column('agent_id', String), column('group_id', String), column('permission', String),
+                name='permission_changes'
+            ).data(updates)
+            db_session.execute(
+                update(AgentGroupModel)
+                .where(AgentGroupModel.agent_id == changes.c.agent_id, AgentGroupModel.group_id == changes.c.group_id)
+                .values(permission=changes.c.permission)
+            )
+            return
+        # SQLite cannot name the columns of a VALUES list, so use a CASE over the pairs
+        db_session.execute(
+            update(AgentGroupModel)
+            .where(tuple_(AgentGroupModel.agent_id, AgentGroupModel.group_id).in_([(a, g) for a, g, _ in updates]))
+            .values(permission=case(
+                *[(and_(AgentGroupModel.agent_id == a, AgentGroupModel.group_id == g), p) for a, g, p in updates],
+                else_=AgentGroupModel.permission
+            ))
+        )
+
+    def _invalidate_group_members(self, db_session, group_ids: Iterable[str]) -> None:
+        """Invalidate cached agent access for the members of groups whose agent associations changed."""
+        group_ids = set(group_ids)
+        if self.access_index is None or not group_ids:
+            return
+        if EVERYONE_GROUP_ID in group_ids:
+            self.access_index.invalidate()
+            return
+        member_ids = [
+            row.user_id for row in db_session.query(GroupUserModel.user_id).filter(
+                GroupUserModel.group_id.in_(group_ids)
+            ).distinct().all()
+        ]
+        self.access_index.invalidate(member_ids)
+
     def get_agent_group_permissions(self, agent_id: str) -> Dict[str, str]:
         """Returns {group_id: permission} for all groups associated with agent."""
         with self.metadata.get_db_session() as db_session:
@@ -0,0 +1,140 @@
+"""
+Immutable, versioned snapshots of the effective MCP configuration.
+
+Config.get_mcp_snapshot() merges the static MCP config with bond-mcps
+discovery results once, and keeps the result until one of them changes; the
+next snapshot gets the next version number. Each snapshot carries the
+indexes the tool-call path needs, so resolving a tool is a dict lookup:
+
+    server_by_hash   hash in /b.{hash}.{tool} -> configured server name
+    tool_schemas     server name -> tool name -> definition, for the built-in
+                     admin and common tools (remote tool schemas are only
+                     known by asking the server)
+
+User-defined servers live in the database, so they are indexed per owner
+(hash -> server id) in a cache namespace. An owner's index is dropped when a
+session commits a change to their UserMcpServer rows; changes made by other
+workers are picked up within MCP_USER_SERVER_INDEX_TTL_SECONDS.
+
+Snapshots are shared by every caller, so their config and indexes must be
+treated as read-only.
+"""
+
+import functools
+import hashlib
+import itertools
+import logging
+import os
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from bondable.bond.cache import CacheNamespace
+from bondable.bond.providers.metadata import UserMcpServer
+
+LOGGER = logging.getLogger(__name__)
+
+
+def hash_server_name(server_name: str) -> str:
+    """
+    Generate 6-character hash of server name.
+
+    Uses SHA256 and takes first 6 hex characters. This provides
+    ~16 million unique values, sufficient for MCP server identification.
+
+    Args:
+        server_name: MCP server name from config
+
+    Returns:
+        6-character lowercase hex string
+    """
+    return hashlib.sha256(server_name.encode()).hexdigest()[:6]
+
+
+@functools.lru_cache(maxsize=1)
+def builtin_tool_schemas() -> Mapping[str, Mapping[str, Dict[str, Any]]]:
+    """Server name -> tool name -> definition for the admin and common tools."""
+    from bondable.bond.providers.bedrock.AdminMCP import ADMIN_SERVER_NAME, get_admin_tool_definitions
+    from bondable.bond.providers.bedrock.CommonToolsMCP import COMMON_SERVER_NAME, get_common_tool_definitions
+    return MappingProxyType({
+        ADMIN_SERVER_NAME: MappingProxyType({t['name']: t for t in get_admin_tool_definitions()}),
+        COMMON_SERVER_NAME: MappingProxyType({t['name']: t for t in get_common_tool_definitions()}),
+    })
+
+
+_versions = itertools.count(1)
+_latest: Optional["McpConfigSnapshot"] = None
+
+
+class McpConfigSnapshot:
+    """The merged MCP config of one moment, with lookup indexes built from it."""
+
+    __slots__ = ("version", "config", "servers", "server_by_hash", "tool_schemas", "_static_source", "_discovered")
+
+    def __init__(self, config: Dict[str, Any], static_source: Any, discovered: List[Dict[str, str]]):
+        servers = config.get("mcpServers", {}) if isinstance(config, dict) else {}
+        by_hash: Dict[str, str] = {}
+        for name in servers:
+            # On a hash collision the first server in config order wins, as it did with a linear scan
+            by_hash.setdefault(hash_server_name(name), name)
+        self.version = next(_versions)
+        self.config = config
+        self.servers = MappingProxyType(servers)
+        self.server_by_hash = MappingProxyType(by_hash)
+        self.tool_schemas = builtin_tool_schemas()
+        self._static_source = static_source
+        self._discovered = discovered
+
+    def built_from(self, static_source: Any, discovered: List[Dict[str, str]]) -> bool:
+        """True if this snapshot was built from the same static config and discovery results."""
+        return (self._static_source is static_source or self._static_source == static_source) \
+            and self._discovered == discovered
+
+
+def publish(snapshot: McpConfigSnapshot) -> None:
+    global _latest
+    _latest = snapshot
+    LOGGER.info(f"MCP config snapshot v{snapshot.version}: {len(snapshot.servers)} servers")
+
+
+def latest_snapshot() -> Optional[McpConfigSnapshot]:
+    """The most recently built snapshot, or None before the MCP config was first read."""
+    return _latest
+
+
+# --- User-defined servers ---
+
+USER_SERVER_INDEX = CacheNamespace(
+    "mcp_user_servers",
+    max_entries=int(os.environ.get('MCP_USER_SERVER_INDEX_MAX_USERS', '1024')),
+    ttl_seconds=float(os.environ.get('MCP_USER_SERVER_INDEX_TTL_SECONDS', '300')),
+)
+
+_PENDING_OWNERS = "mcp_user_server_owners"
+
+
+def user_servers_by_hash(owner_user_id: str, load: Callable[[], Mapping[str, str]]) -> Mapping[str, str]:
+    """Hash -> server id for the owner's active servers; load() builds it on a miss."""
+    return USER_SERVER_INDEX.get_or_load(owner_user_id, lambda: MappingProxyType(dict(load())))
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_user_server_changes(session, flush_context):
+    owners = {obj.owner_user_id for obj in itertools.chain(session.new, session.dirty, session.deleted)
+              if isinstance(obj, UserMcpServer)}
+    if owners:
+        session.info.setdefault(_PENDING_OWNERS, set()).update(owners)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_user_server_indexes(session):
+    # Invalidate only once the change is visible to other sessions, so a reload cannot see the old rows
+    for owner_user_id in session.info.pop(_PENDING_OWNERS, ()):
+        USER_SERVER_INDEX.invalidate(owner_user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_user_server_changes(session):
+    session.info.pop(_PENDING_OWNERS, None)
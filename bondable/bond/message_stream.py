@@ -0,0 +1,149 @@
+"""
+Incremental parser for the <_bondmessage> stream.
+
+Agents stream responses as text in which each message is wrapped in
+<_bondmessage id="..." thread_id="..." ...> ... </_bondmessage> tags.
+BondMessageParser turns chunks of that stream into structured events as they
+arrive:
+
+    MessageStart(attributes)   a start tag; attributes are unescaped
+    MessageText(text)          body text, in as few pieces as the chunks allow
+    MessageEnd()               an end tag (also emitted after a self-closing start tag)
+
+Each chunk is scanned once: the parser jumps between '<' characters with
+str.find and only looks closer at those, so plain body text costs one find
+and one slice per chunk. A tag split across chunks is held back until the
+rest of it arrives. A '<' that cannot start a bond tag is ordinary text.
+"""
+
+import re
+from typing import Dict, List, NamedTuple, Optional, Union
+from xml.sax.saxutils import unescape
+
+_TAG_NAME = "_bondmessage"
+_START_TAG = re.compile(r'<\s*_bondmessage((?:\s+[\w:-]+="[^"]*")*)\s*(/?)>')
+_END_TAG = re.compile(r'</\s*_bondmessage\s*>')
+_ATTRIBUTE = re.compile(r'([\w:-]+)="([^"]*)"')
+# What may follow the tag name in a start tag that has not been fully received yet
+_PARTIAL_START_TAIL = re.compile(r'(?:\s+[\w:-]+="[^"]*")*(?:\s+[\w:-]*(?:=(?:"[^"]*)?)?|\s*/?)\Z')
+_ENTITIES = {"&quot;": '"', "&apos;": "'"}
+
+# A '<' followed by more than this without completing a tag is treated as text
+MAX_TAG_LENGTH = 4096
+
+
+class MessageStart(NamedTuple):
+    attributes: Dict[str, str]
+
+    def flag(self, name: str) -> bool:
+        """Boolean attribute such as is_done or is_error."""
+        return self.attributes.get(name, "").lower() == "true"
+
+
+class MessageText(NamedTuple):
+    text: str
+
+
+class MessageEnd(NamedTuple):
+    pass
+
+
+MessageEvent = Union[MessageStart, MessageText, MessageEnd]
+
+
+def parse_attributes(raw: str) -> Dict[str, str]:
+    return {name: unescape(value, _ENTITIES) if "&" in value else value
+            for name, value in _ATTRIBUTE.findall(raw)}
+
+
+def _could_become_tag(text: str, pos: int) -> bool:
+    """True if text[pos:] (starting with '<') is an incomplete start or end tag."""
+    i = pos + 1
+    closing = text.startswith("/", i)
+    if closing:
+        i += 1
+    while i < len(text) and text[i].isspace():
+        i += 1
+    rest = text[i:]
+    if len(rest) <= len(_TAG_NAME):
+        return _TAG_NAME.startswith(rest)
+    if not rest.startswith(_TAG_NAME):
+        return False
+    tail = rest[len(_TAG_NAME):]
+    if closing:
+        return not tail.strip()
+    return _PARTIAL_START_TAIL.match(tail) is not None
+
+
+class BondMessageParser:
+    """
+    Streaming tokenizer for <_bondmessage> tags. Feed it chunks in order; it
+    keeps only an unfinished tag between calls. Not thread-safe: use one
+    parser per stream.
+    """
+
+    __slots__ = ("_pending", "in_message")
+
+    def __init__(self):
+        self._pending = ""
+        # True between a start tag and its end tag
+        self.in_message = False
+
+    @property
+    def has_pending(self) -> bool:
+        """True while the end of the last chunk is held back as a possible partial tag."""
+        return bool(self._pending)
+
+    def feed(self, chunk: Optional[str]) -> List[MessageEvent]:
+        if not chunk:
+            return []
+        if self._pending:
+            text = self._pending + chunk
+            self._pending = ""
+        else:
+            text = chunk
+
+        events: List[MessageEvent] = []
+        length = len(text)
+        text_start = 0
+        pos = 0
+        while True:
+            lt = text.find("<", pos)
+            if lt < 0:
+                break
+            match = _START_TAG.match(text, lt)
+            if match is not None:
+                if lt > text_start:
+                    events.append(MessageText(text[text_start:lt]))
+                events.append(MessageStart(parse_attributes(match.group(1))))
+                if match.group(2):
+                    events.append(MessageEnd())
+                    self.in_message = False
+                else:
+                    self.in_message = True
+                pos = text_start = match.end()
+                continue
+            match = _END_TAG.match(text, lt)
+            if match is not None:
+                if lt > text_start:
+                    events.append(MessageText(text[text_start:lt]))
+                events.append(MessageEnd())
+                self.in_message = False
+                pos = text_start = match.end()
+                continue
+            if length - lt <= MAX_TAG_LENGTH and _could_become_tag(text, lt):
+                # Hold the possible tag back until the next chunk completes or rules it out
+                if lt > text_start:
+                    events.append(MessageText(text[text_start:lt]))
+                self._pending = text[lt:]
+                return events
+            pos = lt + 1
+
+        if text_start < length:
+            events.append(MessageText(text[text_start:] if text_start else text))
+        return events
+
+    def close(self) -> List[MessageEvent]:
+        """End of stream: anything held back was not a tag after all."""
+        pending, self._pending = self._pending, ""
+        return [MessageText(pending)] if pending else []
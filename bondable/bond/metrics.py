@@ -0,0 +1,487 @@
+"""
+In-process metrics for Bond.
+
+A small registry of labelled counters and histograms that the chat path and
+the REST layer record into. It is dependency-free: the registry renders the
+Prometheus text exposition format itself (served at GET /metrics), and can
+also be mirrored to an OpenTelemetry collector over OTLP when the OTel SDK is
+installed, or written to a local file for environments with no scraper.
+
+Exporters are configured from the environment by start_exporters():
+
+    METRICS_OTLP_ENDPOINT           OTLP/HTTP metrics endpoint (optional)
+    METRICS_OTLP_EXPORT_SECONDS     OTLP export interval (default 60)
+    METRICS_FILE                    Path to write Prometheus text to (optional)
+    METRICS_FILE_INTERVAL_SECONDS   How often the file is rewritten (default 30)
+
+DB time is collected from SQLAlchemy cursor events into a per-request
+accumulator (see track_request_db_time), so any engine used while a request
+is being handled is counted without changes to the providers.
+"""
+
+import bisect
+import contextvars
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+# Seconds; spans a fast DB call up to a long multi-tool chat turn
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+DEPTH_BUCKETS = (0, 1, 2, 3, 4, 5, 6, 8, 10, 15, 20)
+
+LabelValues = Tuple[str, ...]
+
+
+def _label_values(names: Sequence[str], labels: Dict[str, Any]) -> LabelValues:
+    if set(labels) != set(names):
+        raise ValueError(f"Expected labels {sorted(names)}, got {sorted(labels)}")
+    return tuple('' if labels[n] is None else str(labels[n]) for n in names)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(pairs: Sequence[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape_label(v)}"' for k, v in pairs) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[str, float, Dict[str, str]], None]] = []
+
+    def _notify(self, value: float, values: LabelValues) -> None:
+        if not self._listeners:
+            return
+        attributes = dict(zip(self.label_names, values))
+        for listener in self._listeners:
+            try:
+                listener(self.name, value, attributes)
+            except Exception as e:  # noqa: BLE001 - an exporter must not break the caller
+                LOGGER.debug(f"Metrics listener failed for {self.name}: {e}")
+
+
+class Counter(_Metric):
+    """Monotonic counter, one series per label combination."""
+    kind = 'counter'
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = ()):
+        super().__init__(name, description, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        values = _label_values(self.label_names, labels)
+        with self._lock:
+            self._values[values] = self._values.get(values, 0) + amount
+        self._notify(amount, values)
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(_label_values(self.label_names, labels), 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}_total{_format_labels(list(zip(self.label_names, values)))} {_format_value(total)}"
+            for values, total in items
+        ]
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [{'labels': dict(zip(self.label_names, v)), 'value': total} for v, total in sorted(self._values.items())]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class _HistogramSeries:
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self, size: int):
+        self.counts = [0] * size
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram, one series per label combination."""
+    kind = 'histogram'
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, description, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelValues, _HistogramSeries] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        values = _label_values(self.label_names, labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(values)
+            if series is None:
+                series = self._series[values] = _HistogramSeries(len(self.buckets) + 1)
+            series.counts[index] += 1
+            series.sum += value
+            series.count += 1
+        self._notify(value, values)
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Observe the wall time of the with-block, including when it raises."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(time.monotonic() - start, **labels)
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            series = self._series.get(_label_values(self.label_names, labels))
+            return series.count if series else 0
+
+    def sum(self, **labels) -> float:
+        with self._lock:
+            series = self._series.get(_label_values(self.label_names, labels))
+            return series.sum if series else 0.0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(v, list(s.counts), s.sum, s.count) for v, s in sorted(self._series.items())]
+        lines = []
+        for values, counts, total, count in items:
+            pairs = list(zip(self.label_names, values))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels(pairs + [('le', _format_value(bound))])} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(pairs)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(pairs)} {count}")
+        return lines
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                {'labels': dict(zip(self.label_names, v)), 'count': s.count, 'sum': s.sum,
+                 'buckets': dict(zip([_format_value(b) for b in self.buckets + (math.inf,)], s.counts))}
+                for v, s in sorted(self._series.items())
+            ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class MetricsRegistry:
+    """Holds the process's metrics and renders them for scraping or export."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, description: str, labels: Sequence[str], **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, description, labels, **kwargs)
+            elif not isinstance(metric, cls) or metric.label_names != tuple(labels):
+                raise ValueError(f"Metric {name} already registered with a different type or labels")
+            return metric
+
+    def counter(self, name: str, description: str, labels: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, description, labels)
+
+    def histogram(self, name: str, description: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, description, labels, buckets=buckets)
+
+    def metrics(self) -> List[_Metric]:
+        with self._lock:
+            return [self._metrics[name] for name in sorted(self._metrics)]
+
+    def add_listener(self, listener: Callable[[_Metric], Optional[Callable[[str, float, Dict[str, str]], None]]]) -> None:
+        """
+        Attach an exporter. listener(metric) is called for every registered
+        metric and returns a callback(name, value, attributes) that receives
+        each later observation, or None to skip that metric.
+        """
+        for metric in self.metrics():
+            callback = listener(metric)
+            if callback is not None:
+                metric._listeners.append(callback)
+
+    def render_prometheus(self) -> str:
+        lines = []
+        for metric in self.metrics():
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {m.name: {'type': m.kind, 'series': m.snapshot()} for m in self.metrics()}
+
+    def reset(self) -> None:
+        """Clear every recorded value. Registered metrics are kept."""
+        for metric in self.metrics():
+            metric.reset()
+
+
+REGISTRY = MetricsRegistry()
+
+CHAT_TIME_TO_FIRST_TOKEN = REGISTRY.histogram(
+    'bond_chat_time_to_first_token_seconds',
+    'Time from the start of a chat turn to the first text chunk sent to the client',
+    labels=('agent_id',))
+INVOKE_AGENT_LATENCY = REGISTRY.histogram(
+    'bond_invoke_agent_seconds',
+    'Latency of Bedrock invoke_agent calls until the response stream opens',
+    labels=('agent_id', 'phase'))
+MCP_TOOL_LATENCY = REGISTRY.histogram(
+    'bond_mcp_tool_seconds',
+    'Latency of MCP tool executions',
+    labels=('agent_id', 'tool', 'outcome'))
+CONTINUATION_DEPTH = REGISTRY.histogram(
+    'bond_chat_continuation_depth',
+    'Depth of each returnControl continuation handled in a chat turn',
+    labels=('agent_id',), buckets=DEPTH_BUCKETS)
+COMPACTION_LATENCY = REGISTRY.histogram(
+    'bond_context_compaction_seconds',
+    'Time spent summarising and rotating a thread context',
+    labels=('agent_id',))
+KB_RETRIEVAL_LATENCY = REGISTRY.histogram(
+    'bond_kb_retrieval_seconds',
+    'Knowledge Base retrieval latency before a chat turn',
+    labels=('agent_id',))
+IMAGE_ANALYSIS_LATENCY = REGISTRY.histogram(
+    'bond_image_analysis_seconds',
+    'Time spent analysing image attachments via the Converse API',
+    labels=('agent_id',))
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    'bond_http_request_duration_seconds',
+    'REST request duration, including streamed response bodies',
+    labels=('method', 'route', 'status'))
+HTTP_REQUEST_DB_TIME = REGISTRY.histogram(
+    'bond_http_request_db_seconds',
+    'Time spent executing SQL statements while handling a REST request',
+    labels=('method', 'route'))
+HTTP_REQUEST_DB_STATEMENTS = REGISTRY.counter(
+    'bond_http_request_db_statements',
+    'SQL statements executed while handling REST requests',
+    labels=('method', 'route'))
+AWS_CALL_LATENCY = REGISTRY.histogram(
+    'bond_aws_call_seconds',
+    'Latency of AWS API calls made through the shared clients, until the response (or stream) opens',
+    labels=('service', 'operation', 'outcome'))
+CACHE_LOOKUPS = REGISTRY.counter(
+    'bond_cache_lookups',
+    'Process cache lookups by outcome: hit, shared_hit (loaded from the shared tier) or miss',
+    labels=('namespace', 'result'))
+CACHE_EVICTIONS = REGISTRY.counter(
+    'bond_cache_evictions',
+    'Process cache entries removed before reuse, by reason: lru, expired or invalidated',
+    labels=('namespace', 'reason'))
+
+
+# --- Per-request DB time ---
+
+class RequestDbTime:
+    """Mutable accumulator shared by every context copied from the request's."""
+    __slots__ = ('seconds', 'statements')
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.statements = 0
+
+
+_REQUEST_DB_TIME: contextvars.ContextVar[Optional[RequestDbTime]] = contextvars.ContextVar(
+    'bond_request_db_time', default=None)
+_SQLALCHEMY_INSTRUMENTED = False
+_SQLALCHEMY_LOCK = threading.Lock()
+
+
+@contextmanager
+def track_request_db_time() -> Iterator[RequestDbTime]:
+    """
+    Accumulate SQL time for the duration of the block.
+
+    The accumulator is shared with contexts copied from this one, so statements
+    run from threadpool workers and streamed response bodies are counted too.
+    Threads started with a fresh context (e.g. ThreadPoolExecutor workers) are not.
+    """
+    accumulator = RequestDbTime()
+    token = _REQUEST_DB_TIME.set(accumulator)
+    try:
+        yield accumulator
+    finally:
+        _REQUEST_DB_TIME.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _REQUEST_DB_TIME.get() is not None:
+        conn.info.setdefault('bond_metrics_query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    accumulator = _REQUEST_DB_TIME.get()
+    starts = conn.info.get('bond_metrics_query_start')
+    if accumulator is None or not starts:
+        return
+    accumulator.seconds += time.perf_counter() - starts.pop()
+    accumulator.statements += 1
+
+
+def instrument_sqlalchemy() -> None:
+    """Listen to cursor events on every SQLAlchemy engine. Idempotent."""
+    global _SQLALCHEMY_INSTRUMENTED
+    with _SQLALCHEMY_LOCK:
+        if _SQLALCHEMY_INSTRUMENTED:
+            return
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        _SQLALCHEMY_INSTRUMENTED = True
+
+
+# --- Exporters ---
+
+class MetricsFileWriter:
+    """Periodically writes the Prometheus text to a file, for offline collection."""
+
+    def __init__(self, path: str, interval_seconds: float, registry: MetricsRegistry = REGISTRY):
+        self.path = path
+        self.interval_seconds = interval_seconds
+        self.registry = registry
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def write(self) -> None:
+        # Write then rename so a reader never sees a partial file
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(self.registry.render_prometheus())
+        os.replace(tmp_path, self.path)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="metrics-file-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self._write_safely()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            self._write_safely()
+
+    def _write_safely(self) -> None:
+        try:
+            self.write()
+        except Exception as e:  # noqa: BLE001 - keep writing on the next tick
+            LOGGER.warning(f"Could not write metrics to {self.path}: {e}")
+
+
+def _otlp_listener(endpoint: str, export_seconds: float):
+    """Build an OTel MeterProvider exporting to endpoint; returns (listener, meter_provider)."""
+    from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter
+    from opentelemetry.sdk.metrics import MeterProvider
+    from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+    from opentelemetry.sdk.metrics.view import ExplicitBucketHistogramAggregation, View
+    from opentelemetry.sdk.resources import Resource
+
+    histograms = [m for m in REGISTRY.metrics() if isinstance(m, Histogram)]
+    reader = PeriodicExportingMetricReader(
+        OTLPMetricExporter(endpoint=endpoint), export_interval_millis=int(export_seconds * 1000))
+    meter_provider = MeterProvider(
+        resource=Resource.create({'service.name': os.getenv('OTEL_SERVICE_NAME', 'bond-ai')}),
+        metric_readers=[reader],
+        # Keep the same bucket boundaries as /metrics so both views agree
+        views=[View(instrument_name=h.name, aggregation=ExplicitBucketHistogramAggregation(list(h.buckets)))
+               for h in histograms],
+    )
+    meter = meter_provider.get_meter('bondable')
+
+    def listener(metric: _Metric):
+        if isinstance(metric, Histogram):
+            instrument = meter.create_histogram(metric.name, description=metric.description)
+            return lambda name, value, attributes: instrument.record(value, attributes=attributes)
+        if isinstance(metric, Counter):
+            instrument = meter.create_counter(metric.name, description=metric.description)
+            return lambda name, value, attributes: instrument.add(value, attributes=attributes)
+        return None
+
+    return listener, meter_provider
+
+
+_exporters_lock = threading.Lock()
+_file_writer: Optional[MetricsFileWriter] = None
+_meter_provider = None
+
+
+def start_exporters() -> None:
+    """Start the exporters configured in the environment. Safe to call more than once."""
+    global _file_writer, _meter_provider
+    with _exporters_lock:
+        otlp_endpoint = os.getenv('METRICS_OTLP_ENDPOINT')
+        if otlp_endpoint and _meter_provider is None:
+            try:
+                listener, _meter_provider = _otlp_listener(
+                    otlp_endpoint, float(os.getenv('METRICS_OTLP_EXPORT_SECONDS', '60')))
+                REGISTRY.add_listener(listener)
+                LOGGER.info(f"Exporting metrics over OTLP to {otlp_endpoint}")
+            except ImportError:
+                LOGGER.warning("METRICS_OTLP_ENDPOINT is set but the OpenTelemetry SDK is not installed; "
+                               "install opentelemetry-sdk and opentelemetry-exporter-otlp-proto-http")
+
+        metrics_file = os.getenv('METRICS_FILE')
+        if metrics_file and _file_writer is None:
+            _file_writer = MetricsFileWriter(metrics_file, float(os.getenv('METRICS_FILE_INTERVAL_SECONDS', '30')))
+            _file_writer.start()
+            LOGGER.info(f"Writing metrics to {metrics_file}")
+
+
+def stop_exporters() -> None:
+    """Flush and stop the exporters started by start_exporters()."""
+    global _file_writer, _meter_provider
+    with _exporters_lock:
+        if _file_writer is not None:
+            _file_writer.stop()
+            _file_writer = None
+        if _meter_provider is not None:
+            try:
+                _meter_provider.shutdown()
+            except Exception as e:  # noqa: BLE001
+                LOGGER.warning(f"Error shutting down OTLP metrics exporter: {e}")
+            _meter_provider = None
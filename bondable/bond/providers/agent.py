@@ -1,13 +1,25 @@
 from abc import ABC, abstractmethod
 from bondable.bond.definition import AgentDefinition
 from bondable.bond.broker import Broker
+from bondable.bond.agent_access import AgentAccessIndex
 from bondable.bond.providers.metadata import Metadata, AgentRecord, AgentGroup, GroupUser, VectorStore, EVERYONE_GROUP_ID
 from sqlalchemy import case, func
-from typing import List, Dict, Optional, Generator
+from typing import Callable, List, Dict, Optional, Generator, Any, Tuple
 import logging
+import os
+import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 LOGGER = logging.getLogger(__name__)
 
+# How long a process trusts its cached default agent before re-reading it. The
+# default only changes when it is first created or deleted, and this process
+# resets its own cache when it does either.
+_DEFAULT_AGENT_CACHE_TTL = int(os.environ.get('DEFAULT_AGENT_CACHE_TTL', '300'))
+# Agents deleted concurrently when a user is offboarded
+_AGENT_DELETE_MAX_WORKERS = int(os.environ.get('AGENT_DELETE_MAX_WORKERS', '8'))
+
 
 
 
@@ -135,6 +147,12 @@ class AgentProvider(ABC):
     """
 
     metadata: Metadata = None
+    # Optional per-user permission cache; set by the provider that owns this instance
+    access_index: Optional[AgentAccessIndex] = None
+    # (agent_id, summary, loaded_at) for the default agent. Providers are per-process
+    # singletons, so an entry stored on the instance is effectively process-wide.
+    _default_agent_cache: Optional[Tuple[str, Optional[Dict[str, Any]], float]] = None
+    _default_agent_cache_lock = threading.Lock()
 
     def __init__(self, metadata: Metadata):
         """
@@ -152,13 +170,16 @@ class AgentProvider(ABC):
         pass
 
     @abstractmethod
-    def create_or_update_agent_resource(self, agent_def: AgentDefinition, owner_user_id: str) -> Agent:
+    def create_or_update_agent_resource(self, agent_def: AgentDefinition, owner_user_id: str,
+                                        on_prepare: Optional[Callable[[str], None]] = None) -> Agent:
         """
         Creates or updates an agent resource based on the provided agent definition.
 
         Args:
             user_id (str): The ID of the user creating or updating the agent.
             agent_def (AgentDefinition): The definition of the agent to be created or updated.
+            on_prepare: Called with the agent id when the provider starts preparing the
+                agent, for providers that have such a step.
 
         Returns:
             Agent: The created or updated agent object.
@@ -288,6 +309,10 @@ class AgentProvider(ABC):
                 # Now delete the agent record (safe from FK constraints)
                 deleted_rows_count = session.query(AgentRecord).filter(AgentRecord.agent_id == agent_id).delete()
                 session.commit()
+                if self.access_index is not None:
+                    self.access_index.invalidate()
+                if self._default_agent_cache and self._default_agent_cache[0] == agent_id:
+                    self._reset_default_agent_cache()
                 if deleted_rows_count > 0:
                     LOGGER.info(f"Deleted {deleted_rows_count} local DB records for agent_id: {agent_id}")
                 else:
@@ -298,20 +323,39 @@ class AgentProvider(ABC):
                 raise
 
     def delete_agents_for_user(self, user_id: str) -> None:
-        # query all agents owned by the user
+        """
+        Deletes every agent the user owns. Each delete_agent call waits on the
+        provider's API, so they run concurrently on a bounded pool.
+        """
         with self.metadata.get_db_session() as session:
             LOGGER.info(f"Cleaning up resources for user_id: {user_id}")
-            for agent_id_tuple in session.query(AgentRecord.agent_id).filter(AgentRecord.owner_user_id == user_id).all():
-                agent_id = agent_id_tuple[0]
+            agent_ids = [row[0] for row in session.query(AgentRecord.agent_id).filter(AgentRecord.owner_user_id == user_id).all()]
+        if not agent_ids:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(_AGENT_DELETE_MAX_WORKERS, len(agent_ids)),
+                                thread_name_prefix="agent-delete") as executor:
+            futures = {executor.submit(self._delete_agent_in_worker, agent_id): agent_id for agent_id in agent_ids}
+            for future in as_completed(futures):
+                agent_id = futures[future]
                 try:
-                    deleted = self.delete_agent(agent_id)
+                    deleted = future.result()
                     LOGGER.info(f"Deleted agent with agent_id: {agent_id} - Success: {deleted}")
                 except Exception as e:
                     LOGGER.error(f"Error deleting agent with agent_id: {agent_id}. Error: {e}")
 
+    def _delete_agent_in_worker(self, agent_id: str) -> bool:
+        try:
+            return self.delete_agent(agent_id)
+        finally:
+            # Worker threads get their own scoped session; release it before the thread is reused
+            self.metadata.get_db_session().close()
+
 
-    def create_or_update_agent(self, agent_def: AgentDefinition, user_id: str) -> Agent:
-        agent: Agent = self.create_or_update_agent_resource(agent_def=agent_def, owner_user_id=user_id)
+    def create_or_update_agent(self, agent_def: AgentDefinition, user_id: str,
+                               on_prepare: Optional[Callable[[str], None]] = None) -> Agent:
+        agent: Agent = self.create_or_update_agent_resource(agent_def=agent_def, owner_user_id=user_id,
+                                                            on_prepare=on_prepare)
         with self.metadata.get_db_session() as session:
             # check to see if the agent already exists in the metadata
             agent_record: AgentRecord = session.query(AgentRecord).filter(AgentRecord.agent_id == agent.get_agent_id()).first()
@@ -403,6 +447,10 @@ class AgentProvider(ABC):
                             session.commit()
                             LOGGER.info(f"Updated vector store {vector_store_record.name} to be default for agent {agent.get_name()}")
 
+        # Any user with can_edit may save the agent, and a save can touch ownership or
+        # the default flag, so drop every cached entry rather than just the caller's
+        if self.access_index is not None:
+            self.access_index.invalidate()
         return agent
 
 
@@ -506,7 +554,39 @@ class AgentProvider(ABC):
 
             return agent_records
 
+    def get_agent_summaries(self, agent_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns lightweight summaries for the given agents, keyed by agent_id, for
+        callers that only need display data and not a full Agent instance.
+
+        Each summary has: agent_id, name, slug, description, model, icon, metadata
+        (including owner_user_id, as returned by Agent.get_metadata) and owner_user_id.
+        Unknown agent ids are omitted.
+
+        This default implementation builds each agent; providers that keep this data
+        locally should override it with a bulk query.
+        """
+        summaries = {}
+        for agent_id in dict.fromkeys(aid for aid in agent_ids if aid):
+            agent = self.get_agent(agent_id=agent_id)
+            if not agent:
+                continue
+            record = self.get_agent_record(agent_id)
+            metadata = agent.get_metadata()
+            summaries[agent_id] = {
+                "agent_id": agent_id,
+                "name": agent.get_name(),
+                "slug": record.slug if record else None,
+                "description": agent.get_description(),
+                "model": getattr(agent, 'model', None),
+                "icon": metadata.get('icon_svg'),
+                "metadata": metadata,
+                "owner_user_id": metadata.get('owner_user_id'),
+            }
+        return summaries
+
     def list_agents(self, user_id) -> List[Agent]:
+        """Build every agent the user can access. Use get_agent_summaries when only display data is needed."""
         agent_records = self.get_agent_records(user_id=user_id)
         agents = []
         for record in agent_records:
@@ -543,6 +623,8 @@ class AgentProvider(ABC):
         Validates if a user can access a given agent. The user can either be the owner of the agent,
         the agent could have been shared with the user via a group, or the agent is in the Everyone group.
         """
+        if self.access_index is not None:
+            return self.access_index.can_access(user_id, agent_id)
         with self.metadata.get_db_session() as session:
             access_query = (
                 session.query(AgentRecord)
@@ -563,6 +645,8 @@ class AgentProvider(ABC):
         Returns the effective permission for a user on an agent.
         Returns 'owner', 'can_edit', 'can_use', or None (no access).
         """
+        if self.access_index is not None:
+            return self.access_index.get_permission(user_id, agent_id)
         with self.metadata.get_db_session() as session:
             # Check if user owns the agent
             agent_record = session.query(AgentRecord).filter(
@@ -599,6 +683,49 @@ class AgentProvider(ABC):
                 return 'can_use'
             return 'can_use_read_only'
 
+    def get_default_agent_id(self) -> Optional[str]:
+        """
+        Returns the id of the default agent without building it, or None if no default
+        agent exists yet. Use this to check whether an agent is the default; it does not
+        create one. Served from a process-wide cache refreshed every DEFAULT_AGENT_CACHE_TTL
+        seconds.
+        """
+        entry = self._load_default_agent_cache()
+        return entry[0] if entry else None
+
+    def get_default_agent_summary(self) -> Optional[Dict[str, Any]]:
+        """Returns the cached get_agent_summaries entry for the default agent, or None."""
+        entry = self._load_default_agent_cache()
+        return entry[1] if entry else None
+
+    def _load_default_agent_cache(self) -> Optional[Tuple[str, Optional[Dict[str, Any]], float]]:
+        now = time.monotonic()
+        with self._default_agent_cache_lock:
+            entry = self._default_agent_cache
+            if entry is not None and now - entry[2] < _DEFAULT_AGENT_CACHE_TTL:
+                return entry
+
+        with self.metadata.get_db_session() as session:
+            record = session.query(AgentRecord.agent_id).filter(AgentRecord.is_default == True).first()
+        if record is None:
+            # Not cached: the default may be created by another worker at any time
+            return None
+
+        summary = None
+        try:
+            summary = self.get_agent_summaries([record.agent_id]).get(record.agent_id)
+        except Exception as e:
+            LOGGER.warning(f"Could not load summary for default agent {record.agent_id}: {e}")
+
+        entry = (record.agent_id, summary, now)
+        with self._default_agent_cache_lock:
+            self._default_agent_cache = entry
+        return entry
+
+    def _reset_default_agent_cache(self) -> None:
+        with self._default_agent_cache_lock:
+            self._default_agent_cache = None
+
     def get_default_agent(self) -> Optional[Agent]:
         """
         Retrieves the default agent from the database.
@@ -658,6 +785,9 @@ class AgentProvider(ABC):
                 if agent_record:
                     agent_record.is_default = True
                     session.commit()
+                    if self.access_index is not None:
+                        self.access_index.invalidate()
+                    self._reset_default_agent_cache()
                     LOGGER.info(f"Created default agent with id: {agent.get_agent_id()}")
                     return agent
                 else:
@@ -15,8 +15,9 @@ import pandas as pd
 import logging
 import base64
 import hashlib
+import concurrent.futures
 import boto3
-from typing import List, Dict, Optional, Generator, Any
+from typing import Callable, List, Dict, Optional, Generator, Any
 from http.client import RemoteDisconnected
 from botocore.exceptions import ClientError, ConnectionClosedError, EventStreamError, ReadTimeoutError
 from urllib3.exceptions import ReadTimeoutError as Urllib3ReadTimeoutError
@@ -33,6 +34,11 @@ from .BedrockCRUD import create_bedrock_agent, update_bedrock_agent, delete_bedr
 from .BedrockGuardrails import GUARDRAIL_BLOCK_MESSAGE
 from xml.sax.saxutils import escape as xml_escape, unescape as xml_unescape  # nosec B406
 from bondable.utils.logging_utils import safe_id
+from bondable.bond.metrics import (
+    CHAT_TIME_TO_FIRST_TOKEN, COMPACTION_LATENCY, CONTINUATION_DEPTH, IMAGE_ANALYSIS_LATENCY,
+    INVOKE_AGENT_LATENCY, KB_RETRIEVAL_LATENCY, MCP_TOOL_LATENCY,
+)
+from bondable.bond.response_buffer import ResponseBuffer
 from .BedrockMCP import (
     execute_mcp_tool_sync,
     _parse_tool_path,
@@ -65,9 +71,14 @@ DEFAULT_CONTEXT_WINDOW = 200_000
 CHARS_PER_TOKEN_ESTIMATE = 4
 MAX_SUMMARY_TOKENS = 2048
 
-# Configurable compaction threshold (fraction of context window).
-# Override via BEDROCK_COMPACTION_THRESHOLD env var (0.0-1.0).
+# Configurable compaction thresholds (fractions of context window, 0.0-1.0).
+# A turn that ends past BEDROCK_COMPACTION_THRESHOLD starts summarizing the thread
+# in the background and the next turn switches to the summary. Only a turn that
+# ends past BEDROCK_COMPACTION_HARD_THRESHOLD with no summary ready compacts inline.
 COMPACTION_THRESHOLD_RATIO = float(os.environ.get('BEDROCK_COMPACTION_THRESHOLD', '0.6'))
+COMPACTION_HARD_THRESHOLD_RATIO = float(os.environ.get('BEDROCK_COMPACTION_HARD_THRESHOLD', '0.85'))
+# A compaction_in_progress flag older than this is treated as abandoned
+COMPACTION_FLAG_STALE_SECONDS = 60
 
 # Ensure instructions meet minimum length requirement (40 chars for Bedrock)
 MIN_INSTRUCTION_LENGTH = 40
@@ -381,6 +392,8 @@ class BedrockAgent(Agent):
         # Consider refactoring to use Python's contextvars module for thread-safe storage.
         self._current_user = current_user
         self._jwt_token = jwt_token
+        # Turn start for the time-to-first-token metric (see _handle_chunk_event)
+        self._turn_started_at = time.monotonic()
         if not thread_id:
             raise ValueError("thread_id is required for streaming response")
 
@@ -405,7 +418,7 @@ class BedrockAgent(Agent):
                 from datetime import datetime, timedelta, timezone
                 try:
                     started = datetime.fromisoformat(compaction_ts)
-                    if datetime.now(timezone.utc) - started < timedelta(seconds=60):
+                    if datetime.now(timezone.utc) - started < timedelta(seconds=COMPACTION_FLAG_STALE_SECONDS):
                         LOGGER.warning(f"Compaction in progress for thread {thread_id}, proceeding with existing session")
                     else:
                         LOGGER.warning(f"Stale compaction flag for thread {thread_id}, clearing")
@@ -421,6 +434,10 @@ class BedrockAgent(Agent):
                         session_id=session_id, session_state=session_state
                     )
 
+            # Switch to a summary a background compaction prepared after an earlier turn
+            session_id, session_state = self._take_precomputed_compaction(
+                thread_id, user_id, session_id, session_state)
+
             # Check if a prior compaction prepared a summary for this session
             pending_summary = session_state.get('pending_compaction_summary')
             if pending_summary:
@@ -473,11 +490,12 @@ class BedrockAgent(Agent):
 
             # Query Knowledge Base if in knowledge_base mode
             if self.file_storage == 'knowledge_base':
-                kb_results = self.bond_provider.vectorstores.query_knowledge_base(
-                    query=prompt,
-                    agent_id=self.agent_id,
-                    max_results=10
-                )
+                with KB_RETRIEVAL_LATENCY.time(agent_id=self.agent_id):
+                    kb_results = self.bond_provider.vectorstores.query_knowledge_base(
+                        query=prompt,
+                        agent_id=self.agent_id,
+                        max_results=10
+                    )
                 if kb_results:
                     LOGGER.info(f"KB query returned {len(kb_results)} results for agent {self.agent_id}")
                     kb_context = "\n\n--- Relevant Context from Knowledge Base ---\n"
@@ -510,7 +528,8 @@ class BedrockAgent(Agent):
 
                 # Analyze images via Converse API and augment the prompt
                 if image_attachments:
-                    image_analysis = self._analyze_images_via_converse(image_attachments, prompt)
+                    with IMAGE_ANALYSIS_LATENCY.time(agent_id=self.agent_id):
+                        image_analysis = self._analyze_images_via_converse(image_attachments, prompt)
                     prompt = f"{prompt}\n\n--- Image Analysis ---\n{image_analysis}\n--- End Image Analysis ---"
                     LOGGER.info(f"Augmented prompt with image analysis from {len(image_attachments)} image(s)")
 
@@ -1386,17 +1405,25 @@ Please integrate any relevant insights from the documents with your analysis of
                     try:
                         # mcp_config already fetched above for server resolution
                         if mcp_config:
-                            result = execute_mcp_tool_sync(
-                                mcp_config,
-                                tool_name,
-                                parameters,
-                                current_user=self._current_user,
-                                jwt_token=self._jwt_token,
-                                target_server=target_server  # Direct routing to correct server
-                            )
+                            tool_start = time.monotonic()
+                            try:
+                                result = execute_mcp_tool_sync(
+                                    mcp_config,
+                                    tool_name,
+                                    parameters,
+                                    current_user=self._current_user,
+                                    jwt_token=self._jwt_token,
+                                    target_server=target_server  # Direct routing to correct server
+                                )
+                            except Exception:
+                                self._observe_metric(MCP_TOOL_LATENCY, time.monotonic() - tool_start,
+                                                     tool=tool_name, outcome='exception')
+                                raise
 
                             # T9/T21: Structured audit log for tool execution outcome
                             success = result.get('success', False)
+                            self._observe_metric(MCP_TOOL_LATENCY, time.monotonic() - tool_start,
+                                                 tool=tool_name, outcome='success' if success else 'error')
                             result_preview = str(result.get('result', result.get('error', 'Unknown')))[:200]
                             LOGGER.info(
                                 "MCP_TOOL_RESULT: tool=%s server=%s user_id=%s agent_id=%s success=%s",
@@ -1538,6 +1565,13 @@ Please integrate any relevant insights from the documents with your analysis of
 
         return new_response_id
 
+    def _observe_metric(self, histogram, value: float, **labels) -> None:
+        """Record a per-agent observation. Metrics must never interrupt a chat turn."""
+        try:
+            histogram.observe(value, agent_id=getattr(self, 'agent_id', None), **labels)
+        except Exception as e:
+            LOGGER.debug(f"Could not record {histogram.name}: {e}")
+
     def _handle_chunk_event(self, chunk: Dict[str, Any]) -> Optional[str]:
         """
         Handle a chunk event from Bedrock streaming.
@@ -1550,6 +1584,10 @@ Please integrate any relevant insights from the documents with your analysis of
         """
         if 'bytes' in chunk:
             text = chunk['bytes'].decode('utf-8')
+            turn_started_at = getattr(self, '_turn_started_at', None)
+            if text and turn_started_at is not None:
+                self._observe_metric(CHAT_TIME_TO_FIRST_TOKEN, time.monotonic() - turn_started_at)
+                self._turn_started_at = None
             return xml_escape(text)
         return None
 
@@ -1735,7 +1773,8 @@ Please integrate any relevant insights from the documents with your analysis of
 
         # Strip custom keys that are not valid Bedrock sessionState parameters.
         # These are used internally for context tracking but must not be sent to the API.
-        _CUSTOM_SESSION_KEYS = {'context_usage', 'pending_compaction_summary', 'compaction_in_progress'}
+        _CUSTOM_SESSION_KEYS = {'context_usage', 'pending_compaction_summary', 'compaction_in_progress',
+                                'precomputed_compaction'}
         bedrock_session_state = {
             k: v for k, v in updated_session_state.items()
             if k not in _CUSTOM_SESSION_KEYS
@@ -1754,8 +1793,9 @@ Please integrate any relevant insights from the documents with your analysis of
             }
         }
 
-        # Initialize response tracking
-        full_content = ""
+        # Initialize response tracking. The buffer is shared with the
+        # continuation handlers, which append their text to it directly.
+        response_buffer = ResponseBuffer()
         response_id = str(uuid.uuid4())
         response_type = "text"
         response_role = "assistant"
@@ -1788,7 +1828,9 @@ Please integrate any relevant insights from the documents with your analysis of
                         f"retrying in {delay}s"
                     )
                     time.sleep(delay)
+                invoke_start = time.monotonic()
                 response = self.bond_provider.bedrock_agent_runtime_client.invoke_agent(**request)
+                self._observe_metric(INVOKE_AGENT_LATENCY, time.monotonic() - invoke_start, phase='initial')
                 break
             except (RemoteDisconnected, ConnectionClosedError, ConnectionError, OSError) as e:
                 if attempt == MAX_INVOKE_RETRIES:
@@ -1824,7 +1866,7 @@ Please integrate any relevant insights from the documents with your analysis of
                         text = self._handle_chunk_event(event['chunk'])
                         if text:
                             yield text
-                            full_content += text
+                            response_buffer.append(text)
 
                     # Handle files event
                     elif 'files' in event:
@@ -1836,14 +1878,14 @@ Please integrate any relevant insights from the documents with your analysis of
                                     thread_id=thread_id,
                                     user_id=user_id,
                                     current_response_id=response_id,
-                                    full_content=full_content,
+                                    full_content=response_buffer.getvalue(),
                                     attachments=attachments if not phase_metadata else None,
                                     seen_file_hashes=seen_file_hashes
                                 )
 
                                 if new_response_id != response_id:
                                     response_id = new_response_id
-                                    full_content = ''
+                                    response_buffer.clear()
 
                     # Handle returnControl events for MCP tools
                     elif 'returnControl' in event:
@@ -1855,13 +1897,14 @@ Please integrate any relevant insights from the documents with your analysis of
                             session_id=session_id,
                             thread_id=thread_id,
                             seen_file_hashes=seen_file_hashes,
-                            attachments=attachments if not phase_metadata else None
+                            attachments=attachments if not phase_metadata else None,
+                            response_buffer=response_buffer
                         )
 
                         for cont_item in continuation_generator:
                             if isinstance(cont_item, str):
+                                # Already appended to response_buffer by the continuation handler
                                 yield cont_item
-                                full_content += cont_item
                             elif isinstance(cont_item, dict) and 'files_event' in cont_item:
                                 files_event = cont_item['files_event']['files']
                                 if 'files' in files_event:
@@ -1871,13 +1914,13 @@ Please integrate any relevant insights from the documents with your analysis of
                                             thread_id=thread_id,
                                             user_id=user_id,
                                             current_response_id=response_id,
-                                            full_content=full_content,
+                                            full_content=response_buffer.getvalue(),
                                             attachments=attachments if not phase_metadata else None,
                                             seen_file_hashes=seen_file_hashes
                                         )
                                         if new_response_id != response_id:
                                             response_id = new_response_id
-                                            full_content = ''
+                                            response_buffer.clear()
                             elif isinstance(cont_item, dict):
                                 # Handle session_state from continuation response
                                 # (files_event is already handled by the condition at line 1040)
@@ -1936,10 +1979,10 @@ Please integrate any relevant insights from the documents with your analysis of
 
         # Save response if we have content
         compaction_performed = False
-        if full_content:
+        if response_buffer:
             # Unescape XML entities before persisting — the stream escapes
             # <, >, & for safe XML transport, but the DB should store raw text.
-            db_content = xml_unescape(full_content)
+            db_content = xml_unescape(response_buffer.getvalue())
 
             # Build metadata
             metadata = {
@@ -1970,34 +2013,28 @@ Please integrate any relevant insights from the documents with your analysis of
 
             # Check if compaction is needed after updating context usage
             try:
-                updated_session_state = self.bond_provider.threads.get_thread_session_state(thread_id, user_id) or {}
-                if self._needs_compaction(updated_session_state):
-                    LOGGER.info(f"Context compaction triggered for thread {thread_id} "
-                                f"(tokens={updated_session_state.get('context_usage', {}).get('estimated_tokens', 0)})")
-                    result = self._compact_context(thread_id, user_id, updated_session_state)
-                    if result[0] is not None:
-                        compaction_performed = True
+                compaction_performed = self._compact_after_turn(thread_id, user_id)
             except Exception as e:
                 LOGGER.error(f"Post-invocation context compaction failed (non-fatal): {e}")
 
         # Update session state if provided by Bedrock, preserving our custom tracking keys.
         # Skip if compaction just rotated the session — the compaction already wrote fresh state.
         if new_session_state and not compaction_performed:
-            current_state = self.bond_provider.threads.get_thread_session_state(thread_id, user_id) or {}
-            # Only preserve context_usage and compaction_in_progress.
-            # pending_compaction_summary is intentionally excluded — once consumed
-            # at the start of a request (line ~402), it should not be re-injected.
-            new_session_state.update({
-                k: current_state[k]
-                for k in ('context_usage', 'compaction_in_progress')
-                if k in current_state and k not in new_session_state
-            })
-            self.bond_provider.threads.update_thread_session(
-                thread_id=thread_id,
-                user_id=user_id,
-                session_id=session_id,
-                session_state=new_session_state
-            )
+            def merge_bedrock_state(current_state: dict, _current_session_id) -> str:
+                # Only preserve our tracking keys; a background compaction may have
+                # stored its summary while this turn ran. pending_compaction_summary is
+                # intentionally excluded — once consumed at the start of a request,
+                # it should not be re-injected.
+                preserved = {
+                    k: current_state[k]
+                    for k in ('context_usage', 'compaction_in_progress', 'precomputed_compaction')
+                    if k in current_state and k not in new_session_state
+                }
+                current_state.clear()
+                current_state.update(new_session_state, **preserved)
+                return session_id
+
+            self.bond_provider.threads.update_thread_session_state(thread_id, user_id, merge_bedrock_state)
             LOGGER.debug(f"Updated session state for thread {thread_id}")
 
     def _update_context_usage(self, thread_id: str, user_id: str,
@@ -2009,50 +2046,292 @@ Please integrate any relevant insights from the documents with your analysis of
         Uses real token counts from Bedrock trace events when available,
         falls back to character-based estimation otherwise.
         """
-        session_state = self.bond_provider.threads.get_thread_session_state(thread_id, user_id) or {}
-        usage = session_state.get('context_usage', {
-            'total_tokens': 0,
-            'total_chars': 0,
-            'estimated_tokens': 0,
-            'message_count': 0,
-            'compaction_count': 0,
-        })
+        def add_usage(session_state: dict, session_id: Optional[str]) -> Optional[str]:
+            usage = session_state.get('context_usage', {
+                'total_tokens': 0,
+                'total_chars': 0,
+                'estimated_tokens': 0,
+                'message_count': 0,
+                'compaction_count': 0,
+            })
 
-        # Prefer real token counts from trace; fall back to char estimation
-        if trace_input_tokens > 0 or trace_output_tokens > 0:
-            new_tokens = trace_input_tokens + trace_output_tokens
-            usage['total_tokens'] = usage.get('total_tokens', 0) + new_tokens
-            # Add new trace tokens to existing estimate (preserves prior char-based estimates)
-            usage['estimated_tokens'] = usage.get('estimated_tokens', 0) + new_tokens
-            usage['token_source'] = 'trace'  # nosec B105
-        else:
-            new_chars = input_chars + output_chars
-            usage['total_chars'] = usage.get('total_chars', 0) + new_chars
-            usage['estimated_tokens'] = usage.get('total_tokens', 0) + (usage['total_chars'] // CHARS_PER_TOKEN_ESTIMATE)
-            usage['token_source'] = 'estimated'  # nosec B105
+            # Prefer real token counts from trace; fall back to char estimation
+            if trace_input_tokens > 0 or trace_output_tokens > 0:
+                new_tokens = trace_input_tokens + trace_output_tokens
+                usage['total_tokens'] = usage.get('total_tokens', 0) + new_tokens
+                # Add new trace tokens to existing estimate (preserves prior char-based estimates)
+                usage['estimated_tokens'] = usage.get('estimated_tokens', 0) + new_tokens
+                usage['token_source'] = 'trace'  # nosec B105
+            else:
+                new_chars = input_chars + output_chars
+                usage['total_chars'] = usage.get('total_chars', 0) + new_chars
+                usage['estimated_tokens'] = usage.get('total_tokens', 0) + (usage['total_chars'] // CHARS_PER_TOKEN_ESTIMATE)
+                usage['token_source'] = 'estimated'  # nosec B105
 
-        usage['message_count'] = usage.get('message_count', 0) + 2
-        session_state['context_usage'] = usage
+            usage['message_count'] = usage.get('message_count', 0) + 2
+            session_state['context_usage'] = usage
+            return session_id
 
-        session_id = self.bond_provider.threads.get_thread_session_id(thread_id)
-        self.bond_provider.threads.update_thread_session(
-            thread_id=thread_id, user_id=user_id,
-            session_id=session_id, session_state=session_state
-        )
+        # Read-modify-write under the row lock so a background compaction's
+        # result is not overwritten
+        self.bond_provider.threads.update_thread_session_state(thread_id, user_id, add_usage)
 
-    def _needs_compaction(self, session_state: dict) -> bool:
-        """Check if context usage exceeds compaction threshold."""
+    def _needs_compaction(self, session_state: dict, threshold_ratio: Optional[float] = None) -> bool:
+        """Check if context usage exceeds the compaction threshold (soft by default)."""
         usage = session_state.get('context_usage', {})
         estimated_tokens = usage.get('estimated_tokens', 0)
         if estimated_tokens == 0:
             return False
-        threshold = int(self._get_context_window_size() * COMPACTION_THRESHOLD_RATIO)
+        if threshold_ratio is None:
+            threshold_ratio = COMPACTION_THRESHOLD_RATIO
+        threshold = int(self._get_context_window_size() * threshold_ratio)
         return estimated_tokens >= threshold
 
+    @staticmethod
+    def _compaction_running(session_state: dict) -> bool:
+        """True if a compaction started less than COMPACTION_FLAG_STALE_SECONDS ago."""
+        from datetime import datetime, timedelta, timezone
+        try:
+            started = datetime.fromisoformat(session_state['compaction_in_progress'])
+            return datetime.now(timezone.utc) - started < timedelta(seconds=COMPACTION_FLAG_STALE_SECONDS)
+        except (KeyError, ValueError, TypeError):
+            return False
+
+    def _compact_after_turn(self, thread_id: str, user_id: str) -> bool:
+        """
+        Start compaction once a turn's context usage has been recorded.
+
+        Past the soft threshold the summary is prepared by a background job and
+        picked up by the next turn. The turn only compacts inline when it ends past
+        the hard threshold with no summary ready, or when there is no job runner.
+
+        Returns:
+            True if the session was rotated inline.
+        """
+        session_state = self.bond_provider.threads.get_thread_session_state(thread_id, user_id) or {}
+        if not self._needs_compaction(session_state):
+            return False
+        tokens = session_state.get('context_usage', {}).get('estimated_tokens', 0)
+
+        jobs = self.bond_provider.jobs
+        hard_limit = self._needs_compaction(session_state, COMPACTION_HARD_THRESHOLD_RATIO)
+        if jobs is None or (hard_limit and 'precomputed_compaction' not in session_state):
+            LOGGER.info(f"Context compaction triggered for thread {thread_id} (tokens={tokens})")
+            with COMPACTION_LATENCY.time(agent_id=self.agent_id):
+                result = self._compact_context(thread_id, user_id, session_state)
+            return result[0] is not None
+
+        if self._schedule_compaction(thread_id, user_id):
+            LOGGER.info(f"Background context compaction scheduled for thread {thread_id} (tokens={tokens})")
+        return False
+
+    def _schedule_compaction(self, thread_id: str, user_id: str) -> Optional[str]:
+        """
+        Submit a background job that prepares a compaction summary for the thread.
+
+        Returns the job id, or None if a summary is already waiting or being prepared.
+        """
+        from datetime import datetime, timezone
+        started_at = datetime.now(timezone.utc).isoformat()
+
+        def claim(session_state: dict, session_id: Optional[str]):
+            if 'precomputed_compaction' in session_state or self._compaction_running(session_state):
+                return False
+            session_state['compaction_in_progress'] = started_at
+            return session_id
+
+        if not self.bond_provider.threads.update_thread_session_state(thread_id, user_id, claim):
+            return None
+        return self.bond_provider.jobs.submit(
+            kind="context_compaction",
+            user_id=user_id,
+            subject_id=thread_id,
+            work=lambda job_id: self._precompute_compaction(thread_id, user_id, started_at),
+        )
+
+    def _precompute_compaction(self, thread_id: str, user_id: str, started_at: str) -> Dict[str, Any]:
+        """
+        Background job: summarize the thread and store the result in session state
+        as precomputed_compaction, with the watermark (message_index) of the last
+        message it covers. The session is not rotated here; the next turn does that
+        in _take_precomputed_compaction.
+        """
+        session_id = self.bond_provider.threads.get_thread_session_id(thread_id)
+        precomputed = None
+        try:
+            with COMPACTION_LATENCY.time(agent_id=self.agent_id):
+                messages = self.bond_provider.threads.get_messages(thread_id, limit=None, user_id=user_id)
+                summary_history = self._summarize_messages(thread_id, messages)
+            if summary_history:
+                # The newest message summarized; later turns are carried over verbatim
+                last_message = list(messages.values())[-1]
+                precomputed = {
+                    'summary': summary_history,
+                    'watermark': last_message.metadata['message_index'],
+                    'session_id': session_id,
+                }
+        finally:
+            def store(session_state: dict, current_session_id: Optional[str]):
+                if session_state.get('compaction_in_progress') == started_at:
+                    del session_state['compaction_in_progress']
+                # An inline compaction may have rotated the session in the meantime
+                if precomputed and current_session_id == session_id:
+                    session_state['precomputed_compaction'] = precomputed
+                return current_session_id
+
+            self.bond_provider.threads.update_thread_session_state(thread_id, user_id, store)
+
+        if precomputed is None:
+            return {'thread_id': thread_id, 'summarized': False}
+        LOGGER.info(f"Prepared compaction summary for thread {thread_id} "
+                    f"through message {precomputed['watermark']}")
+        return {'thread_id': thread_id, 'summarized': True, 'watermark': precomputed['watermark']}
+
+    def _take_precomputed_compaction(self, thread_id: str, user_id: str, session_id: str,
+                                     session_state: dict) -> tuple:
+        """
+        Rotate to a new Bedrock session seeded with a summary from _precompute_compaction,
+        followed by the turns stored after its watermark.
+
+        The summary is consumed under the thread's row lock, so of two concurrent
+        turns only one rotates. A summary taken before the session was rotated some
+        other way is discarded.
+
+        Returns:
+            (session_id, session_state) to use for this turn; the given ones if
+            no summary was waiting.
+        """
+        precomputed = session_state.pop('precomputed_compaction', None)
+        if not precomputed:
+            return session_id, session_state
+
+        # Leave room for the two summary messages within the 20-message history limit
+        tail = self.bond_provider.threads.get_conversation_history_after(
+            thread_id, user_id, precomputed['watermark'], max_messages=18)
+        if tail is None:
+            return self._replace_precomputed_compaction(thread_id, user_id, session_id, session_state, precomputed)
+        new_session_id = uuid.uuid4().hex
+        rotated = {}
+
+        def rotate(current_state: dict, current_session_id: Optional[str]):
+            rotated.clear()
+            if current_state.get('precomputed_compaction') != precomputed:
+                return False  # already taken by a concurrent turn
+            del current_state['precomputed_compaction']
+            if current_session_id != precomputed['session_id']:
+                return current_session_id
+            new_state = self._compacted_session_state(precomputed['summary'] + tail,
+                                                      current_state.get('context_usage', {}))
+            current_state.clear()
+            current_state.update(new_state)
+            rotated.update(new_state)
+            return new_session_id
+
+        if not self.bond_provider.threads.update_thread_session_state(thread_id, user_id, rotate) or not rotated:
+            LOGGER.info(f"Discarded precomputed compaction summary for thread {thread_id}")
+            return session_id, session_state
+
+        LOGGER.info(
+            f"Context compaction #{rotated['context_usage']['compaction_count']} for thread {thread_id}: "
+            f"switched to precomputed summary through message {precomputed['watermark']} "
+            f"plus {len(tail)} later messages"
+        )
+        return new_session_id, rotated
+
+    def _replace_precomputed_compaction(self, thread_id: str, user_id: str, session_id: str,
+                                        session_state: dict, precomputed: dict) -> tuple:
+        """
+        More turns were stored after the summary's watermark than fit next to it, so
+        drop the summary and compact inline over the whole thread instead of losing
+        the oldest of those turns.
+        """
+        compact = {}
+
+        def discard(current_state: dict, current_session_id: Optional[str]):
+            compact.clear()
+            if current_state.get('precomputed_compaction') != precomputed:
+                return False  # already taken by a concurrent turn
+            del current_state['precomputed_compaction']
+            if current_session_id == precomputed['session_id']:
+                compact['session_state'] = current_state
+            return current_session_id
+
+        if not self.bond_provider.threads.update_thread_session_state(thread_id, user_id, discard) or not compact:
+            LOGGER.info(f"Discarded precomputed compaction summary for thread {thread_id}")
+            return session_id, session_state
+
+        LOGGER.info(f"Too many turns after the precomputed summary for thread {thread_id} "
+                    f"(watermark {precomputed['watermark']}), compacting inline")
+        with COMPACTION_LATENCY.time(agent_id=self.agent_id):
+            new_session_id, new_session_state, _ = self._compact_context(
+                thread_id, user_id, compact['session_state'])
+        if new_session_id is None:
+            return session_id, session_state
+        return new_session_id, new_session_state
+
+    @staticmethod
+    def _compacted_session_state(history: List[Dict], old_usage: dict) -> dict:
+        """Session state for a new session that starts from a compaction summary."""
+        history_chars = sum(len(part.get('text', '')) for msg in history for part in msg['content'])
+        return {
+            'context_usage': {
+                'total_tokens': 0,
+                'total_chars': history_chars,
+                'estimated_tokens': history_chars // CHARS_PER_TOKEN_ESTIMATE,
+                'message_count': 0,
+                'compaction_count': old_usage.get('compaction_count', 0) + 1,
+                'token_source': 'reset',
+            },
+            'pending_compaction_summary': history,
+        }
+
+    def _summarize_messages(self, thread_id: str, messages: Dict[str, Any]) -> Optional[List[Dict]]:
+        """
+        Summarize a thread's messages via the Converse API.
+
+        Returns:
+            The summary as a user/assistant conversationHistory pair, or None if
+            there is nothing to summarize or the summarizer returned nothing.
+        """
+        def _truncate(text, limit=3000):
+            return text[:limit] + "..." if len(text) > limit else text
+
+        conversation_parts = [
+            f"{msg.role.upper()}: {_truncate(content)}"
+            for msg in messages.values()
+            for content in [msg.clob.get_content() if hasattr(msg, 'clob') and msg.clob else '']
+            if content
+        ]
+
+        # Skip compaction if there's no meaningful conversation to summarize
+        if not conversation_parts:
+            LOGGER.warning(f"Skipping compaction for thread {thread_id}: no conversation content to summarize")
+            return None
+
+        conversation_text = "\n\n".join(conversation_parts)
+        # Cap total text sent to summarizer to avoid exceeding its own context
+        if len(conversation_text) > 150_000:
+            conversation_text = conversation_text[-150_000:]
+
+        # Call Converse API for summary
+        summary = self._generate_summary(conversation_text)
+
+        # Validate summary is non-empty
+        if not summary or not summary.strip():
+            LOGGER.warning(f"Skipping compaction for thread {thread_id}: summarizer returned empty result")
+            return None
+
+        return [
+            {"role": "user", "content": [{"text":
+                "Please continue our conversation. Here is a summary of our discussion so far."}]},
+            {"role": "assistant", "content": [{"text": summary}]}
+        ]
+
     def _compact_context(self, thread_id: str, user_id: str,
                          session_state: dict) -> tuple:
         """
-        Summarize conversation and rotate to a new Bedrock session.
+        Summarize conversation and rotate to a new Bedrock session, inline.
+        Only used past the hard threshold; see _compact_after_turn.
 
         Returns:
             (new_session_id, new_session_state, summary_history) or
@@ -2070,40 +2349,9 @@ Please integrate any relevant insights from the documents with your analysis of
 
         try:
             # Get all messages from thread
-            messages = self.bond_provider.threads.get_messages(thread_id)
-
-            # Build conversation text for summarization
-            def _truncate(text, limit=3000):
-                return text[:limit] + "..." if len(text) > limit else text
-
-            conversation_parts = [
-                f"{msg.role.upper()}: {_truncate(content)}"
-                for msg in messages.values()
-                for content in [msg.clob.get_content() if hasattr(msg, 'clob') and msg.clob else '']
-                if content
-            ]
-
-            # Skip compaction if there's no meaningful conversation to summarize
-            if not conversation_parts:
-                LOGGER.warning(f"Skipping compaction for thread {thread_id}: no conversation content to summarize")
-                session_state.pop('compaction_in_progress', None)
-                self.bond_provider.threads.update_thread_session(
-                    thread_id=thread_id, user_id=user_id,
-                    session_id=session_id, session_state=session_state
-                )
-                return None, None, None
-
-            conversation_text = "\n\n".join(conversation_parts)
-            # Cap total text sent to summarizer to avoid exceeding its own context
-            if len(conversation_text) > 150_000:
-                conversation_text = conversation_text[-150_000:]
-
-            # Call Converse API for summary
-            summary = self._generate_summary(conversation_text)
-
-            # Validate summary is non-empty
-            if not summary or not summary.strip():
-                LOGGER.warning(f"Skipping compaction for thread {thread_id}: summarizer returned empty result")
+            messages = self.bond_provider.threads.get_messages(thread_id, limit=None, user_id=user_id)
+            summary_history = self._summarize_messages(thread_id, messages)
+            if not summary_history:
                 session_state.pop('compaction_in_progress', None)
                 self.bond_provider.threads.update_thread_session(
                     thread_id=thread_id, user_id=user_id,
@@ -2111,28 +2359,10 @@ Please integrate any relevant insights from the documents with your analysis of
                 )
                 return None, None, None
 
-            # Build conversationHistory with summary
-            summary_history = [
-                {"role": "user", "content": [{"text":
-                    "Please continue our conversation. Here is a summary of our discussion so far."}]},
-                {"role": "assistant", "content": [{"text": summary}]}
-            ]
-
             # Generate new session ID and reset context usage
             new_session_id = uuid.uuid4().hex
             old_usage = session_state.get('context_usage', {})
-            summary_chars = len(summary)
-            new_session_state = {
-                'context_usage': {
-                    'total_tokens': 0,
-                    'total_chars': summary_chars,
-                    'estimated_tokens': summary_chars // CHARS_PER_TOKEN_ESTIMATE,
-                    'message_count': 0,
-                    'compaction_count': old_usage.get('compaction_count', 0) + 1,
-                    'token_source': 'reset',
-                },
-                'pending_compaction_summary': summary_history,
-            }
+            new_session_state = self._compacted_session_state(summary_history, old_usage)
 
             # Persist new session
             self.bond_provider.threads.update_thread_session(
@@ -2143,7 +2373,7 @@ Please integrate any relevant insights from the documents with your analysis of
             LOGGER.info(
                 f"Context compaction #{new_session_state['context_usage']['compaction_count']} "
                 f"for thread {thread_id}: rotated session, "
-                f"summary={summary_chars} chars, "
+                f"summary={len(summary_history[1]['content'][0]['text'])} chars, "
                 f"old_tokens={old_usage.get('estimated_tokens', 0)}"
             )
 
@@ -2200,7 +2430,8 @@ Please integrate any relevant insights from the documents with your analysis of
     def _handle_continuation_response(self, return_control: Dict[str, Any], session_id: str,
                                     thread_id: str, seen_file_hashes: set,
                                     attachments: Optional[List] = None,
-                                    depth: int = 0) -> Generator[Any, None, None]:
+                                    depth: int = 0,
+                                    response_buffer: Optional[ResponseBuffer] = None) -> Generator[Any, None, None]:
         """
         Handle continuation response after tool execution.
 
@@ -2211,21 +2442,28 @@ Please integrate any relevant insights from the documents with your analysis of
             seen_file_hashes: Set of already seen file hashes
             attachments: Optional attachments
             depth: Current recursion depth for nested tool calls
+            response_buffer: The caller's response buffer. Every text chunk
+                yielded here (including nested calls) is appended to it, so
+                callers must not append yielded text again.
 
         Yields:
             str: Response text chunks
             dict: Files events (with 'files_event' key) or session state (with 'session_state' key)
         """
+        if response_buffer is None:
+            response_buffer = ResponseBuffer()
+
         # Safety check for recursion depth
         if depth >= self.MAX_TOOL_CALL_DEPTH:
             LOGGER.error(f"Maximum tool call depth ({self.MAX_TOOL_CALL_DEPTH}) exceeded - stopping recursion")
-            yield f"\n\n[Error: Maximum tool call depth exceeded. The agent attempted too many sequential tool calls.]\n"
+            yield response_buffer.emit(f"\n\n[Error: Maximum tool call depth exceeded. The agent attempted too many sequential tool calls.]\n")
             return
 
+        self._observe_metric(CONTINUATION_DEPTH, depth)
         continuation_start_time = time.monotonic()
         tool_results = self._handle_return_control(return_control)
         tool_exec_elapsed = time.monotonic() - continuation_start_time
-        full_content = ""
+        content_chars = 0
         new_session_state = None
 
         # If no tool results were generated, create a fallback error response
@@ -2321,6 +2559,7 @@ Please integrate any relevant insights from the documents with your analysis of
                     continuation_response = self.bond_provider.bedrock_agent_runtime_client.invoke_agent(**continuation_request)
                     continuation_stream = continuation_response.get('completion')
                     invoke_elapsed = time.monotonic() - invoke_start
+                    self._observe_metric(INVOKE_AGENT_LATENCY, invoke_elapsed, phase='continuation')
                     LOGGER.info(
                         f"[Continuation] invoke_agent succeeded at depth={depth} in {invoke_elapsed:.3f}s, "
                         f"payload={total_result_bytes} bytes, "
@@ -2342,7 +2581,7 @@ Please integrate any relevant insights from the documents with your analysis of
                             f"Tool result payload size: {total_result_bytes} bytes. "
                             f"This may indicate the payload exceeds the model's context window or a transient network issue."
                         )
-                        yield (
+                        yield response_buffer.emit(
                             f"\n\nI was unable to send the tool results back to the agent because "
                             f"the response was too large ({total_result_bytes} bytes), even after compaction. "
                             f"Please try a more specific query to get fewer results.\n"
@@ -2354,7 +2593,7 @@ Please integrate any relevant insights from the documents with your analysis of
                         f"[Continuation] invoke_agent failed at depth={depth}, "
                         f"invocationId={invocation_id}: {type(e).__name__}: {e}"
                     )
-                    yield (
+                    yield response_buffer.emit(
                         f"\n\nI encountered an error while processing the tool results "
                         f"({type(e).__name__}). Please try your request again.\n"
                     )
@@ -2372,8 +2611,8 @@ Please integrate any relevant insights from the documents with your analysis of
                         if 'chunk' in cont_event:
                             text = self._handle_chunk_event(cont_event['chunk'])
                             if text:
-                                yield text
-                                full_content += text
+                                yield response_buffer.emit(text)
+                                content_chars += len(text)
                                 any_content_yielded = True
                         elif 'files' in cont_event:
                             # Note: File handling in continuation is handled by the caller
@@ -2392,15 +2631,17 @@ Please integrate any relevant insights from the documents with your analysis of
                                 thread_id=thread_id,
                                 seen_file_hashes=seen_file_hashes,
                                 attachments=attachments,
-                                depth=depth + 1
+                                depth=depth + 1,
+                                response_buffer=response_buffer
                             )
 
                             # Forward all yielded items from nested handler
                             nested_text_len = 0
                             for nested_item in nested_generator:
                                 if isinstance(nested_item, str):
+                                    # Already appended to response_buffer by the nested handler
                                     yield nested_item
-                                    full_content += nested_item
+                                    content_chars += len(nested_item)
                                     any_content_yielded = True
                                     nested_text_len += len(nested_item)
                                 elif isinstance(nested_item, dict):
@@ -2436,7 +2677,7 @@ Please integrate any relevant insights from the documents with your analysis of
                     f"Tool result status codes: {result_summary}. "
                     f"stream_attempt={stream_attempt + 1}/{MAX_STREAM_RETRIES + 1}, "
                     f"any_content_yielded={any_content_yielded}, "
-                    f"content_length={len(full_content)}"
+                    f"content_length={content_chars}"
                 )
 
                 if any_content_yielded or stream_attempt >= MAX_STREAM_RETRIES:
@@ -2444,9 +2685,9 @@ Please integrate any relevant insights from the documents with your analysis of
                     if any_content_yielded:
                         LOGGER.warning(
                             f"[Continuation] Cannot retry EventStreamError - "
-                            f"content already yielded to user (text={len(full_content)} chars)"
+                            f"content already yielded to user (text={content_chars} chars)"
                         )
-                        yield (
+                        yield response_buffer.emit(
                             f"\n\nThe agent encountered an error processing the tool results "
                             f"(Bedrock error: {error_code}). This can happen when tool results "
                             f"are very large or in an unexpected format. "
@@ -2457,7 +2698,7 @@ Please integrate any relevant insights from the documents with your analysis of
                             f"[Continuation] All {MAX_STREAM_RETRIES + 1} stream attempts exhausted "
                             f"for EventStreamError ({error_code})"
                         )
-                        yield (
+                        yield response_buffer.emit(
                             f"\n\nThe agent encountered a transient error "
                             f"(Bedrock error: {error_code}). "
                             f"Please try your request again.\n"
@@ -2482,7 +2723,7 @@ Please integrate any relevant insights from the documents with your analysis of
                     f"The agent may need more time to process complex tool results. "
                     f"Consider increasing BEDROCK_AGENT_RUNTIME_READ_TIMEOUT (current default: 300s)."
                 )
-                yield (
+                yield response_buffer.emit(
                     f"\n\nThe request timed out while the agent was processing the tool results. "
                     f"This can happen with complex queries. Please try simplifying your request or try again.\n"
                 )
@@ -2493,7 +2734,7 @@ Please integrate any relevant insights from the documents with your analysis of
                 LOGGER.exception(
                     f"[Continuation] {error_type} processing continuation stream at depth={depth}: {e}"
                 )
-                yield (
+                yield response_buffer.emit(
                     f"\n\nAn unexpected error occurred while processing the response "
                     f"({error_type}). Please try again.\n"
                 )
@@ -2511,6 +2752,8 @@ class BedrockAgentProvider(AgentProvider):
         self.bedrock_client = bedrock_client
         self.bedrock_agent_client = bedrock_agent_client
         self.metadata = metadata
+        # agent_id -> monotonic time of the last failed summary backfill
+        self._summary_backfill_failures: Dict[str, float] = {}
         LOGGER.info("Initialized BedrockAgentProvider")
 
     def select_material_icon(self, name: str, description: str, instructions: str = None) -> str:
@@ -2681,6 +2924,9 @@ Remember: Return ONLY the icon name that exists in the above list, and a valid h
                 "color": "#757575"  # Default grey
             })
 
+    # Files copied into the KB prefix concurrently during an agent save
+    _KB_UPLOAD_MAX_WORKERS = int(os.environ.get('KB_UPLOAD_MAX_WORKERS', '8'))
+
     def _upload_files_to_knowledge_base(self, agent_id: str, file_ids: list) -> None:
         """
         Upload files to Knowledge Base for an agent with file_storage='knowledge_base'.
@@ -2719,63 +2965,41 @@ Remember: Return ONLY the icon name that exists in the above list, and a valid h
 
         # Remove files that are no longer in the agent's file list
         removed_count = 0
-        for file_id in files_to_remove:
-            LOGGER.debug(f"[KB Upload] Removing file {file_id} from KB")
-            success = provider.vectorstores.remove_file_from_knowledge_base(file_id, agent_id)
-            if success:
-                removed_count += 1
-                LOGGER.debug(f"[KB Upload] SUCCESS - Removed file {file_id} from KB")
+        if files_to_remove:
+            LOGGER.debug(f"[KB Upload] Removing {len(files_to_remove)} files from KB")
+            removed_count = provider.vectorstores.remove_files_from_knowledge_base(list(files_to_remove), agent_id) or 0
+            if removed_count > 0:
+                LOGGER.info(f"[KB Upload] Removed {removed_count} files from KB for agent {agent_id}")
             else:
-                LOGGER.warning(f"[KB Upload] FAILED - Could not remove file {file_id} from KB")
-
-        if removed_count > 0:
-            LOGGER.info(f"[KB Upload] Removed {removed_count} files from KB for agent {agent_id}")
+                LOGGER.warning(f"[KB Upload] FAILED - Could not remove files {files_to_remove} from KB")
 
-        # Upload only new files
+        # Upload only new files, several at a time. Details come from one query.
         uploaded_count = 0
-        for file_id in files_to_add:
-            LOGGER.debug(f"[KB Upload] Processing new file {file_id}")
-            try:
-                # Get file details
-                LOGGER.debug(f"[KB Upload] Getting file details for {file_id}")
-                file_details_list = provider.files.get_file_details([file_id])
-                if not file_details_list:
-                    LOGGER.warning(f"[KB Upload] File {file_id} not found in metadata - skipping KB upload")
-                    continue
-
-                file_details = file_details_list[0]
-                LOGGER.debug(f"[KB Upload] File details: path={file_details.file_path}, mime={file_details.mime_type}, size={file_details.file_size}")
-
-                # Get file bytes from regular storage
-                LOGGER.debug(f"[KB Upload] Retrieving file bytes from storage")
-                file_bytes_io = provider.files.get_file_bytes((file_id, None))
-                if not file_bytes_io:
-                    LOGGER.warning(f"[KB Upload] Could not get bytes for file {file_id} - skipping KB upload")
-                    continue
-
-                file_bytes = file_bytes_io.read()
-                file_name = file_details.file_path or f"file_{file_id}"
-                mime_type = file_details.mime_type or "application/octet-stream"
-                LOGGER.debug(f"[KB Upload] Retrieved {len(file_bytes)} bytes for file {file_name}")
-
-                # Upload to KB prefix
-                LOGGER.debug(f"[KB Upload] Uploading to KB S3 prefix...")
-                s3_key = provider.vectorstores.upload_file_to_knowledge_base(
-                    file_id=file_id,
-                    agent_id=agent_id,
-                    file_bytes=file_bytes,
-                    file_name=file_name,
-                    mime_type=mime_type
-                )
-
-                if s3_key:
-                    uploaded_count += 1
-                    LOGGER.debug(f"[KB Upload] SUCCESS - Uploaded file {file_id} to KB: {s3_key}")
-                else:
-                    LOGGER.warning(f"[KB Upload] FAILED - upload_file_to_knowledge_base returned None for {file_id}")
-
-            except Exception as e:
-                LOGGER.error(f"[KB Upload] ERROR uploading file {file_id} to KB: {e}", exc_info=True)
+        file_details_by_id = {}
+        if files_to_add:
+            file_details_by_id = {d.file_id: d for d in provider.files.get_file_details(list(files_to_add))}
+            for file_id in files_to_add - file_details_by_id.keys():
+                LOGGER.warning(f"[KB Upload] File {file_id} not found in metadata - skipping KB upload")
+
+        if file_details_by_id:
+            max_workers = min(self._KB_UPLOAD_MAX_WORKERS, len(file_details_by_id))
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="kb-upload") as executor:
+                futures = {
+                    executor.submit(self._upload_file_to_knowledge_base, provider, agent_id, file_details): file_id
+                    for file_id, file_details in file_details_by_id.items()
+                }
+                for future in concurrent.futures.as_completed(futures):
+                    file_id = futures[future]
+                    try:
+                        s3_key = future.result()
+                    except Exception as e:
+                        LOGGER.error(f"[KB Upload] ERROR uploading file {file_id} to KB: {e}", exc_info=True)
+                        continue
+                    if s3_key:
+                        uploaded_count += 1
+                        LOGGER.debug(f"[KB Upload] SUCCESS - Uploaded file {file_id} to KB: {s3_key}")
+                    else:
+                        LOGGER.warning(f"[KB Upload] FAILED - KB upload returned None for {file_id}")
 
         LOGGER.debug(f"[KB Upload] Upload phase complete: {uploaded_count}/{len(files_to_add)} new files uploaded")
 
@@ -2792,6 +3016,41 @@ Remember: Return ONLY the icon name that exists in the above list, and a valid h
         else:
             LOGGER.debug(f"[KB Upload] No changes to KB files, skipping ingestion trigger")
 
+    def _upload_file_to_knowledge_base(self, provider: 'BedrockProvider', agent_id: str, file_details) -> Optional[str]:
+        """
+        Put one file under the agent's KB prefix and return its S3 key (None on failure).
+
+        Files stored in S3 are copied server-side; anything else is read and re-uploaded.
+        Runs on the KB upload pool, so it must not touch shared session state.
+        """
+        file_id = file_details.file_id
+        file_name = file_details.file_path or f"file_{file_id}"
+        mime_type = file_details.mime_type or "application/octet-stream"
+        LOGGER.debug(f"[KB Upload] Processing new file {file_id}: path={file_details.file_path}, mime={file_details.mime_type}, size={file_details.file_size}")
+
+        if file_id.startswith('s3://'):
+            source_bucket, source_key = provider.files._get_key_from_file_id(file_id)
+            return provider.vectorstores.copy_file_to_knowledge_base(
+                file_id=file_id,
+                agent_id=agent_id,
+                source_bucket=source_bucket,
+                source_key=source_key,
+                file_name=file_name,
+                mime_type=mime_type
+            )
+
+        file_bytes_io = provider.files.get_file_bytes((file_id, None))
+        if not file_bytes_io:
+            LOGGER.warning(f"[KB Upload] Could not get bytes for file {file_id} - skipping KB upload")
+            return None
+        return provider.vectorstores.upload_file_to_knowledge_base(
+            file_id=file_id,
+            agent_id=agent_id,
+            file_bytes=file_bytes_io.read(),
+            file_name=file_name,
+            mime_type=mime_type
+        )
+
     @override
     def get_agent(self, agent_id: str) -> Agent:
         """
@@ -2830,6 +3089,83 @@ Remember: Return ONLY the icon name that exists in the above list, and a valid h
         finally:
             session.close()
 
+    # Bound the IN list size so SQLite's host-parameter limit is never hit
+    _SUMMARY_BATCH_SIZE = 500
+    # Back-off before retrying a legacy row whose backfill from Bedrock failed
+    _SUMMARY_BACKFILL_RETRY_SECONDS = 300
+
+    @override
+    def get_agent_summaries(self, agent_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get display summaries for many agents without building BedrockAgent instances.
+
+        Reads AgentRecord joined with BedrockAgentOptions in one IN query per batch.
+        Rows created before description/model were stored locally are backfilled
+        from Bedrock and persisted, so later calls make no AWS calls. This means a
+        read can commit a write the first time a legacy agent is listed. A failed
+        backfill is not retried for _SUMMARY_BACKFILL_RETRY_SECONDS; until then the
+        summary is served with an empty description and model=None.
+        """
+        agent_ids = list(dict.fromkeys(aid for aid in agent_ids if aid))
+        if not agent_ids:
+            return {}
+
+        summaries = {}
+        session = self.metadata.get_db_session()
+        try:
+            backfilled = False
+            for start in range(0, len(agent_ids), self._SUMMARY_BATCH_SIZE):
+                batch = agent_ids[start:start + self._SUMMARY_BATCH_SIZE]
+                rows = (
+                    session.query(AgentRecord, BedrockAgentOptions)
+                    .join(BedrockAgentOptions, AgentRecord.agent_id == BedrockAgentOptions.agent_id)
+                    .filter(AgentRecord.agent_id.in_(batch))
+                    .all()
+                )
+                for agent_record, bedrock_options in rows:
+                    if bedrock_options.model is None and self._should_backfill_summary(agent_record.agent_id):
+                        backfilled = self._backfill_agent_summary_fields(bedrock_options) or backfilled
+                    metadata = dict(bedrock_options.agent_metadata or {})
+                    metadata['owner_user_id'] = agent_record.owner_user_id
+                    summaries[agent_record.agent_id] = {
+                        "agent_id": agent_record.agent_id,
+                        "name": agent_record.name,
+                        "slug": agent_record.slug,
+                        "description": bedrock_options.description or '',
+                        "model": bedrock_options.model,
+                        "icon": metadata.get('icon_svg'),
+                        "metadata": metadata,
+                        "owner_user_id": agent_record.owner_user_id,
+                    }
+            if backfilled:
+                session.commit()
+        except Exception as e:
+            session.rollback()
+            LOGGER.error(f"Error getting agent summaries: {e}")
+            raise
+        finally:
+            session.close()
+        return summaries
+
+    def _should_backfill_summary(self, agent_id: str) -> bool:
+        failed_at = self._summary_backfill_failures.get(agent_id)
+        return failed_at is None or time.monotonic() - failed_at >= self._SUMMARY_BACKFILL_RETRY_SECONDS
+
+    def _backfill_agent_summary_fields(self, bedrock_options: BedrockAgentOptions) -> bool:
+        """Copy description and model from the Bedrock agent onto a legacy options row."""
+        try:
+            response = self.bedrock_agent_client.get_agent(agentId=bedrock_options.bedrock_agent_id)
+            bedrock_agent = response.get('agent', {})
+            bedrock_options.description = bedrock_agent.get('description', '')
+            bedrock_options.model = bedrock_agent.get('foundationModel')
+            self._summary_backfill_failures.pop(bedrock_options.agent_id, None)
+            LOGGER.info(f"Backfilled description/model for agent {bedrock_options.agent_id}")
+            return True
+        except Exception as e:
+            self._summary_backfill_failures[bedrock_options.agent_id] = time.monotonic()
+            LOGGER.warning(f"Could not backfill summary fields for agent {bedrock_options.agent_id}: {e}")
+            return False
+
     @override
     def delete_agent_resource(self, agent_id: str) -> bool:
         """
@@ -2880,13 +3216,32 @@ Remember: Return ONLY the icon name that exists in the above list, and a valid h
             return False
 
     @override
-    def create_or_update_agent_resource(self, agent_def: AgentDefinition, owner_user_id: str) -> Agent:
+    def _sync_knowledge_base_files(self, agent_id: str, agent_def: AgentDefinition) -> None:
+        """Upload the agent's file_search files to the KB when file_storage is 'knowledge_base'."""
+        file_storage_mode = getattr(agent_def, 'file_storage', 'direct')
+        LOGGER.debug(f"[KB Check] Agent {agent_id}: file_storage_mode='{file_storage_mode}'")
+        LOGGER.debug(f"[KB Check] Agent {agent_id}: tool_resources={agent_def.tool_resources}")
+        if file_storage_mode == 'knowledge_base':
+            file_search_resources = (agent_def.tool_resources or {}).get('file_search', {})
+            file_ids = file_search_resources.get('file_ids', [])
+            LOGGER.debug(f"[KB Check] Agent {agent_id}: file_search_resources={file_search_resources}, file_ids={file_ids}")
+            if file_ids:
+                LOGGER.debug(f"Agent {agent_id} has file_storage='knowledge_base' with {len(file_ids)} files - uploading to KB")
+                self._upload_files_to_knowledge_base(agent_id, file_ids)
+            else:
+                LOGGER.debug(f"[KB Check] Agent {agent_id}: file_storage='knowledge_base' but no file_ids in tool_resources")
+        else:
+            LOGGER.debug(f"[KB Check] Agent {agent_id}: file_storage='{file_storage_mode}' (not 'knowledge_base'), skipping KB upload")
+
+    def create_or_update_agent_resource(self, agent_def: AgentDefinition, owner_user_id: str,
+                                        on_prepare: Optional[Callable[[str], None]] = None) -> Agent:
         """
         Create or update an agent.
 
         Args:
             agent_def: Agent definition
             owner_user_id: User who owns this agent
+            on_prepare: Called with the agent id when Bedrock starts preparing the agent
 
         Returns:
             BedrockAgent instance
@@ -2925,11 +3280,30 @@ Remember: Return ONLY the icon name that exists in the above list, and a valid h
                     session.commit()  # Commit to persist before long-running AWS operations
                     LOGGER.info(f"Created AgentRecord for {agent_id}")
 
-                bedrock_agent_id, bedrock_agent_alias_id = create_bedrock_agent(
-                    agent_id=agent_id,
-                    agent_def=agent_def,
-                    owner_user_id=owner_user_id
-                )
+                # Icon selection is a Converse call and KB files hang off the AgentRecord,
+                # neither depends on the Bedrock agent, so run both while
+                # create_bedrock_agent waits on prepare and the alias
+                with concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="agent-setup") as setup_executor:
+                    LOGGER.debug(f"Creating new agent '{agent_def.name}' - selecting material icon")
+                    icon_future = setup_executor.submit(
+                        self.select_material_icon,
+                        name=agent_def.name,
+                        description=agent_def.description or "",
+                        instructions=agent_def.instructions or ""
+                    )
+                    kb_future = setup_executor.submit(self._sync_knowledge_base_files, agent_id, agent_def)
+                    try:
+                        bedrock_agent_id, bedrock_agent_alias_id = create_bedrock_agent(
+                            agent_id=agent_id,
+                            agent_def=agent_def,
+                            owner_user_id=owner_user_id,
+                            on_prepare=(lambda: on_prepare(agent_id)) if on_prepare else None
+                        )
+                    finally:
+                        # Let the upload settle before any cleanup of the AgentRecord it writes under
+                        concurrent.futures.wait([kb_future])
+                    icon_data = icon_future.result()
+                    kb_future.result()
 
                 bedrock_options = BedrockAgentOptions(
                     agent_id=agent_id,
@@ -2942,13 +3316,8 @@ Remember: Return ONLY the icon name that exists in the above list, and a valid h
                     mcp_resources=agent_def.mcp_resources or [],
                     agent_metadata=agent_def.metadata or {},
                     file_storage=getattr(agent_def, 'file_storage', 'direct'),
-                )
-                # Select the Material icon if not provided
-                LOGGER.debug(f"Creating new agent '{agent_def.name}' - selecting material icon")
-                icon_data = self.select_material_icon(
-                    name=agent_def.name,
-                    description=agent_def.description or "",
-                    instructions=agent_def.instructions or ""
+                    description=agent_def.description,
+                    model=agent_def.model,
                 )
                 bedrock_options.agent_metadata['icon_svg'] = icon_data
                 # Mark the field as modified to ensure SQLAlchemy detects the change
@@ -3013,21 +3382,12 @@ Remember: Return ONLY the icon name that exists in the above list, and a valid h
                 LOGGER.debug(f"  - Current description: '{current_description}'")
                 LOGGER.debug(f"  - New description: '{agent_def.description or ''}'")
 
-                if (existing_agent_record and
+                needs_icon_update = bool(
+                    existing_agent_record and
                     (existing_agent_record.name != agent_def.name or
-                     current_description != (agent_def.description or ''))):
-                    LOGGER.debug(f"Icon update triggered - name or description changed")
-                    icon_data = self.select_material_icon(
-                        name=agent_def.name,
-                        description=agent_def.description or "",
-                        instructions=agent_def.instructions or ""
-                    )
-                    bedrock_options.agent_metadata['icon_svg'] = icon_data
-                    # Mark the field as modified to ensure SQLAlchemy detects the change
-                    from sqlalchemy.orm.attributes import flag_modified
-                    flag_modified(bedrock_options, 'agent_metadata')
-                    LOGGER.info(f"Updated icon data for agent '{agent_def.name}' to '{icon_data}'")
-                else:
+                     current_description != (agent_def.description or ''))
+                )
+                if not needs_icon_update:
                     LOGGER.debug(f"No icon update needed - name and description unchanged")
                     current_icon = bedrock_options.agent_metadata.get('icon_svg', 'none')
                     LOGGER.debug(f"Current icon for agent '{agent_def.name}': '{current_icon}'")
@@ -3037,12 +3397,41 @@ Remember: Return ONLY the icon name that exists in the above list, and a valid h
                 # connection, causing an implicit ROLLBACK of any uncommitted changes.
                 session.commit()
 
-                bedrock_agent_id, bedrock_agent_alias_id = update_bedrock_agent(
-                    agent_def=agent_def,
-                    bedrock_agent_id=bedrock_agent_id,
-                    bedrock_agent_alias_id=bedrock_agent_alias_id,
-                    owner_user_id=owner_user_id
+                # Select the new icon and sync KB files while update_bedrock_agent waits on prepare and the alias
+                with concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="agent-setup") as setup_executor:
+                    icon_future = None
+                    if needs_icon_update:
+                        LOGGER.debug(f"Icon update triggered - name or description changed")
+                        icon_future = setup_executor.submit(
+                            self.select_material_icon,
+                            name=agent_def.name,
+                            description=agent_def.description or "",
+                            instructions=agent_def.instructions or ""
+                        )
+                    kb_future = setup_executor.submit(self._sync_knowledge_base_files, agent_id, agent_def)
+                    bedrock_agent_id, bedrock_agent_alias_id = update_bedrock_agent(
+                        agent_def=agent_def,
+                        bedrock_agent_id=bedrock_agent_id,
+                        bedrock_agent_alias_id=bedrock_agent_alias_id,
+                        owner_user_id=owner_user_id,
+                        on_prepare=(lambda: on_prepare(agent_id)) if on_prepare else None
+                    )
+                    icon_data = icon_future.result() if icon_future else None
+                    kb_future.result()
+
+                # update_bedrock_agent fills in a default description, so copy afterwards.
+                # Bulk update rather than attribute writes: the options object may have
+                # been detached by the commit above.
+                session.query(BedrockAgentOptions).filter_by(agent_id=agent_id).update(
+                    {"description": agent_def.description, "model": agent_def.model},
+                    synchronize_session=False
                 )
+                if icon_data is not None:
+                    # Re-query for the same reason; the JSON column needs a fresh copy to be flagged dirty
+                    fresh_options = session.query(BedrockAgentOptions).filter_by(agent_id=agent_id).first()
+                    if fresh_options is not None:
+                        fresh_options.agent_metadata = {**(fresh_options.agent_metadata or {}), 'icon_svg': icon_data}
+                        LOGGER.info(f"Updated icon data for agent '{agent_def.name}' to '{icon_data}'")
 
 
             session.commit()
@@ -3054,22 +3443,6 @@ Remember: Return ONLY the icon name that exists in the above list, and a valid h
             if bedrock_options is None:
                 raise RuntimeError(f"BedrockAgentOptions not found for {agent_id} immediately after commit — unexpected DB state")
 
-            # If file_storage is 'knowledge_base' and files are attached, upload to KB
-            file_storage_mode = getattr(agent_def, 'file_storage', 'direct')
-            LOGGER.debug(f"[KB Check] Agent {agent_id}: file_storage_mode='{file_storage_mode}'")
-            LOGGER.debug(f"[KB Check] Agent {agent_id}: tool_resources={agent_def.tool_resources}")
-            if file_storage_mode == 'knowledge_base':
-                file_search_resources = (agent_def.tool_resources or {}).get('file_search', {})
-                file_ids = file_search_resources.get('file_ids', [])
-                LOGGER.debug(f"[KB Check] Agent {agent_id}: file_search_resources={file_search_resources}, file_ids={file_ids}")
-                if file_ids:
-                    LOGGER.debug(f"Agent {agent_id} has file_storage='knowledge_base' with {len(file_ids)} files - uploading to KB")
-                    self._upload_files_to_knowledge_base(agent_id, file_ids)
-                else:
-                    LOGGER.debug(f"[KB Check] Agent {agent_id}: file_storage='knowledge_base' but no file_ids in tool_resources")
-            else:
-                LOGGER.debug(f"[KB Check] Agent {agent_id}: file_storage='{file_storage_mode}' (not 'knowledge_base'), skipping KB upload")
-
             bedrock_agent = BedrockAgent(
                 agent_id=agent_id,
                 name=agent_def.name,
@@ -3089,6 +3462,9 @@ Remember: Return ONLY the icon name that exists in the above list, and a valid h
             # generates a fresh agent_id via uuid4().
             if not agent_def.id and bedrock_agent_id is None:  # Only for new agents where Bedrock creation failed
                 try:
+                    if getattr(agent_def, 'file_storage', 'direct') == 'knowledge_base':
+                        # Files uploaded alongside create_bedrock_agent reference the record
+                        self._upload_files_to_knowledge_base(agent_id, [])
                     orphaned = session.query(AgentRecord).filter_by(agent_id=agent_id).first()
                     if orphaned:
                         session.delete(orphaned)
@@ -6,7 +6,7 @@ import time
 import logging
 import base64
 import hashlib
-from typing import List, Dict, Optional, Any
+from typing import Callable, List, Dict, Optional, Any
 from botocore.exceptions import ClientError
 from bondable.bond.config import Config
 from bondable.bond.definition import AgentDefinition
@@ -41,7 +41,8 @@ def get_bedrock_agent(bedrock_agent_id: str) -> str:
     return _get_bedrock_agent_client().get_agent(agentId=bedrock_agent_id)
 
 
-def create_bedrock_agent(agent_id: str, agent_def: AgentDefinition, owner_user_id: Optional[str] = None) -> tuple[str, str]:
+def create_bedrock_agent(agent_id: str, agent_def: AgentDefinition, owner_user_id: Optional[str] = None,
+                         on_prepare: Optional[Callable[[], None]] = None) -> tuple[str, str]:
     """
     Create a Bedrock Agent for the Bond agent.
 
@@ -49,6 +50,7 @@ def create_bedrock_agent(agent_id: str, agent_def: AgentDefinition, owner_user_i
         agent_id: Bond agent ID (used as Bedrock agent name for uniqueness)
         agent_def: Agent definition with configuration
         owner_user_id: User who owns this agent (needed for OAuth token lookup for MCP)
+        on_prepare: Called just before the agent is prepared
 
     Returns:
         Tuple of (bedrock_agent_id, bedrock_agent_alias_id)
@@ -117,17 +119,19 @@ def create_bedrock_agent(agent_id: str, agent_def: AgentDefinition, owner_user_i
         else:
             LOGGER.debug(f"Code interpreter not requested for Bedrock Agent {bedrock_agent_id}, skipping")
 
-        # Step 4: Prepare the agent with code interpreter enabled
-        bedrock_agent_client.prepare_agent(agentId=bedrock_agent_id)
-        _wait_for_resource_status('agent', bedrock_agent_id, ['PREPARED'])
-
-        # Step 5: Create MCP action groups if any MCP tools specified
+        # Step 4: Create MCP action groups if any MCP tools specified. Action groups
+        # attach to the DRAFT version, so they go in before the single prepare below
+        # instead of paying for a second prepare/wait cycle.
         if agent_def.mcp_tools:
             create_mcp_action_groups(bedrock_agent_id, agent_def.mcp_tools, agent_def.mcp_resources or [], user_id=owner_user_id)
-            bedrock_agent_client.prepare_agent(agentId=bedrock_agent_id)
-            _wait_for_resource_status('agent', bedrock_agent_id, ['PREPARED'])
             LOGGER.debug(f"Enabled MCP tools for bond agent {agent_id}")
 
+        # Step 5: Prepare the agent with code interpreter and MCP action groups in place
+        if on_prepare:
+            on_prepare()
+        bedrock_agent_client.prepare_agent(agentId=bedrock_agent_id)
+        _wait_for_resource_status('agent', bedrock_agent_id, ['PREPARED'])
+
         # Step 6: Create alias
         alias_name = f"{bedrock_agent_name}_alias_{uuid.uuid4().hex[:8]}"
         LOGGER.debug(f"Creating alias {alias_name} for Bedrock Agent {bedrock_agent_id}")
@@ -156,7 +160,8 @@ def create_bedrock_agent(agent_id: str, agent_def: AgentDefinition, owner_user_i
 
 
 
-def update_bedrock_agent(agent_def: AgentDefinition, bedrock_agent_id: str, bedrock_agent_alias_id: str, owner_user_id: Optional[str] = None) -> tuple[str, str]:
+def update_bedrock_agent(agent_def: AgentDefinition, bedrock_agent_id: str, bedrock_agent_alias_id: str, owner_user_id: Optional[str] = None,
+                         on_prepare: Optional[Callable[[], None]] = None) -> tuple[str, str]:
     """
     Update an existing Bedrock Agent.
 
@@ -165,6 +170,7 @@ def update_bedrock_agent(agent_def: AgentDefinition, bedrock_agent_id: str, bedr
         bedrock_agent_id: Existing Bedrock agent ID
         bedrock_agent_alias_id: Existing Bedrock alias ID
         owner_user_id: User who owns this agent (needed for OAuth token lookup for MCP)
+        on_prepare: Called just before the agent is prepared
 
     Returns:
         Tuple of (bedrock_agent_id, bedrock_agent_alias_id) - may return new alias ID if recreated
@@ -255,23 +261,11 @@ def update_bedrock_agent(agent_def: AgentDefinition, bedrock_agent_id: str, bedr
             except ClientError as e:
                 LOGGER.warning(f"Failed to delete code interpreter action group: {e}")
 
-        # Step 3b: Update MCP tools if needed
+        # Step 3b: Update MCP tools if needed. An existing MCPTools group is updated
+        # in place instead of being deleted and recreated.
         if agent_def.mcp_tools:
-            if mcp_action_group_id:
-                # Delete existing MCP action group to replace it
-                try:
-                    LOGGER.debug(f"Deleting existing MCP action group {mcp_action_group_id}")
-                    bedrock_agent_client.delete_agent_action_group(
-                        agentId=bedrock_agent_id,
-                        agentVersion=AGENT_VERSION,
-                        actionGroupId=mcp_action_group_id,
-                        skipResourceInUseCheck=True  # Force deletion
-                    )
-                except ClientError as e:
-                    LOGGER.warning(f"Failed to delete existing MCP action group: {e}")
-
-            # Create new MCP action groups
-            create_mcp_action_groups(bedrock_agent_id, agent_def.mcp_tools, agent_def.mcp_resources or [], user_id=owner_user_id)
+            create_mcp_action_groups(bedrock_agent_id, agent_def.mcp_tools, agent_def.mcp_resources or [],
+                                     user_id=owner_user_id, existing_action_group_id=mcp_action_group_id)
         else:
             # Remove MCP action group if it exists but no MCP tools specified
             if mcp_action_group_id:
@@ -281,6 +275,8 @@ def update_bedrock_agent(agent_def: AgentDefinition, bedrock_agent_id: str, bedr
 
         # Step 4: Prepare the agent after updates
         LOGGER.debug(f"Preparing agent {bedrock_agent_id} after updates")
+        if on_prepare:
+            on_prepare()
         bedrock_agent_client.prepare_agent(agentId=bedrock_agent_id)
         _wait_for_resource_status('agent', bedrock_agent_id, ['PREPARED'])
 
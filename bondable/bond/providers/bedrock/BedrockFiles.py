@@ -19,6 +19,9 @@ from bondable.bond.providers.bedrock.BedrockMetadata import BedrockMetadata
 
 LOGGER = logging.getLogger(__name__)
 
+# S3 delete_objects accepts at most 1000 keys per call
+S3_DELETE_BATCH_SIZE = 1000
+
 
 def _sanitize_ascii(value: str) -> str:
     """Normalize unicode to ASCII-safe string.
@@ -224,6 +227,46 @@ class BedrockFilesProvider(FilesProvider):
             LOGGER.error(f"Unexpected error deleting file: {e}")
             return False
 
+    def delete_file_resources(self, file_ids: List[str]) -> int:
+        """
+        Deletes many files from S3 with delete_objects, S3_DELETE_BATCH_SIZE keys
+        per call and grouped by bucket. Keys that do not exist count as deleted,
+        so there is no head_object check per file.
+
+        Args:
+            file_ids: IDs (S3 URIs) of the files to delete
+
+        Returns:
+            Number of files deleted
+        """
+        keys_by_bucket: Dict[str, List[str]] = {}
+        for file_id in file_ids:
+            try:
+                bucket_name, s3_key = self._get_key_from_file_id(file_id)
+            except ValueError as e:
+                LOGGER.warning(f"Skipping delete of {file_id}: {e}")
+                continue
+            keys_by_bucket.setdefault(bucket_name, []).append(s3_key)
+
+        deleted = 0
+        for bucket_name, keys in keys_by_bucket.items():
+            for start in range(0, len(keys), S3_DELETE_BATCH_SIZE):
+                batch = keys[start:start + S3_DELETE_BATCH_SIZE]
+                try:
+                    response = self.s3_client.delete_objects(
+                        Bucket=bucket_name,
+                        Delete={'Objects': [{'Key': key} for key in batch], 'Quiet': True}
+                    )
+                except ClientError as e:
+                    LOGGER.error(f"Failed to delete {len(batch)} files from bucket {bucket_name}: {e}")
+                    continue
+                errors = response.get('Errors', [])
+                for error in errors:
+                    LOGGER.error(f"Error deleting S3 object {error.get('Key')}: {error.get('Message')}")
+                deleted += len(batch) - len(errors)
+        LOGGER.info(f"Deleted {deleted} of {len(file_ids)} files from S3")
+        return deleted
+
     def get_file_bytes(self, file_tuple: Tuple[str, Optional[bytes]]) -> io.BytesIO:
         """
         Override to handle S3 file retrieval.
@@ -0,0 +1,231 @@
+"""
+Background monitor for Bedrock Knowledge Base ingestion jobs.
+
+One daemon thread per process polls every in-flight ingestion job, backing off
+while a job's status is unchanged, and writes finished jobs' statuses to
+knowledge_base_files in bulk. Callers that need the outcome get a Future from
+track() instead of polling Bedrock themselves.
+
+In-flight jobs are also picked up from knowledge_base_files rows still marked
+'in_progress', so jobs started by a process that has since exited are finished
+off by whichever process runs the monitor next. Several processes may poll the
+same job; the status writes are idempotent.
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional
+
+from botocore.exceptions import ClientError
+from bondable.bond.providers.bedrock.BedrockMetadata import KnowledgeBaseFile
+
+LOGGER = logging.getLogger(__name__)
+
+TERMINAL_STATES = frozenset({'COMPLETE', 'FAILED', 'STOPPED'})
+# Bedrock job status -> knowledge_base_files.ingestion_status
+FILE_STATUS_FOR_JOB = {'COMPLETE': 'completed', 'FAILED': 'failed', 'STOPPED': 'failed'}
+
+DEFAULT_MIN_POLL_SECONDS = 2
+DEFAULT_MAX_POLL_SECONDS = 60
+# How often the monitor looks for in-progress rows it is not tracking yet
+DB_RESCAN_SECONDS = 300
+
+
+class _TrackedJob:
+    __slots__ = ('job_id', 'status', 'interval', 'next_poll_at', 'futures')
+
+    def __init__(self, job_id: str, min_interval: float):
+        self.job_id = job_id
+        self.status: Optional[str] = None
+        self.interval = min_interval
+        self.next_poll_at = time.monotonic()
+        self.futures: List[Future] = []
+
+
+class IngestionMonitor:
+    """Tracks ingestion jobs for one BedrockVectorStoresProvider on a daemon thread."""
+
+    def __init__(self, vectorstores):
+        self.vectorstores = vectorstores
+        self._min_interval = float(os.getenv('KB_INGESTION_MIN_POLL_SECONDS', str(DEFAULT_MIN_POLL_SECONDS)))
+        self._max_interval = float(os.getenv('KB_INGESTION_MAX_POLL_SECONDS', str(DEFAULT_MAX_POLL_SECONDS)))
+        self._jobs: Dict[str, _TrackedJob] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._next_db_scan = 0.0
+
+    def track(self, job_id: str) -> Future:
+        """
+        Start tracking job_id and return a Future for its final status.
+
+        The Future resolves to the same dict wait_for_ingestion_job returns
+        (job_id, status, statistics, failure_reasons, started_at, updated_at).
+        Async callers can await asyncio.wrap_future(future).
+        """
+        future: Future = Future()
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                job = self._jobs[job_id] = _TrackedJob(job_id, self._min_interval)
+            else:
+                # A new waiter means someone cares now; poll soon
+                job.interval = self._min_interval
+                job.next_poll_at = time.monotonic()
+            job.futures.append(future)
+        self.start()
+        self._wake.set()
+        return future
+
+    def tracked_job_ids(self) -> List[str]:
+        with self._lock:
+            return list(self._jobs)
+
+    def start(self) -> None:
+        """Start the monitor thread. Idempotent."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._next_db_scan = 0.0
+            self._thread = threading.Thread(target=self._run, name="kb-ingestion-monitor", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+
+    def poll_once(self) -> None:
+        """Poll every job that is due and record any that finished. One monitor iteration."""
+        if time.monotonic() >= self._next_db_scan:
+            self._adopt_in_progress_jobs()
+            self._next_db_scan = time.monotonic() + DB_RESCAN_SECONDS
+
+        now = time.monotonic()
+        with self._lock:
+            due = [job for job in self._jobs.values() if job.next_poll_at <= now]
+
+        finished: Dict[str, Dict[str, Any]] = {}
+        for job in due:
+            result = self._get_job(job.job_id)
+            if result is None:
+                # Transient error: keep the job but back off
+                self._back_off(job, changed=False)
+                continue
+            if result['status'] in TERMINAL_STATES:
+                finished[job.job_id] = result
+            else:
+                self._back_off(job, changed=result['status'] != job.status)
+                job.status = result['status']
+
+        if finished:
+            self._record_finished(finished)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception:  # noqa: BLE001 - monitor must never die
+                LOGGER.error("[KB Ingestion] Monitor iteration failed", exc_info=True)
+            self._wake.wait(self._seconds_until_next_poll())
+            self._wake.clear()
+
+    def _seconds_until_next_poll(self) -> float:
+        with self._lock:
+            if not self._jobs:
+                return max(self._next_db_scan - time.monotonic(), 0.0)
+            next_poll_at = min(job.next_poll_at for job in self._jobs.values())
+        return max(min(next_poll_at, self._next_db_scan) - time.monotonic(), 0.0)
+
+    def _back_off(self, job: _TrackedJob, changed: bool) -> None:
+        job.interval = self._min_interval if changed else min(job.interval * 2, self._max_interval)
+        job.next_poll_at = time.monotonic() + job.interval
+
+    def _get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        vs = self.vectorstores
+        try:
+            response = vs.bedrock_agent_client.get_ingestion_job(
+                knowledgeBaseId=vs.knowledge_base_id,
+                dataSourceId=vs.data_source_id,
+                ingestionJobId=job_id
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ResourceNotFoundException':
+                LOGGER.warning(f"[KB Ingestion] Job {job_id} no longer exists, marking failed")
+                return {'job_id': job_id, 'status': 'FAILED', 'statistics': {},
+                        'failure_reasons': ['Ingestion job not found'], 'started_at': None, 'updated_at': None}
+            LOGGER.warning(f"[KB Ingestion] Error polling job {job_id}: {e}")
+            return None
+        except Exception as e:
+            LOGGER.warning(f"[KB Ingestion] Error polling job {job_id}: {e}")
+            return None
+        job = response.get('ingestionJob', {})
+        return {
+            'job_id': job.get('ingestionJobId', job_id),
+            'status': job.get('status'),
+            'statistics': job.get('statistics', {}),
+            'failure_reasons': job.get('failureReasons', []),
+            'started_at': job.get('startedAt'),
+            'updated_at': job.get('updatedAt')
+        }
+
+    def _adopt_in_progress_jobs(self) -> None:
+        """Track jobs that knowledge_base_files says are running but nobody is watching."""
+        session = self.vectorstores.metadata.get_db_session()
+        try:
+            rows = session.query(KnowledgeBaseFile.ingestion_job_id).filter(
+                KnowledgeBaseFile.ingestion_status == 'in_progress',
+                KnowledgeBaseFile.ingestion_job_id.isnot(None)
+            ).distinct().all()
+        except Exception as e:
+            LOGGER.warning(f"[KB Ingestion] Could not load in-progress jobs: {e}")
+            return
+        finally:
+            session.close()
+        with self._lock:
+            for (job_id,) in rows:
+                if job_id not in self._jobs:
+                    self._jobs[job_id] = _TrackedJob(job_id, self._min_interval)
+        if rows:
+            LOGGER.debug(f"[KB Ingestion] Monitoring {len(rows)} in-progress jobs from the database")
+
+    def _record_finished(self, finished: Dict[str, Dict[str, Any]]) -> None:
+        """Write final statuses with one UPDATE per status, then resolve waiters."""
+        by_file_status: Dict[str, List[str]] = {}
+        for job_id, result in finished.items():
+            by_file_status.setdefault(FILE_STATUS_FOR_JOB[result['status']], []).append(job_id)
+            self.vectorstores._log_ingestion_results(result)
+
+        session = self.vectorstores.metadata.get_db_session()
+        try:
+            for file_status, job_ids in by_file_status.items():
+                session.query(KnowledgeBaseFile).filter(
+                    KnowledgeBaseFile.ingestion_job_id.in_(job_ids)
+                ).update({'ingestion_status': file_status}, synchronize_session=False)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            # Leave the jobs tracked so the update is retried on a later poll
+            LOGGER.error(f"[KB Ingestion] Error recording finished jobs {list(finished)}: {e}")
+            with self._lock:
+                for job_id in finished:
+                    if job_id in self._jobs:
+                        self._back_off(self._jobs[job_id], changed=False)
+            return
+        finally:
+            session.close()
+
+        with self._lock:
+            jobs = [self._jobs.pop(job_id) for job_id in finished if job_id in self._jobs]
+        for job in jobs:
+            for future in job.futures:
+                if not future.done():
+                    future.set_result(finished[job.job_id])
@@ -15,6 +15,7 @@ import json
 import logging
 import hashlib
 import re
+import threading
 from typing import List, Dict, Any, Optional, Tuple
 from fastmcp import Client
 from fastmcp.client.transports import StreamableHttpTransport  # Use fastmcp's transport wrapper
@@ -27,6 +28,8 @@ from bondable.bond.auth.mcp_token_cache import (
     TokenExpiredError
 )
 from bondable.bond.auth.oauth_utils import safe_isoformat
+from bondable.bond.mcp_snapshot import builtin_tool_schemas, latest_snapshot, user_servers_by_hash
+from bondable.bond.mcp_snapshot import hash_server_name as _hash_server_name
 from bondable.utils.logging_utils import safe_id
 
 LOGGER = logging.getLogger(__name__)
@@ -97,22 +100,6 @@ from bondable.bond.providers.bedrock.CommonToolsMCP import (
     get_common_tool_definitions,
 )
 
-def _hash_server_name(server_name: str) -> str:
-    """
-    Generate 6-character hash of server name.
-
-    Uses SHA256 and takes first 6 hex characters. This provides
-    ~16 million unique values, sufficient for MCP server identification.
-
-    Args:
-        server_name: MCP server name from config
-
-    Returns:
-        6-character lowercase hex string
-    """
-    return hashlib.sha256(server_name.encode()).hexdigest()[:6]
-
-
 def _build_tool_path(server_name: str, tool_name: str) -> str:
     """
     Build tool path with server hash: /b.{hash6}.{tool_name}
@@ -182,6 +169,7 @@ def _resolve_server_from_hash(server_hash: str, mcp_config: Dict[str, Any], owne
     Resolve server hash to server name.
 
     Checks global servers first, then user-defined servers if owner_user_id is provided.
+    When mcp_config is the current config snapshot, both are index lookups.
 
     Args:
         server_hash: 6-character hash from tool path
@@ -191,59 +179,66 @@ def _resolve_server_from_hash(server_hash: str, mcp_config: Dict[str, Any], owne
     Returns:
         Server name if found (or "__user_server__{id}" for user servers), None otherwise
     """
-    servers = mcp_config.get('mcpServers', {})
-    for server_name in servers:
-        if _hash_server_name(server_name) == server_hash:
-            return server_name
+    snapshot = latest_snapshot()
+    if snapshot is not None and snapshot.config is mcp_config:
+        server_name = snapshot.server_by_hash.get(server_hash)
+    else:
+        server_name = next((name for name in mcp_config.get('mcpServers', {})
+                            if _hash_server_name(name) == server_hash), None)
+    if server_name:
+        return server_name
 
     # Check user-defined servers
     if owner_user_id:
-        user_server = _resolve_user_server_by_hash(server_hash, owner_user_id)
-        if user_server:
-            return f"__user_server__{user_server.id}"
+        server_id = _resolve_user_server_by_hash(server_hash, owner_user_id)
+        if server_id:
+            return f"__user_server__{server_id}"
 
     return None
 
 
-def _resolve_user_server_by_hash(server_hash: str, owner_user_id: str):
+def _resolve_user_server_by_hash(server_hash: str, owner_user_id: str) -> Optional[str]:
     """
-    Resolve a server hash to a UserMcpServer record.
+    Resolve a server hash to the id of one of the owner's active UserMcpServer records.
 
     Args:
         server_hash: 6-character hash from tool path
         owner_user_id: Owner user ID to scope the lookup
 
     Returns:
-        UserMcpServer record if found, None otherwise
+        UserMcpServer id if found, None otherwise
     """
     try:
-        from bondable.bond.providers.metadata import UserMcpServer
-        from bondable.rest.routers.user_mcp_servers import get_user_server_internal_name
-        from bondable.bond.config import Config
+        return user_servers_by_hash(owner_user_id, lambda: _load_user_server_hashes(owner_user_id)).get(server_hash)
+    except Exception as e:
+        LOGGER.warning("[MCP] Error resolving user server from hash: %s", e)
+        return None
 
-        config = Config.config()
-        provider = config.get_provider()
-        if not provider or not hasattr(provider, 'metadata'):
-            return None
 
-        db_session = provider.metadata.get_db_session()
-        if not db_session:
-            return None
+def _load_user_server_hashes(owner_user_id: str) -> Dict[str, str]:
+    """Hash -> id for the owner's active user-defined servers, read from the database."""
+    from bondable.bond.providers.metadata import UserMcpServer
+    from bondable.rest.routers.user_mcp_servers import get_user_server_internal_name
 
-        user_servers = db_session.query(UserMcpServer).filter(
-            UserMcpServer.owner_user_id == owner_user_id,
-            UserMcpServer.is_active == True  # noqa: E712
-        ).all()
+    config = Config.config()
+    provider = config.get_provider()
+    if not provider or not hasattr(provider, 'metadata'):
+        return {}
 
-        for server in user_servers:
-            internal_name = get_user_server_internal_name(owner_user_id, server.server_name)
-            if _hash_server_name(internal_name) == server_hash:
-                return server
+    db_session = provider.metadata.get_db_session()
+    if not db_session:
+        return {}
 
-    except Exception as e:
-        LOGGER.warning("[MCP] Error resolving user server from hash: %s", e)
+    user_servers = db_session.query(UserMcpServer).filter(
+        UserMcpServer.owner_user_id == owner_user_id,
+        UserMcpServer.is_active == True  # noqa: E712
+    ).all()
 
-    return None
+    hashes: Dict[str, str] = {}
+    for server in user_servers:
+        internal_name = get_user_server_internal_name(owner_user_id, server.server_name)
+        hashes.setdefault(_hash_server_name(internal_name), server.id)
+    return hashes
 
 
 def _get_user_server_config(server_id: str) -> Optional[Tuple[str, Dict[str, Any]]]:
@@ -381,6 +376,9 @@ MAX_DESCRIPTION_LENGTH = 200
 # Timeout for individual MCP tool calls (seconds). Prevents indefinite hangs
 # when an MCP server is unresponsive.
 MCP_TOOL_TIMEOUT = 120
+# Shared deadline (seconds) for listing tools across all MCP servers when building
+# action groups. Servers that have not answered by then are skipped.
+MCP_TOOL_DISCOVERY_TIMEOUT = 30
 
 # Unsupported JSON Schema keywords that must be removed for Bedrock
 _UNSUPPORTED_SCHEMA_KEYWORDS = {
@@ -763,15 +761,33 @@ def _coerce_parameters_for_mcp(tool_name: str, parameters: Dict[str, Any], tool_
     return coerced
 
 
-def create_mcp_action_groups(bedrock_agent_id: str, mcp_tools: List[str], mcp_resources: List[str], user_id: Optional[str] = None):
+def _delete_mcp_action_group(bedrock_agent_client: Any, bedrock_agent_id: str, action_group_id: str):
+    try:
+        LOGGER.debug(f"[MCP Action Groups] Deleting existing MCP action group {action_group_id}")
+        bedrock_agent_client.delete_agent_action_group(
+            agentId=bedrock_agent_id,
+            agentVersion="DRAFT",
+            actionGroupId=action_group_id,
+            skipResourceInUseCheck=True  # Force deletion
+        )
+    except Exception as e:
+        LOGGER.warning(f"[MCP Action Groups] Failed to delete existing MCP action group: {e}")
+
+
+def create_mcp_action_groups(bedrock_agent_id: str, mcp_tools: List[str], mcp_resources: List[str],
+                             user_id: Optional[str] = None, existing_action_group_id: Optional[str] = None):
     """
     Create action groups for MCP tools.
 
+    All tools go into a single MCPTools action group. When the agent already has
+    one, it is updated in place (one call) rather than deleted and recreated.
+
     Args:
         bedrock_agent_id: The Bedrock agent ID
         mcp_tools: List of MCP tool names to create action groups for
         mcp_resources: List of MCP resource names (for future use)
         user_id: User ID for OAuth token lookup (required for oauth2 servers)
+        existing_action_group_id: ID of the agent's current MCPTools action group, if any
     """
     LOGGER.debug("[MCP Action Groups] Creating action groups for agent %s with %d tools", bedrock_agent_id, len(mcp_tools))
 
@@ -787,6 +803,8 @@ def create_mcp_action_groups(bedrock_agent_id: str, mcp_tools: List[str], mcp_re
 
         if not mcp_config:
             LOGGER.error("[MCP Action Groups] MCP tools specified but no MCP config available")
+            if existing_action_group_id:
+                _delete_mcp_action_group(bedrock_agent_client, bedrock_agent_id, existing_action_group_id)
             return
 
         # Get tool definitions from MCP (with OAuth support)
@@ -795,6 +813,8 @@ def create_mcp_action_groups(bedrock_agent_id: str, mcp_tools: List[str], mcp_re
 
         if not mcp_tool_definitions:
             LOGGER.warning("[MCP Action Groups] No MCP tool definitions found - action group will NOT be created")
+            if existing_action_group_id:
+                _delete_mcp_action_group(bedrock_agent_client, bedrock_agent_id, existing_action_group_id)
             return
 
         LOGGER.debug(f"[MCP Action Groups] Got {len(mcp_tool_definitions)} tool definitions")
@@ -916,6 +936,20 @@ def create_mcp_action_groups(bedrock_agent_id: str, mcp_tools: List[str], mcp_re
             }
         }
 
+        if existing_action_group_id:
+            try:
+                LOGGER.info(f"Updating MCP action group {existing_action_group_id} with {len(paths)} tools")
+                bedrock_agent_client.update_agent_action_group(
+                    agentId=bedrock_agent_id,
+                    agentVersion="DRAFT",
+                    actionGroupId=existing_action_group_id,
+                    **action_group_spec
+                )
+                return
+            except Exception as e:
+                LOGGER.warning(f"[MCP Action Groups] In-place update failed, recreating action group: {e}")
+                _delete_mcp_action_group(bedrock_agent_client, bedrock_agent_id, existing_action_group_id)
+
         LOGGER.info(f"Creating MCP action group with {len(paths)} tools")
         action_response = bedrock_agent_client.create_agent_action_group(
             agentId=bedrock_agent_id,
@@ -985,7 +1019,7 @@ async def _get_mcp_tool_definitions(mcp_config: Dict[str, Any], tool_names: List
             def __init__(self, uid, email):
                 self.user_id = uid
                 self.email = email
-        current_user = UserContext(user_id, _resolve_user_email(user_id))
+        current_user = UserContext(user_id, await _run_blocking(_resolve_user_email, user_id))
 
     tool_definitions = []
 
@@ -1041,8 +1075,7 @@ async def _get_mcp_tool_definitions(mcp_config: Dict[str, Any], tool_names: List
     admin_tool_names_requested = admin_targeted | admin_unqualified
     if admin_tool_names_requested:
         LOGGER.debug(f"[MCP Tool Defs] Found {len(admin_tool_names_requested)} admin tools in request: {admin_tool_names_requested}")
-        admin_tool_defs = get_admin_tool_definitions()
-        admin_tool_map = {t['name']: t for t in admin_tool_defs}
+        admin_tool_map = builtin_tool_schemas()[ADMIN_SERVER_NAME]
 
         for tool_name in admin_tool_names_requested:
             if tool_name in admin_tool_map:
@@ -1074,8 +1107,7 @@ async def _get_mcp_tool_definitions(mcp_config: Dict[str, Any], tool_names: List
     common_tool_names_requested = common_targeted | common_unqualified
     if common_tool_names_requested:
         LOGGER.debug(f"[MCP Tool Defs] Found {len(common_tool_names_requested)} common tools in request: {common_tool_names_requested}")
-        common_tool_defs = get_common_tool_definitions()
-        common_tool_map = {t['name']: t for t in common_tool_defs}
+        common_tool_map = builtin_tool_schemas()[COMMON_SERVER_NAME]
 
         for tool_name in common_tool_names_requested:
             if tool_name in common_tool_map:
@@ -1099,101 +1131,72 @@ async def _get_mcp_tool_definitions(mcp_config: Dict[str, Any], tool_names: List
                 LOGGER.debug(f"[MCP Tool Defs] Added common tool '{tool_name}'")
 
     # =================================================================
-    # Search each external MCP server for the remaining tools
+    # Query the candidate external MCP servers concurrently
     # =================================================================
-    for server_name, server_config in servers.items():
+    # Bare names can live on any server; qualified names only on their own.
+    candidate_servers = [
+        (server_name, server_config) for server_name, server_config in servers.items()
+        if unqualified or server_name in server_targeted
+    ] if _has_remaining() else []
+    server_tools = await _list_tools_on_servers(candidate_servers, current_user)
+
+    # Merge in config order so first-match for bare names is the same as a serial walk
+    for server_name, server_config in candidate_servers:
         if not _has_remaining():
             break  # Found all tools
 
-        server_url = server_config.get('url')
-        if not server_url:
-            LOGGER.warning("[MCP Tool Defs] No URL configured for MCP server %s", safe_id(server_name))
+        all_tools = server_tools.get(server_name)
+        if all_tools is None:
             continue
+        tool_dict = {tool.name: tool for tool in all_tools}
+
+        # Determine which tools to look for on this server:
+        # 1. Tools explicitly targeted to this server (qualified names)
+        # 2. Unqualified tools (backward compat: first-match wins)
+        tools_to_find = set()
+        targeted_for_server = server_targeted.get(server_name, set())
+        if targeted_for_server:
+            tools_to_find.update(targeted_for_server)
+        tools_to_find.update(unqualified)
+
+        for tool_name in list(tools_to_find):
+            if tool_name in tool_dict:
+                tool = tool_dict[tool_name]
+                tool_def = {
+                    'name': tool_name,
+                    'description': tool.description or f"MCP tool {tool_name}",
+                    'server_name': server_name  # Track which server has this tool
+                }
 
-        try:
-            # Get authentication headers (handles oauth2, bond_jwt, static)
-            try:
-                headers = _get_auth_headers_for_server(server_name, server_config, current_user)
-                headers['User-Agent'] = 'Bond-AI-MCP-Client/1.0'
-                LOGGER.debug("[MCP Tool Defs] Server '%s': authenticated successfully", safe_id(server_name))
-            except (AuthorizationRequiredError, TokenExpiredError) as e:
-                LOGGER.warning("[MCP Tool Defs] Server '%s': OAuth not available - %s", safe_id(server_name), e)
-                # Fall back to static headers only
-                headers = server_config.get('headers', {})
-                headers['User-Agent'] = 'Bond-AI-MCP-Client/1.0'
-
-            # Use appropriate transport based on config
-            transport_type = server_config.get('transport', 'streamable-http')
-
-            # Note: Don't override Accept/Content-Type headers for streamable-http
-            # The MCP SDK sets these by default with lowercase keys
-
-            if transport_type == 'sse':
-                transport = SSETransport(server_url, headers=headers)
-            else:
-                transport = StreamableHttpTransport(server_url, headers=headers)
-
-            async with Client(transport) as client:
-                # Fetch all available tools from this server
-                all_tools = await client.list_tools()
-                allowed_tools = server_config.get('allowed_tools')
-                if allowed_tools is not None:
-                    allowed_set = set(allowed_tools)
-                    all_tools = [t for t in all_tools if t.name in allowed_set]
-                tool_dict = {tool.name: tool for tool in all_tools}
-                LOGGER.debug("[MCP Tool Defs] Server '%s': %d tools available", safe_id(server_name), len(all_tools))
-
-                # Determine which tools to look for on this server:
-                # 1. Tools explicitly targeted to this server (qualified names)
-                # 2. Unqualified tools (backward compat: first-match wins)
-                tools_to_find = set()
-                targeted_for_server = server_targeted.get(server_name, set())
-                if targeted_for_server:
-                    tools_to_find.update(targeted_for_server)
-                tools_to_find.update(unqualified)
-
-                for tool_name in list(tools_to_find):
-                    if tool_name in tool_dict:
-                        tool = tool_dict[tool_name]
-                        tool_def = {
-                            'name': tool_name,
-                            'description': tool.description or f"MCP tool {tool_name}",
-                            'server_name': server_name  # Track which server has this tool
-                        }
+                # Add parameter schema if available, with sanitization
+                if hasattr(tool, 'inputSchema') and tool.inputSchema:
+                    schema = tool.inputSchema
+                    if 'properties' in schema:
+                        raw_properties = dict(schema['properties'])
+                        raw_required = schema.get('required', [])
+                        sanitized_props, sanitized_required = _sanitize_tool_parameters(
+                            tool_name=tool_name,
+                            properties=raw_properties,
+                            required=raw_required,
+                        )
+                        tool_def['parameters'] = sanitized_props
+                        tool_def['required'] = sanitized_required
+                        LOGGER.info(
+                            f"[MCP Tool Defs] Tool '{tool_name}' schema: "
+                            f"{len(raw_properties)} raw params -> "
+                            f"{len(sanitized_props)} sanitized params, "
+                            f"required={sanitized_required}"
+                        )
+                    else:
+                        tool_def['parameters'] = {}
+                        tool_def['required'] = []
+                else:
+                    tool_def['parameters'] = {}
+                    tool_def['required'] = []
 
-                        # Add parameter schema if available, with sanitization
-                        if hasattr(tool, 'inputSchema') and tool.inputSchema:
-                            schema = tool.inputSchema
-                            if 'properties' in schema:
-                                raw_properties = dict(schema['properties'])
-                                raw_required = schema.get('required', [])
-                                sanitized_props, sanitized_required = _sanitize_tool_parameters(
-                                    tool_name=tool_name,
-                                    properties=raw_properties,
-                                    required=raw_required,
-                                )
-                                tool_def['parameters'] = sanitized_props
-                                tool_def['required'] = sanitized_required
-                                LOGGER.info(
-                                    f"[MCP Tool Defs] Tool '{tool_name}' schema: "
-                                    f"{len(raw_properties)} raw params -> "
-                                    f"{len(sanitized_props)} sanitized params, "
-                                    f"required={sanitized_required}"
-                                )
-                            else:
-                                tool_def['parameters'] = {}
-                                tool_def['required'] = []
-                        else:
-                            tool_def['parameters'] = {}
-                            tool_def['required'] = []
-
-                        tool_definitions.append(tool_def)
-                        _mark_found(server_name, tool_name)
-                        LOGGER.debug("[MCP Tool Defs] Found tool '%s' on server '%s'", safe_id(tool_name), safe_id(server_name))
-
-        except Exception as e:
-            LOGGER.error("[MCP Tool Defs] Error fetching tools from server '%s': %s", safe_id(server_name), e)
-            continue
+                tool_definitions.append(tool_def)
+                _mark_found(server_name, tool_name)
+                LOGGER.debug("[MCP Tool Defs] Found tool '%s' on server '%s'", safe_id(tool_name), safe_id(server_name))
 
     # Report any tools not found
     remaining_report = []
@@ -1208,19 +1211,127 @@ async def _get_mcp_tool_definitions(mcp_config: Dict[str, Any], tool_names: List
     return tool_definitions
 
 
+async def _list_server_tools(server_name: str, server_config: Dict[str, Any], current_user: Optional[Any]) -> Optional[List[Any]]:
+    """List the tools one MCP server exposes, after allowed_tools filtering. Returns None on failure."""
+    server_url = server_config.get('url')
+    if not server_url:
+        LOGGER.warning("[MCP Tool Defs] No URL configured for MCP server %s", safe_id(server_name))
+        return None
+
+    try:
+        # Get authentication headers (handles oauth2, bond_jwt, static)
+        try:
+            headers = await _run_blocking(_get_auth_headers_for_server, server_name, server_config, current_user)
+            headers['User-Agent'] = 'Bond-AI-MCP-Client/1.0'
+            LOGGER.debug("[MCP Tool Defs] Server '%s': authenticated successfully", safe_id(server_name))
+        except (AuthorizationRequiredError, TokenExpiredError) as e:
+            LOGGER.warning("[MCP Tool Defs] Server '%s': OAuth not available - %s", safe_id(server_name), e)
+            # Fall back to static headers only (copied: the config dict is shared)
+            headers = dict(server_config.get('headers', {}))
+            headers['User-Agent'] = 'Bond-AI-MCP-Client/1.0'
+
+        # Use appropriate transport based on config
+        transport_type = server_config.get('transport', 'streamable-http')
+
+        # Note: Don't override Accept/Content-Type headers for streamable-http
+        # The MCP SDK sets these by default with lowercase keys
+
+        if transport_type == 'sse':
+            transport = SSETransport(server_url, headers=headers)
+        else:
+            transport = StreamableHttpTransport(server_url, headers=headers)
+
+        async with Client(transport) as client:
+            all_tools = await client.list_tools()
+    except Exception as e:
+        LOGGER.error("[MCP Tool Defs] Error fetching tools from server '%s': %s", safe_id(server_name), e)
+        return None
+
+    allowed_tools = server_config.get('allowed_tools')
+    if allowed_tools is not None:
+        allowed_set = set(allowed_tools)
+        all_tools = [t for t in all_tools if t.name in allowed_set]
+    LOGGER.debug("[MCP Tool Defs] Server '%s': %d tools available", safe_id(server_name), len(all_tools))
+    return all_tools
+
+
+async def _list_tools_on_servers(candidate_servers: List[Tuple[str, Dict[str, Any]]],
+                                 current_user: Optional[Any]) -> Dict[str, List[Any]]:
+    """
+    List tools on every candidate server at once under MCP_TOOL_DISCOVERY_TIMEOUT.
+
+    Returns {server_name: tools} for servers that answered; failed or timed-out
+    servers are left out.
+    """
+    if not candidate_servers:
+        return {}
+    tasks = {
+        server_name: asyncio.ensure_future(_list_server_tools(server_name, server_config, current_user))
+        for server_name, server_config in candidate_servers
+    }
+    done, pending = await asyncio.wait(tasks.values(), timeout=MCP_TOOL_DISCOVERY_TIMEOUT)
+    if pending:
+        timed_out = [name for name, task in tasks.items() if task in pending]
+        LOGGER.warning(
+            "[MCP Tool Defs] Servers did not list tools within %ds, skipping: %s",
+            MCP_TOOL_DISCOVERY_TIMEOUT, [safe_id(name) for name in timed_out]
+        )
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+    return {
+        name: task.result() for name, task in tasks.items()
+        if task in done and task.result() is not None
+    }
+
+
+# Sync callers (agent save, tool execution from the Bedrock stream) share one
+# long-lived event loop on a daemon thread instead of paying for a new thread
+# pool and event loop on every call.
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_loop_lock = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None or _background_loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="mcp-event-loop", daemon=True).start()
+            _background_loop = loop
+        return _background_loop
+
+
+def _call_with_own_session(func, *args, **kwargs):
+    """Call func, then close this thread's scoped DB session (OAuth token and server lookups open it)."""
+    try:
+        return func(*args, **kwargs)
+    finally:
+        provider = Config.config().provider
+        if provider and hasattr(provider, 'metadata'):
+            try:
+                provider.metadata.get_db_session().close()
+            except Exception as e:  # noqa: BLE001 - cleanup must not mask the result
+                LOGGER.debug("[MCP] Could not close worker thread session: %s", e)
+
+
+async def _run_blocking(func, *args, **kwargs):
+    """
+    Run blocking DB/OAuth work (token refresh, server and user lookups) on a worker
+    thread so it does not stall other users' calls on the shared event loop.
+    """
+    return await asyncio.to_thread(_call_with_own_session, func, *args, **kwargs)
+
+
+def _run_on_background_loop(coro):
+    """Run a coroutine on the shared MCP event loop and block until it finishes."""
+    future = asyncio.run_coroutine_threadsafe(coro, _get_background_loop())
+    return future.result()
+
+
 def _get_mcp_tool_definitions_sync(mcp_config: Dict[str, Any], tool_names: List[str], user_id: Optional[str] = None) -> List[Dict[str, Any]]:
     """Synchronous wrapper for getting MCP tool definitions."""
-    try:
-        # Try to get the current event loop
-        loop = asyncio.get_running_loop()
-        # If we're in an async context, create a task
-        import concurrent.futures
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            future = executor.submit(asyncio.run, _get_mcp_tool_definitions(mcp_config, tool_names, user_id))
-            return future.result()
-    except RuntimeError:
-        # No event loop running, we can use asyncio.run directly
-        return asyncio.run(_get_mcp_tool_definitions(mcp_config, tool_names, user_id))
+    return _run_on_background_loop(_get_mcp_tool_definitions(mcp_config, tool_names, user_id))
 
 
 def _get_auth_headers_for_server(
@@ -1389,7 +1500,7 @@ async def execute_mcp_tool(
     # Handle user-defined server (sentinel prefix from _resolve_server_from_hash)
     if target_server and target_server.startswith("__user_server__"):
         server_id = target_server[len("__user_server__"):]
-        user_config = _get_user_server_config(server_id)
+        user_config = await _run_blocking(_get_user_server_config, server_id)
         if user_config is None:
             return {"success": False, "error": f"User-defined server '{server_id}' not found or inactive"}
         connection_name, user_server_config = user_config
@@ -1429,7 +1540,8 @@ async def execute_mcp_tool(
         for attempt in range(max_attempts):
             try:
                 # Get authentication headers based on auth_type
-                headers = _get_auth_headers_for_server(
+                headers = await _run_blocking(
+                    _get_auth_headers_for_server,
                     server_name=server_name,
                     server_config=server_config,
                     current_user=current_user,
@@ -1566,7 +1678,7 @@ async def execute_mcp_tool(
                         )
                         # Force refresh by calling get_token with auto_refresh=True
                         token_cache = get_mcp_token_cache()
-                        token_cache.get_token(user_id, server_name, auto_refresh=True)
+                        await _run_blocking(token_cache.get_token, user_id, server_name, auto_refresh=True)
                         continue  # Retry with refreshed token
 
                 # Log full exception details including traceback for debugging
@@ -1605,17 +1717,6 @@ def execute_mcp_tool_sync(
     Returns:
         Result dictionary with 'success' and 'result' or 'error' fields
     """
-    try:
-        # Try to get the current event loop
-        loop = asyncio.get_running_loop()
-        # If we're in an async context, create a task
-        import concurrent.futures
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            future = executor.submit(
-                asyncio.run,
-                execute_mcp_tool(mcp_config, tool_name, parameters, current_user, jwt_token, target_server)
-            )
-            return future.result()
-    except RuntimeError:
-        # No event loop running, we can use asyncio.run directly
-        return asyncio.run(execute_mcp_tool(mcp_config, tool_name, parameters, current_user, jwt_token, target_server))
+    return _run_on_background_loop(
+        execute_mcp_tool(mcp_config, tool_name, parameters, current_user, jwt_token, target_server)
+    )
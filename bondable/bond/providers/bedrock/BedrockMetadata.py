@@ -5,8 +5,9 @@ This module extends the base Metadata class to add message storage capabilities
 since Bedrock doesn't have built-in thread/conversation management.
 """
 
-from sqlalchemy import Column, String, DateTime, JSON, ForeignKey, Integer, Index, Float, UniqueConstraint
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, DateTime, JSON, ForeignKey, Integer, Index, Float, UniqueConstraint, \
+    and_, case, event, exists, func, or_, select, true
+from sqlalchemy.orm import Session, relationship
 from bondable.bond.providers.metadata import Metadata, Base, Thread, AgentRecord, FileRecord, VectorStore
 import datetime
 import uuid
@@ -34,6 +35,11 @@ class BedrockAgentOptions(Base):
     mcp_resources = Column(JSON, nullable=False, default=dict)  # MCP resources list
     agent_metadata = Column(JSON, nullable=True, default=dict)  # Additional metadata for the agent
     file_storage = Column(String, nullable=False, default='direct')  # 'direct' | 'knowledge_base'
+    # Copies of the Bedrock agent's description and foundation model so listings
+    # don't need a get_agent call per agent. Null for rows created before these
+    # columns existed; filled in on first read by get_agent_summaries.
+    description = Column(String, nullable=True)
+    model = Column(String, nullable=True)
 
     __table_args__ = (
         Index('idx_bedrock_agent_id', 'bedrock_agent_id'),
@@ -62,6 +68,78 @@ class BedrockMessage(Base):
         Index('idx_session_id', 'session_id'),  # Index for session-based queries
     )
 
+def is_hidden_message(metadata: Optional[Dict]) -> bool:
+    """
+    Hidden messages (agent introductions) don't count as user activity. They
+    are marked with metadata hidden=true (bool or string) or, in older threads,
+    override_role='system'.
+    """
+    if not metadata:
+        return False
+    hidden = metadata.get('hidden')
+    return hidden is True or hidden == 'true' or metadata.get('override_role') == 'system'
+
+
+def _visible_user_message_clause(messages, thread_id_column):
+    """SQL counterpart of a visible user message (see is_hidden_message) in the given thread."""
+    # .as_boolean()/.as_string() compare JSON the same way on SQLite and PostgreSQL.
+    # Missing keys compare as NULL, which falls through to ELSE (visible).
+    is_hidden = or_(
+        messages.c.message_metadata['hidden'].as_boolean() == True,
+        messages.c.message_metadata['hidden'].as_string() == 'true',
+        messages.c.message_metadata['override_role'].as_string() == 'system',
+    )
+    return and_(
+        messages.c.thread_id == thread_id_column,
+        messages.c.role == 'user',
+        case((is_hidden, False), else_=True),
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _record_thread_activity(session, flush_context):
+    """Fold newly inserted messages into their threads' activity columns, in the same transaction."""
+    activity: Dict[str, Dict[str, Any]] = {}
+    for message in session.new:
+        if not isinstance(message, BedrockMessage):
+            continue
+        thread = activity.setdefault(message.thread_id, {
+            'count': 0, 'last_message_at': None, 'has_user_message': False})
+        thread['count'] += 1
+        if message.created_at and (thread['last_message_at'] is None or message.created_at > thread['last_message_at']):
+            thread['last_message_at'] = message.created_at
+        if message.role == 'user' and not is_hidden_message(message.message_metadata):
+            thread['has_user_message'] = True
+    if not activity:
+        return
+
+    threads = Thread.__table__
+    connection = session.connection()
+    for thread_id, thread in activity.items():
+        values = {'message_count': threads.c.message_count + thread['count']}
+        if thread['last_message_at'] is not None:
+            values['last_message_at'] = case(
+                (threads.c.last_message_at > thread['last_message_at'], threads.c.last_message_at),
+                else_=thread['last_message_at'])
+        if thread['has_user_message']:
+            values['has_user_message'] = true()
+        connection.execute(threads.update().where(threads.c.thread_id == thread_id).values(**values))
+
+
+def refresh_thread_activity(session, thread_ids: List[str]) -> None:
+    """Recompute the threads' activity columns from their messages, e.g. after messages were removed."""
+    if not thread_ids:
+        return
+    threads = Thread.__table__
+    messages = BedrockMessage.__table__
+    of_thread = messages.c.thread_id == threads.c.thread_id
+    session.execute(threads.update().where(threads.c.thread_id.in_(thread_ids)).values(
+        message_count=select(func.count()).where(of_thread).scalar_subquery(),
+        last_message_at=select(func.max(messages.c.created_at)).where(of_thread).scalar_subquery(),
+        has_user_message=exists().where(_visible_user_message_clause(messages, threads.c.thread_id)),
+    ))
+
+
 class BedrockVectorStoreFile(Base):
     """Store file associations for vector stores in Bedrock"""
     __tablename__ = 'bedrock_vector_store_files'
@@ -6,12 +6,12 @@ S3 for file storage, and Bedrock Knowledge Bases for vector stores.
 """
 
 import os
-import boto3
 from botocore.config import Config as BotoConfig
 from botocore.exceptions import ClientError
 from sqlalchemy import text
 from bondable.bond.providers.provider import Provider
 from bondable.bond.config import Config
+from bondable.bond.aws_clients import BULK_WORKLOAD, STREAMING_WORKLOAD, aws_client
 from bondable.bond.cache import bond_cache
 from .BedrockMetadata import BedrockMetadata
 from .BedrockThreads import BedrockThreadsProvider
@@ -83,10 +83,17 @@ class BedrockProvider(Provider):
         from bondable.bond.groups import Groups
         from bondable.bond.users import Users
         from bondable.bond.agent_folders import AgentFolders
-        self.groups = Groups(self.metadata)
-        self.users = Users(self.metadata)
+        from bondable.bond.agent_access import AgentAccessIndex
+        # Shared so group/user writes invalidate the permission lookups done by agents
+        self.agent_access = AgentAccessIndex(self.metadata)
+        self.agents.access_index = self.agent_access
+        self.groups = Groups(self.metadata, access_index=self.agent_access)
+        self.users = Users(self.metadata, access_index=self.agent_access)
         self.agent_folders = AgentFolders(self.metadata)
 
+        from bondable.bond.background_jobs import BackgroundJobs
+        self.jobs = BackgroundJobs(self.metadata)
+
         LOGGER.info("Initialized BedrockProvider")
 
     def _init_aws_clients(self):
@@ -95,38 +102,13 @@ class BedrockProvider(Provider):
         self.aws_region = os.getenv('AWS_REGION')
         if not self.aws_region:
             raise ValueError("AWS_REGION environment variable must be set. Please set AWS_REGION to your desired AWS region (e.g., us-east-2)")
-        aws_session = None
-        try:
-            aws_profile = os.getenv('AWS_PROFILE', None)
-            if aws_profile:
-                aws_session: boto3.Session = boto3.Session(
-                    profile_name=aws_profile,
-                    region_name=self.aws_region
-                )
-            else:
-                aws_session: boto3.Session = boto3.Session(
-                    aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID', None),
-                    aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY', None),
-                    region_name=self.aws_region
-                )
-        except Exception as e:
-            LOGGER.error(f"Error creating AWS session: {e}")
-            raise ValueError("Failed to create AWS session. Check your AWS credentials and configuration.")
-
-        # Initialize Bedrock clients
+        # Clients come from the shared factory, so every provider in the process
+        # reuses the same connection pools
         try:
-            self.bedrock_client = aws_session.client(
-                service_name='bedrock',
-                region_name=self.aws_region
-            )
-            self.bedrock_runtime_client = aws_session.client(
-                service_name='bedrock-runtime',
-                region_name=self.aws_region
-            )
-            self.bedrock_agent_client = aws_session.client(
-                service_name='bedrock-agent',
-                region_name=self.aws_region
-            )
+            self.bedrock_client = aws_client('bedrock', self.aws_region)
+            self.bedrock_runtime_client = aws_client('bedrock-runtime', self.aws_region,
+                                                     workload=STREAMING_WORKLOAD)
+            self.bedrock_agent_client = aws_client('bedrock-agent', self.aws_region, workload=BULK_WORKLOAD)
             # Agent runtime needs a longer read timeout because Bedrock may take
             # significant time to process tool results before streaming a response
             # (the default 60s is not enough for complex multi-tool prompts).
@@ -138,17 +120,12 @@ class BedrockProvider(Provider):
                 retries={'max_attempts': agent_runtime_max_attempts, 'mode': 'standard'},
                 tcp_keepalive=True
             )
-            self.bedrock_agent_runtime_client = aws_session.client(
-                service_name='bedrock-agent-runtime',
-                region_name=self.aws_region,
-                config=agent_runtime_config
-            )
+            self.bedrock_agent_runtime_client = aws_client('bedrock-agent-runtime', self.aws_region,
+                                                           workload=STREAMING_WORKLOAD,
+                                                           config=agent_runtime_config)
 
             # S3 client for file storage
-            self.s3_client = aws_session.client(
-                service_name='s3',
-                region_name=self.aws_region
-            )
+            self.s3_client = aws_client('s3', self.aws_region, workload=BULK_WORKLOAD)
 
             LOGGER.info(f"Initialized AWS clients in region {self.aws_region}")
 
@@ -353,7 +330,7 @@ class BedrockProvider(Provider):
 
         # Check AWS credentials
         try:
-            sts = boto3.client('sts')
+            sts = aws_client('sts')
             identity = sts.get_caller_identity()
             results['info']['aws_account'] = identity['Account']
             results['info']['aws_arn'] = identity['Arn']
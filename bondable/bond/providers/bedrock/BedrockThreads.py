@@ -11,16 +11,113 @@ from bondable.bond.config import Config
 from bondable.bond.providers.metadata import Thread
 from bondable.bond.providers.files import FileDetails
 from bondable.bond.providers.provider import Provider
-from .BedrockMetadata import BedrockMetadata, BedrockMessage
+from .BedrockMetadata import BedrockMetadata, BedrockMessage, refresh_thread_activity
+import copy
 import uuid
 import logging
-from typing import Dict, Optional, Any, List
+from typing import Callable, Dict, Optional, Any, List, Union
 import datetime
 import boto3
+from sqlalchemy import Text, cast
 import json
 
 LOGGER = logging.getLogger(__name__)
 
+# Threads per DELETE ... WHERE thread_id IN (...) when purging messages
+THREAD_DELETE_BATCH_SIZE = 500
+
+# Read-modify-write rounds update_thread_session_state tries before giving up
+SESSION_STATE_UPDATE_ATTEMPTS = 5
+
+
+def _conversation_history(messages: List[BedrockMessage], max_messages: int) -> Optional[List[Dict]]:
+    """
+    Bedrock conversationHistory entries for stored messages, oldest first:
+    visible user/assistant text only, alternating roles, at most max_messages.
+    Returns None if nothing is left.
+    """
+    # Build raw message list (text messages with user/assistant roles only)
+    raw_messages = []
+    for msg in messages:
+        if msg.role not in ('user', 'assistant'):
+            continue
+        # Skip hidden messages (introductions)
+        msg_meta = msg.message_metadata or {}
+        if msg_meta.get('hidden') in (True, 'true') or msg_meta.get('override_role') == 'system':
+            continue
+        if msg.type in ('system', 'error', 'file_link', 'image_file'):
+            continue
+
+        # Extract text content
+        text_content = ""
+        if isinstance(msg.content, str):
+            text_content = msg.content
+        elif isinstance(msg.content, list):
+            for item in msg.content:
+                if isinstance(item, dict) and 'text' in item:
+                    text_content += item['text']
+        else:
+            text_content = str(msg.content)
+
+        if not text_content.strip():
+            continue
+
+        # Truncate individual messages at 2000 chars
+        if len(text_content) > 2000:
+            text_content = text_content[:2000] + "..."
+
+        raw_messages.append({'role': msg.role, 'text': text_content})
+
+    if not raw_messages:
+        return None
+
+    # Bedrock requires conversationHistory to:
+    # 1. Start with a "user" message
+    # 2. Strictly alternate: user, assistant, user, assistant, ...
+    # Skip leading assistant messages (e.g. agent introductions)
+    while raw_messages and raw_messages[0]['role'] == 'assistant':
+        raw_messages.pop(0)
+
+    if not raw_messages:
+        return None
+
+    # Merge consecutive same-role messages to enforce alternation
+    history = []
+    for msg in raw_messages:
+        if history and history[-1]['role'] == msg['role']:
+            # Merge into previous message of same role
+            prev_text = history[-1]['content'][0]['text']
+            merged = prev_text + "\n\n" + msg['text']
+            # Re-truncate after merging
+            if len(merged) > 2000:
+                merged = merged[:2000] + "..."
+            history[-1]['content'][0]['text'] = merged
+        else:
+            history.append({
+                'role': msg['role'],
+                'content': [{'text': msg['text']}]
+            })
+
+    if not history:
+        return None
+
+    # Ensure the history ends with an assistant message (Bedrock may require this
+    # since the current user prompt is sent separately via inputText)
+    if history[-1]['role'] == 'user':
+        history.pop()
+
+    if not history:
+        return None
+
+    # Cap at max_messages (keep the last N, ensuring we start with user)
+    if len(history) > max_messages:
+        history = history[-max_messages:]
+        # If truncation leaves a leading assistant, drop it
+        if history and history[0]['role'] == 'assistant':
+            history.pop(0)
+
+    return history or None
+
 
 class BedrockThreadsProvider(ThreadsProvider):
     """Thread management for Bedrock using metadata storage with session support"""
@@ -39,6 +136,7 @@ class BedrockThreadsProvider(ThreadsProvider):
             count = session.query(BedrockMessage)\
                 .filter_by(thread_id=thread_id, user_id=user_id)\
                 .delete()
+            refresh_thread_activity(session, [thread_id])
             session.commit()
             return count
         except Exception as e:
@@ -108,51 +206,39 @@ class BedrockThreadsProvider(ThreadsProvider):
         Returns:
             True if successful, False otherwise
         """
-        try:
-            # First delete all messages in the thread
-            # Note: We don't have user_id here, so we'll need to delete all messages for this thread
-            from bondable.bond.providers.metadata import Thread
-            session = self.metadata.get_db_session()
-            try:
-                # Get all unique users who have messages in this thread
-                from bondable.bond.providers.bedrock.BedrockMetadata import BedrockMessage
-                users_with_messages = session.query(BedrockMessage.user_id)\
-                    .filter_by(thread_id=thread_id)\
-                    .distinct()\
-                    .all()
+        return self.delete_thread_resources([thread_id]) == 1
 
-                # Delete messages for each user
-                total_deleted = 0
-                for (user_id,) in users_with_messages:
-                    count = self._delete_thread_messages(thread_id, user_id)
-                    total_deleted += count
-
-                # Before we delete the thread we need to delete the session in bedrock
-                # session_id = self.get_thread_session_id(thread_id=thread_id)
-                # if session_id is not None:
-                #     try:
-                #         response = self.bedrock_agent_runtime_client.delete_session(
-                #             sessionIdentifier=session_id
-                #         )
-                #         LOGGER.info(f"Deleted Bedrock session {session_id} associated with thread {thread_id}: {response}")
-                #     except Exception as bedrockExc:
-                #         LOGGER.exception(f"Error deleting bedrock session {session_id}: {bedrockExc}")
-                # else:
-                #     LOGGER.error(f"Unable to delete bedrock session for thread: {session_id} - no session id")
-
-                LOGGER.info(f"Deleted {total_deleted} messages from thread {thread_id}")
-                return True
+    def delete_thread_resources(self, thread_ids: List[str]) -> int:
+        """
+        Delete the messages of many threads, THREAD_DELETE_BATCH_SIZE threads per DELETE.
 
-            except Exception as e:
-                session.rollback()
-                LOGGER.exception(f"Error deleting thread {thread_id}: {e}")
-                return False
-            finally:
-                session.close()
+        Messages are deleted for every user in the thread, so there is no need to
+        look the users up first.
 
+        Args:
+            thread_ids: The thread IDs to delete
+
+        Returns:
+            The number of threads whose messages were deleted
+        """
+        session = self.metadata.get_db_session()
+        deleted_threads = 0
+        total_deleted = 0
+        try:
+            for start in range(0, len(thread_ids), THREAD_DELETE_BATCH_SIZE):
+                batch = thread_ids[start:start + THREAD_DELETE_BATCH_SIZE]
+                total_deleted += session.query(BedrockMessage)\
+                    .filter(BedrockMessage.thread_id.in_(batch))\
+                    .delete(synchronize_session=False)
+                session.commit()
+                deleted_threads += len(batch)
+            LOGGER.info(f"Deleted {total_deleted} messages from {deleted_threads} threads")
         except Exception as e:
-            LOGGER.error(f"Error in delete_thread_resource: {e}")
-            return False
+            session.rollback()
+            LOGGER.exception(f"Error deleting messages for threads: {e}")
+        finally:
+            session.close()
+        return deleted_threads
 
     def create_thread_resource(self) -> str:
         """
@@ -221,13 +307,13 @@ class BedrockThreadsProvider(ThreadsProvider):
             # On error, assume there might be new messages
             return True
 
-    def get_messages(self, thread_id: str, limit: int = 100, user_id: Optional[str] = None) -> Dict[str, BondMessage]:
+    def get_messages(self, thread_id: str, limit: Optional[int] = 100, user_id: Optional[str] = None) -> Dict[str, BondMessage]:
         """
         Get messages from a thread.
 
         Args:
             thread_id: The thread ID
-            limit: Maximum number of messages to return
+            limit: Maximum number of messages to return (the oldest first), None for all
             user_id: If provided, verify thread ownership before returning messages
 
         Returns:
@@ -472,6 +558,65 @@ class BedrockThreadsProvider(ThreadsProvider):
         finally:
             session.close()
 
+    def update_thread_session_state(self, thread_id: str, user_id: str,
+                                    update: Callable[[Dict[str, Any], Optional[str]], Union[str, None, bool]]) -> bool:
+        """
+        Read-modify-write a thread's session state as a compare-and-set.
+
+        update(session_state, session_id) edits session_state in place and returns
+        the session id to store with it (usually the one it was given), or False to
+        leave the row unchanged. The write is a conditional UPDATE that only applies
+        if the stored session id and state are still the ones read (FOR UPDATE is
+        ignored by SQLite); if another writer got there first, the row is read again
+        and update is called again, so it must only act through its arguments and
+        return value. Use this rather than get_thread_session_state() +
+        update_thread_session() when a background job may write the same thread
+        concurrently.
+
+        Returns True if the row was written.
+        """
+        session = self.metadata.get_db_session()
+        try:
+            for _ in range(SESSION_STATE_UPDATE_ATTEMPTS):
+                thread = session.query(Thread.session_state, Thread.session_id,
+                                       cast(Thread.session_state, Text).label('stored_state'))\
+                    .filter_by(thread_id=thread_id, user_id=user_id)\
+                    .with_for_update()\
+                    .first()
+                if not thread:
+                    LOGGER.warning(f"Thread {thread_id} not found for session state update")
+                    session.rollback()
+                    return False
+
+                session_state = copy.deepcopy(thread.session_state or {})
+                session_id = update(session_state, thread.session_id)
+                if session_id is False:
+                    session.rollback()
+                    return False
+
+                written = session.query(Thread)\
+                    .filter(Thread.thread_id == thread_id, Thread.user_id == user_id,
+                            Thread.session_id.is_not_distinct_from(thread.session_id),
+                            cast(Thread.session_state, Text).is_not_distinct_from(thread.stored_state))\
+                    .update({Thread.session_state: session_state, Thread.session_id: session_id,
+                             Thread.updated_at: datetime.datetime.now()}, synchronize_session=False)
+                if written:
+                    session.commit()
+                    return True
+                session.rollback()
+                LOGGER.debug(f"Session state of thread {thread_id} changed while updating it, retrying")
+
+            LOGGER.warning(f"Gave up updating session state of thread {thread_id} after "
+                           f"{SESSION_STATE_UPDATE_ATTEMPTS} concurrent changes")
+            return False
+
+        except Exception as e:
+            session.rollback()
+            LOGGER.error(f"Error updating session state: {e}")
+            return False
+        finally:
+            session.close()
+
     def get_thread_info(self, thread_id: str, user_id: str) -> Optional[Dict[str, Any]]:
         """Get complete thread information including session data"""
         try:
@@ -530,95 +675,45 @@ class BedrockThreadsProvider(ThreadsProvider):
                 if not has_cross_agent:
                     return None
 
-                # Build raw message list (text messages with user/assistant roles only)
-                raw_messages = []
-                for msg in messages:
-                    if msg.role not in ('user', 'assistant'):
-                        continue
-                    # Skip hidden messages (introductions) from cross-agent context
-                    msg_meta = msg.message_metadata or {}
-                    if msg_meta.get('hidden') in (True, 'true') or msg_meta.get('override_role') == 'system':
-                        continue
-                    if msg.type in ('system', 'error', 'file_link', 'image_file'):
-                        continue
-
-                    # Extract text content
-                    text_content = ""
-                    if isinstance(msg.content, str):
-                        text_content = msg.content
-                    elif isinstance(msg.content, list):
-                        for item in msg.content:
-                            if isinstance(item, dict) and 'text' in item:
-                                text_content += item['text']
-                    else:
-                        text_content = str(msg.content)
-
-                    if not text_content.strip():
-                        continue
-
-                    # Truncate individual messages at 2000 chars
-                    if len(text_content) > 2000:
-                        text_content = text_content[:2000] + "..."
-
-                    raw_messages.append({'role': msg.role, 'text': text_content})
-
-                if not raw_messages:
-                    return None
-
-                # Bedrock requires conversationHistory to:
-                # 1. Start with a "user" message
-                # 2. Strictly alternate: user, assistant, user, assistant, ...
-                # Skip leading assistant messages (e.g. agent introductions)
-                while raw_messages and raw_messages[0]['role'] == 'assistant':
-                    raw_messages.pop(0)
-
-                if not raw_messages:
+                history = _conversation_history(messages, max_messages)
+                if not history:
                     return None
 
-                # Merge consecutive same-role messages to enforce alternation
-                history = []
-                for msg in raw_messages:
-                    if history and history[-1]['role'] == msg['role']:
-                        # Merge into previous message of same role
-                        prev_text = history[-1]['content'][0]['text']
-                        merged = prev_text + "\n\n" + msg['text']
-                        # Re-truncate after merging
-                        if len(merged) > 2000:
-                            merged = merged[:2000] + "..."
-                        history[-1]['content'][0]['text'] = merged
-                    else:
-                        history.append({
-                            'role': msg['role'],
-                            'content': [{'text': msg['text']}]
-                        })
+                LOGGER.info(f"Built cross-agent conversation history for thread {thread_id}: "
+                           f"{len(history)} messages (current_agent={current_agent_id})")
+                return history
 
-                if not history:
-                    return None
+        except Exception as e:
+            LOGGER.warning(f"Failed to build cross-agent conversation history for thread {thread_id}: {e}")
+            return None
 
-                # Ensure the history ends with an assistant message (Bedrock may require this
-                # since the current user prompt is sent separately via inputText)
-                if history[-1]['role'] == 'user':
-                    history.pop()
+    def get_conversation_history_after(self, thread_id: str, user_id: str, message_index: int,
+                                       max_messages: int = 20) -> Optional[List[Dict]]:
+        """
+        conversationHistory entries (see get_cross_agent_conversation_history) for
+        the messages stored after message_index, e.g. the turns a compaction summary
+        does not cover yet.
 
-                if not history:
+        Returns None if they need more than max_messages entries (or the thread is
+        not the user's), rather than dropping the oldest of them.
+        """
+        try:
+            with self.metadata.get_db_session() as session:
+                if not session.query(Thread).filter_by(thread_id=thread_id, user_id=user_id).first():
+                    LOGGER.warning(f"Thread {thread_id} not found for user {user_id}")
                     return None
-
-                # Cap at max_messages (keep the last N, ensuring we start with user)
+                messages = session.query(BedrockMessage)\
+                    .filter(BedrockMessage.thread_id == thread_id,
+                            BedrockMessage.message_index > message_index)\
+                    .order_by(BedrockMessage.message_index.asc())\
+                    .all()
+                history = _conversation_history(messages, len(messages)) or []
                 if len(history) > max_messages:
-                    history = history[-max_messages:]
-                    # If truncation leaves a leading assistant, drop it
-                    if history and history[0]['role'] == 'assistant':
-                        history.pop(0)
-
-                if not history:
                     return None
-
-                LOGGER.info(f"Built cross-agent conversation history for thread {thread_id}: "
-                           f"{len(history)} messages (current_agent={current_agent_id})")
                 return history
 
         except Exception as e:
-            LOGGER.warning(f"Failed to build cross-agent conversation history for thread {thread_id}: {e}")
+            LOGGER.warning(f"Failed to build conversation history for thread {thread_id}: {e}")
             return None
 
     def list_sessions(self, max_results=100):
@@ -8,15 +8,19 @@ Supports both 'direct' mode (5-file limit) and 'knowledge_base' mode (unlimited)
 import os
 import uuid
 import json
-import time
-from typing import Optional, List, Dict, Any
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Callable, Optional, List, Dict, Any
 from bondable.bond.providers.vectorstores import VectorStoresProvider
 import logging
 from typing_extensions import override
 from bondable.bond.providers.bedrock.BedrockMetadata import BedrockVectorStoreFile, KnowledgeBaseFile
+from bondable.bond.providers.bedrock.BedrockIngestion import IngestionMonitor
 
 LOGGER = logging.getLogger(__name__)
 
+# delete_objects accepts at most 1000 keys per request
+S3_DELETE_BATCH_SIZE = 1000
+
 
 class BedrockVectorStoresProvider(VectorStoresProvider):
     """
@@ -42,9 +46,12 @@ class BedrockVectorStoresProvider(VectorStoresProvider):
         self.data_source_id = os.getenv('BEDROCK_KB_DATA_SOURCE_ID', '')
         self.kb_s3_prefix = os.getenv('BEDROCK_KB_S3_PREFIX', 'knowledge-base/')
         self.s3_bucket_name = os.getenv('S3_BUCKET_NAME', '')
+        self._bucket_regions: Dict[str, str] = {}
 
         # KB is enabled if we have a knowledge base ID
         self.kb_enabled = bool(self.knowledge_base_id)
+        # Polls started ingestion jobs in the background; its thread starts on first use
+        self.ingestion_monitor = IngestionMonitor(self)
 
         if self.kb_enabled:
             LOGGER.info(f"Initialized BedrockVectorStoresProvider with Knowledge Base: {self.knowledge_base_id}")
@@ -86,6 +93,94 @@ class BedrockVectorStoresProvider(VectorStoresProvider):
         """
         LOGGER.debug(f"[KB VectorStore] upload_file_to_knowledge_base called for file_id={file_id}, agent_id={agent_id}, file_name={file_name}")
 
+        def put_file(s3_key: str) -> None:
+            self.s3_client.put_object(
+                Bucket=self.s3_bucket_name,
+                Key=s3_key,
+                Body=file_bytes,
+                ContentType=mime_type
+            )
+
+        return self._store_kb_file(file_id, agent_id, file_name, put_file)
+
+    def copy_file_to_knowledge_base(
+        self,
+        file_id: str,
+        agent_id: str,
+        source_bucket: str,
+        source_key: str,
+        file_name: str,
+        mime_type: str
+    ) -> Optional[str]:
+        """
+        Copy a file already stored in S3 into the Knowledge Base prefix.
+
+        The copy happens inside S3 (multipart for large objects), so the content
+        never passes through this process. Cross-region sources fall back to a
+        download and upload.
+
+        Args:
+            file_id: The file ID from the files table
+            agent_id: The agent ID this file belongs to
+            source_bucket: Bucket holding the original file
+            source_key: Key of the original file
+            file_name: Original file name
+            mime_type: MIME type of the file
+
+        Returns:
+            S3 key of the copied file, or None if failed
+        """
+        if not self._same_region(source_bucket):
+            LOGGER.debug(f"[KB VectorStore] {source_bucket} is in another region, copying {file_id} through this process")
+            try:
+                response = self.s3_client.get_object(Bucket=source_bucket, Key=source_key)
+                file_bytes = response['Body'].read()
+            except Exception as e:
+                LOGGER.error(f"Error reading {file_id} for Knowledge Base upload: {e}", exc_info=True)
+                return None
+            return self.upload_file_to_knowledge_base(file_id, agent_id, file_bytes, file_name, mime_type)
+
+        def copy_file(s3_key: str) -> None:
+            # Managed copy: a single CopyObject below the multipart threshold, UploadPartCopy above it
+            self.s3_client.copy(
+                CopySource={'Bucket': source_bucket, 'Key': source_key},
+                Bucket=self.s3_bucket_name,
+                Key=s3_key,
+                ExtraArgs={'ContentType': mime_type, 'MetadataDirective': 'REPLACE'}
+            )
+
+        return self._store_kb_file(file_id, agent_id, file_name, copy_file)
+
+    def _same_region(self, source_bucket: str) -> bool:
+        """Whether source_bucket is in the KB bucket's region. Lookups are cached per bucket."""
+        if source_bucket == self.s3_bucket_name:
+            return True
+        cached = self._bucket_regions.get(source_bucket)
+        if cached is None:
+            try:
+                # get_bucket_location reports us-east-1 as None
+                location = self.s3_client.get_bucket_location(Bucket=source_bucket).get('LocationConstraint')
+                cached = location or 'us-east-1'
+            except Exception as e:
+                LOGGER.warning(f"[KB VectorStore] Could not look up region of bucket {source_bucket}: {e}")
+                return False
+            self._bucket_regions[source_bucket] = cached
+        return cached == (self.s3_client.meta.region_name or 'us-east-1')
+
+    def _store_kb_file(
+        self,
+        file_id: str,
+        agent_id: str,
+        file_name: str,
+        write_file: Callable[[str], None]
+    ) -> Optional[str]:
+        """
+        Write a file under the KB prefix with its metadata sidecar and track it.
+
+        write_file(s3_key) puts the file content at s3_key; this method handles
+        the key layout, the metadata.json Bedrock filters on, and the
+        KnowledgeBaseFile record.
+        """
         if not self.is_kb_enabled():
             LOGGER.warning("[KB VectorStore] Knowledge Base not enabled, cannot upload file")
             return None
@@ -96,20 +191,26 @@ class BedrockVectorStoresProvider(VectorStoresProvider):
 
         LOGGER.debug(f"[KB VectorStore] Using bucket: {self.s3_bucket_name}, KB prefix: {self.kb_s3_prefix}")
 
+        # Check if record already exists (defensive - caller should check first)
+        session = self.metadata.get_db_session()
+        try:
+            existing = session.query(KnowledgeBaseFile.s3_key).filter(
+                KnowledgeBaseFile.file_id == file_id,
+                KnowledgeBaseFile.agent_id == agent_id
+            ).first()
+        finally:
+            session.close()
+        if existing:
+            LOGGER.debug(f"KnowledgeBaseFile already exists for file {file_id}, agent {agent_id} - returning existing S3 key")
+            return existing.s3_key
+
         try:
             # Create S3 key: knowledge-base/{agent_id}/{uuid}/{filename}
             file_uuid = str(uuid.uuid4())
             s3_key = f"{self.kb_s3_prefix}{agent_id}/{file_uuid}/{file_name}"
-            LOGGER.debug(f"[KB VectorStore] Uploading to S3 key: {s3_key}")
-
-            # Upload file to S3
-            self.s3_client.put_object(
-                Bucket=self.s3_bucket_name,
-                Key=s3_key,
-                Body=file_bytes,
-                ContentType=mime_type
-            )
-            LOGGER.debug(f"[KB VectorStore] SUCCESS - Uploaded file to S3: s3://{self.s3_bucket_name}/{s3_key}")
+            LOGGER.debug(f"[KB VectorStore] Writing to S3 key: {s3_key}")
+            write_file(s3_key)
+            LOGGER.debug(f"[KB VectorStore] SUCCESS - Wrote file to S3: s3://{self.s3_bucket_name}/{s3_key}")
 
             # Create metadata.json for filtering (required by Bedrock KB)
             # IMPORTANT: Only include attributes that have corresponding columns in Aurora
@@ -122,50 +223,36 @@ class BedrockVectorStoresProvider(VectorStoresProvider):
                     "file_name": file_name
                 }
             }
-            metadata_key = f"{self.kb_s3_prefix}{agent_id}/{file_uuid}/{file_name}.metadata.json"
+            metadata_key = f"{s3_key}.metadata.json"
             LOGGER.debug(f"[KB VectorStore] Uploading metadata to: {metadata_key}")
-            LOGGER.debug(f"[KB VectorStore] Metadata content: {json.dumps(metadata)}")
             self.s3_client.put_object(
                 Bucket=self.s3_bucket_name,
                 Key=metadata_key,
                 Body=json.dumps(metadata),
                 ContentType='application/json'
             )
-            LOGGER.debug(f"[KB VectorStore] SUCCESS - Uploaded metadata to S3: s3://{self.s3_bucket_name}/{metadata_key}")
-
-            # Track in KnowledgeBaseFile table
-            session = self.metadata.get_db_session()
-            try:
-                # Check if record already exists (defensive - caller should check first)
-                existing = session.query(KnowledgeBaseFile).filter(
-                    KnowledgeBaseFile.file_id == file_id,
-                    KnowledgeBaseFile.agent_id == agent_id
-                ).first()
-                if existing:
-                    LOGGER.debug(f"KnowledgeBaseFile already exists for file {file_id}, agent {agent_id} - returning existing S3 key")
-                    return existing.s3_key
-
-                kb_file = KnowledgeBaseFile(
-                    file_id=file_id,
-                    agent_id=agent_id,
-                    s3_key=s3_key,
-                    ingestion_status='pending'
-                )
-                session.add(kb_file)
-                session.commit()
-                LOGGER.info(f"Created KnowledgeBaseFile record for file {file_id}")
-            except Exception as e:
-                session.rollback()
-                LOGGER.error(f"Error creating KnowledgeBaseFile record: {e}")
-                raise
-            finally:
-                session.close()
+        except Exception as e:
+            LOGGER.error(f"Error uploading file to Knowledge Base: {e}", exc_info=True)
+            return None
 
+        # Track in KnowledgeBaseFile table
+        session = self.metadata.get_db_session()
+        try:
+            session.add(KnowledgeBaseFile(
+                file_id=file_id,
+                agent_id=agent_id,
+                s3_key=s3_key,
+                ingestion_status='pending'
+            ))
+            session.commit()
+            LOGGER.info(f"Created KnowledgeBaseFile record for file {file_id}")
             return s3_key
-
         except Exception as e:
-            LOGGER.error(f"Error uploading file to Knowledge Base: {e}", exc_info=True)
+            session.rollback()
+            LOGGER.error(f"Error creating KnowledgeBaseFile record: {e}")
             return None
+        finally:
+            session.close()
 
     def trigger_ingestion_job(
         self,
@@ -235,12 +322,15 @@ class BedrockVectorStoresProvider(VectorStoresProvider):
                 finally:
                     session.close()
 
+            # The monitor records the final status on the KnowledgeBaseFile rows
+            future = self.ingestion_monitor.track(job_id)
+
             # Return immediately if not waiting
             if not wait_for_completion:
                 return {'job_id': job_id, 'status': status}
 
             # Wait for completion and return full result with stats
-            return self.wait_for_ingestion_job(job_id, timeout_seconds)
+            return self._wait_for_future(job_id, future, timeout_seconds)
 
         except Exception as e:
             LOGGER.error(f"Error starting ingestion job: {e}", exc_info=True)
@@ -295,19 +385,29 @@ class BedrockVectorStoresProvider(VectorStoresProvider):
             for reason in result['failure_reasons']:
                 LOGGER.error(f"  Failure: {reason}")
 
+    def track_ingestion_job(self, job_id: str) -> Future:
+        """
+        Get a Future that resolves to the job's final status dict.
+
+        Polling happens on the ingestion monitor thread. Async callers can
+        await asyncio.wrap_future(...) instead of blocking.
+        """
+        return self.ingestion_monitor.track(job_id)
+
     def wait_for_ingestion_job(
         self,
         job_id: str,
-        timeout_seconds: int = 600,
-        poll_interval_seconds: int = 10
+        timeout_seconds: int = 600
     ) -> Optional[Dict[str, Any]]:
         """
-        Wait for an ingestion job to complete by polling.
+        Wait for an ingestion job to complete.
+
+        Blocks on the ingestion monitor's Future for the job; this thread never
+        polls Bedrock itself.
 
         Args:
             job_id: The ingestion job ID
             timeout_seconds: Maximum time to wait (default 10 minutes)
-            poll_interval_seconds: Time between status checks
 
         Returns:
             Final job status dict with statistics, or None if timeout/error
@@ -316,46 +416,15 @@ class BedrockVectorStoresProvider(VectorStoresProvider):
             LOGGER.error("Bedrock agent client not available")
             return None
 
-        start_time = time.time()
-        terminal_states = {'COMPLETE', 'FAILED', 'STOPPED'}
-
         LOGGER.info(f"Waiting for ingestion job {job_id} to complete (timeout: {timeout_seconds}s)...")
+        return self._wait_for_future(job_id, self.ingestion_monitor.track(job_id), timeout_seconds)
 
-        while True:
-            elapsed = time.time() - start_time
-            if elapsed > timeout_seconds:
-                LOGGER.warning(f"Ingestion job {job_id} timed out after {timeout_seconds}s")
-                return None
-
-            try:
-                response = self.bedrock_agent_client.get_ingestion_job(
-                    knowledgeBaseId=self.knowledge_base_id,
-                    dataSourceId=self.data_source_id,
-                    ingestionJobId=job_id
-                )
-
-                job = response.get('ingestionJob', {})
-                status = job.get('status')
-
-                LOGGER.debug(f"Ingestion job {job_id} status: {status} (elapsed: {int(elapsed)}s)")
-
-                if status in terminal_states:
-                    result = {
-                        'job_id': job.get('ingestionJobId'),
-                        'status': status,
-                        'statistics': job.get('statistics', {}),
-                        'failure_reasons': job.get('failureReasons', []),
-                        'started_at': job.get('startedAt'),
-                        'updated_at': job.get('updatedAt')
-                    }
-                    self._log_ingestion_results(result)
-                    return result
-
-                time.sleep(poll_interval_seconds)
-
-            except Exception as e:
-                LOGGER.error(f"Error polling ingestion job status: {e}")
-                return None
+    def _wait_for_future(self, job_id: str, future: Future, timeout_seconds: int) -> Optional[Dict[str, Any]]:
+        try:
+            return future.result(timeout=timeout_seconds)
+        except FutureTimeoutError:
+            LOGGER.warning(f"Ingestion job {job_id} timed out after {timeout_seconds}s")
+            return None
 
     def query_knowledge_base(
         self,
@@ -430,10 +499,6 @@ class BedrockVectorStoresProvider(VectorStoresProvider):
         """
         Remove a file from the Knowledge Base.
 
-        This method:
-        1. Deletes the S3 objects (file + metadata)
-        2. Removes the tracking record from our database
-
         The actual KB removal happens when start_ingestion_job runs - it detects
         that the S3 file is gone and removes it from the vector store (incremental sync).
 
@@ -444,57 +509,78 @@ class BedrockVectorStoresProvider(VectorStoresProvider):
         Returns:
             True if successful, False otherwise
         """
+        return self.remove_files_from_knowledge_base([file_id], agent_id) is not None
+
+    def remove_files_from_knowledge_base(self, file_ids: List[str], agent_id: str) -> Optional[int]:
+        """
+        Remove several files from an agent's Knowledge Base.
+
+        Deletes the S3 objects (file + metadata) with batched delete_objects calls,
+        then removes the tracking records in one statement. As with
+        remove_file_from_knowledge_base, the vectors go away on the next ingestion.
+
+        Args:
+            file_ids: The file IDs to remove
+            agent_id: The agent ID
+
+        Returns:
+            Number of tracking records removed, or None on failure
+        """
         if not self.is_kb_enabled():
             LOGGER.warning("Knowledge Base not enabled")
-            return False
+            return None
+        if not file_ids:
+            return 0
 
         session = self.metadata.get_db_session()
         try:
-            # Get the KB file record
-            kb_file = session.query(KnowledgeBaseFile).filter(
-                KnowledgeBaseFile.file_id == file_id,
-                KnowledgeBaseFile.agent_id == agent_id
-            ).first()
-
-            if not kb_file:
-                LOGGER.warning(f"KnowledgeBaseFile not found for file {file_id}, agent {agent_id}")
-                return True  # Already removed
-
-            s3_key = kb_file.s3_key
+            kb_files = session.query(KnowledgeBaseFile.id, KnowledgeBaseFile.s3_key).filter(
+                KnowledgeBaseFile.agent_id == agent_id,
+                KnowledgeBaseFile.file_id.in_(list(file_ids))
+            ).all()
+            if not kb_files:
+                LOGGER.warning(f"No KnowledgeBaseFile records found for {len(file_ids)} files, agent {agent_id}")
+                return 0  # Already removed
 
             # Step 1: Delete from S3 (this triggers removal from KB on next ingestion sync)
             if self.s3_client and self.s3_bucket_name:
-                try:
-                    # Delete the file
-                    self.s3_client.delete_object(
-                        Bucket=self.s3_bucket_name,
-                        Key=s3_key
-                    )
-                    # Delete the metadata file
-                    metadata_key = f"{s3_key}.metadata.json"
-                    self.s3_client.delete_object(
-                        Bucket=self.s3_bucket_name,
-                        Key=metadata_key
-                    )
-                    LOGGER.info(f"Deleted S3 objects: {s3_key}")
-                except Exception as e:
-                    LOGGER.error(f"Error deleting S3 objects: {e}")
-                    # Continue to delete DB record anyway
+                keys = []
+                for kb_file in kb_files:
+                    keys.append(kb_file.s3_key)
+                    keys.append(f"{kb_file.s3_key}.metadata.json")
+                self._delete_s3_keys(keys)
 
             # Step 2: Delete from our database
-            session.delete(kb_file)
+            session.query(KnowledgeBaseFile).filter(
+                KnowledgeBaseFile.id.in_([kb_file.id for kb_file in kb_files])
+            ).delete(synchronize_session=False)
             session.commit()
-            LOGGER.info(f"Removed KnowledgeBaseFile record for file {file_id}")
-
-            return True
+            LOGGER.info(f"Removed {len(kb_files)} KnowledgeBaseFile records for agent {agent_id}")
+            return len(kb_files)
 
         except Exception as e:
             session.rollback()
-            LOGGER.error(f"Error removing file from Knowledge Base: {e}", exc_info=True)
-            return False
+            LOGGER.error(f"Error removing files from Knowledge Base: {e}", exc_info=True)
+            return None
         finally:
             session.close()
 
+    def _delete_s3_keys(self, keys: List[str]) -> None:
+        """Delete keys from the KB bucket, 1000 per delete_objects call. Errors are logged, not raised."""
+        for start in range(0, len(keys), S3_DELETE_BATCH_SIZE):
+            batch = keys[start:start + S3_DELETE_BATCH_SIZE]
+            try:
+                response = self.s3_client.delete_objects(
+                    Bucket=self.s3_bucket_name,
+                    Delete={'Objects': [{'Key': key} for key in batch], 'Quiet': True}
+                )
+                for error in response.get('Errors', []):
+                    LOGGER.error(f"Error deleting S3 object {error.get('Key')}: {error.get('Message')}")
+                LOGGER.info(f"Deleted {len(batch)} S3 objects from {self.s3_bucket_name}")
+            except Exception as e:
+                LOGGER.error(f"Error deleting S3 objects: {e}")
+                # Continue to delete DB records anyway
+
     def get_agent_kb_files(self, agent_id: str) -> List[Dict[str, Any]]:
         """
         Get all Knowledge Base files for an agent.
@@ -15,6 +15,7 @@ import ipaddress
 import json
 import logging
 import os
+import threading
 from typing import Dict, Any, List, Set
 from urllib.parse import urlparse
 
@@ -24,15 +25,6 @@ LOGGER = logging.getLogger(__name__)
 # Constants
 # =============================================================================
 
-# Explicit timeout configuration for trafilatura URL fetching
-def _create_trafilatura_config():
-    from trafilatura.settings import use_config
-    config = use_config()
-    config.set("DEFAULT", "DOWNLOAD_TIMEOUT", "30")
-    return config
-
-_TRAFILATURA_CONFIG = _create_trafilatura_config()
-
 # Special 6-character "hash" for common tools (matches the /b.{hash6}.{tool} format)
 # This is NOT a real hash - it's a reserved identifier that won't collide with
 # actual server name hashes (which are hex characters only: 0-9, a-f)
@@ -246,6 +238,21 @@ def _parse_urls(urls_param: str) -> List[str]:
     return [u.strip() for u in urls_param.split(',') if u.strip()]
 
 
+_url_fetcher = None
+_url_fetcher_lock = threading.Lock()
+
+
+def _get_url_fetcher():
+    """Process-wide UrlFetcher, so connection pools, worker threads and the cache are shared."""
+    global _url_fetcher
+    if _url_fetcher is None:
+        with _url_fetcher_lock:
+            if _url_fetcher is None:
+                from bondable.bond.providers.bedrock.web_fetch import UrlFetcher
+                _url_fetcher = UrlFetcher.from_env(is_blocked=_is_internal_url)
+    return _url_fetcher
+
+
 def _handle_fetch_urls(parameters: Dict[str, Any]) -> Dict[str, Any]:
     """
     Fetch URLs and return their content as markdown.
@@ -256,8 +263,6 @@ def _handle_fetch_urls(parameters: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Dict with 'success' and 'result' keys
     """
-    import trafilatura
-
     urls_param = parameters.get('urls', '')
     urls = _parse_urls(urls_param)
 
@@ -284,34 +289,27 @@ def _handle_fetch_urls(parameters: Dict[str, Any]) -> Dict[str, Any]:
         valid_urls = valid_urls[:5]
         truncated = True
 
-    # Fetch each URL
+    # Fetch concurrently; results come back in input order
     results_parts = []
-    for url in valid_urls:
-        try:
-            html = trafilatura.fetch_url(url, config=_TRAFILATURA_CONFIG)
-            if html is None:
-                results_parts.append(f"## {url}\n\n*Error: Could not fetch URL (network error or URL not accessible)*\n")
-                continue
-
-            content = trafilatura.extract(
-                html,
-                output_format="markdown",
-                include_links=True
-            )
-
-            if content is None or not content.strip():
-                results_parts.append(f"## {url}\n\n*No extractable content found on this page.*\n")
-                continue
+    for fetched in _get_url_fetcher().fetch_all(valid_urls):
+        url = fetched.url
+        if fetched.fetch_error is not None:
+            results_parts.append(f"## {url}\n\n*Error: Could not fetch URL ({fetched.fetch_error})*\n")
+            continue
+        if fetched.extract_error is not None:
+            results_parts.append(f"## {url}\n\n*Error fetching URL: {fetched.extract_error}*\n")
+            continue
 
-            # Truncate if needed
-            if len(content) > MAX_CONTENT_PER_URL:
-                content = content[:MAX_CONTENT_PER_URL] + "\n\n*[Content truncated due to length]*"
+        content = fetched.content
+        if not content or not content.strip():
+            results_parts.append(f"## {url}\n\n*No extractable content found on this page.*\n")
+            continue
 
-            results_parts.append(f"## {url}\n\n{content}\n")
+        # Truncate if needed
+        if len(content) > MAX_CONTENT_PER_URL:
+            content = content[:MAX_CONTENT_PER_URL] + "\n\n*[Content truncated due to length]*"
 
-        except Exception as e:
-            LOGGER.warning(f"[Common Tools] Error fetching URL {url}: {e}")
-            results_parts.append(f"## {url}\n\n*Error fetching URL: {e}*\n")
+        results_parts.append(f"## {url}\n\n{content}\n")
 
     markdown = "\n---\n\n".join(results_parts)
     if truncated:
@@ -320,6 +318,21 @@ def _handle_fetch_urls(parameters: Dict[str, Any]) -> Dict[str, Any]:
     return {"success": True, "result": markdown}
 
 
+_web_searcher = None
+_web_searcher_lock = threading.Lock()
+
+
+def _get_web_searcher():
+    """Process-wide WebSearcher, so the result cache and rate limit are shared by all chats."""
+    global _web_searcher
+    if _web_searcher is None:
+        with _web_searcher_lock:
+            if _web_searcher is None:
+                from bondable.bond.providers.bedrock.web_search import WebSearcher
+                _web_searcher = WebSearcher.from_env()
+    return _web_searcher
+
+
 def _handle_web_search(parameters: Dict[str, Any]) -> Dict[str, Any]:
     """
     Search the web using DuckDuckGo.
@@ -330,8 +343,7 @@ def _handle_web_search(parameters: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Dict with 'success' and 'result' keys
     """
-    from duckduckgo_search import DDGS
-    from duckduckgo_search.exceptions import RatelimitException
+    from bondable.bond.providers.bedrock.web_search import SearchRateLimitError
 
     query = parameters.get('query', '').strip()
     if not query:
@@ -345,7 +357,8 @@ def _handle_web_search(parameters: Dict[str, Any]) -> Dict[str, Any]:
     max_results = max(1, min(max_results, 10))
 
     try:
-        results = DDGS().text(query, max_results=max_results)
+        # Cached and coalesced per normalized query; see web_search.py
+        results = _get_web_searcher().search(query, max_results)
 
         if not results:
             return {"success": True, "result": f"No search results found for: {query}"}
@@ -361,8 +374,8 @@ def _handle_web_search(parameters: Dict[str, Any]) -> Dict[str, Any]:
         markdown = "\n\n".join(parts)
         return {"success": True, "result": markdown}
 
-    except RatelimitException:
-        LOGGER.warning("[Common Tools] DuckDuckGo rate limit reached")
+    except SearchRateLimitError:
+        LOGGER.warning("[Common Tools] Web search rate limit reached")
         return {"success": False, "error": "Web search rate limit reached. Please try again in a moment."}
     except Exception as e:
         LOGGER.exception(f"[Common Tools] Web search error: {e}")
@@ -0,0 +1,331 @@
+"""
+Concurrent, cached URL fetching for the fetch_urls common tool.
+
+UrlFetcher downloads a batch of URLs on a shared thread pool. Connections go
+through one urllib3 PoolManager whose per-host pools block when full, so no
+host gets more than COMMON_TOOLS_FETCH_PER_HOST connections from this
+process however many tool calls run at once. Text extraction (trafilatura)
+runs on a separate bounded pool with a timeout, so one huge page cannot hold
+a chat turn for longer than COMMON_TOOLS_EXTRACT_TIMEOUT_SECONDS.
+
+Extracted text is cached in a local SQLite file (UrlCache), keyed by URL and
+extraction settings. Fresh entries are served without any request; stale
+entries with an ETag or Last-Modified are revalidated with a conditional GET
+and reused on 304. The cache is size-bounded and evicts least recently used
+entries.
+
+    COMMON_TOOLS_FETCH_CONCURRENCY         Concurrent downloads per process (default 8)
+    COMMON_TOOLS_FETCH_PER_HOST            Connections per host (default 2)
+    COMMON_TOOLS_FETCH_TIMEOUT_SECONDS     Connect/read timeout (default 30)
+    COMMON_TOOLS_FETCH_MAX_BYTES           Bytes read per page before truncating (default 5 MB)
+    COMMON_TOOLS_EXTRACT_WORKERS           Extraction threads (default 2)
+    COMMON_TOOLS_EXTRACT_TIMEOUT_SECONDS   Per-page extraction timeout (default 20)
+    URL_CACHE_ENABLED                      Set to false to disable the cache (default true)
+    URL_CACHE_PATH                         SQLite file (default <tmp>/bond-url-cache.sqlite3)
+    URL_CACHE_MAX_MB                       Cache size limit (default 100)
+    URL_CACHE_TTL_SECONDS                  Freshness when the response sets no max-age (default 900)
+"""
+
+import concurrent.futures
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+from urllib.parse import urljoin
+
+import urllib3
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_FETCH_CONCURRENCY = 8
+DEFAULT_FETCH_PER_HOST = 2
+DEFAULT_FETCH_TIMEOUT_SECONDS = 30
+DEFAULT_FETCH_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_EXTRACT_WORKERS = 2
+DEFAULT_EXTRACT_TIMEOUT_SECONDS = 20
+DEFAULT_CACHE_MAX_MB = 100
+DEFAULT_CACHE_TTL_SECONDS = 900
+# Upper bound on a server-provided max-age
+MAX_CACHE_TTL_SECONDS = 86400
+MAX_REDIRECTS = 5
+
+# Part of the cache key: entries extracted with other settings are not reused
+EXTRACTION_SETTINGS = {"output_format": "markdown", "include_links": True}
+
+USER_AGENT = "Mozilla/5.0 (compatible; BondAI-fetch/1.0)"
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+@dataclass
+class CacheEntry:
+    content: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+
+@dataclass
+class FetchResult:
+    url: str
+    # Extracted text; "" when the page had no extractable content
+    content: Optional[str] = None
+    # Set when the page could not be downloaded
+    fetch_error: Optional[str] = None
+    # Set when the page was downloaded but extraction failed
+    extract_error: Optional[str] = None
+    from_cache: bool = False
+
+
+def cache_key(url: str) -> str:
+    settings = json.dumps(EXTRACTION_SETTINGS, sort_keys=True)
+    return hashlib.sha256(f"{url}\n{settings}".encode("utf-8")).hexdigest()
+
+
+def _ttl_from_headers(cache_control: Optional[str], default_ttl: int) -> Optional[int]:
+    """Seconds the response may be served without revalidation, or None if it must not be stored."""
+    directives = (cache_control or "").lower()
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0
+    match = _MAX_AGE.search(directives)
+    if match:
+        return min(int(match.group(1)), MAX_CACHE_TTL_SECONDS)
+    return default_ttl
+
+
+class UrlCache:
+    """SQLite-backed store of extracted page text. Safe to share across threads and processes."""
+
+    def __init__(self, path: str, max_bytes: int, default_ttl: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS url_cache ("
+                " key TEXT PRIMARY KEY, url TEXT NOT NULL, content TEXT NOT NULL,"
+                " etag TEXT, last_modified TEXT, expires_at REAL NOT NULL,"
+                " size INTEGER NOT NULL, last_used REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_url_cache_last_used ON url_cache (last_used)")
+
+    @classmethod
+    def from_env(cls) -> Optional["UrlCache"]:
+        if os.getenv("URL_CACHE_ENABLED", "true").lower() != "true":
+            return None
+        path = os.getenv("URL_CACHE_PATH") or os.path.join(tempfile.gettempdir(), "bond-url-cache.sqlite3")
+        try:
+            return cls(
+                path,
+                max_bytes=int(os.environ.get("URL_CACHE_MAX_MB", str(DEFAULT_CACHE_MAX_MB))) * 1024 * 1024,
+                default_ttl=int(os.environ.get("URL_CACHE_TTL_SECONDS", str(DEFAULT_CACHE_TTL_SECONDS))),
+            )
+        except (sqlite3.Error, OSError) as e:
+            LOGGER.warning(f"URL cache disabled, could not open {path}: {e}")
+            return None
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5, isolation_level=None)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT content, etag, last_modified, expires_at FROM url_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row:
+                    conn.execute("UPDATE url_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+        except sqlite3.Error as e:
+            LOGGER.warning(f"URL cache read failed: {e}")
+            return None
+        return CacheEntry(*row) if row else None
+
+    def put(self, key: str, url: str, content: str, etag: Optional[str], last_modified: Optional[str],
+            ttl: int) -> None:
+        # Without validators a stale entry can never be reused, so only keep it while fresh
+        if ttl <= 0 and not (etag or last_modified):
+            return
+        size = len(content.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO url_cache"
+                    " (key, url, content, etag, last_modified, expires_at, size, last_used)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, url, content, etag, last_modified, now + ttl, size, now),
+                )
+                self._evict(conn)
+        except sqlite3.Error as e:
+            LOGGER.warning(f"URL cache write failed: {e}")
+
+    def refresh(self, key: str, ttl: int) -> None:
+        """Extend an entry after a 304 Not Modified."""
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute("UPDATE url_cache SET expires_at = ?, last_used = ? WHERE key = ?",
+                             (now + ttl, now, key))
+        except sqlite3.Error as e:
+            LOGGER.warning(f"URL cache refresh failed: {e}")
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM url_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Drop least recently used entries until back under the limit
+        excess = total - self.max_bytes
+        freed = 0
+        doomed = []
+        for key, size in conn.execute("SELECT key, size FROM url_cache ORDER BY last_used"):
+            doomed.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM url_cache WHERE key = ?", doomed)
+
+
+@dataclass
+class _Download:
+    status: int
+    body: bytes = b""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    cache_control: Optional[str] = None
+
+
+class UrlFetcher:
+    """Fetches and extracts a batch of URLs concurrently, through the cache when one is configured."""
+
+    def __init__(self, is_blocked: Callable[[str], bool], cache: Optional[UrlCache] = None,
+                 concurrency: int = DEFAULT_FETCH_CONCURRENCY, per_host: int = DEFAULT_FETCH_PER_HOST,
+                 timeout: float = DEFAULT_FETCH_TIMEOUT_SECONDS, max_bytes: int = DEFAULT_FETCH_MAX_BYTES,
+                 extract_workers: int = DEFAULT_EXTRACT_WORKERS,
+                 extract_timeout: float = DEFAULT_EXTRACT_TIMEOUT_SECONDS):
+        self.is_blocked = is_blocked
+        self.cache = cache
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.extract_timeout = extract_timeout
+        self._http = urllib3.PoolManager(
+            num_pools=64, maxsize=per_host, block=True,
+            timeout=urllib3.Timeout(connect=min(timeout, 10), read=timeout),
+            retries=urllib3.Retry(total=1, redirect=False, raise_on_redirect=False),
+            headers={"User-Agent": USER_AGENT, "Accept": "text/html,application/xhtml+xml,*/*;q=0.8"},
+        )
+        self._fetch_pool = concurrent.futures.ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="url-fetch")
+        self._extract_pool = concurrent.futures.ThreadPoolExecutor(max_workers=extract_workers,
+                                                                   thread_name_prefix="url-extract")
+
+    @classmethod
+    def from_env(cls, is_blocked: Callable[[str], bool]) -> "UrlFetcher":
+        return cls(
+            is_blocked,
+            cache=UrlCache.from_env(),
+            concurrency=int(os.environ.get("COMMON_TOOLS_FETCH_CONCURRENCY", str(DEFAULT_FETCH_CONCURRENCY))),
+            per_host=int(os.environ.get("COMMON_TOOLS_FETCH_PER_HOST", str(DEFAULT_FETCH_PER_HOST))),
+            timeout=float(os.environ.get("COMMON_TOOLS_FETCH_TIMEOUT_SECONDS", str(DEFAULT_FETCH_TIMEOUT_SECONDS))),
+            max_bytes=int(os.environ.get("COMMON_TOOLS_FETCH_MAX_BYTES", str(DEFAULT_FETCH_MAX_BYTES))),
+            extract_workers=int(os.environ.get("COMMON_TOOLS_EXTRACT_WORKERS", str(DEFAULT_EXTRACT_WORKERS))),
+            extract_timeout=float(os.environ.get("COMMON_TOOLS_EXTRACT_TIMEOUT_SECONDS",
+                                                 str(DEFAULT_EXTRACT_TIMEOUT_SECONDS))),
+        )
+
+    def fetch_all(self, urls: List[str]) -> List[FetchResult]:
+        """Fetch every URL concurrently; results are in the order given."""
+        futures = [self._fetch_pool.submit(self.fetch, url) for url in urls]
+        return [future.result() for future in futures]
+
+    def fetch(self, url: str) -> FetchResult:
+        key = cache_key(url)
+        cached = self.cache.get(key) if self.cache else None
+        if cached and cached.fresh:
+            return FetchResult(url, content=cached.content, from_cache=True)
+
+        try:
+            download = self._download(url, cached)
+        except Exception as e:
+            LOGGER.warning(f"[Common Tools] Error fetching URL {url}: {e}")
+            return FetchResult(url, fetch_error=str(e))
+
+        ttl = _ttl_from_headers(download.cache_control, self.cache.default_ttl) if self.cache else None
+        if download.status == 304 and cached:
+            self.cache.refresh(key, ttl or 0)
+            return FetchResult(url, content=cached.content, from_cache=True)
+        if download.status != 200:
+            return FetchResult(url, fetch_error=f"HTTP {download.status}")
+
+        try:
+            content = self._extract_pool.submit(_extract, download.body).result(timeout=self.extract_timeout)
+        except concurrent.futures.TimeoutError:
+            LOGGER.warning(f"[Common Tools] Extraction timed out after {self.extract_timeout}s for {url}")
+            return FetchResult(url, extract_error=f"extraction timed out after {self.extract_timeout:g}s")
+        except Exception as e:
+            LOGGER.warning(f"[Common Tools] Error extracting URL {url}: {e}")
+            return FetchResult(url, extract_error=str(e))
+
+        content = content or ""
+        if self.cache and ttl is not None:
+            self.cache.put(key, url, content, download.etag, download.last_modified, ttl)
+        return FetchResult(url, content=content)
+
+    def _download(self, url: str, cached: Optional[CacheEntry]) -> _Download:
+        headers = {}
+        if cached and cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached and cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+
+        for _ in range(MAX_REDIRECTS + 1):
+            response = self._http.request("GET", url, headers=headers, preload_content=False,
+                                          redirect=False, pool_timeout=self.timeout)
+            fully_read = False
+            try:
+                location = response.headers.get("Location")
+                if response.status in (301, 302, 303, 307, 308) and location:
+                    url = urljoin(url, location)
+                    fully_read = response.length_remaining == 0
+                    # Every hop is checked, so a public URL cannot redirect to an internal one
+                    if not url.startswith(("http://", "https://")) or self.is_blocked(url):
+                        raise ValueError(f"redirect to a disallowed URL: {url}")
+                    continue
+                body = response.read(self.max_bytes) if response.status == 200 else b""
+                fully_read = response.length_remaining == 0 or (
+                    response.status == 200 and len(body) < self.max_bytes)
+                return _Download(
+                    status=response.status,
+                    body=body,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                    cache_control=response.headers.get("Cache-Control"),
+                )
+            finally:
+                if fully_read:
+                    # Nothing left to read; this just finishes the response so the connection can be reused
+                    response.drain_conn()
+                else:
+                    # Draining a truncated or unread body would download it in full
+                    # just to reuse the socket; drop the connection instead
+                    response.close()
+                response.release_conn()
+        raise ValueError(f"too many redirects (more than {MAX_REDIRECTS})")
+
+
+def _extract(html: bytes) -> Optional[str]:
+    import trafilatura
+    return trafilatura.extract(html, **EXTRACTION_SETTINGS)
@@ -0,0 +1,159 @@
+"""
+Cached, rate-limited web search for the web_search common tool.
+
+Agents often repeat a query within a conversation, and concurrent users often
+search for the same thing. WebSearcher keeps recent results in a cache
+namespace (bondable.bond.cache), keyed by backend, normalized query, region
+and result count, which also coalesces concurrent identical searches into one
+backend call (single-flight): the first caller searches, the others wait for
+its result. When BOND_CACHE_SHARED_DB_URL is set, results are shared with the
+other workers too.
+
+Calls to the backend go through a token bucket so bursts are smoothed out
+instead of tripping the provider's throttling. When the backend does report
+throttling, it is left alone for a cooldown period and callers get a rate
+limit error straight away.
+
+    WEB_SEARCH_CACHE_TTL_SECONDS          How long results are reused (default 600, 0 disables)
+    WEB_SEARCH_CACHE_MAX_ENTRIES          Cached searches kept per process (default 1000)
+    WEB_SEARCH_REGION                     Backend region code, e.g. us-en (default: backend default)
+    WEB_SEARCH_RATE_PER_SECOND            Sustained backend calls per second (default 1)
+    WEB_SEARCH_RATE_BURST                 Calls allowed back to back (default 3)
+    WEB_SEARCH_RATE_MAX_WAIT_SECONDS      Longest a caller waits for its turn (default 5)
+    WEB_SEARCH_RATELIMIT_COOLDOWN_SECONDS Pause after the backend throttles us (default 30)
+"""
+
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+from bondable.bond.cache import CacheNamespace, shared_tier
+
+LOGGER = logging.getLogger(__name__)
+
+SearchResults = List[Dict[str, str]]
+
+
+class SearchRateLimitError(Exception):
+    """The backend throttled us, or the local rate limit could not be met in time."""
+
+
+class SearchBackend(ABC):
+    """A search provider. Subclasses return dicts with 'title', 'body' and 'href'."""
+
+    name = "backend"
+
+    @abstractmethod
+    def search(self, query: str, region: str, max_results: int) -> SearchResults:
+        """Return up to max_results results for query; raise SearchRateLimitError when throttled."""
+
+
+class DuckDuckGoBackend(SearchBackend):
+
+    name = "duckduckgo"
+
+    def search(self, query: str, region: str, max_results: int) -> SearchResults:
+        from duckduckgo_search import DDGS
+        from duckduckgo_search.exceptions import RatelimitException
+
+        kwargs = {"max_results": max_results}
+        if region:
+            kwargs["region"] = region
+        try:
+            return DDGS().text(query, **kwargs) or []
+        except RatelimitException as e:
+            raise SearchRateLimitError(str(e)) from e
+
+
+class RateLimiter:
+    """Token bucket with an optional cooldown, shared by all threads calling one backend."""
+
+    def __init__(self, rate_per_second: float, burst: int, max_wait: float):
+        self.rate = rate_per_second
+        self.burst = max(1, burst)
+        self.max_wait = max_wait
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> bool:
+        """Take a token, waiting up to max_wait. Returns False if none became available in time."""
+        deadline = time.monotonic() + self.max_wait
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now >= self._blocked_until:
+                    self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return True
+                    ready_at = now + (1 - self._tokens) / self.rate if self.rate > 0 else float("inf")
+                else:
+                    ready_at = self._blocked_until
+            if ready_at > deadline:
+                return False
+            time.sleep(max(ready_at - time.monotonic(), 0.001))
+
+    def cooldown(self, seconds: float) -> None:
+        """Hand out no tokens for the given time, e.g. after the backend throttled us."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+            self._updated = self._blocked_until
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+class WebSearcher:
+    """Thread-safe search front end with a TTL/LRU result cache, single-flight and rate limiting."""
+
+    def __init__(self, backend: SearchBackend, region: str = "", ttl_seconds: float = 600,
+                 max_entries: int = 1000, rate_limiter: Optional[RateLimiter] = None,
+                 cooldown_seconds: float = 30, shared: bool = False):
+        self.backend = backend
+        self.region = region
+        self.rate_limiter = rate_limiter or RateLimiter(rate_per_second=1, burst=3, max_wait=5)
+        self.cooldown_seconds = cooldown_seconds
+        self.cache = CacheNamespace("web_search", max_entries=max_entries, ttl_seconds=ttl_seconds,
+                                    shared_tier=shared_tier() if shared else None)
+
+    @classmethod
+    def from_env(cls, backend: Optional[SearchBackend] = None) -> "WebSearcher":
+        return cls(
+            backend or DuckDuckGoBackend(),
+            region=os.getenv("WEB_SEARCH_REGION", ""),
+            ttl_seconds=float(os.environ.get("WEB_SEARCH_CACHE_TTL_SECONDS", "600")),
+            max_entries=int(os.environ.get("WEB_SEARCH_CACHE_MAX_ENTRIES", "1000")),
+            rate_limiter=RateLimiter(
+                rate_per_second=float(os.environ.get("WEB_SEARCH_RATE_PER_SECOND", "1")),
+                burst=int(os.environ.get("WEB_SEARCH_RATE_BURST", "3")),
+                max_wait=float(os.environ.get("WEB_SEARCH_RATE_MAX_WAIT_SECONDS", "5")),
+            ),
+            cooldown_seconds=float(os.environ.get("WEB_SEARCH_RATELIMIT_COOLDOWN_SECONDS", "30")),
+            shared=True,
+        )
+
+    def search(self, query: str, max_results: int) -> SearchResults:
+        key = (self.backend.name, normalize_query(query), self.region, max_results)
+        return list(self.cache.get_or_load(key, lambda: self._search_backend(query, max_results)))
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+    def _search_backend(self, query: str, max_results: int) -> SearchResults:
+        if not self.rate_limiter.acquire():
+            raise SearchRateLimitError(f"local rate limit for {self.backend.name} reached")
+        try:
+            return list(self.backend.search(query, self.region, max_results))
+        except SearchRateLimitError:
+            LOGGER.warning(f"[Common Tools] {self.backend.name} throttled searches; "
+                           f"pausing for {self.cooldown_seconds:g}s")
+            self.rate_limiter.cooldown(self.cooldown_seconds)
+            raise
@@ -141,6 +141,18 @@ class FilesProvider(ABC):
         """
         pass
 
+    def delete_file_resources(self, file_ids: List[str]) -> int:
+        """
+        Deletes many files at once and returns how many were deleted.
+        Providers that can delete in bulk should override this; the default
+        deletes them one at a time.
+        """
+        deleted = 0
+        for file_id in file_ids:
+            if self.delete_file_resource(file_id):
+                deleted += 1
+        return deleted
+
     @abstractmethod
     def create_file_resource(self, file_path: str, file_bytes: io.BytesIO) -> str:
         """
@@ -262,15 +274,33 @@ class FilesProvider(ABC):
                 raise
 
     def delete_files_for_user(self, user_id: str) -> None:
+        """
+        Deletes every file the user owns. Resources are removed in one bulk call
+        and the file records with a single DELETE.
+        """
         with self.metadata.get_db_session() as session:
-            for file_record in session.query(FileRecord).filter(FileRecord.owner_user_id == user_id).all():
-                if file_record.file_id is None:
-                    continue
-                try:
-                    deleted = self.delete_file(file_record.file_id)
-                    LOGGER.info(f"Deleted file with file_id: {file_record.file_id} - Success: {deleted}")
-                except Exception as e:
-                    LOGGER.error(f"Error deleting file with file_id: {file_record.file_id}. Error: {e}")
+            file_ids = [row[0] for row in session.query(FileRecord.file_id).filter(
+                FileRecord.owner_user_id == user_id,
+                FileRecord.file_id.isnot(None)
+            ).distinct().all()]
+            if not file_ids:
+                return
+            try:
+                deleted_resources = self.delete_file_resources(file_ids)
+                LOGGER.info(f"Deleted {deleted_resources} of {len(file_ids)} file resources for user_id: {user_id}")
+            except Exception as e:
+                LOGGER.error(f"Error deleting file resources for user_id: {user_id}. Error: {e}")
+
+            try:
+                # FileRecord.file_id stores the provider_file_id, so drop every record for those files
+                deleted_count = session.query(FileRecord).filter(
+                    FileRecord.file_id.in_(file_ids)
+                ).delete(synchronize_session=False)
+                session.commit()
+                LOGGER.info(f"Deleted {deleted_count} file records for user_id: {user_id}")
+            except Exception as e:
+                session.rollback()
+                LOGGER.error(f"Error deleting file records for user_id: {user_id}. Error: {e}")
 
 
     def get_file_details(self, file_ids: List[str], user_id: str = None) -> List[FileDetails]:
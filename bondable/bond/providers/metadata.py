@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 
 
-from sqlalchemy import ForeignKey, create_engine, Column, String, DateTime, func, PrimaryKeyConstraint, UniqueConstraint, Boolean, JSON, Integer
+from sqlalchemy import ForeignKey, create_engine, Column, String, DateTime, func, PrimaryKeyConstraint, UniqueConstraint, Boolean, JSON, Integer, Index, false
 from sqlalchemy.orm import sessionmaker, scoped_session, declarative_base
 from sqlalchemy.sql import text
 import logging
@@ -31,7 +31,18 @@ class Thread(Base):
     scheduled_job_id = Column(String, ForeignKey('scheduled_jobs.id', ondelete='SET NULL'), nullable=True, index=True)
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
-    __table_args__ = (PrimaryKeyConstraint('thread_id', 'user_id'),)
+    # Message activity across all users of the thread, maintained as messages are
+    # written so listings don't need to look at the messages table.
+    # has_user_message ignores hidden messages (agent introductions).
+    has_user_message = Column(Boolean, nullable=False, default=False, server_default=false())
+    message_count = Column(Integer, nullable=False, default=0, server_default='0')
+    last_message_at = Column(DateTime, nullable=True)
+    __table_args__ = (
+        PrimaryKeyConstraint('thread_id', 'user_id'),
+        # Match the listing order (updated_at, thread_id) so cursor pages are range scans
+        Index('ix_threads_user_recent', 'user_id', 'updated_at', 'thread_id'),
+        Index('ix_threads_user_active_recent', 'user_id', 'has_user_message', 'updated_at', 'thread_id'),
+    )
 class AgentRecord(Base):
     __tablename__ = "agents"
     agent_id = Column(String, primary_key=True)
@@ -265,6 +276,24 @@ class UserAgentSortOrder(Base):
     __table_args__ = (PrimaryKeyConstraint('user_id', 'agent_id'),)
 
 
+class BackgroundJob(Base):
+    """
+    Status of long-running work (agent provisioning, user offboarding, ...) that runs
+    off the request thread. The row is the status resource clients poll; the work
+    itself runs in the worker process that accepted the request.
+    """
+    __tablename__ = "background_jobs"
+    id = Column(String, primary_key=True, nullable=False)
+    kind = Column(String, nullable=False)  # agent_create | agent_update | ...
+    user_id = Column(String, nullable=False, index=True)  # Soft reference: offboarding outlives the user row
+    subject_id = Column(String, nullable=True, index=True)  # e.g. agent_id, once known
+    status = Column(String, nullable=False, default="PENDING")  # PENDING | <running states> | READY/COMPLETED | FAILED
+    error = Column(String, nullable=True)
+    result = Column(JSON, nullable=True)
+    created_at = Column(DateTime, default=datetime.datetime.now)
+    updated_at = Column(DateTime, default=datetime.datetime.now, onupdate=datetime.datetime.now)
+
+
 # ============================================================================
 # User-Defined MCP Server Configuration
 # ============================================================================
@@ -429,7 +458,20 @@ class Metadata(ABC):
             # Check for extra_config column (migration b7e2d4f1a093)
             mcp_cols = {col['name'] for col in inspector.get_columns('user_mcp_servers')}
             if 'extra_config' in mcp_cols:
-                return "head"
+                # Check for background_jobs table (migration f1a7c3e95d20)
+                if 'background_jobs' in existing_tables:
+                    # Check for activity columns on threads (migration 0b9d6e4c2a71)
+                    thread_cols = {col['name'] for col in inspector.get_columns('threads')}
+                    if 'has_user_message' in thread_cols:
+                        return "0b9d6e4c2a71"
+                    return "f1a7c3e95d20"
+                # Check for description/model on bedrock_agent_options (migration e6f4a0b32c9d)
+                if 'bedrock_agent_options' in existing_tables:
+                    options_cols = {col['name'] for col in inspector.get_columns('bedrock_agent_options')}
+                    if 'model' in options_cols:
+                        return "e6f4a0b32c9d"
+                # Tables created before e6f4a0b32c9d; the upgrade adds the columns
+                return "d5e3f9a21b8c"
             # Has table but not extra_config → at a3f1c8d92b4e
             return "a3f1c8d92b4e"
         # No user_mcp_servers table → at initial schema
@@ -10,7 +10,7 @@ from bondable.bond.providers.agent import Agent, AgentProvider
 from bondable.bond.providers.openai.OAIAMetadata import OAIAMetadata
 from bondable.bond.mcp_client import MCPClient
 from typing_extensions import override
-from typing import List, Dict, Optional, Generator
+from typing import Callable, List, Dict, Optional, Generator
 from openai import OpenAI, AssistantEventHandler, NotFoundError
 from openai.types.beta.assistant import Assistant
 from openai.types.beta.threads import (
@@ -545,10 +545,12 @@ class OAIAAgentProvider(AgentProvider):
 
 
     @override
-    def create_or_update_agent_resource(self, agent_def: AgentDefinition, owner_user_id: str) -> Agent:
+    def create_or_update_agent_resource(self, agent_def: AgentDefinition, owner_user_id: str,
+                                        on_prepare: Optional[Callable[[str], None]] = None) -> Agent:
         """
         Creates a new agent. This method should be implemented by subclasses.
-        Returns the created agent.
+        Returns the created agent. OpenAI assistants have no prepare step, so
+        on_prepare is not called.
         """
         openai_assistant_obj = None # Holds the final OpenAI assistant object
 
@@ -6,6 +6,7 @@ from bondable.bond.providers.agent import AgentProvider
 from bondable.bond.groups import Groups
 from bondable.bond.users import Users
 from bondable.bond.agent_folders import AgentFolders
+from bondable.bond.background_jobs import BackgroundJobs
 import logging
 LOGGER = logging.getLogger(__name__)
 
@@ -18,6 +19,7 @@ class Provider(ABC):
     groups: Groups = None
     users: Users = None
     agent_folders: AgentFolders = None
+    jobs: BackgroundJobs = None
 
     def get_default_model(self) -> str:
         """
@@ -1,13 +1,35 @@
 from abc import ABC, abstractmethod
 from bondable.bond.providers.metadata import Metadata, Thread
+import base64
+import json
 import logging
+import os
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List
-from sqlalchemy import exists, column, table, or_, case, JSON
+from typing import Optional, Dict, List, Tuple
+from sqlalchemy import func, tuple_
 from bondable.bond.broker import BondMessage
 
 LOGGER = logging.getLogger(__name__)
 
+# estimate_thread_count() stops counting past this many threads
+THREAD_COUNT_ESTIMATE_CAP = int(os.environ.get('THREAD_COUNT_ESTIMATE_CAP', '1000'))
+
+
+def encode_thread_cursor(updated_at: datetime, thread_id: str) -> str:
+    """Opaque cursor for the position after a thread in the recency ordering."""
+    raw = json.dumps([updated_at.isoformat(), thread_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_thread_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Inverse of encode_thread_cursor. Raises ValueError for a malformed cursor."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        updated_at, thread_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(updated_at), str(thread_id)
+    except Exception as e:
+        raise ValueError(f"Invalid thread cursor: {cursor!r}") from e
+
 class ThreadsProvider(ABC):
 
     metadata: Metadata = None
@@ -27,6 +49,18 @@ class ThreadsProvider(ABC):
         """
         pass
 
+    def delete_thread_resources(self, thread_ids: List[str]) -> int:
+        """
+        Deletes many thread resources at once and returns how many were deleted.
+        Providers that can delete in bulk should override this; the default
+        deletes them one at a time.
+        """
+        deleted = 0
+        for thread_id in thread_ids:
+            if self.delete_thread_resource(thread_id):
+                deleted += 1
+        return deleted
+
     @abstractmethod
     def create_thread_resource(self) -> str:
         """
@@ -130,67 +164,81 @@ class ThreadsProvider(ABC):
         finally:
             session.close()
 
-    def _user_message_exists_clause(self):
-        """Return an exists() clause checking for visible user messages in bedrock_messages.
-
-        Excludes hidden messages (agent introductions) which have:
-        - message_metadata.hidden == true (bool or string)
-        - message_metadata.override_role == 'system' (legacy)
-        """
-        bm = table('bedrock_messages',
-                    column('thread_id'),
-                    column('role'),
-                    column('message_metadata', JSON))
-
-        # A message is hidden if any of these metadata conditions match.
-        # Use .as_boolean()/.as_string() for cross-database JSON comparison
-        # (SQLite json_extract vs PostgreSQL -> operators).
-        # NULL metadata or missing keys produce NULL comparisons, which
-        # don't match in the CASE, falling through to ELSE True (visible).
-        is_hidden = or_(
-            bm.c.message_metadata['hidden'].as_boolean() == True,
-            bm.c.message_metadata['hidden'].as_string() == 'true',
-            bm.c.message_metadata['override_role'].as_string() == 'system',
-        )
-
-        is_visible = case(
-            (is_hidden, False),
-            else_=True
-        )
-
-        return exists().where(
-            (bm.c.thread_id == Thread.thread_id) &
-            (bm.c.role == 'user') &
-            is_visible
-        )
-
     def _build_threads_query(self, session, user_id: str, exclude_empty: bool = False):
         """Build the base query for threads with optional empty filtering."""
         query = (session.query(Thread.thread_id, Thread.name, Thread.created_at, Thread.updated_at, Thread.last_agent_id)
                     .filter_by(user_id=user_id))
         if exclude_empty:
-            query = query.filter(self._user_message_exists_clause())
+            query = query.filter(Thread.has_user_message == True)
         return query
 
+    @staticmethod
+    def _thread_rows(results) -> list:
+        return [
+            {"thread_id": thread_id, "name": name, "created_at": created_at, "updated_at": updated_at, "last_agent_id": last_agent_id}
+            for thread_id, name, created_at, updated_at, last_agent_id in results
+        ]
+
     def get_current_threads(self, user_id: str, count: int = 20, offset: int = 0, exclude_empty: bool = False) -> list:
+        """Threads by recency (updated_at, then thread_id, descending). Prefer get_threads_page for deep paging."""
         with self.metadata.get_db_session() as session:
             query = self._build_threads_query(session, user_id, exclude_empty)
-            results = (query.order_by(Thread.updated_at.desc(), Thread.created_at.desc())
+            results = (query.order_by(Thread.updated_at.desc(), Thread.thread_id.desc())
                         .offset(offset)
                         .limit(count).all())
-            threads = [
-                {"thread_id": thread_id, "name": name, "created_at": created_at, "updated_at": updated_at, "last_agent_id": last_agent_id}
-                for thread_id, name, created_at, updated_at, last_agent_id in results
-            ]
+            threads = self._thread_rows(results)
             LOGGER.debug(f"Retrieved {len(threads)} threads for user {user_id} (limit: {count}, offset: {offset}, exclude_empty: {exclude_empty}, sorted by updated_at desc)")
             return threads
 
+    def get_threads_page(self, user_id: str, count: int = 20, cursor: Optional[str] = None,
+                         exclude_empty: bool = False) -> Tuple[list, Optional[str]]:
+        """
+        A page of threads in the same order as get_current_threads, starting after
+        cursor (or at the most recent thread). Returns the threads and the cursor
+        of the next page, or None on the last page.
+
+        Each page is a range scan on the user's recency index, so deep pages cost the
+        same as the first, and threads updated while paging are neither repeated nor
+        skipped unless they move across the cursor.
+        Raises ValueError for a malformed cursor.
+        """
+        with self.metadata.get_db_session() as session:
+            query = self._build_threads_query(session, user_id, exclude_empty)
+            if cursor:
+                after_updated_at, after_thread_id = decode_thread_cursor(cursor)
+                query = query.filter(tuple_(Thread.updated_at, Thread.thread_id) < (after_updated_at, after_thread_id))
+            results = (query.order_by(Thread.updated_at.desc(), Thread.thread_id.desc())
+                        .limit(count + 1).all())
+            threads = self._thread_rows(results[:count])
+            next_cursor = None
+            if len(results) > count and threads[-1]["updated_at"] is not None:
+                next_cursor = encode_thread_cursor(threads[-1]["updated_at"], threads[-1]["thread_id"])
+            LOGGER.debug(f"Retrieved {len(threads)} threads for user {user_id} (limit: {count}, cursor: {cursor}, exclude_empty: {exclude_empty})")
+            return threads, next_cursor
+
     def get_thread_count(self, user_id: str, exclude_empty: bool = False) -> int:
         """Get the total count of threads for a user."""
         with self.metadata.get_db_session() as session:
             query = self._build_threads_query(session, user_id, exclude_empty)
             return query.count()
 
+    def estimate_thread_count(self, user_id: str, exclude_empty: bool = False,
+                              cap: Optional[int] = None) -> Tuple[int, bool]:
+        """
+        Count the user's threads, but stop after cap (THREAD_COUNT_ESTIMATE_CAP by
+        default) so the cost is bounded for users with many threads.
+        Returns the count and whether it is exact; a count that hit the cap is a
+        lower bound.
+        """
+        cap = THREAD_COUNT_ESTIMATE_CAP if cap is None else cap
+        with self.metadata.get_db_session() as session:
+            bounded = (self._build_threads_query(session, user_id, exclude_empty)
+                        .with_entities(Thread.thread_id)
+                        .limit(cap + 1)
+                        .subquery())
+            count = session.query(func.count()).select_from(bounded).scalar()
+            return min(count, cap), count <= cap
+
     def get_empty_thread_ids(self, user_id: str, min_age_minutes: int = 0) -> List[str]:
         """Get IDs of threads that have no user messages.
 
@@ -203,7 +251,7 @@ class ThreadsProvider(ABC):
         with self.metadata.get_db_session() as session:
             query = (session.query(Thread.thread_id)
                         .filter_by(user_id=user_id)
-                        .filter(~self._user_message_exists_clause()))
+                        .filter(Thread.has_user_message == False))
             if min_age_minutes > 0:
                 cutoff = datetime.utcnow() - timedelta(minutes=min_age_minutes)
                 query = query.filter(Thread.created_at < cutoff)
@@ -254,6 +302,12 @@ class ThreadsProvider(ABC):
                 # User does not have access yet. Create a new access record.
                 # The `name` will be used if provided; otherwise, the DB default ("New Thread") will apply.
                 new_access_record = Thread(thread_id=thread_id, user_id=user_id, name=name)
+                # Message activity is per thread, so carry it over from another user's record
+                shared = session.query(Thread).filter_by(thread_id=thread_id).first()
+                if shared:
+                    new_access_record.has_user_message = shared.has_user_message
+                    new_access_record.message_count = shared.message_count
+                    new_access_record.last_message_at = shared.last_message_at
                 session.add(new_access_record)
                 session.commit()
                 LOGGER.info(f"Created new thread record in database: thread_id={thread_id}, user_id={user_id}, name='{name or 'New Thread'}'")
@@ -291,14 +345,28 @@ class ThreadsProvider(ABC):
 
 
     def delete_threads_for_user(self, user_id: str) -> None:
-         with self.metadata.get_db_session() as session:
-            for thread_id_tuple in session.query(Thread.thread_id).filter(Thread.user_id == user_id).all():
-                thread_id = thread_id_tuple[0]
-                try:
-                    deleted = self.delete_thread(thread_id=thread_id, user_id=user_id)
-                    LOGGER.info(f"Deleted thread with thread_id: {thread_id} - Success: {deleted}")
-                except Exception as e:
-                    LOGGER.error(f"Error deleting thread with thread_id: {thread_id}. Error: {e}")
+        """
+        Deletes every thread the user has access to, with their resources.
+        Resources are removed in one bulk call and the user's thread records with
+        a single DELETE, rather than one round trip per thread.
+        """
+        with self.metadata.get_db_session() as session:
+            thread_ids = [row[0] for row in session.query(Thread.thread_id).filter(Thread.user_id == user_id).distinct().all()]
+            if not thread_ids:
+                return
+            try:
+                deleted_resources = self.delete_thread_resources(thread_ids)
+                LOGGER.info(f"Deleted {deleted_resources} of {len(thread_ids)} thread resources for user_id: {user_id}")
+            except Exception as e:
+                LOGGER.error(f"Error deleting thread resources for user_id: {user_id}. Error: {e}")
+
+            try:
+                deleted_count = session.query(Thread).filter(Thread.user_id == user_id).delete(synchronize_session=False)
+                session.commit()
+                LOGGER.info(f"Deleted {deleted_count} thread records for user_id: {user_id}")
+            except Exception as e:
+                session.rollback()
+                LOGGER.error(f"Error deleting thread records for user_id: {user_id}. Error: {e}")
 
 
     def get_thread(self, thread_id: str, user_id: str) -> Optional[Thread]:
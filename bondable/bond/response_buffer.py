@@ -0,0 +1,93 @@
+"""
+Append-only text buffer for streamed responses.
+
+Streaming paths used to grow the response with `content += chunk`, which
+copies the whole response on every chunk. ResponseBuffer keeps the chunks in
+a list and joins them only when the full text is needed (persisting the
+message, logging), caching the result until the next append.
+
+It can also watch for a marker such as "bond://forward/" as chunks arrive,
+so callers that only care about text containing the marker (agent
+forwarding) never have to join or regex-scan a response that has none.
+"""
+
+import re
+from typing import List, Optional
+
+
+class ResponseBuffer:
+    """
+    Chunks appended in order; getvalue() returns them joined. Not thread-safe:
+    a buffer belongs to the generator chain of a single response.
+    """
+
+    __slots__ = ("_chunks", "_length", "_marker", "_marker_at", "_tail")
+
+    def __init__(self, initial: str = "", marker: Optional[str] = None):
+        self._chunks: List[str] = []
+        self._length = 0
+        self._marker = marker
+        # Offset of the first marker occurrence, or -1 while none has been seen
+        self._marker_at = -1
+        # Last len(marker) - 1 characters, to catch a marker split across chunks
+        self._tail = ""
+        if initial:
+            self.append(initial)
+
+    def append(self, text: str) -> None:
+        if not text:
+            return
+        if self._marker is not None and self._marker_at < 0:
+            window = self._tail + text
+            found = window.find(self._marker)
+            if found >= 0:
+                self._marker_at = self._length - len(self._tail) + found
+            else:
+                self._tail = window[-(len(self._marker) - 1):] if len(self._marker) > 1 else ""
+        self._chunks.append(text)
+        self._length += len(text)
+
+    def emit(self, text: str) -> str:
+        """Append text and return it, for `yield buffer.emit(text)` in generators."""
+        self.append(text)
+        return text
+
+    def getvalue(self) -> str:
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+        return self._chunks[0] if self._chunks else ""
+
+    def clear(self) -> None:
+        self._chunks = []
+        self._length = 0
+        self._marker_at = -1
+        self._tail = ""
+
+    @property
+    def marker_seen(self) -> bool:
+        return self._marker_at >= 0
+
+    def search(self, pattern: "re.Pattern") -> Optional["re.Match"]:
+        """
+        Search for a markdown link whose target starts with the marker, e.g.
+        [Label](bond://forward/Agent). Returns None without joining the
+        buffer when the marker never appeared. Otherwise the scan starts just
+        after the last ']' before the first marker's "](", since a link
+        label cannot contain ']', so no match can begin earlier.
+        """
+        if self._marker is not None and self._marker_at < 0:
+            return None
+        text = self.getvalue()
+        start = 0
+        if self._marker is not None:
+            start = text.rfind("]", 0, max(self._marker_at - 2, 0)) + 1
+        return pattern.search(text, start)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __bool__(self) -> bool:
+        return self._length > 0
+
+    def __str__(self) -> str:
+        return self.getvalue()
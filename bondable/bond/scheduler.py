@@ -184,13 +184,15 @@ class JobScheduler:
         cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=retention_days)
 
         try:
-            from bondable.bond.providers.bedrock.BedrockMetadata import BedrockMessage
+            from bondable.bond.providers.bedrock.BedrockMetadata import BedrockMessage, refresh_thread_activity
             session = self._metadata.get_db_session()
             try:
-                deleted = session.query(BedrockMessage).filter(
-                    BedrockMessage.created_at < cutoff
-                ).delete()
+                expired = BedrockMessage.created_at < cutoff
+                # Bulk deletes bypass the listener that keeps threads' activity columns current
+                thread_ids = [row.thread_id for row in session.query(BedrockMessage.thread_id).filter(expired).distinct()]
+                deleted = session.query(BedrockMessage).filter(expired).delete(synchronize_session=False)
                 if deleted > 0:
+                    refresh_thread_activity(session, thread_ids)
                     session.commit()
                     LOGGER.info("DATA_RETENTION: Deleted %d messages older than %d days", deleted, retention_days)
                 else:
@@ -0,0 +1,190 @@
+"""
+Opt-in SQL profiler.
+
+When SQL_PROFILING_ENABLED=true, every statement executed while a request is
+being handled is attributed to that request through a context variable, so
+helpers that open their own metadata session are counted too. For each
+request the profiler tracks the statement count and total DB time (reported
+as a Server-Timing header by SqlProfilerMiddleware), flags statements repeated
+often enough to look like an N+1 pattern, and samples slow statements with
+their parameters and the bondable call site into a bounded ring buffer that
+admins can read at GET /metrics/slow-queries.
+
+    SQL_PROFILING_ENABLED         Install the profiler (default false)
+    SQL_SLOW_QUERY_MS             Statements at least this slow are sampled (default 100)
+    SQL_SLOW_QUERY_BUFFER_SIZE    Slow statements kept, newest first (default 200)
+    SQL_N_PLUS_ONE_THRESHOLD      Repeats of one statement in a request that get flagged (default 5)
+"""
+
+import contextvars
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+LOGGER = logging.getLogger(__name__)
+
+MAX_PARAMETERS_CHARS = 500
+MAX_STATEMENT_CHARS = 2000
+_BONDABLE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def profiling_enabled() -> bool:
+    return os.getenv('SQL_PROFILING_ENABLED', 'false').lower() == 'true'
+
+
+class RequestProfile:
+    """SQL activity attributed to one request."""
+
+    def __init__(self, request: str, n_plus_one_threshold: int):
+        self.request = request
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.statements = 0
+        self.seconds = 0.0
+        self.counts: Dict[str, int] = {}
+        # statement -> call site, filled in once a statement crosses the threshold
+        self.repeated: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, seconds: float) -> bool:
+        """Count one statement; returns True the first time it crosses the N+1 threshold."""
+        with self._lock:
+            self.statements += 1
+            self.seconds += seconds
+            count = self.counts.get(statement, 0) + 1
+            self.counts[statement] = count
+            return count == self.n_plus_one_threshold
+
+    def n_plus_one(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                {'statement': statement, 'count': self.counts[statement], 'call_site': call_site}
+                for statement, call_site in self.repeated.items()
+            ]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.seconds * 1000:.1f};desc="{self.statements} queries"'
+
+
+class SqlProfiler:
+    """Engine event listeners plus the slow-query ring buffer."""
+
+    def __init__(self, slow_query_ms: float = 100, buffer_size: int = 200, n_plus_one_threshold: int = 5):
+        self.slow_query_seconds = slow_query_ms / 1000
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self._slow_queries: deque = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+        self._current: contextvars.ContextVar[Optional[RequestProfile]] = contextvars.ContextVar(
+            'bond_sql_profile', default=None)
+        self._installed = False
+
+    @classmethod
+    def from_env(cls) -> 'SqlProfiler':
+        return cls(
+            slow_query_ms=float(os.getenv('SQL_SLOW_QUERY_MS', '100')),
+            buffer_size=int(os.getenv('SQL_SLOW_QUERY_BUFFER_SIZE', '200')),
+            n_plus_one_threshold=int(os.getenv('SQL_N_PLUS_ONE_THRESHOLD', '5')),
+        )
+
+    def install(self) -> None:
+        """Listen to cursor events on every SQLAlchemy engine. Idempotent."""
+        with self._lock:
+            if self._installed:
+                return
+            from sqlalchemy import event
+            from sqlalchemy.engine import Engine
+            event.listen(Engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', self._after_cursor_execute)
+            self._installed = True
+
+    def uninstall(self) -> None:
+        with self._lock:
+            if not self._installed:
+                return
+            from sqlalchemy import event
+            from sqlalchemy.engine import Engine
+            event.remove(Engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.remove(Engine, 'after_cursor_execute', self._after_cursor_execute)
+            self._installed = False
+
+    @contextmanager
+    def profile(self, request: str) -> Iterator[RequestProfile]:
+        """Attribute statements run in this context (and contexts copied from it) to one profile."""
+        profile = RequestProfile(request, self.n_plus_one_threshold)
+        token = self._current.set(profile)
+        try:
+            yield profile
+        finally:
+            self._current.reset(token)
+
+    def slow_queries(self) -> List[Dict[str, Any]]:
+        """Sampled slow statements, newest first."""
+        with self._lock:
+            return list(reversed(self._slow_queries))
+
+    def clear_slow_queries(self) -> None:
+        with self._lock:
+            self._slow_queries.clear()
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self._current.get() is not None:
+            conn.info.setdefault('bond_profiler_query_start', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        profile = self._current.get()
+        starts = conn.info.get('bond_profiler_query_start')
+        if profile is None or not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+
+        if profile.record(statement, elapsed):
+            call_site = _call_site()
+            with profile._lock:
+                profile.repeated[statement] = call_site
+
+        if elapsed >= self.slow_query_seconds:
+            entry = {
+                'timestamp': datetime.now(timezone.utc).isoformat(),
+                'request': profile.request,
+                'duration_ms': round(elapsed * 1000, 3),
+                'statement': statement[:MAX_STATEMENT_CHARS],
+                'parameters': _truncate(repr(parameters), MAX_PARAMETERS_CHARS),
+                'executemany': executemany,
+                'call_site': _call_site(),
+            }
+            with self._lock:
+                self._slow_queries.append(entry)
+
+
+def _truncate(value: str, limit: int) -> str:
+    return value if len(value) <= limit else value[:limit] + '...'
+
+
+def _call_site() -> str:
+    """The innermost bondable frame that led to the statement, as path:line in function."""
+    frame = sys._getframe(1)
+    this_file = os.path.abspath(__file__)
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename.startswith(_BONDABLE_DIR) and filename != this_file:
+            return f"{os.path.relpath(filename, os.path.dirname(_BONDABLE_DIR))}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return 'unknown'
+
+
+_profiler: Optional[SqlProfiler] = None
+_profiler_lock = threading.Lock()
+
+
+def get_profiler() -> SqlProfiler:
+    """The process-wide profiler, configured from the environment on first use."""
+    global _profiler
+    with _profiler_lock:
+        if _profiler is None:
+            _profiler = SqlProfiler.from_env()
+        return _profiler
@@ -4,6 +4,7 @@ import logging
 
 from bondable.bond.config import Config
 from bondable.bond.providers.metadata import Metadata, User as UserModel
+from bondable.bond.agent_access import AgentAccessIndex
 
 LOGGER = logging.getLogger(__name__)
 
@@ -11,8 +12,9 @@ LOGGER = logging.getLogger(__name__)
 class Users:
     """Handles user-related operations in the bondable layer."""
 
-    def __init__(self, metadata: Metadata):
+    def __init__(self, metadata: Metadata, access_index: Optional[AgentAccessIndex] = None):
         self.metadata = metadata
+        self.access_index = access_index
 
     def get_or_create_user(self, user_id: str, email: str, name: str, sign_in_method: str) -> Tuple[str, bool]:
         """Get existing user or create new user in database using OAuth provider's user_id.
@@ -146,6 +148,10 @@ class Users:
                 # Commit all changes
                 db_session.commit()
 
+                # Owned groups are gone, so other members may have lost access too
+                if self.access_index is not None:
+                    self.access_index.invalidate()
+
                 LOGGER.info(f"Successfully deleted user {email} (id: {user_id}) and all related data")
                 return True
 
@@ -10,7 +10,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # Import routers
-from bondable.rest.routers import auth, agents, threads, chat, files, mcp, groups, connections, scheduled_jobs, agent_folders, user_mcp_servers
+from bondable.rest.routers import auth, agents, threads, chat, files, mcp, groups, connections, scheduled_jobs, agent_folders, user_mcp_servers, jobs, metrics
 
 # Configure logging from YAML file
 def setup_logging():
@@ -48,6 +48,10 @@ async def lifespan(app: FastAPI):
     from bondable.bond.mcp_discovery import start_background_poller, stop_background_poller
     start_background_poller()
 
+    # OTLP / file exporters for /metrics data, when configured
+    from bondable.bond.metrics import start_exporters, stop_exporters
+    start_exporters()
+
     scheduler = None
     if os.getenv("SCHEDULED_JOBS_ENABLED", "false").lower() == "true":
         from bondable.bond.scheduler import JobScheduler
@@ -56,10 +60,23 @@ async def lifespan(app: FastAPI):
         scheduler = JobScheduler(metadata=provider.metadata, provider=provider)
         scheduler.start()
         LOGGER.info("Scheduled jobs scheduler started")
+
+    # Finish off Knowledge Base ingestion jobs left in progress by a previous process
+    ingestion_monitor = None
+    if os.getenv("BEDROCK_KNOWLEDGE_BASE_ID"):
+        from bondable.bond.config import Config
+        vectorstores = getattr(Config.config().get_provider(), "vectorstores", None)
+        ingestion_monitor = getattr(vectorstores, "ingestion_monitor", None)
+        if ingestion_monitor:
+            ingestion_monitor.start()
+            LOGGER.info("Knowledge Base ingestion monitor started")
     yield
+    if ingestion_monitor:
+        ingestion_monitor.stop()
     if scheduler:
         scheduler.stop()
         LOGGER.info("Scheduled jobs scheduler stopped")
+    stop_exporters()
     stop_background_poller()
 
 
@@ -101,6 +118,20 @@ app.add_middleware(AuditLogMiddleware)
 from bondable.rest.middleware.csrf import CSRFMiddleware
 app.add_middleware(CSRFMiddleware)
 
+# Request duration and per-request SQL time, exposed at /metrics
+from bondable.bond.metrics import instrument_sqlalchemy
+from bondable.rest.middleware.metrics import MetricsMiddleware
+instrument_sqlalchemy()
+app.add_middleware(MetricsMiddleware)
+
+# Opt-in per-request SQL profiling: Server-Timing headers, N+1 warnings, slow-query samples
+from bondable.bond.sql_profiler import get_profiler, profiling_enabled
+if profiling_enabled():
+    from bondable.rest.middleware.sql_profiler import SqlProfilerMiddleware
+    get_profiler().install()
+    app.add_middleware(SqlProfilerMiddleware)
+    LOGGER.info("SQL profiling enabled")
+
 # Rate limiting
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
@@ -124,6 +155,8 @@ app.include_router(connections.router)
 app.include_router(scheduled_jobs.router)
 app.include_router(agent_folders.router)
 app.include_router(user_mcp_servers.router)
+app.include_router(jobs.router)
+app.include_router(metrics.router)
 
 # Health check endpoint
 @app.get("/health")
@@ -0,0 +1,63 @@
+"""
+Request metrics middleware.
+
+Records REST request duration and the SQL time spent handling each request,
+labelled by route template (e.g. /threads/{thread_id}) rather than the raw
+path so label cardinality stays bounded. For streamed responses such as chat,
+the observation is taken when the body finishes streaming.
+"""
+
+import time
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+from bondable.bond.metrics import (
+    HTTP_REQUEST_DB_STATEMENTS,
+    HTTP_REQUEST_DB_TIME,
+    HTTP_REQUEST_DURATION,
+    track_request_db_time,
+)
+
+# Paths to exclude from request metrics (scrapes and probes)
+METRICS_EXCLUDE_PATHS = {"/health", "/metrics"}
+
+
+def _route_template(request: Request) -> str:
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next) -> Response:
+        if request.url.path in METRICS_EXCLUDE_PATHS:
+            return await call_next(request)
+
+        start_time = time.monotonic()
+        method = request.method
+        with track_request_db_time() as db_time:
+            response = await call_next(request)
+
+        def record():
+            route = _route_template(request)
+            HTTP_REQUEST_DURATION.observe(time.monotonic() - start_time, method=method, route=route,
+                                          status=str(response.status_code))
+            HTTP_REQUEST_DB_TIME.observe(db_time.seconds, method=method, route=route)
+            if db_time.statements:
+                HTTP_REQUEST_DB_STATEMENTS.inc(db_time.statements, method=method, route=route)
+
+        body_iterator = getattr(response, "body_iterator", None)
+        if body_iterator is None:
+            record()
+            return response
+
+        async def recording_body():
+            try:
+                async for chunk in body_iterator:
+                    yield chunk
+            finally:
+                record()
+
+        response.body_iterator = recording_body()
+        return response
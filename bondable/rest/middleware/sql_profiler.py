@@ -0,0 +1,65 @@
+"""
+SQL profiling middleware (opt-in, SQL_PROFILING_ENABLED=true).
+
+Opens a profile for each request so every SQL statement it causes is counted,
+reports the count and DB time in a Server-Timing header, and logs statements
+that repeat often enough to look like an N+1 pattern.
+
+Log format: SQL_N_PLUS_ONE: method=... path=... count=... call_site=... statement=...
+
+Headers are sent before a streamed body is produced, so for streaming
+responses (chat) Server-Timing covers only the work done before the first
+byte; the complete totals are logged when the body finishes.
+"""
+
+import logging
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+from bondable.bond.sql_profiler import get_profiler
+
+LOGGER = logging.getLogger(__name__)
+
+# Paths to exclude from profiling (probes and the profiler's own endpoints)
+PROFILER_EXCLUDE_PATHS = {"/health", "/metrics", "/metrics/slow-queries"}
+
+
+class SqlProfilerMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next) -> Response:
+        path = request.url.path
+        if path in PROFILER_EXCLUDE_PATHS:
+            return await call_next(request)
+
+        method = request.method
+        with get_profiler().profile(f"{method} {path}") as profile:
+            response = await call_next(request)
+
+        server_timing = profile.server_timing()
+        existing = response.headers.get("server-timing")
+        response.headers["Server-Timing"] = f"{existing}, {server_timing}" if existing else server_timing
+
+        def report():
+            for repeated in profile.n_plus_one():
+                LOGGER.warning(
+                    "SQL_N_PLUS_ONE: method=%s path=%s count=%d call_site=%s statement=%s",
+                    method, path, repeated["count"], repeated["call_site"], " ".join(repeated["statement"].split())[:300]
+                )
+            LOGGER.debug("SQL profile: method=%s path=%s statements=%d db_ms=%.1f",
+                         method, path, profile.statements, profile.seconds * 1000)
+
+        body_iterator = getattr(response, "body_iterator", None)
+        if body_iterator is None:
+            report()
+            return response
+
+        async def reporting_body():
+            try:
+                async for chunk in body_iterator:
+                    yield chunk
+            finally:
+                report()
+
+        response.body_iterator = reporting_body()
+        return response
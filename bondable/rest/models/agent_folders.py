@@ -30,3 +30,13 @@ class AgentReorderRequest(BaseModel):
 
 class FolderReorderRequest(BaseModel):
     folder_ids: List[str]
+
+
+class AgentMoveRequest(BaseModel):
+    agent_id: str
+    after_agent_id: Optional[str] = None  # None moves the agent to the front
+
+
+class FolderMoveRequest(BaseModel):
+    folder_id: str
+    after_folder_id: Optional[str] = None  # None moves the folder to the front
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Literal
 from datetime import datetime
 
 
@@ -35,3 +35,50 @@ class GroupMember(BaseModel):
 
 class GroupWithMembers(Group):
     members: List[GroupMember] = []
+
+
+class GroupMemberChange(BaseModel):
+    group_id: str
+    user_id: str
+    action: Literal["add", "remove"]
+
+
+class GroupMemberBatchRequest(BaseModel):
+    changes: List[GroupMemberChange]
+
+
+class GroupMemberChangeResult(BaseModel):
+    group_id: str
+    user_id: str
+    reason: Optional[str] = None  # set on skipped changes
+
+
+class GroupMemberBatchResponse(BaseModel):
+    added: List[GroupMemberChangeResult] = []
+    removed: List[GroupMemberChangeResult] = []
+    skipped: List[GroupMemberChangeResult] = []
+
+
+class AgentGroupChange(BaseModel):
+    agent_id: str
+    group_id: str
+    action: Literal["add", "remove", "set_permission"]
+    permission: Optional[Literal["can_use_read_only", "can_use", "can_edit"]] = None
+
+
+class AgentGroupBatchRequest(BaseModel):
+    changes: List[AgentGroupChange]
+
+
+class AgentGroupChangeResult(BaseModel):
+    agent_id: str
+    group_id: str
+    permission: Optional[str] = None
+    reason: Optional[str] = None  # set on skipped changes
+
+
+class AgentGroupBatchResponse(BaseModel):
+    added: List[AgentGroupChangeResult] = []
+    removed: List[AgentGroupChangeResult] = []
+    updated: List[AgentGroupChangeResult] = []
+    skipped: List[AgentGroupChangeResult] = []
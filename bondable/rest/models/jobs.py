@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import Optional, Dict, Any
+from datetime import datetime
+
+
+class BackgroundJobResponse(BaseModel):
+    job_id: str
+    kind: str
+    status: str  # PENDING | PREPARING | RUNNING | READY | COMPLETED | FAILED
+    subject_id: Optional[str] = None
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
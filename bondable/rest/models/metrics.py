@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from typing import List
+
+
+class SlowQueryResponse(BaseModel):
+    timestamp: str
+    request: str
+    duration_ms: float
+    statement: str
+    parameters: str
+    executemany: bool
+    call_site: str
+
+
+class SlowQueryListResponse(BaseModel):
+    enabled: bool
+    slow_query_ms: float
+    queries: List[SlowQueryResponse]
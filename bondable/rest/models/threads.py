@@ -31,6 +31,8 @@ class PaginatedThreadsResponse(BaseModel):
     offset: int
     limit: int
     has_more: bool
+    next_cursor: Optional[str] = None  # Pass as ?cursor= for the next page
+    total_is_estimate: bool = False  # total is a lower bound (estimate_total=true on a large history)
 
 
 class MessageRef(BaseModel):
@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 import logging
 from bondable.rest.models.agent_folders import (
     FolderRef, FolderCreateRequest, FolderUpdateRequest, FolderAssignRequest,
-    AgentReorderRequest, FolderReorderRequest
+    AgentReorderRequest, FolderReorderRequest, AgentMoveRequest, FolderMoveRequest
 )
 from bondable.rest.models.auth import User
 from bondable.rest.dependencies.auth import get_current_user
@@ -149,6 +149,60 @@ async def reorder_folders(
         )
 
 
+@router.put("/move-agent", response_model=dict)
+async def move_agent(
+    request: AgentMoveRequest,
+    current_user: Annotated[User, Depends(get_current_user)],
+    bond_provider=Depends(get_bond_provider)
+):
+    """Move one agent to just after another without rewriting the whole order."""
+    try:
+        sort_order = bond_provider.agent_folders.move_agent(
+            user_id=current_user.user_id,
+            agent_id=request.agent_id,
+            after_agent_id=request.after_agent_id
+        )
+        return {"status": "ok", "sort_order": sort_order}
+    except KeyError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Agent not found in sort order."
+        )
+    except Exception as e:
+        LOGGER.error(f"Error moving agent: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Could not move agent."
+        )
+
+
+@router.put("/move-folder", response_model=dict)
+async def move_folder(
+    request: FolderMoveRequest,
+    current_user: Annotated[User, Depends(get_current_user)],
+    bond_provider=Depends(get_bond_provider)
+):
+    """Move one folder to just after another without rewriting the whole order."""
+    try:
+        sort_order = bond_provider.agent_folders.move_folder(
+            user_id=current_user.user_id,
+            folder_id=request.folder_id,
+            after_folder_id=request.after_folder_id
+        )
+        return {"status": "ok", "sort_order": sort_order}
+    except KeyError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Folder not found."
+        )
+    except Exception as e:
+        LOGGER.error(f"Error moving folder: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Could not move folder."
+        )
+
+
 @router.put("/{folder_id}", response_model=FolderRef)
 async def update_folder(
     folder_id: str,
@@ -1,7 +1,7 @@
 import os
 import uuid
-from typing import Annotated, List, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Annotated, List, Dict, Any, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from pydantic import BaseModel
 import logging
 from bondable.bond.definition import AgentDefinition
@@ -11,10 +11,12 @@ from bondable.rest.models.agents import (
     AgentRef, AgentCreateRequest, AgentUpdateRequest, AgentResponse,
     AgentDetailResponse, ToolResourcesResponse, ToolResourceFilesList, ModelInfo
 )
+from bondable.rest.models.jobs import BackgroundJobResponse
 from bondable.rest.dependencies.auth import get_current_user
 from bondable.rest.dependencies.providers import get_bond_provider
 from bondable.rest.routers.files import _to_opaque_id, _resolve_file_id
 from bondable.bond.providers.metadata import EVERYONE_GROUP_ID
+from bondable.bond.background_jobs import PENDING, PREPARING, READY
 
 router = APIRouter(prefix="/agents", tags=["Agent"])
 LOGGER = logging.getLogger(__name__)
@@ -89,24 +91,26 @@ def get_agents(
             folder_assignments = provider.agent_folders.get_user_folder_assignments(current_user.user_id)
             sort_orders = provider.agent_folders.get_user_agent_sort_orders(current_user.user_id)
 
+        # One bulk lookup instead of building a full agent per record
+        summaries = provider.agents.get_agent_summaries([record['agent_id'] for record in agent_records])
+
         result = []
         for record in agent_records:
-            agent = provider.agents.get_agent(agent_id=record['agent_id'])
-            if not agent:
+            summary = summaries.get(record['agent_id'])
+            if not summary:
                 continue
             # Compute effective permission
             permission = record.get('permission', 'can_use')
             # Check if this is the default agent and user is admin
             if record.get('is_default') and current_user.is_admin:
                 permission = 'admin'
-            metadata = agent.get_metadata()
-            agent_id = agent.get_agent_id()
+            agent_id = summary['agent_id']
             result.append(AgentRef(
                 id=agent_id,
-                name=agent.get_name(),
+                name=summary['name'],
                 slug=record.get('slug'),
-                description=agent.get_description(),
-                metadata=metadata,
+                description=summary['description'],
+                metadata=summary['metadata'],
                 user_permission=permission,
                 folder_id=folder_assignments.get(agent_id),
                 sort_order=sort_orders.get(agent_id),
@@ -138,6 +142,11 @@ def get_default_agent(
 ):
     """Get the default agent, creating one if it doesn't exist."""
     try:
+        summary = provider.agents.get_default_agent_summary()
+        if summary:
+            return AgentResponse(agent_id=summary["agent_id"], name=summary["name"])
+
+        # Not created yet (or its summary could not be loaded): build it, creating it if needed
         default_agent = provider.agents.get_default_agent()
         if not default_agent:
             raise HTTPException(
@@ -175,11 +184,115 @@ def get_available_groups_for_agent(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Could not fetch available groups.")
 
 
-@router.post("", response_model=AgentResponse, status_code=status.HTTP_201_CREATED)
+def _agent_job_result(agent_instance) -> Dict[str, Any]:
+    return {"agent_id": agent_instance.get_agent_id(), "name": agent_instance.get_name()}
+
+
+def _mark_preparing(provider: Provider, job_id: Optional[str]):
+    """on_prepare callback that moves the job to PREPARING once the provider starts preparing the agent."""
+    if not job_id:
+        return None
+    return lambda agent_id: provider.jobs.set_status(job_id, PREPARING, subject_id=agent_id)
+
+
+def _provision_agent_create(provider: Provider, agent_def: AgentDefinition, request_data: AgentCreateRequest,
+                            current_user: User, job_id: Optional[str] = None):
+    """Create the agent and its group associations. Runs inline or as a background job."""
+    agent_instance = provider.agents.create_or_update_agent(agent_def=agent_def, user_id=current_user.user_id,
+                                                            on_prepare=_mark_preparing(provider, job_id))
+    if job_id:
+        provider.jobs.set_status(job_id, PREPARING, subject_id=agent_instance.get_agent_id())
+
+    # Create default group for the agent and associate them
+    try:
+        default_group_id = provider.groups.create_default_group_and_associate(
+            agent_name=request_data.name,
+            agent_id=agent_instance.get_agent_id(),
+            user_id=current_user.user_id
+        )
+        LOGGER.info(f"Created and associated default group '{default_group_id}' for agent '{agent_instance.get_name()}'")
+        # Store default_group_id on the agent record
+        try:
+            provider.agents.set_default_group_id(
+                agent_id=agent_instance.get_agent_id(),
+                default_group_id=default_group_id
+            )
+        except Exception as e:
+            LOGGER.error(f"Failed to set default_group_id for agent: {e}")
+    except Exception as group_error:
+        LOGGER.error(f"Failed to create default group for agent '{request_data.name}': {group_error}")
+        # Don't fail the agent creation if group creation fails, just log the error
+
+    # Associate agent with additional selected groups
+    if request_data.group_ids:
+        try:
+            perms = request_data.group_permissions or {}
+            for group_id in request_data.group_ids:
+                perm = perms.get(group_id, 'can_use')
+                provider.groups.associate_agent_with_group(
+                    agent_id=agent_instance.get_agent_id(),
+                    group_id=group_id,
+                    permission=perm
+                )
+            LOGGER.info(f"Associated agent '{agent_instance.get_agent_id()}' with {len(request_data.group_ids)} additional groups")
+        except Exception as group_error:
+            LOGGER.error(f"Failed to associate agent with additional groups: {group_error}")
+            # Don't fail the agent creation if additional group associations fail
+
+    LOGGER.info(f"Created agent '{agent_instance.get_name()}' with ID '{agent_instance.get_agent_id()}' for user {current_user.user_id} ({current_user.email}).")
+    return agent_instance
+
+
+def _provision_agent_update(provider: Provider, agent_def: AgentDefinition, request_data: AgentUpdateRequest,
+                            owner_user_id: str, job_id: Optional[str] = None):
+    """Update the agent and sync its group associations. Runs inline or as a background job."""
+    agent_instance = provider.agents.create_or_update_agent(agent_def=agent_def, user_id=owner_user_id,
+                                                            on_prepare=_mark_preparing(provider, job_id))
+
+    # Sync group associations if group_ids was provided
+    if request_data.group_ids is not None:
+        try:
+            # Look up default_group_id from agent record to preserve it
+            updated_agent_record = provider.agents.get_agent_record(agent_instance.get_agent_id())
+            preserve_ids = [updated_agent_record.default_group_id] if updated_agent_record and updated_agent_record.default_group_id else []
+            preserve_ids.append(EVERYONE_GROUP_ID)
+
+            provider.groups.sync_agent_groups(
+                agent_id=agent_instance.get_agent_id(),
+                desired_group_ids=request_data.group_ids,
+                preserve_group_ids=preserve_ids,
+                group_permissions=request_data.group_permissions
+            )
+            LOGGER.info(f"Synced agent '{agent_instance.get_agent_id()}' with {len(request_data.group_ids)} groups")
+        except Exception as group_error:
+            LOGGER.error(f"Failed to sync agent group associations: {group_error}")
+            # Don't fail the agent update if group sync fails
+
+    # Update default group permission if provided
+    if request_data.group_permissions:
+        try:
+            agent_rec = provider.agents.get_agent_record(agent_instance.get_agent_id())
+            default_gid = agent_rec.default_group_id if agent_rec else None
+            if default_gid and default_gid in request_data.group_permissions:
+                provider.groups.associate_agent_with_group(
+                    agent_id=agent_instance.get_agent_id(),
+                    group_id=default_gid,
+                    permission=request_data.group_permissions[default_gid]
+                )
+                LOGGER.info(f"Updated default group permission to '{request_data.group_permissions[default_gid]}'")
+        except Exception as perm_error:
+            LOGGER.error(f"Failed to update default group permission: {perm_error}")
+
+    return agent_instance
+
+
+@router.post("", response_model=Union[AgentResponse, BackgroundJobResponse], status_code=status.HTTP_201_CREATED)
 def create_agent(
     request_data: AgentCreateRequest,
     current_user: Annotated[User, Depends(get_current_user)],
-    provider: Provider = Depends(get_bond_provider)
+    response: Response,
+    provider: Provider = Depends(get_bond_provider),
+    background: bool = Query(False, description="Provision in the background and return 202 with a job to poll at /jobs/{job_id}")
 ):
     """Create a new agent."""
     LOGGER.info(f"Create agent request for user {current_user.user_id} ({current_user.email}) - MCP tools: {request_data.mcp_tools}, MCP resources: {request_data.mcp_resources}")
@@ -231,45 +344,19 @@ def create_agent(
         LOGGER.debug(f"  - tools: {agent_def.tools}")
         LOGGER.debug("================================")
 
-        agent_instance = provider.agents.create_or_update_agent(agent_def=agent_def, user_id=current_user.user_id)
-
-        # Create default group for the agent and associate them
-        try:
-            default_group_id = provider.groups.create_default_group_and_associate(
-                agent_name=request_data.name,
-                agent_id=agent_instance.get_agent_id(),
-                user_id=current_user.user_id
+        if background and provider.jobs is not None:
+            job_id = provider.jobs.submit(
+                kind="agent_create",
+                user_id=current_user.user_id,
+                done_status=READY,
+                work=lambda job_id: _agent_job_result(
+                    _provision_agent_create(provider, agent_def, request_data, current_user, job_id)
+                ),
             )
-            LOGGER.info(f"Created and associated default group '{default_group_id}' for agent '{agent_instance.get_name()}'")
-            # Store default_group_id on the agent record
-            try:
-                provider.agents.set_default_group_id(
-                    agent_id=agent_instance.get_agent_id(),
-                    default_group_id=default_group_id
-                )
-            except Exception as e:
-                LOGGER.error(f"Failed to set default_group_id for agent: {e}")
-        except Exception as group_error:
-            LOGGER.error(f"Failed to create default group for agent '{request_data.name}': {group_error}")
-            # Don't fail the agent creation if group creation fails, just log the error
-
-        # Associate agent with additional selected groups
-        if request_data.group_ids:
-            try:
-                perms = request_data.group_permissions or {}
-                for group_id in request_data.group_ids:
-                    perm = perms.get(group_id, 'can_use')
-                    provider.groups.associate_agent_with_group(
-                        agent_id=agent_instance.get_agent_id(),
-                        group_id=group_id,
-                        permission=perm
-                    )
-                LOGGER.info(f"Associated agent '{agent_instance.get_agent_id()}' with {len(request_data.group_ids)} additional groups")
-            except Exception as group_error:
-                LOGGER.error(f"Failed to associate agent with additional groups: {group_error}")
-                # Don't fail the agent creation if additional group associations fail
+            response.status_code = status.HTTP_202_ACCEPTED
+            return BackgroundJobResponse(job_id=job_id, kind="agent_create", status=PENDING)
 
-        LOGGER.info(f"Created agent '{agent_instance.get_name()}' with ID '{agent_instance.get_agent_id()}' for user {current_user.user_id} ({current_user.email}).")
+        agent_instance = _provision_agent_create(provider, agent_def, request_data, current_user)
         return AgentResponse(agent_id=agent_instance.get_agent_id(), name=agent_instance.get_name())
 
     except Exception as e:
@@ -279,12 +366,14 @@ def create_agent(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Could not create agent: {str(e)}")
 
 
-@router.put("/{agent_id}", response_model=AgentResponse)
+@router.put("/{agent_id}", response_model=Union[AgentResponse, BackgroundJobResponse])
 def update_agent(
     agent_id: str,
     request_data: AgentUpdateRequest,
     current_user: Annotated[User, Depends(get_current_user)],
-    provider: Provider = Depends(get_bond_provider)
+    response: Response,
+    provider: Provider = Depends(get_bond_provider),
+    background: bool = Query(False, description="Provision in the background and return 202 with a job to poll at /jobs/{job_id}")
 ):
     """Update an existing agent."""
     LOGGER.info(f"Update agent request for agent {agent_id}, user {current_user.user_id} ({current_user.email}) - MCP tools: {request_data.mcp_tools}, MCP resources: {request_data.mcp_resources}")
@@ -376,41 +465,20 @@ def update_agent(
         LOGGER.debug(f"  - tools: {agent_def.tools}")
         LOGGER.debug("================================")
 
-        agent_instance = provider.agents.create_or_update_agent(agent_def=agent_def, user_id=owner_user_id)
-
-        # Sync group associations if group_ids was provided
-        if request_data.group_ids is not None:
-            try:
-                # Look up default_group_id from agent record to preserve it
-                updated_agent_record = provider.agents.get_agent_record(agent_instance.get_agent_id())
-                preserve_ids = [updated_agent_record.default_group_id] if updated_agent_record and updated_agent_record.default_group_id else []
-                preserve_ids.append(EVERYONE_GROUP_ID)
+        if background and provider.jobs is not None:
+            job_id = provider.jobs.submit(
+                kind="agent_update",
+                user_id=current_user.user_id,
+                subject_id=agent_id,
+                done_status=READY,
+                work=lambda job_id: _agent_job_result(
+                    _provision_agent_update(provider, agent_def, request_data, owner_user_id, job_id)
+                ),
+            )
+            response.status_code = status.HTTP_202_ACCEPTED
+            return BackgroundJobResponse(job_id=job_id, kind="agent_update", status=PENDING, subject_id=agent_id)
 
-                provider.groups.sync_agent_groups(
-                    agent_id=agent_instance.get_agent_id(),
-                    desired_group_ids=request_data.group_ids,
-                    preserve_group_ids=preserve_ids,
-                    group_permissions=request_data.group_permissions
-                )
-                LOGGER.info(f"Synced agent '{agent_instance.get_agent_id()}' with {len(request_data.group_ids)} groups")
-            except Exception as group_error:
-                LOGGER.error(f"Failed to sync agent group associations: {group_error}")
-                # Don't fail the agent update if group sync fails
-
-        # Update default group permission if provided
-        if request_data.group_permissions:
-            try:
-                agent_rec = provider.agents.get_agent_record(agent_instance.get_agent_id())
-                default_gid = agent_rec.default_group_id if agent_rec else None
-                if default_gid and default_gid in request_data.group_permissions:
-                    provider.groups.associate_agent_with_group(
-                        agent_id=agent_instance.get_agent_id(),
-                        group_id=default_gid,
-                        permission=request_data.group_permissions[default_gid]
-                    )
-                    LOGGER.info(f"Updated default group permission to '{request_data.group_permissions[default_gid]}'")
-            except Exception as perm_error:
-                LOGGER.error(f"Failed to update default group permission: {perm_error}")
+        agent_instance = _provision_agent_update(provider, agent_def, request_data, owner_user_id)
 
         LOGGER.info(f"Updated agent '{agent_instance.get_name()}' with ID '{agent_instance.get_agent_id()}' for user {current_user.user_id} ({current_user.email}).")
         return AgentResponse(agent_id=agent_instance.get_agent_id(), name=agent_instance.get_name())
@@ -437,9 +505,8 @@ def get_agent_details(
         # Check if this is a default agent (accessible to all users)
         is_default_agent = False
         try:
-            # Check if this agent is the default agent by comparing with the default agent ID
-            default_agent = provider.agents.get_default_agent()
-            is_default_agent = default_agent and default_agent.get_agent_id() == agent_id
+            # Compare against the cached default agent ID; no need to build the default agent
+            is_default_agent = provider.agents.get_default_agent_id() == agent_id
         except Exception as e:
             LOGGER.error(f"Error checking if agent {agent_id} is default: {e}")
 
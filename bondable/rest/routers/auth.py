@@ -1,6 +1,6 @@
 from typing import Annotated
 from datetime import timedelta, datetime, timezone
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Request
 from fastapi.responses import RedirectResponse, JSONResponse
 import logging
 import hashlib
@@ -15,6 +15,8 @@ from bondable.bond.auth import OAuth2ProviderFactory
 from bondable.bond.auth.oauth_utils import generate_pkce_pair, generate_oauth_state, validate_oauth_state
 from bondable.bond.config import Config
 from bondable.rest.models.auth import User
+from bondable.rest.models.jobs import BackgroundJobResponse
+from bondable.bond.background_jobs import PENDING
 from bondable.rest.dependencies.auth import get_current_user
 from bondable.rest.dependencies.providers import get_bond_provider
 from bondable.rest.utils.auth import create_access_token
@@ -608,11 +610,20 @@ async def provision_user(
     return {"user_id": user_id, "email": body.email, "is_new": is_new}
 
 
+def _offboard_user(bond_provider, email: str) -> dict:
+    """Background job body for DELETE /users/{email}?background=true."""
+    if not bond_provider.users.delete_user_by_email(email, provider=bond_provider):
+        raise ValueError("User not found")
+    LOGGER.info(f"Background offboarding of user {email} completed")
+    return {"email": email}
+
+
 @router.delete("/users/{email}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_user_by_email(
     email: str,
     current_user: Annotated[User, Depends(get_current_user)],
-    bond_provider = Depends(get_bond_provider)
+    bond_provider = Depends(get_bond_provider),
+    background: bool = Query(False, description="Offboard in the background and return 202 with a job to poll at /jobs/{job_id}")
 ):
     """Delete user by email (admin only)."""
     # Admin authorization check using unified config
@@ -638,6 +649,15 @@ async def delete_user_by_email(
     try:
         LOGGER.info(f"Admin {current_user.email} requested deletion of user: {email}")
 
+        if background and bond_provider.jobs is not None:
+            job_id = bond_provider.jobs.submit(
+                kind="user_offboard",
+                user_id=current_user.user_id,
+                work=lambda job_id: _offboard_user(bond_provider, email),
+            )
+            job = BackgroundJobResponse(job_id=job_id, kind="user_offboard", status=PENDING)
+            return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=job.model_dump(mode="json"))
+
         success = bond_provider.users.delete_user_by_email(email, provider=bond_provider)
 
         if not success:
@@ -9,6 +9,8 @@ import logging
 
 from bondable.bond.providers.provider import Provider
 from bondable.rest.models.auth import User
+from bondable.bond.message_stream import BondMessageParser, MessageEnd, MessageStart
+from bondable.bond.response_buffer import ResponseBuffer
 from bondable.rest.models.chat import ChatRequest
 from bondable.rest.dependencies.auth import get_current_user_with_token
 from bondable.rest.dependencies.providers import get_bond_provider
@@ -24,6 +26,7 @@ _KEEPALIVE_INTERVAL = 15  # seconds
 _SENTINEL = object()
 
 # Agent forwarding via bond://forward/AgentSlug links
+_FORWARD_MARKER = 'bond://forward/'
 _FORWARD_PATTERN = re.compile(r'\[([^\]]*)\]\(bond://forward/([^)]+)\)')
 _MAX_FORWARD_DEPTH = 5
 
@@ -183,9 +186,8 @@ def chat(
         # Check if this is a default agent (accessible to all users)
         is_default_agent = False
         try:
-            # Check if this agent is the default agent by comparing with the default agent ID
-            default_agent = provider.agents.get_default_agent()
-            is_default_agent = default_agent and default_agent.get_agent_id() == request_body.agent_id
+            # Compare against the cached default agent ID; no need to build the default agent
+            is_default_agent = provider.agents.get_default_agent_id() == request_body.agent_id
         except Exception as e:
             LOGGER.error(f"Error checking if agent {request_body.agent_id} is default: {e}")
 
@@ -229,7 +231,10 @@ def chat(
                 has_yielded_done = False
                 has_yielded_assistant_content = False
                 current_is_assistant = False
-                accumulated_text = ""
+                # Only assistant text is kept, and only scanned for a forward
+                # link if the marker shows up while streaming
+                accumulated_text = ResponseBuffer(marker=_FORWARD_MARKER)
+                tag_parser = BondMessageParser()
 
                 try:
                     for response_chunk in current_agent.stream_response(
@@ -242,19 +247,20 @@ def chat(
                     ):
                         # Track bond message state for safety net guarantees
                         if isinstance(response_chunk, str):
-                            if response_chunk.startswith('<_bondmessage '):
-                                bond_message_open = True
-                                has_yielded_bond_message = True
-                                if 'is_done="true"' in response_chunk:
-                                    has_yielded_done = True
-                                # Track if this is an assistant content message
-                                current_is_assistant = 'role="assistant"' in response_chunk
-                            elif response_chunk == '</_bondmessage>':
-                                bond_message_open = False
-                                current_is_assistant = False
-                            elif current_is_assistant and response_chunk.strip():
-                                has_yielded_assistant_content = True
-                                accumulated_text += response_chunk
+                            for event in tag_parser.feed(response_chunk):
+                                if isinstance(event, MessageStart):
+                                    has_yielded_bond_message = True
+                                    if event.flag('is_done'):
+                                        has_yielded_done = True
+                                    # Track if this is an assistant content message
+                                    current_is_assistant = event.attributes.get('role') == 'assistant'
+                                elif isinstance(event, MessageEnd):
+                                    current_is_assistant = False
+                                elif current_is_assistant:
+                                    if event.text.strip():
+                                        has_yielded_assistant_content = True
+                                    accumulated_text.append(event.text)
+                            bond_message_open = tag_parser.in_message
                         yield response_chunk
 
                 except Exception as e:
@@ -312,12 +318,13 @@ def chat(
                     return  # No forwarding after errors
 
                 # --- Check for agent forwarding before applying safety-net guarantees ---
-                LOGGER.debug(
-                    f"Agent {current_agent_name} ({current_agent_id}) stream complete. "
-                    f"Accumulated assistant text ({len(accumulated_text)} chars): "
-                    f"{accumulated_text[:500]!r}"
-                )
-                forward_match = _FORWARD_PATTERN.search(accumulated_text) if accumulated_text else None
+                if LOGGER.isEnabledFor(logging.DEBUG):
+                    LOGGER.debug(
+                        f"Agent {current_agent_name} ({current_agent_id}) stream complete. "
+                        f"Accumulated assistant text ({len(accumulated_text)} chars): "
+                        f"{accumulated_text.getvalue()[:500]!r}"
+                    )
+                forward_match = accumulated_text.search(_FORWARD_PATTERN)
                 LOGGER.debug(
                     f"Forward pattern match: {bool(forward_match)}, "
                     f"depth: {forward_depth}/{_MAX_FORWARD_DEPTH}"
@@ -364,8 +371,7 @@ def chat(
                             # Access check for target agent
                             target_accessible = False
                             try:
-                                default_agent = provider.agents.get_default_agent()
-                                is_target_default = default_agent and default_agent.get_agent_id() == target_agent_id
+                                is_target_default = provider.agents.get_default_agent_id() == target_agent_id
                                 can_access = provider.agents.can_user_access_agent(
                                     user_id=current_user.user_id, agent_id=target_agent_id
                                 )
@@ -1,7 +1,10 @@
 from typing import Annotated, List
 from fastapi import APIRouter, Depends, HTTPException, status
 import logging
-from bondable.rest.models.groups import Group, GroupCreate, GroupUpdate, GroupWithMembers, GroupMember
+from bondable.rest.models.groups import (
+    Group, GroupCreate, GroupUpdate, GroupWithMembers, GroupMember,
+    GroupMemberBatchRequest, GroupMemberBatchResponse, AgentGroupBatchRequest, AgentGroupBatchResponse
+)
 from bondable.rest.models.auth import User
 from bondable.rest.dependencies.auth import get_current_user
 from bondable.rest.dependencies.providers import get_bond_provider
@@ -278,3 +281,67 @@ async def remove_group_member(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Could not remove group member"
         )
+
+
+@router.post("/members/batch", response_model=GroupMemberBatchResponse)
+async def batch_group_members(
+    request: GroupMemberBatchRequest,
+    current_user: Annotated[User, Depends(get_current_user)],
+    bond_provider = Depends(get_bond_provider)
+):
+    """Add or remove many group members in one transaction (owner only).
+
+    Changes to groups the caller does not own, unknown users and no-op changes
+    are returned under "skipped" with a reason rather than failing the batch.
+    """
+    try:
+        diff = bond_provider.groups.apply_member_changes(
+            user_id=current_user.user_id,
+            changes=[change.model_dump() for change in request.changes]
+        )
+        return GroupMemberBatchResponse(**diff)
+    except Exception as e:
+        LOGGER.error(f"Error applying group member changes: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Could not update group members"
+        )
+
+
+@router.post("/agents/batch", response_model=AgentGroupBatchResponse)
+async def batch_agent_groups(
+    request: AgentGroupBatchRequest,
+    current_user: Annotated[User, Depends(get_current_user)],
+    bond_provider = Depends(get_bond_provider)
+):
+    """Add, remove or change the permission of many agent-group associations in one transaction.
+
+    The caller must own or have can_edit on each agent and own or belong to each
+    group; other changes, and changes to the Everyone group or an agent's default
+    group, are returned under "skipped".
+    """
+    try:
+        allowed = {}
+        permitted_changes = []
+        forbidden = []
+        for change in request.changes:
+            if change.agent_id not in allowed:
+                permission = bond_provider.agents.get_user_agent_permission(current_user.user_id, change.agent_id)
+                allowed[change.agent_id] = permission in ('owner', 'can_edit')
+            if allowed[change.agent_id]:
+                permitted_changes.append(change.model_dump())
+            else:
+                forbidden.append({"agent_id": change.agent_id, "group_id": change.group_id, "reason": "forbidden"})
+
+        diff = bond_provider.groups.apply_agent_group_changes(
+            user_id=current_user.user_id,
+            changes=permitted_changes
+        )
+        diff["skipped"] = forbidden + diff["skipped"]
+        return AgentGroupBatchResponse(**diff)
+    except Exception as e:
+        LOGGER.error(f"Error applying agent-group changes: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Could not update agent groups"
+        )
@@ -0,0 +1,33 @@
+"""
+Background Jobs Router - status of work accepted by other endpoints and run off the request thread.
+"""
+
+import logging
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from bondable.bond.providers.provider import Provider
+from bondable.rest.models.auth import User
+from bondable.rest.models.jobs import BackgroundJobResponse
+from bondable.rest.dependencies.auth import get_current_user
+from bondable.rest.dependencies.providers import get_bond_provider
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+LOGGER = logging.getLogger(__name__)
+
+
+@router.get("/{job_id}", response_model=BackgroundJobResponse)
+def get_job(
+    job_id: str,
+    current_user: Annotated[User, Depends(get_current_user)],
+    provider: Provider = Depends(get_bond_provider)
+):
+    """Get the status of a background job started by the current user."""
+    if provider.jobs is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found.")
+    job = provider.jobs.get_job(job_id)
+    # Report another user's job as missing rather than forbidden so ids can't be probed
+    if not job or (job["user_id"] != current_user.user_id and not current_user.is_admin):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found.")
+    return BackgroundJobResponse(**{k: v for k, v in job.items() if k != "user_id"})
@@ -0,0 +1,75 @@
+"""
+Metrics Router - Prometheus text exposition of the in-process metrics registry,
+and the SQL profiler's slow-query samples for admins.
+
+/metrics is disabled unless METRICS_ENABLED=true. Scrapers do not carry a user
+session, so it is protected by a shared bearer token (METRICS_AUTH_TOKEN) when
+one is configured, and should otherwise only be reachable from the private
+network.
+"""
+
+import hmac
+import logging
+import os
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import PlainTextResponse
+
+from bondable.bond.metrics import REGISTRY
+from bondable.bond.sql_profiler import get_profiler, profiling_enabled
+from bondable.rest.models.auth import User
+from bondable.rest.models.metrics import SlowQueryListResponse
+from bondable.rest.dependencies.auth import get_current_user
+
+router = APIRouter(tags=["Metrics"])
+LOGGER = logging.getLogger(__name__)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def metrics_enabled() -> bool:
+    return os.getenv("METRICS_ENABLED", "false").lower() == "true"
+
+
+@router.get("/metrics", include_in_schema=False)
+def get_metrics(request: Request):
+    """Current metrics in the Prometheus text format."""
+    if not metrics_enabled():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+    expected_token = os.getenv("METRICS_AUTH_TOKEN")
+    if expected_token:
+        auth_header = request.headers.get("authorization", "")
+        token = auth_header[7:] if auth_header.lower().startswith("bearer ") else ""
+        if not hmac.compare_digest(token.encode(), expected_token.encode()):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+
+    return PlainTextResponse(REGISTRY.render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def _require_admin(current_user: User) -> None:
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admin users can view SQL profiles",
+        )
+
+
+@router.get("/metrics/slow-queries", response_model=SlowQueryListResponse)
+def get_slow_queries(current_user: Annotated[User, Depends(get_current_user)]):
+    """Slow SQL statements sampled by the profiler, newest first (admin only)."""
+    _require_admin(current_user)
+    profiler = get_profiler()
+    return SlowQueryListResponse(
+        enabled=profiling_enabled(),
+        slow_query_ms=profiler.slow_query_seconds * 1000,
+        queries=profiler.slow_queries(),
+    )
+
+
+@router.delete("/metrics/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+def clear_slow_queries(current_user: Annotated[User, Depends(get_current_user)]):
+    """Empty the slow-query buffer (admin only)."""
+    _require_admin(current_user)
+    get_profiler().clear_slow_queries()
@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 import logging
 
 from bondable.bond.providers.provider import Provider
+from bondable.bond.providers.threads import decode_thread_cursor, encode_thread_cursor
 from bondable.rest.models.auth import User
 from bondable.rest.models.threads import ThreadRef, CreateThreadRequest, UpdateThreadRequest, PaginatedThreadsResponse, MessageRef, MessageFeedbackRequest, MessageFeedbackResponse
 from bondable.rest.dependencies.auth import get_current_user
@@ -13,14 +14,27 @@ router = APIRouter(prefix="/threads", tags=["Thread"])
 LOGGER = logging.getLogger(__name__)
 
 
-def _resolve_agent_name(provider: Provider, agent_id: str) -> Optional[str]:
-    """Resolve an agent ID to its display name. Returns None if not found or on error."""
+def _resolve_agent_names(provider: Provider, agent_ids) -> Dict[str, Optional[str]]:
+    """
+    Resolve agent IDs to display names in one lookup. Missing agents or errors map to None.
+
+    Goes through get_agent_summaries, which on Bedrock may commit a one-time backfill of
+    description/model for agents created before those columns existed.
+    """
+    agent_ids = [aid for aid in agent_ids if aid]
+    if not agent_ids:
+        return {}
     try:
-        agent = provider.agents.get_agent(agent_id=agent_id)
-        return agent.get_name() if agent else None
+        summaries = provider.agents.get_agent_summaries(agent_ids)
     except Exception as e:
-        LOGGER.warning(f"Failed to resolve agent name for {agent_id}: {e}")
-        return None
+        LOGGER.warning(f"Failed to resolve agent names for {agent_ids}: {e}")
+        summaries = {}
+    return {aid: summaries[aid]['name'] if aid in summaries else None for aid in agent_ids}
+
+
+def _resolve_agent_name(provider: Provider, agent_id: str) -> Optional[str]:
+    """Resolve an agent ID to its display name. Returns None if not found or on error."""
+    return _resolve_agent_names(provider, [agent_id]).get(agent_id)
 
 
 @router.get("", response_model=PaginatedThreadsResponse)
@@ -29,27 +43,69 @@ def get_threads(
     provider: Provider = Depends(get_bond_provider),
     offset: int = 0,
     limit: int = 20,
-    exclude_empty: bool = True
+    exclude_empty: bool = True,
+    cursor: Optional[str] = None,
+    estimate_total: bool = False
 ):
-    """Get paginated list of threads for the authenticated user."""
+    """
+    Get paginated list of threads for the authenticated user, most recently
+    updated first.
+
+    Pages are addressed by offset, or by the next_cursor of the previous page;
+    cursor pages stay fast at any depth and don't repeat or skip threads when
+    threads are created meanwhile. With estimate_total, total stops counting at
+    THREAD_COUNT_ESTIMATE_CAP and total_is_estimate says whether it did.
+    """
+    if cursor:
+        try:
+            decode_thread_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
     try:
         offset = max(offset, 0)
         limit = min(max(limit, 1), 100)
-        thread_data_list = provider.threads.get_current_threads(
-            user_id=current_user.user_id,
-            count=limit,
-            offset=offset,
-            exclude_empty=exclude_empty,
-        )
-        total = provider.threads.get_thread_count(
-            user_id=current_user.user_id,
-            exclude_empty=exclude_empty,
-        )
+        if cursor:
+            thread_data_list, next_cursor = provider.threads.get_threads_page(
+                user_id=current_user.user_id,
+                count=limit,
+                cursor=cursor,
+                exclude_empty=exclude_empty,
+            )
+            offset = 0
+        else:
+            thread_data_list = provider.threads.get_current_threads(
+                user_id=current_user.user_id,
+                count=limit,
+                offset=offset,
+                exclude_empty=exclude_empty,
+            )
+            next_cursor = None
+
+        total_is_estimate = False
+        if estimate_total:
+            total, exact = provider.threads.estimate_thread_count(
+                user_id=current_user.user_id,
+                exclude_empty=exclude_empty,
+            )
+            total_is_estimate = not exact
+        else:
+            total = provider.threads.get_thread_count(
+                user_id=current_user.user_id,
+                exclude_empty=exclude_empty,
+            )
+
+        if cursor:
+            has_more = next_cursor is not None
+        else:
+            has_more = (offset + limit) < total or (total_is_estimate and len(thread_data_list) == limit)
+            last = thread_data_list[-1] if thread_data_list else None
+            if has_more and last and isinstance(last.get('updated_at'), datetime):
+                # Lets offset clients continue with cursor pages from here
+                next_cursor = encode_thread_cursor(last['updated_at'], last['thread_id'])
+
         # Batch-resolve agent names for threads with last_agent_id
-        agent_name_cache: dict[str, str | None] = {}
         agent_ids = {td['last_agent_id'] for td in thread_data_list if td.get('last_agent_id')}
-        for aid in agent_ids:
-            agent_name_cache[aid] = _resolve_agent_name(provider, aid)
+        agent_name_cache: dict[str, str | None] = _resolve_agent_names(provider, agent_ids)
 
         threads = [
             ThreadRef(
@@ -68,7 +124,9 @@ def get_threads(
             total=total,
             offset=offset,
             limit=limit,
-            has_more=(offset + limit) < total,
+            has_more=has_more,
+            next_cursor=next_cursor,
+            total_is_estimate=total_is_estimate,
         )
     except Exception as e:
         LOGGER.error(f"Error fetching threads for user {current_user.user_id} ({current_user.email}): {e}", exc_info=True)
@@ -0,0 +1,8 @@
+"""
+Local benchmark harness for bond-ai.
+
+Runs the real FastAPI app and Bedrock provider against local stand-ins for
+bedrock-agent-runtime (replayed event streams), S3 (in memory) and an MCP
+server (fastmcp with tunable latency), so throughput and latency can be
+measured without AWS. See scripts/benchmarks/README.md.
+"""
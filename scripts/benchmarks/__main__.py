@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Run the local benchmark suite and optionally compare against a baseline.
+
+Examples:
+    # All scenarios, 8 concurrent users, 5 turns each
+    poetry run python -m scripts.benchmarks --concurrency 8 --turns 5 --output results.json
+
+    # Fail (exit 1) if anything regressed more than 15% against a stored baseline
+    poetry run python -m scripts.benchmarks --baseline scripts/benchmarks/baseline.json --tolerance 0.15
+
+    # Pure server overhead: replay Bedrock streams without any pacing
+    poetry run python -m scripts.benchmarks --scenarios chat_stream --latency-scale 0
+"""
+
+import argparse
+import json
+import logging
+import platform
+import sys
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+# Metrics where a larger value is better; every other compared metric is lower-is-better
+HIGHER_IS_BETTER = {"throughput_rps"}
+COMPARED_METRICS = (
+    "p50_ms", "p95_ms", "p99_ms", "ttfb_p50_ms", "ttfb_p95_ms",
+    "throughput_rps", "db_statements_per_request", "rss_peak_mb",
+)
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[Tuple[str, str, float, float]]:
+    """
+    Return (scenario, metric, baseline, current) for every metric that got
+    worse by more than tolerance (a fraction), plus any scenario that
+    started returning errors.
+    """
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if current.get("errors", 0) > base.get("errors", 0):
+            regressions.append((name, "errors", base.get("errors", 0), current["errors"]))
+        for metric in COMPARED_METRICS:
+            if metric not in current or not base.get(metric):
+                continue
+            change = (current[metric] - base[metric]) / base[metric]
+            if metric in HIGHER_IS_BETTER:
+                change = -change
+            if change > tolerance:
+                regressions.append((name, metric, base[metric], current[metric]))
+    return regressions
+
+
+def _print_table(results: Dict[str, dict]) -> None:
+    columns = ("requests", "errors", "throughput_rps", "p50_ms", "p95_ms", "p99_ms",
+               "ttfb_p50_ms", "db_statements_per_request", "rss_peak_mb")
+    widths = [max(len(c), 10) + 2 for c in columns]
+    print(f"{'scenario':<15}" + "".join(f"{c:>{w}}" for c, w in zip(columns, widths)))
+    for name, summary in results.items():
+        print(f"{name:<15}" + "".join(f"{summary.get(c, '-'):>{w}}" for c, w in zip(columns, widths)))
+
+
+def main() -> int:
+    # Import lazily: the harness must configure the environment before bondable is imported
+    from .harness import BenchmarkHarness, HarnessOptions
+    from .scenarios import SCENARIOS
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"Comma-separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--turns", type=int, default=3, help="Requests per concurrent worker")
+    parser.add_argument("--latency-scale", type=float, default=1.0,
+                        help="Multiplier for recorded Bedrock delays (0 = no simulated model latency)")
+    parser.add_argument("--first-byte-ms", type=float, default=None, help="Override Bedrock time to first event")
+    parser.add_argument("--chunk-delay-ms", type=float, default=None, help="Override delay between streamed chunks")
+    parser.add_argument("--response-chars", type=int, default=2000)
+    parser.add_argument("--tool-calls", type=int, default=3, help="MCP calls per tool_heavy turn")
+    parser.add_argument("--mcp-latency-ms", type=float, default=50.0)
+    parser.add_argument("--mcp-payload-bytes", type=int, default=2000)
+    parser.add_argument("--history-messages", type=int, default=500)
+    parser.add_argument("--upload-mb", type=float, default=5.0)
+    parser.add_argument("--metadata-db-url", default=None,
+                        help="Database to benchmark against (default: a throwaway SQLite file)")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--baseline", help="Compare against results JSON from an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="Allowed relative regression before failing (default 0.10 = 10%%)")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    selected = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = [s for s in selected if s not in SCENARIOS]
+    if unknown:
+        parser.error(f"Unknown scenario(s): {', '.join(unknown)}")
+
+    options = HarnessOptions(
+        latency_scale=args.latency_scale, first_byte_ms=args.first_byte_ms, chunk_delay_ms=args.chunk_delay_ms,
+        response_chars=args.response_chars, tool_calls=args.tool_calls,
+        mcp_latency_ms=args.mcp_latency_ms, mcp_payload_bytes=args.mcp_payload_bytes,
+        start_mcp_server="tool_heavy" in selected, metadata_db_url=args.metadata_db_url,
+    )
+    results: Dict[str, dict] = {}
+    with BenchmarkHarness(options) as harness:
+        if not args.verbose:
+            # The app's logging config sets per-package INFO levels; per-request lines would dominate the run
+            logging.disable(logging.INFO)
+        for name in selected:
+            print(f"Running {name} (concurrency={args.concurrency}, turns={args.turns})...", file=sys.stderr)
+            result = harness.run(SCENARIOS[name], concurrency=args.concurrency, turns=args.turns,
+                                 history_messages=args.history_messages, upload_mb=args.upload_mb)
+            results[name] = result.summary()
+
+    _print_table(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "options": vars(args),
+                "results": results,
+            }, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for scenario, metric, before, after in regressions:
+            print(f"REGRESSION {scenario}.{metric}: {before} -> {after}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
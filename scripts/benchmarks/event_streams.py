@@ -0,0 +1,168 @@
+"""
+Recorded invoke_agent event streams.
+
+A recording is a list of invocations, one per invoke_agent call in a chat
+turn: the initial call first, then one per returnControl continuation. Each
+invocation holds the completion events Bedrock streamed back (chunk, trace,
+files, returnControl, sessionState) with the delay before each one, so the
+fake runtime can replay both the content and the pacing.
+
+On disk a recording is JSON Lines, optionally gzipped (*.jsonl.gz): a header
+line, then one line per invocation. Bytes values are stored as
+{"__bytes__": "<base64>"} so chunk and file payloads round-trip exactly.
+
+    {"format": "bond-event-stream", "version": 1, "name": "tool_heavy", ...}
+    {"first_byte_ms": 420.0, "events": [{"delay_ms": 12.5, "event": {"chunk": {...}}}, ...]}
+
+Continuation invocations may also carry "tool_results": the result strings
+Bond sent back to Bedrock in the request that opened them, so a replay can
+feed the same payloads through tool result handling.
+"""
+
+import base64
+import gzip
+import json
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+FORMAT_NAME = "bond-event-stream"
+FORMAT_VERSION = 1
+
+
+@dataclass
+class RecordedEvent:
+    event: Dict[str, Any]
+    delay_ms: float = 0.0
+
+
+@dataclass
+class RecordedInvocation:
+    events: List[RecordedEvent] = field(default_factory=list)
+    # Time from the invoke_agent call until the response stream opened
+    first_byte_ms: float = 0.0
+    # Tool results sent with the continuation request that opened this invocation
+    tool_results: List[str] = field(default_factory=list)
+
+
+@dataclass
+class Recording:
+    name: str
+    invocations: List[RecordedInvocation]
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, (bytes, bytearray)):
+        return {"__bytes__": base64.b64encode(bytes(value)).decode("ascii")}
+    if isinstance(value, dict):
+        return {k: _encode(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, dict):
+        if len(value) == 1 and "__bytes__" in value:
+            return base64.b64decode(value["__bytes__"])
+        return {k: _decode(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    return value
+
+
+def _open(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def write_recording(path: str, recording: Recording) -> None:
+    with _open(path, "w") as f:
+        header = {"format": FORMAT_NAME, "version": FORMAT_VERSION, "name": recording.name, **recording.metadata}
+        f.write(json.dumps(header, separators=(",", ":")) + "\n")
+        for invocation in recording.invocations:
+            line = {
+                "first_byte_ms": round(invocation.first_byte_ms, 3),
+                "events": [{"delay_ms": round(e.delay_ms, 3), "event": _encode(e.event)} for e in invocation.events],
+            }
+            if invocation.tool_results:
+                line["tool_results"] = invocation.tool_results
+            f.write(json.dumps(line, separators=(",", ":")) + "\n")
+
+
+def read_recording(path: str) -> Recording:
+    with _open(path, "r") as f:
+        lines = [line for line in f if line.strip()]
+    if not lines:
+        raise ValueError(f"{path} is empty")
+    header = json.loads(lines[0])
+    if header.get("format") != FORMAT_NAME or header.get("version") != FORMAT_VERSION:
+        raise ValueError(f"{path} is not a {FORMAT_NAME} v{FORMAT_VERSION} recording")
+    invocations = []
+    for line in lines[1:]:
+        data = json.loads(line)
+        invocations.append(RecordedInvocation(
+            first_byte_ms=data.get("first_byte_ms", 0.0),
+            events=[RecordedEvent(event=_decode(e["event"]), delay_ms=e.get("delay_ms", 0.0)) for e in data["events"]],
+            tool_results=data.get("tool_results", []),
+        ))
+    metadata = {k: v for k, v in header.items() if k not in ("format", "version", "name")}
+    return Recording(name=header.get("name", ""), invocations=invocations, metadata=metadata)
+
+
+# --- Synthetic recordings ---
+
+def _text_events(text: str, chunk_chars: int, chunk_delay_ms: float) -> List[RecordedEvent]:
+    return [
+        RecordedEvent({"chunk": {"bytes": text[i:i + chunk_chars].encode("utf-8")}}, chunk_delay_ms)
+        for i in range(0, len(text), chunk_chars)
+    ]
+
+
+def _usage_trace(input_tokens: int, output_tokens: int) -> RecordedEvent:
+    return RecordedEvent({"trace": {"trace": {"orchestrationTrace": {"modelInvocationOutput": {
+        "metadata": {"usage": {"inputToken": input_tokens, "outputToken": output_tokens}}
+    }}}}})
+
+
+def text_turn(response_chars: int = 2000, chunk_chars: int = 40, first_byte_ms: float = 300.0,
+              chunk_delay_ms: float = 5.0, traces: int = 3) -> Recording:
+    """A plain answer streamed in small chunks, with a few orchestration traces."""
+    events = [RecordedEvent({"trace": {"trace": {"orchestrationTrace": {"rationale": {"text": "thinking"}}}}})
+              for _ in range(traces)]
+    events += _text_events(("lorem ipsum dolor sit amet " * (response_chars // 27 + 1))[:response_chars],
+                           chunk_chars, chunk_delay_ms)
+    events.append(_usage_trace(1500, response_chars // 4))
+    return Recording("text_turn", [RecordedInvocation(events, first_byte_ms)])
+
+
+def tool_turn(server_hash: str, tool_name: str = "bench_tool", tool_calls: int = 3,
+              tool_parameters: Optional[Dict[str, Any]] = None, response_chars: int = 1000,
+              chunk_chars: int = 40, first_byte_ms: float = 300.0, chunk_delay_ms: float = 5.0) -> Recording:
+    """
+    A turn that calls an MCP tool tool_calls times in sequence before answering.
+    The tool is addressed with the /b.{server_hash}.{tool_name} path Bond registers.
+    """
+    parameters = [{"name": k, "type": "string", "value": str(v)} for k, v in (tool_parameters or {}).items()]
+    invocations = []
+    for _ in range(tool_calls):
+        invocations.append(RecordedInvocation([
+            _usage_trace(1500, 50),
+            RecordedEvent({"returnControl": {
+                "invocationId": str(uuid.uuid4()),
+                "invocationInputs": [{"apiInvocationInput": {
+                    "actionGroup": "bench_tools",
+                    "apiPath": f"/b.{server_hash}.{tool_name}",
+                    "httpMethod": "POST",
+                    "parameters": parameters,
+                }}],
+            }}),
+        ], first_byte_ms))
+    events = _text_events(("tool result summary " * (response_chars // 20 + 1))[:response_chars], chunk_chars, chunk_delay_ms)
+    events.append(_usage_trace(3000, response_chars // 4))
+    invocations.append(RecordedInvocation(events, first_byte_ms))
+    return Recording("tool_turn", invocations)
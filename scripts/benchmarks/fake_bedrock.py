@@ -0,0 +1,207 @@
+"""
+Local stand-ins for the AWS clients BedrockProvider uses.
+
+FakeBedrockAgentRuntime replays recorded event streams from invoke_agent,
+including returnControl continuations, with the recorded (or overridden)
+pacing. FakeBedrockAgentClient answers get_agent, FakeBedrockRuntime answers
+converse, and InMemoryS3 keeps objects in a dict. Anything else raises
+NotImplementedError so a benchmark never silently measures a no-op.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Iterator, Optional, Union
+
+from botocore.exceptions import ClientError
+
+from .event_streams import Recording, RecordedInvocation
+
+RecordingSource = Union[Recording, Callable[[dict], Recording]]
+
+
+class _Unsupported:
+    service = "aws"
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        def unsupported(*args, **kwargs):
+            raise NotImplementedError(f"{self.service}.{name} is not available in the benchmark harness")
+        return unsupported
+
+
+class FakeBedrockAgentRuntime(_Unsupported):
+    """
+    invoke_agent replays a Recording. The first call of a turn gets the first
+    invocation; each continuation (a request carrying
+    returnControlInvocationResults) gets the next one for that session.
+
+    latency_scale multiplies every recorded delay (0 replays as fast as the
+    consumer can read); first_byte_ms and chunk_delay_ms override the recorded
+    values when set.
+    """
+    service = "bedrock-agent-runtime"
+
+    def __init__(self, recording: RecordingSource, latency_scale: float = 1.0,
+                 first_byte_ms: Optional[float] = None, chunk_delay_ms: Optional[float] = None):
+        self.recording = recording
+        self.latency_scale = latency_scale
+        self.first_byte_ms = first_byte_ms
+        self.chunk_delay_ms = chunk_delay_ms
+        self.calls = 0
+        self._sessions: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def _next_invocation(self, request: dict) -> RecordedInvocation:
+        session_id = request.get("sessionId", "")
+        continuation = bool(request.get("sessionState", {}).get("returnControlInvocationResults"))
+        with self._lock:
+            self.calls += 1
+            if continuation and session_id in self._sessions:
+                recording, index = self._sessions[session_id]
+                index += 1
+            else:
+                recording = self.recording(request) if callable(self.recording) else self.recording
+                index = 0
+            if index >= len(recording.invocations):
+                raise RuntimeError(f"Recording {recording.name!r} has no invocation {index} for session {session_id}")
+            self._sessions[session_id] = (recording, index)
+        return recording.invocations[index]
+
+    def _sleep(self, recorded_ms: float, override_ms: Optional[float]) -> None:
+        delay = (recorded_ms if override_ms is None else override_ms) * self.latency_scale / 1000
+        if delay > 0:
+            time.sleep(delay)
+
+    def _stream(self, invocation: RecordedInvocation) -> Iterator[dict]:
+        for recorded in invocation.events:
+            override = self.chunk_delay_ms if "chunk" in recorded.event else None
+            self._sleep(recorded.delay_ms, override)
+            yield recorded.event
+
+    def invoke_agent(self, **request) -> dict:
+        invocation = self._next_invocation(request)
+        self._sleep(invocation.first_byte_ms, self.first_byte_ms)
+        return {
+            "completion": self._stream(invocation),
+            "sessionId": request.get("sessionId"),
+            "contentType": "application/json",
+        }
+
+    def retrieve(self, **request) -> dict:
+        return {"retrievalResults": []}
+
+
+class FakeBedrockAgentClient(_Unsupported):
+    """Control-plane client; only get_agent is needed to build a BedrockAgent."""
+    service = "bedrock-agent"
+
+    def __init__(self, model: str = "us.anthropic.claude-sonnet-4-20250514-v1:0",
+                 instruction: str = "You are a helpful assistant used for benchmarking."):
+        self.model = model
+        self.instruction = instruction
+
+    def get_agent(self, agentId: str) -> dict:
+        return {"agent": {
+            "agentId": agentId,
+            "agentName": f"bench-{agentId}",
+            "foundationModel": self.model,
+            "instruction": self.instruction,
+            "description": "Benchmark agent",
+            "agentStatus": "PREPARED",
+        }}
+
+
+class FakeBedrockRuntime(_Unsupported):
+    """converse for compaction summaries and image analysis."""
+    service = "bedrock-runtime"
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency_ms = latency_ms
+
+    def converse(self, **request) -> dict:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        return {
+            "output": {"message": {"role": "assistant", "content": [{"text": "Summary of the conversation so far."}]}},
+            "usage": {"inputTokens": 1000, "outputTokens": 20},
+            "stopReason": "end_turn",
+        }
+
+
+class _Body:
+    def __init__(self, data: bytes):
+        self._data = data
+
+    def read(self) -> bytes:
+        return self._data
+
+
+class _Meta:
+    def __init__(self, region_name: str):
+        self.region_name = region_name
+
+
+class InMemoryS3(_Unsupported):
+    """The subset of the S3 client BedrockFiles and BedrockVectorStores call."""
+    service = "s3"
+
+    def __init__(self, region_name: str = "us-east-1"):
+        self.meta = _Meta(region_name)
+        self.objects: Dict[tuple, bytes] = {}
+        self.buckets = set()
+        self._lock = threading.Lock()
+
+    def _missing(self, operation: str, key: str):
+        return ClientError({"Error": {"Code": "404", "Message": f"{key} not found"}}, operation)
+
+    def head_bucket(self, Bucket: str) -> dict:
+        if Bucket not in self.buckets:
+            raise ClientError({"Error": {"Code": "404", "Message": "Not Found"}}, "HeadBucket")
+        return {}
+
+    def create_bucket(self, Bucket: str, **kwargs) -> dict:
+        self.buckets.add(Bucket)
+        return {}
+
+    def get_bucket_location(self, Bucket: str) -> dict:
+        return {"LocationConstraint": self.meta.region_name}
+
+    def put_object(self, Bucket: str, Key: str, Body=b"", **kwargs) -> dict:
+        data = Body.encode() if isinstance(Body, str) else (Body.read() if hasattr(Body, "read") else bytes(Body))
+        with self._lock:
+            self.objects[(Bucket, Key)] = data
+        return {}
+
+    def upload_fileobj(self, Fileobj, Bucket: str, Key: str, ExtraArgs: Optional[dict] = None, **kwargs) -> None:
+        self.put_object(Bucket=Bucket, Key=Key, Body=Fileobj.read())
+
+    def get_object(self, Bucket: str, Key: str, **kwargs) -> dict:
+        with self._lock:
+            data = self.objects.get((Bucket, Key))
+        if data is None:
+            raise self._missing("GetObject", Key)
+        return {"Body": _Body(data), "ContentLength": len(data)}
+
+    def head_object(self, Bucket: str, Key: str, **kwargs) -> dict:
+        with self._lock:
+            data = self.objects.get((Bucket, Key))
+        if data is None:
+            raise self._missing("HeadObject", Key)
+        return {"ContentLength": len(data)}
+
+    def copy(self, CopySource: dict, Bucket: str, Key: str, ExtraArgs: Optional[dict] = None, **kwargs) -> None:
+        source = self.get_object(Bucket=CopySource["Bucket"], Key=CopySource["Key"])
+        self.put_object(Bucket=Bucket, Key=Key, Body=source["Body"].read())
+
+    def delete_object(self, Bucket: str, Key: str) -> dict:
+        with self._lock:
+            self.objects.pop((Bucket, Key), None)
+        return {}
+
+    def delete_objects(self, Bucket: str, Delete: dict) -> dict:
+        with self._lock:
+            for obj in Delete.get("Objects", []):
+                self.objects.pop((Bucket, obj["Key"]), None)
+        return {}
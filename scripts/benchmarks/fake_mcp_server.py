@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+MCP server with tunable tool latency and payload size, for benchmarks.
+
+Tools:
+- bench_tool(query, latency_ms, payload_bytes): sleeps, then returns a
+  payload of roughly payload_bytes. Defaults come from the command line so
+  recorded event streams don't need to carry them.
+- bench_records(count): returns count JSON records, to exercise the tool
+  result compaction path.
+
+Usage:
+    poetry run python -m scripts.benchmarks.fake_mcp_server --port 5599 --latency-ms 50 --payload-bytes 20000
+"""
+
+import argparse
+import asyncio
+
+from fastmcp import FastMCP
+
+DEFAULT_LATENCY_MS = 50.0
+DEFAULT_PAYLOAD_BYTES = 2000
+
+
+def build_server(default_latency_ms: float = DEFAULT_LATENCY_MS,
+                 default_payload_bytes: int = DEFAULT_PAYLOAD_BYTES) -> FastMCP:
+    mcp = FastMCP("Bond Benchmark MCP Server")
+
+    @mcp.tool()
+    async def bench_tool(query: str = "", latency_ms: float = -1, payload_bytes: int = -1) -> str:
+        """Return a payload of the requested size after the requested delay."""
+        delay = default_latency_ms if latency_ms < 0 else latency_ms
+        size = default_payload_bytes if payload_bytes < 0 else payload_bytes
+        if delay:
+            await asyncio.sleep(delay / 1000)
+        unit = f"result for {query or 'query'}; "
+        return (unit * (size // len(unit) + 1))[:size]
+
+    @mcp.tool()
+    async def bench_records(count: int = 50) -> list:
+        """Return count small records."""
+        return [{"id": i, "name": f"record-{i}", "status": "open", "score": i % 7} for i in range(count)]
+
+    return mcp
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5599)
+    parser.add_argument("--latency-ms", type=float, default=DEFAULT_LATENCY_MS)
+    parser.add_argument("--payload-bytes", type=int, default=DEFAULT_PAYLOAD_BYTES)
+    args = parser.parse_args()
+
+    server = build_server(args.latency_ms, args.payload_bytes)
+    server.run(transport="streamable-http", host=args.host, port=args.port, show_banner=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+"""
+Benchmark harness: runs the real app against local stand-ins and drives
+load scenarios over HTTP.
+
+BenchmarkHarness starts, in order:
+- the fake MCP server (a fastmcp subprocess) when a scenario needs tools
+- a BedrockProvider whose AWS clients are the fakes from fake_bedrock
+- the FastAPI app under uvicorn on a local port, so streaming, threadpool
+  and middleware costs are all included
+
+Scenarios are async functions that take the harness and return a
+ScenarioResult. Query counts come from the app's own metrics registry
+(bond_http_request_db_statements), so nothing is patched to count them.
+"""
+
+import asyncio
+import logging
+import os
+import resource
+import socket
+import statistics
+import subprocess  # nosec B404 - starts the local fake MCP server
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+from .event_streams import Recording, text_turn, tool_turn
+from .fake_bedrock import (
+    FakeBedrockAgentClient,
+    FakeBedrockAgentRuntime,
+    FakeBedrockRuntime,
+    InMemoryS3,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+MCP_SERVER_NAME = "bench"
+BENCH_USER_ID = "bench-user"
+BENCH_USER_EMAIL = "bench@example.com"
+TEXT_AGENT_ID = "bench_text_agent"
+TOOL_AGENT_ID = "bench_tool_agent"
+# Bedrock agent ids the fake runtime uses to pick a recording
+TEXT_BEDROCK_AGENT_ID = "BENCHTEXT"
+TOOL_BEDROCK_AGENT_ID = "BENCHTOOL"
+
+
+@dataclass
+class HarnessOptions:
+    latency_scale: float = 1.0
+    first_byte_ms: Optional[float] = None
+    chunk_delay_ms: Optional[float] = None
+    response_chars: int = 2000
+    tool_calls: int = 3
+    mcp_latency_ms: float = 50.0
+    mcp_payload_bytes: int = 2000
+    start_mcp_server: bool = True
+    # False builds the provider and seeds data without starting uvicorn (see replay.py)
+    serve_app: bool = True
+    # Replay this recording for every turn instead of the synthetic ones
+    recording: Optional[Recording] = None
+    # Use a real database (e.g. Postgres) instead of a throwaway SQLite file
+    metadata_db_url: Optional[str] = None
+
+
+# --- Provider ---
+
+def _benchmark_provider_class(runtime, agent_client, bedrock_runtime, s3):
+    from bondable.bond.providers.bedrock.BedrockProvider import BedrockProvider
+
+    class _BenchmarkProvider(BedrockProvider):
+        def _init_aws_clients(self):
+            self.aws_region = os.getenv("AWS_REGION", "us-east-1")
+            self.bedrock_client = FakeBedrockAgentClient()
+            self.bedrock_agent_client = agent_client
+            self.bedrock_runtime_client = bedrock_runtime
+            self.bedrock_agent_runtime_client = runtime
+            self.s3_client = s3
+
+        @classmethod
+        def provider(cls):
+            return cls()
+
+    return _BenchmarkProvider
+
+
+# --- Results ---
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lower, upper = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (k - lower)
+
+
+def rss_mb() -> float:
+    """Current resident set size of this process, in MB."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        return peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    concurrency: int
+    duration_s: float = 0.0
+    latencies_ms: List[float] = field(default_factory=list)
+    ttfb_ms: List[float] = field(default_factory=list)
+    errors: int = 0
+    db_statements: float = 0.0
+    rss_start_mb: float = 0.0
+    rss_end_mb: float = 0.0
+    notes: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies_ms) + self.errors
+
+    def summary(self) -> Dict[str, Any]:
+        ok = len(self.latencies_ms)
+        summary = {
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": round(self.errors / self.requests, 4) if self.requests else 0.0,
+            "concurrency": self.concurrency,
+            "throughput_rps": round(ok / self.duration_s, 3) if self.duration_s else 0.0,
+            "p50_ms": round(percentile(self.latencies_ms, 50), 2),
+            "p95_ms": round(percentile(self.latencies_ms, 95), 2),
+            "p99_ms": round(percentile(self.latencies_ms, 99), 2),
+            "mean_ms": round(statistics.fmean(self.latencies_ms), 2) if ok else 0.0,
+            "db_statements_per_request": round(self.db_statements / self.requests, 2) if self.requests else 0.0,
+            "rss_start_mb": round(self.rss_start_mb, 1),
+            "rss_end_mb": round(self.rss_end_mb, 1),
+            "rss_peak_mb": round(peak_rss_mb(), 1),
+        }
+        if self.ttfb_ms:
+            summary.update({
+                "ttfb_p50_ms": round(percentile(self.ttfb_ms, 50), 2),
+                "ttfb_p95_ms": round(percentile(self.ttfb_ms, 95), 2),
+                "ttfb_p99_ms": round(percentile(self.ttfb_ms, 99), 2),
+            })
+        summary.update(self.notes)
+        return summary
+
+
+# --- Harness ---
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for_port(port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            if s.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.05)
+    raise TimeoutError(f"Nothing listening on port {port} after {timeout}s")
+
+
+class BenchmarkHarness:
+    """Context manager that owns the app server, fakes and seeded data for a run."""
+
+    def __init__(self, options: Optional[HarnessOptions] = None):
+        self.options = options or HarnessOptions()
+        self.base_url = ""
+        self.headers: Dict[str, str] = {}
+        self.provider = None
+        self.runtime: Optional[FakeBedrockAgentRuntime] = None
+        self.tool_server_hash = ""
+        self._mcp_process: Optional[subprocess.Popen] = None
+        self._server = None
+        self._server_thread: Optional[threading.Thread] = None
+        self._db_file: Optional[str] = None
+
+    # -- setup --
+
+    def _configure_environment(self, mcp_port: Optional[int]) -> None:
+        if self.options.metadata_db_url:
+            os.environ["METADATA_DB_URL"] = self.options.metadata_db_url
+        else:
+            self._db_file = tempfile.NamedTemporaryFile(prefix="bond-bench-", suffix=".db", delete=False).name
+            os.environ["METADATA_DB_URL"] = f"sqlite:///{self._db_file}"
+        os.environ.setdefault("JWT_SECRET_KEY", uuid.uuid4().hex + uuid.uuid4().hex)
+        os.environ.setdefault("AWS_REGION", "us-east-1")
+        os.environ.setdefault("OAUTH2_ENABLED_PROVIDERS", "cognito")
+        os.environ.setdefault("BEDROCK_S3_BUCKET", "bond-bench-files")
+        if mcp_port:
+            os.environ["BOND_MCP_CONFIG"] = (
+                f'{{"mcpServers": {{"{MCP_SERVER_NAME}": {{"url": "http://127.0.0.1:{mcp_port}/mcp"}}}}}}'
+            )
+
+    def _start_mcp_server(self) -> int:
+        port = _free_port()
+        self._mcp_process = subprocess.Popen(  # nosec B603 - fixed module path, local only
+            [sys.executable, "-m", "scripts.benchmarks.fake_mcp_server", "--port", str(port),
+             "--latency-ms", str(self.options.mcp_latency_ms),
+             "--payload-bytes", str(self.options.mcp_payload_bytes)],
+            cwd=REPO_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        _wait_for_port(port)
+        return port
+
+    def _recording_for(self, request: dict) -> Recording:
+        opts = self.options
+        if opts.recording is not None:
+            return opts.recording
+        if request.get("agentId") == TOOL_BEDROCK_AGENT_ID:
+            return tool_turn(self.tool_server_hash, tool_calls=opts.tool_calls, response_chars=opts.response_chars // 2)
+        return text_turn(response_chars=opts.response_chars)
+
+    def _seed(self) -> None:
+        from bondable.bond.providers.metadata import AgentRecord
+        from bondable.bond.providers.bedrock.BedrockMetadata import BedrockAgentOptions
+
+        self.provider.users.get_or_create_user(
+            user_id=BENCH_USER_ID, email=BENCH_USER_EMAIL, name="Bench", sign_in_method="cognito")
+        session = self.provider.metadata.get_db_session()
+        try:
+            for agent_id, bedrock_id in ((TEXT_AGENT_ID, TEXT_BEDROCK_AGENT_ID), (TOOL_AGENT_ID, TOOL_BEDROCK_AGENT_ID)):
+                if session.query(AgentRecord).filter_by(agent_id=agent_id).first():
+                    continue
+                session.add(AgentRecord(agent_id=agent_id, name=agent_id, owner_user_id=BENCH_USER_ID))
+                session.add(BedrockAgentOptions(
+                    agent_id=agent_id, bedrock_agent_id=bedrock_id, bedrock_agent_alias_id="BENCHALIAS",
+                    tools={}, tool_resources={}, mcp_tools=[], mcp_resources=[], agent_metadata={},
+                ))
+            session.commit()
+        finally:
+            session.close()
+
+    def _start_app(self) -> None:
+        import uvicorn
+        from bondable.rest.main import app
+
+        port = _free_port()
+        config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="on")
+        self._server = uvicorn.Server(config)
+        self._server_thread = threading.Thread(target=self._server.run, name="bench-uvicorn", daemon=True)
+        self._server_thread.start()
+        _wait_for_port(port)
+        self.base_url = f"http://127.0.0.1:{port}"
+
+    def __enter__(self) -> "BenchmarkHarness":
+        if REPO_ROOT not in sys.path:
+            sys.path.insert(0, REPO_ROOT)
+        mcp_port = self._start_mcp_server() if self.options.start_mcp_server else None
+        self._configure_environment(mcp_port)
+
+        from bondable.bond.config import Config
+        from bondable.bond.providers.bedrock.BedrockMCP import _hash_server_name
+        from bondable.rest.utils.auth import create_access_token
+
+        self.tool_server_hash = _hash_server_name(MCP_SERVER_NAME)
+        opts = self.options
+        self.runtime = FakeBedrockAgentRuntime(
+            self._recording_for, latency_scale=opts.latency_scale,
+            first_byte_ms=opts.first_byte_ms, chunk_delay_ms=opts.chunk_delay_ms,
+        )
+        provider_class = _benchmark_provider_class(
+            self.runtime, FakeBedrockAgentClient(), FakeBedrockRuntime(), InMemoryS3())
+        # Config.get_provider() returns an already-set provider, so the app's
+        # dependencies pick this one up instead of building a real one
+        self.provider = provider_class.provider()
+        Config.config().provider = self.provider
+        self._seed()
+        if opts.serve_app:
+            self._start_app()
+
+        token = create_access_token(data={
+            "sub": BENCH_USER_EMAIL, "name": "Bench", "provider": "cognito", "user_id": BENCH_USER_ID,
+        }, expires_delta=timedelta(hours=6))
+        self.headers = {"Authorization": f"Bearer {token}"}
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._server is not None:
+            self._server.should_exit = True
+            self._server_thread.join(timeout=10)
+        if self._mcp_process is not None:
+            self._mcp_process.terminate()
+            try:
+                self._mcp_process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._mcp_process.kill()
+        if self.provider is not None:
+            self.provider.metadata.engine.dispose()
+        if self._db_file and os.path.exists(self._db_file):
+            os.remove(self._db_file)
+
+    # -- helpers for scenarios --
+
+    def create_thread(self, name: str = "Benchmark") -> str:
+        return self.provider.threads.create_thread(user_id=BENCH_USER_ID, name=name).thread_id
+
+    def seed_history(self, thread_id: str, messages: int, chars_per_message: int = 400) -> None:
+        """Bulk-insert a long conversation directly, without going through chat."""
+        from bondable.bond.providers.bedrock.BedrockMetadata import BedrockMessage
+
+        session_id = self.provider.threads.get_thread_session_id(thread_id)
+        body = ("history " * (chars_per_message // 8 + 1))[:chars_per_message]
+        session = self.provider.metadata.get_db_session()
+        try:
+            session.bulk_save_objects([
+                BedrockMessage(
+                    id=str(uuid.uuid4()), thread_id=thread_id, user_id=BENCH_USER_ID, session_id=session_id,
+                    role="user" if i % 2 == 0 else "assistant", type="text",
+                    content={"text": f"{i}: {body}"}, message_index=i, message_metadata={},
+                )
+                for i in range(messages)
+            ])
+            session.commit()
+        finally:
+            session.close()
+
+    def db_statements(self) -> float:
+        """Total SQL statements the app has attributed to requests so far."""
+        from bondable.bond.metrics import HTTP_REQUEST_DB_STATEMENTS
+        return sum(series["value"] for series in HTTP_REQUEST_DB_STATEMENTS.snapshot())
+
+    def run(self, scenario, **kwargs) -> ScenarioResult:
+        statements_before = self.db_statements()
+        rss_start = rss_mb()
+        result = asyncio.run(scenario(self, **kwargs))
+        result.db_statements = self.db_statements() - statements_before
+        result.rss_start_mb = rss_start
+        result.rss_end_mb = rss_mb()
+        return result
@@ -0,0 +1,197 @@
+"""
+Capture real invoke_agent completion streams as bond-event-stream recordings.
+
+RecordingAgentRuntime wraps a bedrock-agent-runtime client. Every event of
+every invoke_agent stream is scrubbed of PII and timed; when a chat turn
+finishes (an invocation that ends without returnControl) the turn's
+invocations are written to one .jsonl.gz file.
+
+To record from a running app, point the provider class at the recording
+subclass and choose an output directory:
+
+    BOND_PROVIDER_CLASS=scripts.benchmarks.recorder.RecordingBedrockProvider \\
+    BEDROCK_EVENT_RECORD_DIR=/tmp/recordings \\
+    poetry run uvicorn bondable.rest.main:app --reload
+
+Recordings can then be replayed with scripts.benchmarks.replay or served by
+FakeBedrockAgentRuntime.
+"""
+
+import functools
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+from .event_streams import RecordedEvent, RecordedInvocation, Recording, write_recording
+
+LOGGER = logging.getLogger(__name__)
+
+
+class PiiScrubber:
+    """
+    Replaces common PII and secrets in every string of an event with fixed
+    placeholders. Chunk bytes are scrubbed as text; file bytes are replaced
+    with zero bytes of the same length so payload sizes stay realistic.
+
+    Scrubbing is per event, so a value split across two chunks can survive;
+    review recordings before sharing them outside the team.
+    """
+
+    PATTERNS = (
+        ("jwt", re.compile(r"\beyJ[\w-]+\.[\w-]+\.[\w-]+")),
+        ("aws_key", re.compile(r"\b(?:AKIA|ASIA)[0-9A-Z]{16}\b")),
+        ("bearer", re.compile(r"(?i)\bbearer\s+[\w.~+/-]+=*")),
+        ("email", re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")),
+        ("card", re.compile(r"\b(?:\d[ -]?){13,16}\b")),
+        ("ssn", re.compile(r"\b\d{3}-\d{2}-\d{4}\b")),
+        ("phone", re.compile(r"(?<!\w)(?:\+?\d{1,2}[ .-]?)?\(?\d{3}\)?[ .-]?\d{3}[ .-]?\d{4}\b")),
+        ("ip", re.compile(r"\b(?:\d{1,3}\.){3}\d{1,3}\b")),
+        ("aws_account", re.compile(r"(?<=:)\d{12}(?=:)")),
+    )
+
+    def __init__(self, extra_terms: Optional[List[str]] = None):
+        # Known sensitive values (user names, customer names) to replace verbatim
+        self.extra_terms = [t for t in (extra_terms or []) if t]
+
+    def scrub_text(self, text: str) -> str:
+        for term in self.extra_terms:
+            text = text.replace(term, "[REDACTED]")
+        for name, pattern in self.PATTERNS:
+            text = pattern.sub(f"[{name.upper()}]", text)
+        return text
+
+    def scrub(self, value: Any, blank_bytes: bool = False) -> Any:
+        if isinstance(value, (bytes, bytearray)):
+            if blank_bytes:
+                return bytes(len(value))
+            # surrogateescape keeps a multi-byte character split across chunks intact
+            return self.scrub_text(bytes(value).decode("utf-8", "surrogateescape")).encode("utf-8", "surrogateescape")
+        if isinstance(value, str):
+            return self.scrub_text(value)
+        if isinstance(value, dict):
+            return {k: self.scrub(v, blank_bytes) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self.scrub(v, blank_bytes) for v in value]
+        return value
+
+    def scrub_event(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: self.scrub(v, blank_bytes=(k == "files")) for k, v in event.items()}
+
+
+def _continuation_results(request: dict) -> List[str]:
+    """Pull the tool result strings out of a continuation request."""
+    results = []
+    for item in request.get("sessionState", {}).get("returnControlInvocationResults", []) or []:
+        tool_result = item.get("apiResult") or item.get("functionResult") or item
+        body = tool_result.get("responseBody", {})
+        for content in body.values():
+            text = content.get("body", "") if isinstance(content, dict) else ""
+            try:
+                parsed = json.loads(text)
+            except (TypeError, ValueError):
+                parsed = None
+            results.append(parsed["result"] if isinstance(parsed, dict) and "result" in parsed else text)
+    return results
+
+
+class RecordingAgentRuntime:
+    """
+    Delegates everything to the wrapped client; invoke_agent streams are
+    recorded on the way through without changing what the caller sees.
+    """
+
+    def __init__(self, client, output_dir: str, scrubber: Optional[PiiScrubber] = None):
+        self._client = client
+        self.output_dir = output_dir
+        self.scrubber = scrubber or PiiScrubber()
+        self._turns: Dict[str, Recording] = {}
+        self._lock = threading.Lock()
+        os.makedirs(output_dir, exist_ok=True)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    def invoke_agent(self, **request) -> dict:
+        started = time.monotonic()
+        response = self._client.invoke_agent(**request)
+        invocation = RecordedInvocation(
+            first_byte_ms=(time.monotonic() - started) * 1000,
+            tool_results=[self.scrubber.scrub_text(r) for r in _continuation_results(request)],
+        )
+        session_id = request.get("sessionId", "")
+        with self._lock:
+            if not invocation.tool_results or session_id not in self._turns:
+                self._turns[session_id] = Recording(
+                    name=f"{request.get('agentId', 'agent')}-{uuid.uuid4().hex[:8]}",
+                    invocations=[],
+                    metadata={
+                        "agent_id": request.get("agentId"),
+                        "recorded_at": datetime.now(timezone.utc).isoformat(),
+                        "scrubbed": True,
+                    },
+                )
+            self._turns[session_id].invocations.append(invocation)
+        response["completion"] = self._record(response["completion"], session_id, invocation)
+        return response
+
+    def _record(self, completion, session_id: str, invocation: RecordedInvocation) -> Iterator[dict]:
+        last = time.monotonic()
+        returned_control = False
+        try:
+            for event in completion:
+                now = time.monotonic()
+                invocation.events.append(RecordedEvent(self.scrubber.scrub_event(event), (now - last) * 1000))
+                returned_control = returned_control or "returnControl" in event
+                yield event
+                # Time spent by the consumer between events is not Bedrock latency
+                last = time.monotonic()
+        finally:
+            if not returned_control:
+                self._finish_turn(session_id)
+
+    def _finish_turn(self, session_id: str) -> None:
+        with self._lock:
+            recording = self._turns.pop(session_id, None)
+        if recording is None:
+            return
+        path = os.path.join(self.output_dir, f"{recording.name}.jsonl.gz")
+        try:
+            write_recording(path, recording)
+            LOGGER.info(f"Recorded {len(recording.invocations)} invocation(s) to {path}")
+        except OSError as e:
+            LOGGER.warning(f"Could not write event stream recording {path}: {e}")
+
+
+@functools.lru_cache(maxsize=None)
+def _recording_provider_class():
+    from bondable.bond.cache import bond_cache
+    from bondable.bond.providers.bedrock.BedrockProvider import BedrockProvider
+
+    class RecordingBedrockProvider(BedrockProvider):
+        """BedrockProvider whose agent runtime client records every stream to BEDROCK_EVENT_RECORD_DIR."""
+
+        def _init_aws_clients(self):
+            super()._init_aws_clients()
+            output_dir = os.getenv("BEDROCK_EVENT_RECORD_DIR", "recordings")
+            self.bedrock_agent_runtime_client = RecordingAgentRuntime(self.bedrock_agent_runtime_client, output_dir)
+            LOGGER.warning(f"Recording Bedrock event streams to {output_dir}")
+
+        @classmethod
+        @bond_cache
+        def provider(cls):
+            return RecordingBedrockProvider()
+
+    return RecordingBedrockProvider
+
+
+def __getattr__(name):
+    # Resolved lazily so importing the recorder doesn't import bondable
+    if name == "RecordingBedrockProvider":
+        return _recording_provider_class()
+    raise AttributeError(name)
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded chat turn through the real BedrockAgent code paths,
+optionally under a profiler.
+
+stream_response runs in-process against the benchmark provider. The fake
+agent runtime replays the recording with no delays, so the time measured is
+Bond's own work: event parsing, chunk handling, bond message tags, tool
+result compaction and message persistence. MCP calls don't leave the
+process. Each call returns the tool result stored in the recording, or a
+synthetic payload of --tool-payload-bytes when the recording has none.
+
+Examples:
+    # Wall time per turn, no profiler
+    poetry run python -m scripts.benchmarks.replay recordings/turn.jsonl.gz --iterations 50
+
+    # cProfile, top 40 functions by own time, plus a .prof for snakeviz
+    poetry run python -m scripts.benchmarks.replay turn.jsonl.gz --profiler cprofile --sort tottime --profile-output turn.prof
+
+    # pyinstrument (pip install pyinstrument), HTML call tree
+    poetry run python -m scripts.benchmarks.replay turn.jsonl.gz --profiler pyinstrument --profile-output turn.html
+
+    # No recording at hand: use the synthetic tool turn
+    poetry run python -m scripts.benchmarks.replay --synthetic tool_turn
+"""
+
+import argparse
+import collections
+import contextlib
+import cProfile
+import io
+import logging
+import os
+import pstats
+import statistics
+import sys
+import time
+from typing import Dict, Iterator, List
+
+from .event_streams import Recording, read_recording, text_turn, tool_turn
+from .harness import MCP_SERVER_NAME, TEXT_AGENT_ID, BenchmarkHarness, HarnessOptions
+
+# Resolves /b.{hash}.{tool} paths in synthetic recordings; tool calls never reach it
+REPLAY_MCP_CONFIG = f'{{"mcpServers": {{"{MCP_SERVER_NAME}": {{"url": "http://127.0.0.1:9/mcp"}}}}}}'
+
+
+class RecordedToolResults:
+    """Stands in for execute_mcp_tool_sync, returning the recording's tool results in order."""
+
+    def __init__(self, recording: Recording, payload_bytes: int):
+        self.results = [r for invocation in recording.invocations for r in invocation.tool_results]
+        unit = "synthetic tool result; "
+        self.synthetic = (unit * (payload_bytes // len(unit) + 1))[:payload_bytes]
+        self.reset()
+
+    def reset(self) -> None:
+        self._pending = collections.deque(self.results)
+
+    def __call__(self, mcp_config, tool_name, parameters=None, current_user=None, jwt_token=None,
+                 target_server=None) -> Dict:
+        return {"success": True, "result": self._pending.popleft() if self._pending else self.synthetic}
+
+
+@contextlib.contextmanager
+def _tools_replaced(tool_results: RecordedToolResults) -> Iterator[None]:
+    from bondable.bond.providers.bedrock import BedrockAgent as agent_module
+    original = agent_module.execute_mcp_tool_sync
+    agent_module.execute_mcp_tool_sync = tool_results
+    try:
+        yield
+    finally:
+        agent_module.execute_mcp_tool_sync = original
+
+
+def _run_turn(agent, thread_id: str, tool_results: RecordedToolResults) -> int:
+    tool_results.reset()
+    output_bytes = 0
+    for piece in agent.stream_response(prompt="Replayed prompt", thread_id=thread_id):
+        output_bytes += len(piece)
+    return output_bytes
+
+
+def replay(recording: Recording, iterations: int, warmup: int, profiler: str,
+           tool_payload_bytes: int, sort: str, limit: int, profile_output: str = None) -> Dict:
+    os.environ.setdefault("BOND_MCP_CONFIG", REPLAY_MCP_CONFIG)
+    options = HarnessOptions(latency_scale=0, start_mcp_server=False, serve_app=False, recording=recording)
+    tool_results = RecordedToolResults(recording, tool_payload_bytes)
+
+    with BenchmarkHarness(options) as harness, _tools_replaced(tool_results):
+        agent = harness.provider.agents.get_agent(TEXT_AGENT_ID)
+        # Threads are created up front so the profile only covers stream_response
+        threads = [harness.create_thread(f"replay {i}") for i in range(warmup + iterations)]
+        for thread_id in threads[:warmup]:
+            _run_turn(agent, thread_id, tool_results)
+
+        durations: List[float] = []
+        output_bytes = 0
+        active = None
+        if profiler == "cprofile":
+            active = cProfile.Profile()
+            active.enable()
+        elif profiler == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                raise SystemExit("pyinstrument is not installed; pip install pyinstrument or use --profiler cprofile")
+            active = Profiler()
+            active.start()
+        try:
+            for thread_id in threads[warmup:]:
+                started = time.perf_counter()
+                output_bytes = _run_turn(agent, thread_id, tool_results)
+                durations.append((time.perf_counter() - started) * 1000)
+        finally:
+            if profiler == "cprofile":
+                active.disable()
+            elif profiler == "pyinstrument":
+                active.stop()
+
+    events = sum(len(invocation.events) for invocation in recording.invocations)
+    summary = {
+        "recording": recording.name,
+        "invocations": len(recording.invocations),
+        "events_per_turn": events,
+        "output_bytes_per_turn": output_bytes,
+        "iterations": iterations,
+        "mean_ms": round(statistics.fmean(durations), 3),
+        "min_ms": round(min(durations), 3),
+        "p50_ms": round(statistics.median(durations), 3),
+        "events_per_s": round(events * iterations / (sum(durations) / 1000), 1),
+    }
+
+    if profiler == "cprofile":
+        if profile_output:
+            active.dump_stats(profile_output)
+        stream = io.StringIO()
+        pstats.Stats(active, stream=stream).strip_dirs().sort_stats(sort).print_stats(limit)
+        summary["profile"] = stream.getvalue()
+    elif profiler == "pyinstrument":
+        if profile_output:
+            with open(profile_output, "w") as f:
+                f.write(active.output_html())
+        summary["profile"] = active.output_text(unicode=True, color=False)
+    return summary
+
+
+SYNTHETIC = {"text_turn": text_turn, "tool_turn": lambda: tool_turn("000000")}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("recording", nargs="?", help="Path to a .jsonl or .jsonl.gz recording")
+    parser.add_argument("--synthetic", choices=sorted(SYNTHETIC), help="Replay a generated recording instead")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--profiler", choices=("none", "cprofile", "pyinstrument"), default="none")
+    parser.add_argument("--sort", default="cumulative", help="pstats sort key for cProfile output")
+    parser.add_argument("--limit", type=int, default=40, help="Rows of cProfile output to print")
+    parser.add_argument("--profile-output", help="Write the raw profile (.prof for cProfile, .html for pyinstrument)")
+    parser.add_argument("--tool-payload-bytes", type=int, default=2000,
+                        help="Size of tool results when the recording has none")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    if bool(args.recording) == bool(args.synthetic):
+        parser.error("Give either a recording path or --synthetic")
+    recording = read_recording(args.recording) if args.recording else SYNTHETIC[args.synthetic]()
+    if args.verbose:
+        logging.basicConfig(level=logging.INFO, format="[%(asctime)s] %(levelname)s - %(name)s - %(message)s")
+    else:
+        # Logging calls still run and show up in the profile; only the output is suppressed
+        logging.disable(logging.INFO)
+
+    summary = replay(recording, args.iterations, args.warmup, args.profiler,
+                     args.tool_payload_bytes, args.sort, args.limit, args.profile_output)
+    profile = summary.pop("profile", None)
+    for key, value in summary.items():
+        print(f"{key:<24}{value}")
+    if profile:
+        print()
+        print(profile)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
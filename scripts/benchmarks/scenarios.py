@@ -0,0 +1,137 @@
+"""
+Load scenarios. Each one is an async function (harness, concurrency, turns,
+**options) -> ScenarioResult that drives the running app over HTTP.
+
+- chat_stream: concurrent POST /chat turns against the text agent; records
+  time to first byte and time to end of stream
+- tool_heavy: the same, against the tool agent, so every turn goes through
+  returnControl continuations and real MCP calls
+- large_history: chat and GET /threads/{id}/messages on threads that already
+  hold history_messages messages
+- large_upload: concurrent multipart POST /files of upload_mb each
+"""
+
+import asyncio
+import time
+import uuid
+from typing import Awaitable, Callable, List
+
+import httpx
+
+from .harness import TEXT_AGENT_ID, TOOL_AGENT_ID, BenchmarkHarness, ScenarioResult
+
+REQUEST_TIMEOUT_S = 300.0
+
+
+async def _run_workers(result: ScenarioResult, concurrency: int, turns: int,
+                       work: Callable[[int, int], Awaitable[None]]) -> ScenarioResult:
+    """Run turns iterations of work on each of concurrency workers, timing the whole batch."""
+    async def worker(worker_id: int):
+        for turn in range(turns):
+            await work(worker_id, turn)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    result.duration_s = time.perf_counter() - started
+    return result
+
+
+async def _stream_chat(client: httpx.AsyncClient, harness: BenchmarkHarness, result: ScenarioResult,
+                       agent_id: str, thread_id: str, prompt: str) -> None:
+    started = time.perf_counter()
+    first_byte = None
+    try:
+        async with client.stream("POST", f"{harness.base_url}/chat", headers=harness.headers,
+                                 json={"thread_id": thread_id, "agent_id": agent_id, "prompt": prompt}) as response:
+            async for _ in response.aiter_bytes():
+                if first_byte is None:
+                    first_byte = time.perf_counter()
+            if response.status_code != 200:
+                result.errors += 1
+                return
+    except httpx.HTTPError:
+        result.errors += 1
+        return
+    finished = time.perf_counter()
+    result.latencies_ms.append((finished - started) * 1000)
+    result.ttfb_ms.append(((first_byte or finished) - started) * 1000)
+
+
+async def _chat_scenario(name: str, agent_id: str, harness: BenchmarkHarness,
+                         concurrency: int, turns: int) -> ScenarioResult:
+    result = ScenarioResult(name, concurrency)
+    # One thread per worker, like concurrent users each in their own conversation
+    threads = [harness.create_thread(f"{name} {i}") for i in range(concurrency)]
+    async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT_S) as client:
+        async def work(worker_id: int, turn: int):
+            await _stream_chat(client, harness, result, agent_id, threads[worker_id], f"Question {turn}")
+        return await _run_workers(result, concurrency, turns, work)
+
+
+async def chat_stream(harness: BenchmarkHarness, concurrency: int, turns: int, **options) -> ScenarioResult:
+    return await _chat_scenario("chat_stream", TEXT_AGENT_ID, harness, concurrency, turns)
+
+
+async def tool_heavy(harness: BenchmarkHarness, concurrency: int, turns: int, **options) -> ScenarioResult:
+    result = await _chat_scenario("tool_heavy", TOOL_AGENT_ID, harness, concurrency, turns)
+    result.notes["tool_calls_per_turn"] = harness.options.tool_calls
+    return result
+
+
+async def large_history(harness: BenchmarkHarness, concurrency: int, turns: int,
+                        history_messages: int = 500, **options) -> ScenarioResult:
+    result = ScenarioResult("large_history", concurrency, notes={"history_messages": history_messages})
+    threads: List[str] = []
+    for i in range(concurrency):
+        thread_id = harness.create_thread(f"large_history {i}")
+        harness.seed_history(thread_id, history_messages)
+        threads.append(thread_id)
+
+    async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT_S) as client:
+        async def work(worker_id: int, turn: int):
+            thread_id = threads[worker_id]
+            await _stream_chat(client, harness, result, TEXT_AGENT_ID, thread_id, f"Follow-up {turn}")
+            started = time.perf_counter()
+            try:
+                response = await client.get(f"{harness.base_url}/threads/{thread_id}/messages",
+                                            headers=harness.headers, params={"limit": history_messages + 100})
+            except httpx.HTTPError:
+                result.errors += 1
+                return
+            if response.status_code != 200:
+                result.errors += 1
+                return
+            result.latencies_ms.append((time.perf_counter() - started) * 1000)
+        return await _run_workers(result, concurrency, turns, work)
+
+
+async def large_upload(harness: BenchmarkHarness, concurrency: int, turns: int,
+                       upload_mb: float = 5.0, **options) -> ScenarioResult:
+    result = ScenarioResult("large_upload", concurrency, notes={"upload_mb": upload_mb})
+    line = b"benchmark upload line with some text in it\n"
+    payload = (line * (int(upload_mb * 1024 * 1024) // len(line) + 1))[:int(upload_mb * 1024 * 1024)]
+
+    async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT_S) as client:
+        async def work(worker_id: int, turn: int):
+            # Unique contents per request so the upload is never deduplicated
+            body = payload + uuid.uuid4().hex.encode()
+            started = time.perf_counter()
+            try:
+                response = await client.post(f"{harness.base_url}/files", headers=harness.headers,
+                                             files={"file": (f"bench-{worker_id}-{turn}.txt", body, "text/plain")})
+            except httpx.HTTPError:
+                result.errors += 1
+                return
+            if response.status_code != 200:
+                result.errors += 1
+                return
+            result.latencies_ms.append((time.perf_counter() - started) * 1000)
+        return await _run_workers(result, concurrency, turns, work)
+
+
+SCENARIOS = {
+    "chat_stream": chat_stream,
+    "tool_heavy": tool_heavy,
+    "large_history": large_history,
+    "large_upload": large_upload,
+}
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for <_bondmessage> stream parsing.
+
+Compares BondMessageParser (bondable/bond/message_stream.py) with the
+per-chunk regex matching BrokerConnection used before it, which is kept
+here as _LegacyConnection. Both are fed the same synthetic stream, one
+publish per chunk, the way agents stream. Tags arrive as whole chunks, since
+the legacy code can only handle that. Each is timed as a whole connection
+(including the message queue and clobs) and as tag recognition alone.
+
+A last run feeds BrokerConnection the same stream re-cut into random chunk
+sizes, so tags are split across chunks. The legacy code cannot parse that.
+
+Examples:
+    poetry run python -m scripts.benchmarks.tag_parser
+    poetry run python -m scripts.benchmarks.tag_parser --messages 50 --chunks-per-message 2000 --chunk-chars 4
+"""
+
+import argparse
+import logging
+import queue
+import random
+import re
+import sys
+import time
+from typing import Callable, List
+
+from bondable.bond.broker import BondMessage, BrokerConnection
+from bondable.bond.message_stream import BondMessageParser
+
+
+class _LegacyConnection:
+    """BrokerConnection's parsing as it was before BondMessageParser, for comparison."""
+
+    def __init__(self):
+        self.msg_queue = queue.Queue()
+        self.current_msg = None
+
+    def is_bondmessage_start_tag(self, message: str):
+        pattern = r'^<\s*_bondmessage(?:\s+[\w:-]+="[^"]*")*\s*/?>$'
+        return bool(re.match(pattern, message.strip()))
+
+    def parse_bondmessage_start_tag(self, message: str):
+        pattern = r'^<\s*_bondmessage(?:\s+([\w:-]+)="([^"]*)")*\s*/?>$'
+        if not re.match(pattern, message.strip()):
+            return None
+        return dict(re.findall(r'([\w:-]+)="([^"]*)"', message))
+
+    def is_bondmessage_end_tag(self, message: str):
+        pattern = r'^</\s*_bondmessage\s*>$'
+        return bool(re.match(pattern, message.strip()))
+
+    def publish(self, message: str):
+        if self.is_bondmessage_start_tag(message):
+            attributes = self.parse_bondmessage_start_tag(message)
+            self.current_msg = BondMessage(
+                thread_id=attributes.get('thread_id'),
+                message_id=attributes.get('id'),
+                agent_id=attributes.get('agent_id'),
+                type=attributes.get('type'),
+                role=attributes.get('role'),
+                is_error=str(attributes.get('is_error')).lower() == 'true',
+                is_done=str(attributes.get('is_done')).lower() == 'true'
+            )
+            self.msg_queue.put(self.current_msg)
+        elif self.is_bondmessage_end_tag(message):
+            self.current_msg.clob.close()
+            self.current_msg = None
+        else:
+            self.current_msg.clob.put(message)
+
+
+def build_stream(messages: int, chunks_per_message: int, chunk_chars: int, seed: int = 1) -> List[str]:
+    """Chunks of a stream in which every tag is its own chunk."""
+    rng = random.Random(seed)
+    words = ["the", "agent", "returned", "a", "<b>table</b>", "of", "results", "x < y", "and", "links", "\n"]
+    chunks = []
+    for i in range(messages):
+        chunks.append(
+            f'<_bondmessage id="msg-{i}" thread_id="thread-1" agent_id="agent-1" type="text" '
+            f'role="assistant" is_error="false" is_done="{str(i == messages - 1).lower()}">'
+        )
+        for _ in range(chunks_per_message):
+            text = ""
+            while len(text) < chunk_chars:
+                text += rng.choice(words) + " "
+            chunks.append(text[:chunk_chars])
+        chunks.append('</_bondmessage>')
+    return chunks
+
+
+def rechunk(chunks: List[str], max_chars: int, seed: int = 2) -> List[str]:
+    """The same stream cut at random points, splitting tags across chunks."""
+    rng = random.Random(seed)
+    text = "".join(chunks)
+    result, pos = [], 0
+    while pos < len(text):
+        size = rng.randint(1, max_chars)
+        result.append(text[pos:pos + size])
+        pos += size
+    return result
+
+
+def _drain(conn) -> int:
+    count = 0
+    while not conn.msg_queue.empty():
+        message = conn.msg_queue.get_nowait()
+        if message is not None:
+            message.clob.get_content()
+            count += 1
+    return count
+
+
+def run_legacy(chunks: List[str]) -> int:
+    conn = _LegacyConnection()
+    for chunk in chunks:
+        conn.publish(chunk)
+    return _drain(conn)
+
+
+def run_legacy_regex_only(chunks: List[str]) -> int:
+    conn = _LegacyConnection()
+    tags = 0
+    for chunk in chunks:
+        if conn.is_bondmessage_start_tag(chunk):
+            conn.parse_bondmessage_start_tag(chunk)
+            tags += 1
+        elif conn.is_bondmessage_end_tag(chunk):
+            tags += 1
+    return tags
+
+
+def run_connection(chunks: List[str]) -> int:
+    conn = BrokerConnection(broker=None, thread_id="thread-1", subscriber_id="bench")
+    for chunk in chunks:
+        conn.publish(chunk)
+    return _drain(conn)
+
+
+def run_parser_only(chunks: List[str]) -> int:
+    parser = BondMessageParser()
+    events = 0
+    for chunk in chunks:
+        events += len(parser.feed(chunk))
+    return events + len(parser.close())
+
+
+def measure(fn: Callable[[List[str]], int], chunks: List[str], repeats: int) -> dict:
+    best = float("inf")
+    result = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = fn(chunks)
+        best = min(best, time.perf_counter() - started)
+    return {"seconds": best, "chunks_per_s": len(chunks) / best if best else float("inf"), "result": result}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--chunks-per-message", type=int, default=5000)
+    parser.add_argument("--chunk-chars", type=int, default=6, help="Characters per body chunk")
+    parser.add_argument("--split-max-chars", type=int, default=12,
+                        help="Largest chunk when re-cutting the stream for the split-tag run")
+    parser.add_argument("--repeats", type=int, default=5, help="Runs per variant; the fastest is reported")
+    args = parser.parse_args()
+    # BrokerConnection logs tags at DEBUG; keep the calls but not the output
+    logging.disable(logging.INFO)
+
+    chunks = build_stream(args.messages, args.chunks_per_message, args.chunk_chars)
+    split_chunks = rechunk(chunks, args.split_max_chars)
+
+    legacy = measure(run_legacy, chunks, args.repeats)
+    legacy_regex = measure(run_legacy_regex_only, chunks, args.repeats)
+    connection = measure(run_connection, chunks, args.repeats)
+    parser_only = measure(run_parser_only, chunks, args.repeats)
+    split = measure(run_connection, split_chunks, args.repeats)
+
+    if legacy["result"] != connection["result"] or split["result"] != connection["result"]:
+        print("Implementations disagree on the number of messages", file=sys.stderr)
+        return 1
+
+    print(f"{'variant':<36}{'chunks':>10}{'seconds':>10}{'chunks/s':>14}")
+    for name, stats, count in (
+        ("legacy BrokerConnection", legacy, len(chunks)),
+        ("BrokerConnection + parser", connection, len(chunks)),
+        ("legacy tag regexes only", legacy_regex, len(chunks)),
+        ("parser only", parser_only, len(chunks)),
+        ("BrokerConnection, split tags", split, len(split_chunks)),
+    ):
+        print(f"{name:<36}{count:>10}{stats['seconds']:>10.3f}{stats['chunks_per_s']:>14,.0f}")
+    print(f"\nspeedup, connection: {legacy['seconds'] / connection['seconds']:.2f}x")
+    print(f"speedup, tag parsing only: {legacy_regex['seconds'] / parser_only['seconds']:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+"""
+Tests for the per-user agent access index.
+
+Verifies that AgentAccessIndex answers access and permission checks with the
+same semantics as the direct SQL queries in AgentProvider, that entries are
+served from memory once loaded, and that group/agent writes invalidate them.
+"""
+import pytest
+import os
+import tempfile
+
+# --- Test Database Setup ---
+_test_db_file = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+TEST_DB_URL = f"sqlite:///{_test_db_file.name}"
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker, scoped_session
+from bondable.bond.providers.metadata import (
+    Base, User, Group, AgentRecord, AgentGroup, GroupUser,
+    EVERYONE_GROUP_ID,
+)
+from bondable.bond.agent_access import AgentAccessIndex
+from bondable.bond.groups import Groups
+
+USER_A = "access-test-user-a"
+USER_B = "access-test-user-b"
+SYSTEM_USER = "access-test-system"
+PRIVATE_GROUP = "grp_access_private"
+
+
+class FakeMetadata:
+    """Minimal Metadata-like object with a real SQLite DB that counts statements."""
+    def __init__(self, db_url):
+        self.engine = create_engine(db_url, echo=False)
+        Base.metadata.create_all(self.engine)
+        self._session_factory = scoped_session(sessionmaker(bind=self.engine))
+        self.statement_count = 0
+
+        @event.listens_for(self.engine, "before_cursor_execute")
+        def _count(conn, cursor, statement, parameters, context, executemany):
+            self.statement_count += 1
+
+    def get_db_session(self):
+        return self._session_factory()
+
+
+class FakeAgentProvider:
+    """Exposes the real AgentProvider access-control methods with an index attached."""
+    def __init__(self, metadata, access_index):
+        self.metadata = metadata
+        self.access_index = access_index
+
+    from bondable.bond.providers.agent import AgentProvider as _AP
+    can_user_access_agent = _AP.can_user_access_agent
+    get_user_agent_permission = _AP.get_user_agent_permission
+
+
+@pytest.fixture(scope="module")
+def db():
+    metadata = FakeMetadata(TEST_DB_URL)
+    session = metadata.get_db_session()
+    for uid, email in [
+        (SYSTEM_USER, "access-test-system@test.com"),
+        (USER_A, "access-test-a@test.com"),
+        (USER_B, "access-test-b@test.com"),
+    ]:
+        session.add(User(id=uid, email=email, sign_in_method="test"))
+    session.add(Group(id=EVERYONE_GROUP_ID, name="Everyone", owner_user_id=SYSTEM_USER))
+    session.add(Group(id=PRIVATE_GROUP, name="Private", owner_user_id=USER_A))
+    session.flush()
+    session.add(GroupUser(group_id=PRIVATE_GROUP, user_id=USER_A))
+    session.commit()
+    session.close()
+    yield metadata
+    metadata.engine.dispose()
+    db_path = TEST_DB_URL.replace("sqlite:///", "")
+    if os.path.exists(db_path):
+        try:
+            os.remove(db_path)
+        except Exception:
+            pass
+
+
+@pytest.fixture(autouse=True)
+def clear_agents(db):
+    """Clear agent-related tables and extra memberships before each test."""
+    session = db.get_db_session()
+    session.query(AgentGroup).delete()
+    session.query(AgentRecord).delete()
+    session.query(GroupUser).filter(GroupUser.group_id == PRIVATE_GROUP, GroupUser.user_id != USER_A).delete()
+    session.commit()
+    session.close()
+
+
+@pytest.fixture
+def index(db):
+    return AgentAccessIndex(db, ttl_seconds=300)
+
+
+@pytest.fixture
+def provider(db, index):
+    return FakeAgentProvider(db, index)
+
+
+def _create_agent(db, agent_id, owner_user_id, is_default=False):
+    session = db.get_db_session()
+    session.add(AgentRecord(agent_id=agent_id, name=agent_id, owner_user_id=owner_user_id, is_default=is_default))
+    session.commit()
+    session.close()
+
+
+def _add_agent_to_group(db, agent_id, group_id, permission="can_use"):
+    session = db.get_db_session()
+    session.add(AgentGroup(agent_id=agent_id, group_id=group_id, permission=permission))
+    session.commit()
+    session.close()
+
+
+class TestAccessSemantics:
+
+    def test_owner(self, db, provider):
+        _create_agent(db, "agent_owned", USER_A)
+        assert provider.can_user_access_agent(USER_A, "agent_owned") is True
+        assert provider.get_user_agent_permission(USER_A, "agent_owned") == "owner"
+        assert provider.can_user_access_agent(USER_B, "agent_owned") is False
+        assert provider.get_user_agent_permission(USER_B, "agent_owned") is None
+
+    def test_group_permission_highest_wins(self, db, provider):
+        _create_agent(db, "agent_shared", SYSTEM_USER)
+        _add_agent_to_group(db, "agent_shared", EVERYONE_GROUP_ID, permission="can_use_read_only")
+        _add_agent_to_group(db, "agent_shared", PRIVATE_GROUP, permission="can_edit")
+        assert provider.get_user_agent_permission(USER_A, "agent_shared") == "can_edit"
+        assert provider.get_user_agent_permission(USER_B, "agent_shared") == "can_use_read_only"
+
+    def test_owner_beats_group_permission(self, db, provider):
+        _create_agent(db, "agent_mine", USER_A)
+        _add_agent_to_group(db, "agent_mine", PRIVATE_GROUP, permission="can_use")
+        assert provider.get_user_agent_permission(USER_A, "agent_mine") == "owner"
+
+    def test_default_agent_permission_without_access(self, db, provider):
+        """Default agent yields can_use permission but is not reported as accessible."""
+        _create_agent(db, "agent_home", SYSTEM_USER, is_default=True)
+        assert provider.get_user_agent_permission(USER_B, "agent_home") == "can_use"
+        assert provider.can_user_access_agent(USER_B, "agent_home") is False
+
+    def test_unknown_agent(self, provider):
+        assert provider.can_user_access_agent(USER_A, "agent_missing") is False
+        assert provider.get_user_agent_permission(USER_A, "agent_missing") is None
+
+
+class TestCaching:
+
+    def test_repeat_checks_do_not_query(self, db, provider):
+        _create_agent(db, "agent_owned", USER_A)
+        provider.can_user_access_agent(USER_A, "agent_owned")
+        before = db.statement_count
+        for _ in range(10):
+            assert provider.can_user_access_agent(USER_A, "agent_owned") is True
+            assert provider.get_user_agent_permission(USER_A, "agent_owned") == "owner"
+        assert db.statement_count == before
+
+    def test_zero_ttl_disables_caching(self, db):
+        index = AgentAccessIndex(db, ttl_seconds=0)
+        _create_agent(db, "agent_owned", USER_A)
+        index.can_access(USER_A, "agent_owned")
+        before = db.statement_count
+        index.can_access(USER_A, "agent_owned")
+        assert db.statement_count > before
+
+    def test_max_users_bounds_entries(self, db):
+        index = AgentAccessIndex(db, ttl_seconds=300, max_users=2)
+        for user_id in [USER_A, USER_B, SYSTEM_USER]:
+            index.get_user_access(user_id)
+        assert len(index._entries) <= 2
+        assert SYSTEM_USER in index._entries
+
+
+class TestInvalidation:
+
+    def test_add_member_invalidates_member(self, db, index, provider):
+        groups = Groups(db, access_index=index)
+        _create_agent(db, "agent_shared", SYSTEM_USER)
+        _add_agent_to_group(db, "agent_shared", PRIVATE_GROUP)
+        assert provider.can_user_access_agent(USER_B, "agent_shared") is False
+
+        assert groups.manage_group_member(PRIVATE_GROUP, USER_A, USER_B, "add") is True
+        assert provider.can_user_access_agent(USER_B, "agent_shared") is True
+
+        assert groups.manage_group_member(PRIVATE_GROUP, USER_A, USER_B, "remove") is True
+        assert provider.can_user_access_agent(USER_B, "agent_shared") is False
+
+    def test_associate_agent_invalidates(self, db, index, provider):
+        groups = Groups(db, access_index=index)
+        _create_agent(db, "agent_shared", SYSTEM_USER)
+        assert provider.get_user_agent_permission(USER_A, "agent_shared") is None
+
+        groups.associate_agent_with_group("agent_shared", PRIVATE_GROUP, permission="can_use")
+        assert provider.get_user_agent_permission(USER_A, "agent_shared") == "can_use"
+
+        groups.associate_agent_with_group("agent_shared", PRIVATE_GROUP, permission="can_edit")
+        assert provider.get_user_agent_permission(USER_A, "agent_shared") == "can_edit"
+
+    def test_sync_agent_groups_invalidates(self, db, index, provider):
+        groups = Groups(db, access_index=index)
+        _create_agent(db, "agent_shared", SYSTEM_USER)
+        _add_agent_to_group(db, "agent_shared", PRIVATE_GROUP)
+        assert provider.can_user_access_agent(USER_A, "agent_shared") is True
+
+        groups.sync_agent_groups("agent_shared", desired_group_ids=[])
+        assert provider.can_user_access_agent(USER_A, "agent_shared") is False
+
+    def test_invalidate_scope(self, index):
+        for user_id in [USER_A, USER_B]:
+            index.get_user_access(user_id)
+        index.invalidate([USER_A])
+        assert USER_A not in index._entries
+        assert USER_B in index._entries
+        index.invalidate()
+        assert index._entries == {}
+
+    def test_invalidation_during_load_is_not_cached(self, db, index):
+        """A load that races with an invalidation must not store its stale result."""
+        original_load = index._load
+
+        def racing_load(user_id):
+            result = original_load(user_id)
+            index.invalidate_all()
+            return result
+
+        index._load = racing_load
+        index.get_user_access(USER_A)
+        assert USER_A not in index._entries
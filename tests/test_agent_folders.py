@@ -58,6 +58,10 @@ def test_client():
 def mock_provider():
     provider = MagicMock(spec=Provider)
     provider.agents = MagicMock(spec=AgentProvider)
+    # Summaries come from the base implementation so tests can keep mocking get_agent
+    provider.agents.get_agent_summaries.side_effect = (
+        lambda agent_ids: AgentProvider.get_agent_summaries(provider.agents, agent_ids)
+    )
     provider.threads = MagicMock(spec=ThreadsProvider)
     provider.files = MagicMock(spec=FilesProvider)
     provider.vectorstores = MagicMock(spec=VectorStoresProvider)
@@ -543,6 +547,45 @@ class TestReorderFolders:
         assert response.status_code == 404
 
 
+class TestMoveAgent:
+    def test_move_agent(self, authenticated_client):
+        client, headers, provider = authenticated_client
+        provider.agent_folders.move_agent.return_value = 1536
+
+        response = client.put(
+            "/agent-folders/move-agent",
+            json={"agent_id": "a3", "after_agent_id": "a1"},
+            headers=headers,
+        )
+        assert response.status_code == 200
+        assert response.json()["sort_order"] == 1536
+        provider.agent_folders.move_agent.assert_called_once_with(
+            user_id=TEST_USER_ID, agent_id="a3", after_agent_id="a1"
+        )
+
+    def test_move_after_unknown_agent(self, authenticated_client):
+        client, headers, provider = authenticated_client
+        provider.agent_folders.move_agent.side_effect = KeyError("a_ghost")
+
+        response = client.put(
+            "/agent-folders/move-agent",
+            json={"agent_id": "a3", "after_agent_id": "a_ghost"},
+            headers=headers,
+        )
+        assert response.status_code == 404
+
+    def test_move_folder_nonexistent(self, authenticated_client):
+        client, headers, provider = authenticated_client
+        provider.agent_folders.move_folder.side_effect = KeyError("Folder not found")
+
+        response = client.put(
+            "/agent-folders/move-folder",
+            json={"folder_id": "fld_ghost"},
+            headers=headers,
+        )
+        assert response.status_code == 404
+
+
 class TestGetAgentsIncludesSortOrder:
     def test_agents_have_sort_order(self, authenticated_client):
         client, headers, provider = authenticated_client
@@ -16,7 +16,7 @@ os.environ['METADATA_DB_URL'] = TEST_DB_URL
 from bondable.bond.providers.metadata import (
     Base, AgentFolder, AgentFolderAssignment, UserAgentSortOrder, User
 )
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, scoped_session
 from bondable.bond.agent_folders import AgentFolders
 
@@ -228,6 +228,89 @@ class TestReorderAgents:
         assert agent_folders.get_user_agent_sort_orders(USER_B) == {"a2": 0, "a1": 1}
 
 
+class TestBulkReorder:
+    @pytest.fixture
+    def statements(self, agent_folders):
+        executed = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            executed.append(statement)
+
+        engine = agent_folders.metadata.engine
+        event.listen(engine, "before_cursor_execute", record)
+        yield executed
+        event.remove(engine, "before_cursor_execute", record)
+
+    def test_reorder_agents_is_one_statement(self, agent_folders, statements):
+        agent_ids = [f"a{i}" for i in range(300)]
+        agent_folders.reorder_agents(USER_A, agent_ids[:150])
+        statements.clear()
+
+        agent_folders.reorder_agents(USER_A, list(reversed(agent_ids)))
+
+        writes = [s for s in statements if s.lstrip().upper().startswith(("INSERT", "UPDATE"))]
+        assert len(writes) == 1
+        orders = agent_folders.get_user_agent_sort_orders(USER_A)
+        assert orders["a299"] == 0
+        assert orders["a0"] == 299
+
+    def test_reorder_agents_without_upsert_support(self, agent_folders, monkeypatch):
+        from bondable.bond import agent_folders as agent_folders_module
+        monkeypatch.setattr(agent_folders_module, "_UPSERT_DIALECTS", {})
+        agent_folders.reorder_agents(USER_A, ["a1", "a2"])
+        agent_folders.reorder_agents(USER_A, ["a3", "a2", "a1"])
+        assert agent_folders.get_user_agent_sort_orders(USER_A) == {"a3": 0, "a2": 1, "a1": 2}
+
+    def test_reorder_folders_is_one_update(self, agent_folders, statements):
+        ids = [agent_folders.create_folder(f"F{i}", USER_A)["id"] for i in range(20)]
+        statements.clear()
+
+        agent_folders.reorder_folders(USER_A, list(reversed(ids)))
+
+        assert len([s for s in statements if s.lstrip().upper().startswith("UPDATE")]) == 1
+        assert [f["id"] for f in agent_folders.get_user_folders(USER_A)] == list(reversed(ids))
+
+
+class TestMoveAgent:
+    def test_move_writes_one_row_when_keys_are_sparse(self, agent_folders):
+        agent_folders.reorder_agents(USER_A, ["a1", "a2", "a3"])
+        # Dense keys from a full reorder: the first move respaces them
+        agent_folders.move_agent(USER_A, "a3", after_agent_id="a1")
+        orders = agent_folders.get_user_agent_sort_orders(USER_A)
+        assert sorted(orders, key=orders.get) == ["a1", "a3", "a2"]
+
+        before = dict(orders)
+        agent_folders.move_agent(USER_A, "a2", after_agent_id="a1")
+        orders = agent_folders.get_user_agent_sort_orders(USER_A)
+        assert sorted(orders, key=orders.get) == ["a1", "a2", "a3"]
+        assert {k for k in orders if orders[k] != before[k]} == {"a2"}
+
+    def test_move_to_front_and_new_agent(self, agent_folders):
+        agent_folders.reorder_agents(USER_A, ["a1", "a2"])
+        agent_folders.move_agent(USER_A, "a2")
+        agent_folders.move_agent(USER_A, "a_new", after_agent_id="a1")
+        orders = agent_folders.get_user_agent_sort_orders(USER_A)
+        assert sorted(orders, key=orders.get) == ["a2", "a1", "a_new"]
+
+    def test_move_after_unknown_agent_raises(self, agent_folders):
+        agent_folders.reorder_agents(USER_A, ["a1"])
+        with pytest.raises(KeyError):
+            agent_folders.move_agent(USER_A, "a1", after_agent_id="a_ghost")
+
+    def test_move_folder(self, agent_folders):
+        f1 = agent_folders.create_folder("Alpha", USER_A)
+        f2 = agent_folders.create_folder("Beta", USER_A)
+        f3 = agent_folders.create_folder("Gamma", USER_A)
+
+        agent_folders.move_folder(USER_A, f3["id"], after_folder_id=f1["id"])
+        assert [f["id"] for f in agent_folders.get_user_folders(USER_A)] == [f1["id"], f3["id"], f2["id"]]
+        agent_folders.move_folder(USER_A, f2["id"])
+        assert [f["id"] for f in agent_folders.get_user_folders(USER_A)] == [f2["id"], f1["id"], f3["id"]]
+
+        with pytest.raises(KeyError):
+            agent_folders.move_folder(USER_B, f1["id"])
+
+
 class TestReorderFolders:
     def test_reorder_folders(self, agent_folders):
         f1 = agent_folders.create_folder("Alpha", USER_A)
@@ -129,8 +129,7 @@ def _simulate_forwarding_generator(
                     # Access check
                     target_accessible = False
                     try:
-                        default_agent = provider.agents.get_default_agent()
-                        is_target_default = default_agent and default_agent.get_agent_id() == target_agent_id
+                        is_target_default = provider.agents.get_default_agent_id() == target_agent_id
                         target_accessible = is_target_default or provider.agents.can_user_access_agent(
                             user_id=current_user.user_id, agent_id=target_agent_id
                         )
@@ -240,7 +239,7 @@ def _make_provider(agents_by_slug=None, can_access=True, default_agent=None):
     provider = MagicMock()
     provider.agents.get_agent_by_slug.side_effect = lambda slug: agents_by_slug.get(slug)
     provider.agents.can_user_access_agent.return_value = can_access
-    provider.agents.get_default_agent.return_value = default_agent
+    provider.agents.get_default_agent_id.return_value = default_agent.get_agent_id() if default_agent else None
     return provider
 
 
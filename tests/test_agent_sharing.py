@@ -237,7 +237,7 @@ class TestGetAgentDetailsReturnsDefaultGroupId:
         provider.agents.can_user_access_agent.return_value = True
         provider.agents.get_agent_record.return_value = mock_record
         provider.agents.get_user_agent_permission.return_value = 'owner'
-        provider.agents.get_default_agent.return_value = None
+        provider.agents.get_default_agent_id.return_value = None
         provider.groups.get_agent_group_ids.return_value = [group_id]
         provider.groups.get_agent_group_permissions.return_value = {}
 
@@ -268,7 +268,7 @@ class TestGetAgentDetailsReturnsDefaultGroupId:
         provider.agents.can_user_access_agent.return_value = True
         provider.agents.get_agent_record.return_value = mock_record
         provider.agents.get_user_agent_permission.return_value = 'owner'
-        provider.agents.get_default_agent.return_value = None
+        provider.agents.get_default_agent_id.return_value = None
         provider.groups.get_agent_group_ids.return_value = []
         provider.groups.get_agent_group_permissions.return_value = {}
 
@@ -312,7 +312,7 @@ class TestRenamedAgentStillShareable:
         provider.agents.can_user_access_agent.return_value = True
         provider.agents.get_agent_record.return_value = mock_record
         provider.agents.get_user_agent_permission.return_value = 'owner'
-        provider.agents.get_default_agent.return_value = None
+        provider.agents.get_default_agent_id.return_value = None
         provider.groups.get_agent_group_ids.return_value = [original_group_id]
         provider.groups.get_agent_group_permissions.return_value = {}
 
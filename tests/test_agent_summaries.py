@@ -0,0 +1,174 @@
+"""
+Tests for BedrockAgentProvider.get_agent_summaries.
+
+Runs against a real SQLite DB to verify that summaries come from one joined
+IN query per batch without calling Bedrock, and that legacy rows missing
+description/model are backfilled once (or backed off after a failure).
+"""
+import pytest
+import os
+import tempfile
+from unittest.mock import MagicMock
+
+# --- Test Database Setup ---
+_test_db_file = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+TEST_DB_URL = f"sqlite:///{_test_db_file.name}"
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker, scoped_session
+from bondable.bond.providers.metadata import Base, User, AgentRecord
+from bondable.bond.providers.bedrock.BedrockMetadata import BedrockAgentOptions
+from bondable.bond.providers.bedrock.BedrockAgent import BedrockAgentProvider
+
+OWNER = "summary-test-owner"
+
+
+class FakeMetadata:
+    """Minimal Metadata-like object with a real SQLite DB that counts SELECTs."""
+    def __init__(self, db_url):
+        self.engine = create_engine(db_url, echo=False)
+        Base.metadata.create_all(self.engine)
+        self._session_factory = scoped_session(sessionmaker(bind=self.engine))
+        self.select_count = 0
+
+        @event.listens_for(self.engine, "before_cursor_execute")
+        def _count(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                self.select_count += 1
+
+    def get_db_session(self):
+        return self._session_factory()
+
+
+@pytest.fixture(scope="module")
+def db():
+    metadata = FakeMetadata(TEST_DB_URL)
+    session = metadata.get_db_session()
+    session.add(User(id=OWNER, email="summary-test@test.com", sign_in_method="test"))
+    session.commit()
+    session.close()
+    yield metadata
+    metadata.engine.dispose()
+    db_path = TEST_DB_URL.replace("sqlite:///", "")
+    if os.path.exists(db_path):
+        try:
+            os.remove(db_path)
+        except Exception:
+            pass
+
+
+@pytest.fixture(autouse=True)
+def clear_agents(db):
+    session = db.get_db_session()
+    session.query(BedrockAgentOptions).delete()
+    session.query(AgentRecord).delete()
+    session.commit()
+    session.close()
+
+
+@pytest.fixture
+def provider(db):
+    return BedrockAgentProvider(
+        bedrock_client=MagicMock(),
+        bedrock_agent_client=MagicMock(),
+        metadata=db,
+    )
+
+
+def _create_agent(db, agent_id, description="desc", model="model-x", icon="<svg/>"):
+    session = db.get_db_session()
+    session.add(AgentRecord(agent_id=agent_id, name=f"Agent {agent_id}", slug=f"slug-{agent_id}", owner_user_id=OWNER))
+    session.add(BedrockAgentOptions(
+        agent_id=agent_id,
+        bedrock_agent_id=f"bedrock-{agent_id}",
+        bedrock_agent_alias_id="alias",
+        agent_metadata={"icon_svg": icon},
+        description=description,
+        model=model,
+    ))
+    session.commit()
+    session.close()
+
+
+class TestSummaries:
+
+    def test_fields(self, db, provider):
+        _create_agent(db, "agent_1")
+        summaries = provider.get_agent_summaries(["agent_1", "agent_missing"])
+        assert set(summaries) == {"agent_1"}
+        summary = summaries["agent_1"]
+        assert summary["name"] == "Agent agent_1"
+        assert summary["slug"] == "slug-agent_1"
+        assert summary["description"] == "desc"
+        assert summary["model"] == "model-x"
+        assert summary["icon"] == "<svg/>"
+        assert summary["owner_user_id"] == OWNER
+        assert summary["metadata"]["owner_user_id"] == OWNER
+
+    def test_empty_input(self, db, provider):
+        before = db.select_count
+        assert provider.get_agent_summaries([]) == {}
+        assert db.select_count == before
+
+    def test_single_query_without_bedrock_calls(self, db, provider):
+        agent_ids = [f"agent_{i}" for i in range(20)]
+        for agent_id in agent_ids:
+            _create_agent(db, agent_id)
+        before = db.select_count
+        summaries = provider.get_agent_summaries(agent_ids + agent_ids[:5])
+        assert len(summaries) == 20
+        assert db.select_count - before == 1
+        provider.bedrock_agent_client.get_agent.assert_not_called()
+
+    def test_batches_large_id_lists(self, db, provider, monkeypatch):
+        monkeypatch.setattr(BedrockAgentProvider, "_SUMMARY_BATCH_SIZE", 4)
+        agent_ids = [f"agent_{i}" for i in range(10)]
+        for agent_id in agent_ids:
+            _create_agent(db, agent_id)
+        before = db.select_count
+        assert len(provider.get_agent_summaries(agent_ids)) == 10
+        assert db.select_count - before == 3
+
+
+class TestBackfill:
+
+    def test_legacy_row_backfilled_once(self, db, provider):
+        _create_agent(db, "agent_legacy", description=None, model=None)
+        provider.bedrock_agent_client.get_agent.return_value = {
+            "agent": {"description": "from bedrock", "foundationModel": "model-y"}
+        }
+        summary = provider.get_agent_summaries(["agent_legacy"])["agent_legacy"]
+        assert summary["description"] == "from bedrock"
+        assert summary["model"] == "model-y"
+        provider.bedrock_agent_client.get_agent.assert_called_once_with(agentId="bedrock-agent_legacy")
+
+        session = db.get_db_session()
+        options = session.query(BedrockAgentOptions).filter_by(agent_id="agent_legacy").one()
+        assert (options.description, options.model) == ("from bedrock", "model-y")
+        session.close()
+
+        provider.get_agent_summaries(["agent_legacy"])
+        assert provider.bedrock_agent_client.get_agent.call_count == 1
+
+    def test_failed_backfill_is_not_retried_each_listing(self, db, provider):
+        _create_agent(db, "agent_legacy", description=None, model=None)
+        provider.bedrock_agent_client.get_agent.side_effect = Exception("throttled")
+
+        summary = provider.get_agent_summaries(["agent_legacy"])["agent_legacy"]
+        assert summary["description"] == ""
+        assert summary["model"] is None
+        provider.get_agent_summaries(["agent_legacy"])
+        assert provider.bedrock_agent_client.get_agent.call_count == 1
+
+    def test_failed_backfill_retried_after_backoff(self, db, provider, monkeypatch):
+        _create_agent(db, "agent_legacy", description=None, model=None)
+        provider.bedrock_agent_client.get_agent.side_effect = Exception("throttled")
+        provider.get_agent_summaries(["agent_legacy"])
+
+        monkeypatch.setattr(BedrockAgentProvider, "_SUMMARY_BACKFILL_RETRY_SECONDS", 0)
+        provider.bedrock_agent_client.get_agent.side_effect = None
+        provider.bedrock_agent_client.get_agent.return_value = {
+            "agent": {"description": "later", "foundationModel": "model-z"}
+        }
+        assert provider.get_agent_summaries(["agent_legacy"])["agent_legacy"]["model"] == "model-z"
+        assert provider.bedrock_agent_client.get_agent.call_count == 2
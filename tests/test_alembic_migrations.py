@@ -239,6 +239,46 @@ class TestMigrationIdempotency:
         engine.dispose()
 
 
+class TestThreadActivityMigration:
+    """The thread activity columns are backfilled from stored messages."""
+
+    def test_backfill(self, fresh_db):
+        db_url, path = fresh_db
+        cfg = _get_alembic_cfg(db_url)
+        command.upgrade(cfg, "f1a7c3e95d20")
+
+        engine = create_engine(db_url)
+        with engine.begin() as conn:
+            conn.execute(sa.text("INSERT INTO users (id, email, sign_in_method, is_admin) VALUES ('u1', 'u1@example.com', 'test', 0)"))
+            for thread_id in ('t-active', 't-hidden', 't-empty'):
+                conn.execute(sa.text(
+                    "INSERT INTO threads (thread_id, user_id, updated_at) VALUES (:t, 'u1', '2026-01-01 00:00:00')"),
+                    {"t": thread_id})
+            for i, (thread_id, role, meta, created) in enumerate([
+                ('t-active', 'user', '{"hidden": true}', '2026-02-01 10:00:00'),
+                ('t-active', 'user', '{}', '2026-02-01 10:01:00'),
+                ('t-active', 'assistant', '{}', '2026-02-01 10:02:00'),
+                ('t-hidden', 'user', '{"hidden": "true"}', '2026-02-02 09:00:00'),
+            ]):
+                conn.execute(sa.text(
+                    "INSERT INTO bedrock_messages (id, thread_id, user_id, role, type, content, message_index, "
+                    "created_at, message_metadata) VALUES (:id, :t, 'u1', :role, 'text', '[]', :i, :created, :meta)"),
+                    {"id": f"m{i}", "t": thread_id, "role": role, "i": i, "created": created, "meta": meta})
+
+        command.upgrade(cfg, "head")
+
+        with engine.connect() as conn:
+            rows = {r.thread_id: r for r in conn.execute(sa.text(
+                "SELECT thread_id, has_user_message, message_count, last_message_at, updated_at FROM threads"))}
+        assert (rows['t-active'].has_user_message, rows['t-active'].message_count) == (1, 3)
+        assert rows['t-active'].last_message_at.startswith('2026-02-01 10:02:00')
+        assert (rows['t-hidden'].has_user_message, rows['t-hidden'].message_count) == (0, 1)
+        assert (rows['t-empty'].has_user_message, rows['t-empty'].message_count) == (0, 0)
+        assert rows['t-empty'].last_message_at is None
+        assert all(r.updated_at.startswith('2026-01-01') for r in rows.values())
+        engine.dispose()
+
+
 class TestAutogenerateNoDiff:
     """Test that after upgrade, autogenerate detects no schema differences."""
 
@@ -0,0 +1,154 @@
+"""
+Tests for the shared AWS client factory and the Secrets Manager cache.
+
+AWS is never contacted: calls are answered by botocore Stubbers attached to
+the shared clients.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+from botocore.config import Config as BotoConfig
+from botocore.exceptions import ClientError
+from botocore.stub import Stubber
+
+from bondable.bond import aws_clients
+from bondable.bond.aws_clients import (
+    BULK_WORKLOAD, STREAMING_WORKLOAD, aws_client, clear_clients, get_secret_string, workload_settings,
+)
+from bondable.bond.metrics import AWS_CALL_LATENCY
+
+
+@pytest.fixture(autouse=True)
+def aws_env():
+    env = {'AWS_REGION': 'us-east-1', 'AWS_ACCESS_KEY_ID': 'testing', 'AWS_SECRET_ACCESS_KEY': 'testing'}
+    with patch.dict(os.environ, env):
+        for name in ('AWS_PROFILE', 'AWS_MAX_ATTEMPTS', 'AWS_RETRY_MODE'):
+            os.environ.pop(name, None)
+        clear_clients()
+        yield
+    clear_clients()
+
+
+class TestAwsClientFactory:
+
+    def test_client_is_shared(self):
+        client = aws_client('s3', 'us-east-1', workload=BULK_WORKLOAD)
+        assert aws_client('s3', 'us-east-1', workload=BULK_WORKLOAD) is client
+        assert aws_client('s3', 'us-west-2', workload=BULK_WORKLOAD) is not client
+        assert aws_client('s3', 'us-east-1') is not client
+
+    def test_region_defaults_to_aws_region(self):
+        assert aws_client('sts') is aws_client('sts', 'us-east-1')
+        assert aws_client('sts').meta.region_name == 'us-east-1'
+
+    def test_concurrent_callers_get_one_client(self):
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            clients = list(pool.map(lambda _: aws_client('bedrock', 'us-east-1'), range(32)))
+        assert all(c is clients[0] for c in clients)
+
+    def test_workload_settings(self):
+        streaming = aws_client('bedrock-runtime', workload=STREAMING_WORKLOAD).meta.config
+        assert streaming.max_pool_connections == 100
+        assert streaming.read_timeout == 300
+        assert streaming.tcp_keepalive is True
+        bulk = aws_client('s3', workload=BULK_WORKLOAD).meta.config
+        assert bulk.retries == {'mode': 'adaptive', 'total_max_attempts': 5}
+
+    def test_workload_settings_from_env(self):
+        with patch.dict(os.environ, {'AWS_STREAMING_MAX_POOL_CONNECTIONS': '7', 'AWS_STREAMING_RETRY_MODE': 'legacy'}):
+            settings = workload_settings(STREAMING_WORKLOAD)
+        assert settings.max_pool_connections == 7
+        assert settings.retry_mode == 'legacy'
+        assert settings.read_timeout == 300
+
+    def test_sdk_retry_env_replaces_the_defaults(self):
+        with patch.dict(os.environ, {'AWS_MAX_ATTEMPTS': '1', 'AWS_RETRY_MODE': 'standard'}):
+            assert workload_settings(BULK_WORKLOAD)[1:3] == ('standard', 1)
+            with patch.dict(os.environ, {'AWS_BULK_MAX_ATTEMPTS': '2'}):
+                assert workload_settings(BULK_WORKLOAD).max_attempts == 2
+
+    def test_config_override(self):
+        override = BotoConfig(read_timeout=42)
+        client = aws_client('bedrock-agent-runtime', workload=STREAMING_WORKLOAD, config=override)
+        assert client.meta.config.read_timeout == 42
+        assert client.meta.config.max_pool_connections == 100
+        # An equal override maps to the same client; a different one does not
+        assert aws_client('bedrock-agent-runtime', workload=STREAMING_WORKLOAD,
+                          config=BotoConfig(read_timeout=42)) is client
+        assert aws_client('bedrock-agent-runtime', workload=STREAMING_WORKLOAD,
+                          config=BotoConfig(read_timeout=43)) is not client
+
+    def test_calls_are_timed(self):
+        client = aws_client('sts')
+        labels = {'service': 'sts', 'operation': 'GetCallerIdentity'}
+        ok_before = AWS_CALL_LATENCY.count(outcome='ok', **labels)
+        error_before = AWS_CALL_LATENCY.count(outcome='error', **labels)
+
+        with Stubber(client) as stubber:
+            stubber.add_response('get_caller_identity', {
+                'Account': '123456789012', 'Arn': 'arn:aws:iam::123456789012:user/bond', 'UserId': 'AIDAEXAMPLE'})
+            stubber.add_client_error('get_caller_identity', service_error_code='ExpiredToken', http_status_code=403)
+            assert client.get_caller_identity()['Account'] == '123456789012'
+            with pytest.raises(ClientError):
+                client.get_caller_identity()
+
+        assert AWS_CALL_LATENCY.count(outcome='ok', **labels) == ok_before + 1
+        assert AWS_CALL_LATENCY.count(outcome='error', **labels) == error_before + 1
+
+    def test_role_clients_assume_the_role(self):
+        role_arn = 'arn:aws:iam::123456789012:role/bond'
+        client = aws_client('s3', role_arn=role_arn)
+        assert client is not aws_client('s3')
+        assert aws_client('s3', role_arn=role_arn) is client
+
+        from datetime import datetime, timedelta, timezone
+        with Stubber(aws_client('sts')) as stubber:
+            stubber.add_response('assume_role', {'Credentials': {
+                'AccessKeyId': 'ASIAROLEEXAMPLE0001', 'SecretAccessKey': 'secret', 'SessionToken': 'token',
+                'Expiration': datetime.now(timezone.utc) + timedelta(hours=1)}},
+                {'RoleArn': role_arn, 'RoleSessionName': 'bond-ai'})
+            credentials = client._request_signer._credentials.get_frozen_credentials()
+        assert credentials.access_key == 'ASIAROLEEXAMPLE0001'
+        assert credentials.token == 'token'
+
+
+class TestSecretCache:
+
+    SECRET_ARN = 'arn:aws:secretsmanager:us-east-1:123456789012:secret:bond-abc'
+
+    def test_secret_is_cached(self):
+        with Stubber(aws_client('secretsmanager')) as stubber:
+            stubber.add_response('get_secret_value', {'SecretString': 'v1'}, {'SecretId': self.SECRET_ARN})
+            assert get_secret_string(self.SECRET_ARN) == 'v1'
+            assert get_secret_string(self.SECRET_ARN) == 'v1'
+            stubber.assert_no_pending_responses()
+
+    def test_secret_expires(self):
+        with Stubber(aws_client('secretsmanager')) as stubber:
+            stubber.add_response('get_secret_value', {'SecretString': 'v1'}, {'SecretId': self.SECRET_ARN})
+            stubber.add_response('get_secret_value', {'SecretString': 'v2'}, {'SecretId': self.SECRET_ARN})
+            with patch('bondable.bond.cache.time.monotonic', return_value=0.0):
+                assert get_secret_string(self.SECRET_ARN) == 'v1'
+            with patch('bondable.bond.cache.time.monotonic', return_value=aws_clients._secrets.ttl_seconds + 1):
+                assert get_secret_string(self.SECRET_ARN) == 'v2'
+
+    def test_errors_are_not_cached(self):
+        with Stubber(aws_client('secretsmanager')) as stubber:
+            stubber.add_client_error('get_secret_value', service_error_code='ThrottlingException')
+            stubber.add_response('get_secret_value', {'SecretString': 'v1'}, {'SecretId': self.SECRET_ARN})
+            with pytest.raises(ClientError):
+                get_secret_string(self.SECRET_ARN)
+            assert get_secret_string(self.SECRET_ARN) == 'v1'
+
+    def test_config_get_secret_value_uses_the_cache(self):
+        from bondable.bond.config import Config
+        config = Config.__new__(Config)
+        with Stubber(aws_client('secretsmanager')) as stubber:
+            stubber.add_response('get_secret_value', {'SecretString': 's3cret'}, {'SecretId': 'bond-db'})
+            assert config.get_secret_value('bond-db') == 's3cret'
+            assert config.get_secret_value('bond-db') == 's3cret'
+            stubber.add_client_error('get_secret_value', service_error_code='ResourceNotFoundException')
+            assert config.get_secret_value('missing', default='fallback') == 'fallback'
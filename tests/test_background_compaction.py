@@ -0,0 +1,261 @@
+"""
+Tests for background context compaction in BedrockAgent.
+
+Session state and messages live in a real SQLite database, the summary job runs
+on a real BackgroundJobs pool, and the Converse API is a botocore Stubber.
+"""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import boto3
+import pytest
+from botocore.stub import Stubber
+from sqlalchemy import create_engine
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+from bondable.bond.background_jobs import BackgroundJobs
+from bondable.bond.providers.bedrock.BedrockAgent import BedrockAgent
+from bondable.bond.providers.bedrock.BedrockThreads import BedrockThreadsProvider
+from bondable.bond.providers.metadata import Base, Thread, User
+
+USER_ID = "user-1"
+THREAD_ID = "thread-1"
+SUMMARY = "User is planning a trip to Lisbon in May."
+
+
+class StubMetadata:
+
+    def __init__(self, session_factory):
+        self._session_factory = session_factory
+
+    def get_db_session(self):
+        return self._session_factory()
+
+
+def _converse_response(text):
+    return {
+        'output': {'message': {'role': 'assistant', 'content': [{'text': text}]}},
+        'stopReason': 'end_turn',
+        'usage': {'inputTokens': 100, 'outputTokens': 20, 'totalTokens': 120},
+        'metrics': {'latencyMs': 5},
+    }
+
+
+@pytest.fixture
+def env(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'meta.db'}")
+    Base.metadata.create_all(engine)
+    Session = scoped_session(sessionmaker(bind=engine))
+    metadata = StubMetadata(Session)
+
+    session = Session()
+    session.add(User(id=USER_ID, email="user@example.com", sign_in_method="test"))
+    session.add(Thread(thread_id=THREAD_ID, user_id=USER_ID, name="Trip", session_id="session-1",
+                       session_state={}))
+    session.commit()
+    session.close()
+
+    converse_client = boto3.client('bedrock-runtime', region_name='us-east-1',
+                                   aws_access_key_id='testing', aws_secret_access_key='testing')
+    threads = BedrockThreadsProvider(None, None, metadata)
+    jobs = BackgroundJobs(metadata, max_workers=1)
+
+    agent = BedrockAgent.__new__(BedrockAgent)
+    agent.agent_id = 'agent-1'
+    agent.model = 'anthropic.claude-3-5-sonnet-20241022-v2:0'
+    agent.bond_provider = SimpleNamespace(threads=threads, jobs=jobs, bedrock_runtime_client=converse_client)
+
+    with Stubber(converse_client) as stubber:
+        yield SimpleNamespace(agent=agent, threads=threads, jobs=jobs, stubber=stubber)
+
+    jobs.shutdown(wait=True)
+    Session.remove()
+    engine.dispose()
+
+
+def _add_turns(threads, *texts):
+    for i, text in enumerate(texts):
+        threads.add_message(thread_id=THREAD_ID, user_id=USER_ID, role='user' if i % 2 == 0 else 'assistant',
+                            message_type='text', content=text)
+
+
+def _set_state(threads, session_state, session_id="session-1"):
+    threads.update_thread_session(THREAD_ID, USER_ID, session_id=session_id, session_state=session_state)
+
+
+def _state(threads):
+    return threads.get_thread_session_state(THREAD_ID, USER_ID)
+
+
+def _usage(tokens):
+    return {'context_usage': {'estimated_tokens': tokens, 'compaction_count': 1}}
+
+
+def _precompute(env):
+    """Cross the soft threshold and wait for the background summary."""
+    env.stubber.add_response('converse', _converse_response(SUMMARY))
+    assert env.agent._compact_after_turn(THREAD_ID, USER_ID) is False
+    env.jobs.shutdown(wait=True)
+    return _state(env.threads)['precomputed_compaction']
+
+
+class TestBackgroundCompaction:
+
+    def test_soft_threshold_prepares_summary_in_background(self, env):
+        _add_turns(env.threads, "Help me plan a trip", "Where to?", "Lisbon, in May", "Great choice")
+        _set_state(env.threads, _usage(130_000))
+
+        precomputed = _precompute(env)
+
+        env.stubber.assert_no_pending_responses()
+        assert precomputed['summary'][1]['content'][0]['text'] == SUMMARY
+        assert precomputed['watermark'] == 3
+        state = _state(env.threads)
+        assert 'compaction_in_progress' not in state
+        # The session is only rotated by the next turn
+        assert env.threads.get_thread_session_id(THREAD_ID) == "session-1"
+        assert state['context_usage']['estimated_tokens'] == 130_000
+
+    def test_summary_covers_the_whole_thread(self, env):
+        _add_turns(env.threads, *[f"turn {i}" for i in range(110)])
+        _set_state(env.threads, _usage(130_000))
+
+        precomputed = _precompute(env)
+
+        assert precomputed['watermark'] == 109
+        assert env.threads.get_conversation_history_after(THREAD_ID, USER_ID, precomputed['watermark']) == []
+
+    def test_below_soft_threshold_does_nothing(self, env):
+        _add_turns(env.threads, "Hi", "Hello")
+        _set_state(env.threads, _usage(1_000))
+        assert env.agent._compact_after_turn(THREAD_ID, USER_ID) is False
+        assert _state(env.threads) == _usage(1_000)
+
+    def test_next_turn_takes_summary_and_later_turns(self, env):
+        _add_turns(env.threads, "Help me plan a trip", "Where to?")
+        _set_state(env.threads, _usage(130_000))
+        _precompute(env)
+        # A turn that finished after the summary was taken
+        _add_turns(env.threads, "Find me a hotel", "Here are three options")
+
+        session_id, session_state = env.agent._take_precomputed_compaction(
+            THREAD_ID, USER_ID, "session-1", _state(env.threads))
+
+        assert session_id != "session-1"
+        assert env.threads.get_thread_session_id(THREAD_ID) == session_id
+        history = session_state['pending_compaction_summary']
+        assert [m['content'][0]['text'] for m in history[1:]] == [
+            SUMMARY, "Find me a hotel", "Here are three options"]
+        assert session_state['context_usage']['compaction_count'] == 2
+        assert session_state['context_usage']['token_source'] == 'reset'
+        assert _state(env.threads) == session_state
+
+    def test_too_many_later_turns_compact_inline(self, env):
+        _add_turns(env.threads, "Help me plan a trip", "Where to?")
+        _set_state(env.threads, _usage(130_000))
+        _precompute(env)
+        # More turns than fit next to the summary in one conversationHistory
+        _add_turns(env.threads, *[f"later turn {i}" for i in range(20)])
+        env.stubber.add_response('converse', _converse_response("Trip planning, then 20 more turns."))
+
+        session_id, session_state = env.agent._take_precomputed_compaction(
+            THREAD_ID, USER_ID, "session-1", _state(env.threads))
+
+        env.stubber.assert_no_pending_responses()
+        assert session_id != "session-1"
+        assert env.threads.get_thread_session_id(THREAD_ID) == session_id
+        history = session_state['pending_compaction_summary']
+        assert [m['content'][0]['text'] for m in history[1:]] == ["Trip planning, then 20 more turns."]
+        assert _state(env.threads) == session_state
+
+    def test_summary_is_taken_once(self, env):
+        _add_turns(env.threads, "Hi", "Hello")
+        _set_state(env.threads, _usage(130_000))
+        _precompute(env)
+        stale_state = _state(env.threads)
+
+        first_id, _ = env.agent._take_precomputed_compaction(THREAD_ID, USER_ID, "session-1", dict(stale_state))
+        # A concurrent turn that read the state before the first one took the summary
+        second_id, second_state = env.agent._take_precomputed_compaction(
+            THREAD_ID, USER_ID, "session-1", dict(stale_state))
+
+        assert first_id != "session-1"
+        assert second_id == "session-1"
+        assert 'precomputed_compaction' not in second_state
+        assert env.threads.get_thread_session_id(THREAD_ID) == first_id
+
+    def test_summary_for_a_replaced_session_is_discarded(self, env):
+        _add_turns(env.threads, "Hi", "Hello")
+        _set_state(env.threads, _usage(130_000))
+        precomputed = _precompute(env)
+        _set_state(env.threads, {'precomputed_compaction': precomputed}, session_id="session-2")
+
+        session_id, session_state = env.agent._take_precomputed_compaction(
+            THREAD_ID, USER_ID, "session-2", _state(env.threads))
+
+        assert session_id == "session-2"
+        assert 'pending_compaction_summary' not in session_state
+        assert _state(env.threads) == {}
+
+    def test_running_compaction_is_not_scheduled_again(self, env):
+        started = datetime.now(timezone.utc).isoformat()
+        _set_state(env.threads, dict(_usage(130_000), compaction_in_progress=started))
+        assert env.agent._schedule_compaction(THREAD_ID, USER_ID) is None
+
+    def test_failed_summary_clears_the_flag(self, env):
+        _add_turns(env.threads, "Hi", "Hello")
+        _set_state(env.threads, _usage(130_000))
+        env.stubber.add_client_error('converse', service_error_code='ThrottlingException')
+
+        job_id = env.agent._schedule_compaction(THREAD_ID, USER_ID)
+        env.jobs.shutdown(wait=True)
+
+        assert env.jobs.get_job(job_id)['status'] == 'FAILED'
+        assert _state(env.threads) == _usage(130_000)
+
+    def test_hard_threshold_compacts_inline(self, env):
+        _add_turns(env.threads, "Hi", "Hello")
+        _set_state(env.threads, _usage(180_000))
+        env.stubber.add_response('converse', _converse_response(SUMMARY))
+
+        assert env.agent._compact_after_turn(THREAD_ID, USER_ID) is True
+
+        env.stubber.assert_no_pending_responses()
+        assert env.threads.get_thread_session_id(THREAD_ID) != "session-1"
+        assert _state(env.threads)['pending_compaction_summary'][1]['content'][0]['text'] == SUMMARY
+
+    def test_hard_threshold_waits_for_a_ready_summary(self, env):
+        _add_turns(env.threads, "Hi", "Hello")
+        _set_state(env.threads, _usage(130_000))
+        precomputed = _precompute(env)
+        _set_state(env.threads, dict(_usage(180_000), precomputed_compaction=precomputed))
+
+        assert env.agent._compact_after_turn(THREAD_ID, USER_ID) is False
+        assert env.threads.get_thread_session_id(THREAD_ID) == "session-1"
+
+
+class TestSessionStateUpdates:
+
+    def test_concurrent_write_is_not_overwritten(self, env):
+        _set_state(env.threads, _usage(130_000))
+        calls = []
+
+        def claim(session_state, session_id):
+            calls.append(dict(session_state))
+            if len(calls) == 1:
+                # Another worker writes the row between our read and write
+                _set_state(env.threads, dict(_usage(130_000), compaction_in_progress="other"))
+            if 'compaction_in_progress' in session_state:
+                return False
+            session_state['compaction_in_progress'] = "mine"
+            return session_id
+
+        assert env.threads.update_thread_session_state(THREAD_ID, USER_ID, claim) is False
+        assert len(calls) == 2
+        assert _state(env.threads)['compaction_in_progress'] == "other"
+
+    def test_history_after_watermark_is_scoped_to_the_user(self, env):
+        _add_turns(env.threads, "Hi", "Hello")
+        assert env.threads.get_conversation_history_after(THREAD_ID, "someone-else", -1) is None
+        assert len(env.threads.get_conversation_history_after(THREAD_ID, USER_ID, -1)) == 2
@@ -0,0 +1,189 @@
+"""
+Tests for BackgroundJobs and the GET /jobs/{job_id} status route.
+
+The job store runs against a real SQLite DB so status transitions are read back
+the same way a second worker would see them.
+"""
+import pytest
+import os
+import tempfile
+import datetime
+from unittest.mock import MagicMock
+from datetime import timedelta
+
+# --- Test Database Setup ---
+_test_db_file = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+TEST_DB_URL = f"sqlite:///{_test_db_file.name}"
+os.environ.setdefault('METADATA_DB_URL', TEST_DB_URL)
+os.environ.setdefault('OAUTH2_ENABLED_PROVIDERS', 'cognito')
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker, scoped_session
+from bondable.bond.providers.metadata import Base, BackgroundJob
+from bondable.bond.background_jobs import BackgroundJobs, PENDING, PREPARING, READY, COMPLETED, FAILED
+from bondable.bond.providers.provider import Provider
+from bondable.rest.main import app, create_access_token, get_bond_provider
+
+OWNER = "job-owner"
+OTHER = "job-other"
+
+
+class FakeMetadata:
+    """Minimal Metadata-like object backed by a real SQLite DB."""
+    def __init__(self, db_url):
+        self.engine = create_engine(db_url, echo=False, connect_args={"check_same_thread": False})
+        Base.metadata.create_all(self.engine)
+        self._session_factory = scoped_session(sessionmaker(bind=self.engine))
+
+    def get_db_session(self):
+        return self._session_factory()
+
+
+@pytest.fixture(scope="module")
+def db():
+    metadata = FakeMetadata(TEST_DB_URL)
+    yield metadata
+    metadata.engine.dispose()
+    db_path = TEST_DB_URL.replace("sqlite:///", "")
+    if os.path.exists(db_path):
+        try:
+            os.remove(db_path)
+        except Exception:
+            pass
+
+
+@pytest.fixture
+def jobs(db):
+    job_runner = BackgroundJobs(db, max_workers=1)
+    yield job_runner
+    job_runner.shutdown(wait=True)
+
+
+class TestBackgroundJobs:
+
+    def test_success_records_result(self, jobs):
+        def work(job_id):
+            jobs.set_status(job_id, PREPARING, subject_id="agent_1")
+            return {"agent_id": "agent_1"}
+
+        job_id = jobs.submit("agent_create", OWNER, work, done_status=READY)
+        jobs.shutdown(wait=True)
+
+        job = jobs.get_job(job_id)
+        assert job["status"] == READY
+        assert job["subject_id"] == "agent_1"
+        assert job["result"] == {"agent_id": "agent_1"}
+        assert job["user_id"] == OWNER
+        assert job["error"] is None
+
+    def test_failure_records_error(self, jobs):
+        def work(job_id):
+            raise RuntimeError("prepare timed out")
+
+        job_id = jobs.submit("agent_create", OWNER, work)
+        jobs.shutdown(wait=True)
+
+        job = jobs.get_job(job_id)
+        assert job["status"] == FAILED
+        assert job["error"] == "prepare timed out"
+
+    def test_agent_job_preparing_only_once_prepare_starts(self, jobs):
+        from bondable.rest.routers.agents import _agent_job_result, _provision_agent_update
+        seen = {}
+        provider = MagicMock()
+        provider.jobs = jobs
+
+        def create_or_update_agent(agent_def, user_id, on_prepare=None):
+            seen["before_prepare"] = jobs.get_job(seen["job_id"])["status"]
+            on_prepare("agent_1")
+            seen["after_prepare"] = jobs.get_job(seen["job_id"])
+            agent = MagicMock()
+            agent.get_agent_id.return_value = "agent_1"
+            agent.get_name.return_value = "Agent 1"
+            return agent
+
+        def work(job_id):
+            seen["job_id"] = job_id
+            return _agent_job_result(_provision_agent_update(
+                provider, MagicMock(), MagicMock(group_ids=None, group_permissions=None), OWNER, job_id=job_id))
+
+        provider.agents.create_or_update_agent.side_effect = create_or_update_agent
+        job_id = jobs.submit("agent_update", OWNER, work, done_status=READY)
+        jobs.shutdown(wait=True)
+
+        assert seen["before_prepare"] == PENDING
+        assert seen["after_prepare"]["status"] == PREPARING
+        assert seen["after_prepare"]["subject_id"] == "agent_1"
+        assert jobs.get_job(job_id)["status"] == READY
+
+    def test_unknown_job(self, jobs):
+        assert jobs.get_job("job_missing") is None
+
+    def test_stale_job_reported_failed(self, db, jobs):
+        old = datetime.datetime.now() - timedelta(seconds=jobs._stale_seconds + 60)
+        session = db.get_db_session()
+        session.add(BackgroundJob(id="job_stale", kind="agent_create", user_id=OWNER,
+                                  status=PREPARING, created_at=old, updated_at=old))
+        session.add(BackgroundJob(id="job_done", kind="agent_create", user_id=OWNER,
+                                  status=COMPLETED, created_at=old, updated_at=old))
+        session.commit()
+        session.close()
+
+        stale = jobs.get_job("job_stale")
+        assert stale["status"] == FAILED
+        assert stale["error"]
+        assert jobs.get_job("job_done")["status"] == COMPLETED
+
+
+class TestJobsRoute:
+
+    @pytest.fixture
+    def client(self):
+        provider = MagicMock(spec=Provider)
+        provider.jobs = MagicMock(spec=BackgroundJobs)
+        app.dependency_overrides[get_bond_provider] = lambda: provider
+
+        def headers_for(user_id):
+            token = create_access_token(data={
+                "sub": f"{user_id}@example.com",
+                "name": user_id,
+                "provider": "cognito",
+                "user_id": user_id,
+            }, expires_delta=timedelta(minutes=15))
+            return {"Authorization": f"Bearer {token}"}
+
+        yield TestClient(app), headers_for, provider
+        app.dependency_overrides.pop(get_bond_provider, None)
+
+    def _job(self, user_id):
+        now = datetime.datetime.now()
+        return {
+            "job_id": "job_1", "kind": "agent_create", "user_id": user_id, "subject_id": "agent_1",
+            "status": PENDING, "error": None, "result": None, "created_at": now, "updated_at": now,
+        }
+
+    def test_owner_can_poll(self, client):
+        test_client, headers_for, provider = client
+        provider.jobs.get_job.return_value = self._job(OWNER)
+
+        response = test_client.get("/jobs/job_1", headers=headers_for(OWNER))
+        assert response.status_code == 200
+        body = response.json()
+        assert body["job_id"] == "job_1"
+        assert body["status"] == PENDING
+        assert body["subject_id"] == "agent_1"
+
+    def test_other_user_gets_404(self, client):
+        test_client, headers_for, provider = client
+        provider.jobs.get_job.return_value = self._job(OWNER)
+
+        response = test_client.get("/jobs/job_1", headers=headers_for(OTHER))
+        assert response.status_code == 404
+
+    def test_missing_job_404(self, client):
+        test_client, headers_for, provider = client
+        provider.jobs.get_job.return_value = None
+
+        response = test_client.get("/jobs/job_1", headers=headers_for(OWNER))
+        assert response.status_code == 404
@@ -16,14 +16,12 @@ class TestAgentRuntimeConfig:
     """Tests for BedrockProvider boto3 client configuration.
 
     Tests call the real _init_aws_clients method (where BotoConfig is used)
-    with boto3 and BotoConfig mocked at the module level.
+    with the client factory and BotoConfig mocked at the module level.
     """
 
-    def _init_aws_clients(self, mock_boto3, mock_boto_config):
+    def _init_aws_clients(self, mock_aws_client, mock_boto_config):
         """Call the real _init_aws_clients on a BedrockProvider instance."""
-        mock_session = MagicMock()
-        mock_boto3.Session.return_value = mock_session
-        mock_session.client.return_value = MagicMock()
+        mock_aws_client.return_value = MagicMock()
         mock_boto_config.return_value = MagicMock()
 
         from bondable.bond.providers.bedrock.BedrockProvider import BedrockProvider
@@ -32,14 +30,14 @@ class TestAgentRuntimeConfig:
         return provider
 
     @patch('bondable.bond.providers.bedrock.BedrockProvider.BotoConfig')
-    @patch('bondable.bond.providers.bedrock.BedrockProvider.boto3')
-    def test_agent_runtime_config_defaults(self, mock_boto3, mock_boto_config):
+    @patch('bondable.bond.providers.bedrock.BedrockProvider.aws_client')
+    def test_agent_runtime_config_defaults(self, mock_aws_client, mock_boto_config):
         """Config should use connect_timeout=10, tcp_keepalive=True, standard retries with max_attempts=3."""
         with patch.dict(os.environ, {'AWS_REGION': 'us-east-1'}, clear=False):
             os.environ.pop('BEDROCK_AGENT_RUNTIME_MAX_ATTEMPTS', None)
             os.environ.pop('BEDROCK_AGENT_RUNTIME_READ_TIMEOUT', None)
 
-            self._init_aws_clients(mock_boto3, mock_boto_config)
+            self._init_aws_clients(mock_aws_client, mock_boto_config)
 
             mock_boto_config.assert_called_once_with(
                 read_timeout=300,
@@ -47,13 +45,15 @@ class TestAgentRuntimeConfig:
                 retries={'max_attempts': 3, 'mode': 'standard'},
                 tcp_keepalive=True
             )
+            mock_aws_client.assert_any_call('bedrock-agent-runtime', 'us-east-1', workload='streaming',
+                                            config=mock_boto_config.return_value)
 
     @patch('bondable.bond.providers.bedrock.BedrockProvider.BotoConfig')
-    @patch('bondable.bond.providers.bedrock.BedrockProvider.boto3')
-    def test_agent_runtime_config_env_override(self, mock_boto3, mock_boto_config):
+    @patch('bondable.bond.providers.bedrock.BedrockProvider.aws_client')
+    def test_agent_runtime_config_env_override(self, mock_aws_client, mock_boto_config):
         """BEDROCK_AGENT_RUNTIME_MAX_ATTEMPTS env var should override the default."""
         with patch.dict(os.environ, {'AWS_REGION': 'us-east-1', 'BEDROCK_AGENT_RUNTIME_MAX_ATTEMPTS': '5'}):
-            self._init_aws_clients(mock_boto3, mock_boto_config)
+            self._init_aws_clients(mock_aws_client, mock_boto_config)
 
             mock_boto_config.assert_called_once_with(
                 read_timeout=300,
@@ -0,0 +1,122 @@
+"""
+Tests for the pieces of scripts/benchmarks that don't need a running app:
+recording round-trips, the fake runtime's continuation handling, the
+recorder's scrubbing and the baseline comparison.
+"""
+
+import json
+
+import pytest
+
+from scripts.benchmarks.__main__ import compare
+from scripts.benchmarks.event_streams import read_recording, text_turn, tool_turn, write_recording
+from scripts.benchmarks.fake_bedrock import FakeBedrockAgentRuntime, InMemoryS3
+from scripts.benchmarks.harness import percentile
+from scripts.benchmarks.recorder import PiiScrubber, RecordingAgentRuntime
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".jsonl.gz"])
+def test_recording_round_trip(tmp_path, suffix):
+    recording = tool_turn("abc123", tool_calls=2, tool_parameters={"query": "x"})
+    path = str(tmp_path / f"turn{suffix}")
+    write_recording(path, recording)
+
+    loaded = read_recording(path)
+    assert loaded.name == "tool_turn"
+    assert len(loaded.invocations) == 3
+    assert loaded.invocations[0].events[1].event["returnControl"]["invocationInputs"][0]["apiInvocationInput"]["apiPath"] == "/b.abc123.bench_tool"
+    # Chunk payloads come back as bytes, not base64 strings
+    assert loaded.invocations[-1].events[0].event["chunk"]["bytes"] == recording.invocations[-1].events[0].event["chunk"]["bytes"]
+
+
+def test_read_recording_rejects_other_formats(tmp_path):
+    path = tmp_path / "other.jsonl"
+    path.write_text('{"format": "something-else", "version": 1}\n')
+    with pytest.raises(ValueError):
+        read_recording(str(path))
+
+
+def test_fake_runtime_follows_continuations_per_session():
+    runtime = FakeBedrockAgentRuntime(tool_turn("abc123", tool_calls=1), latency_scale=0)
+
+    first = list(runtime.invoke_agent(sessionId="s1")["completion"])
+    assert any("returnControl" in event for event in first)
+    # A new turn on another session starts from the beginning of the recording
+    assert any("returnControl" in event for event in runtime.invoke_agent(sessionId="s2")["completion"])
+
+    final = list(runtime.invoke_agent(sessionId="s1", sessionState={"returnControlInvocationResults": [{}]})["completion"])
+    assert any("chunk" in event for event in final)
+    with pytest.raises(RuntimeError):
+        runtime.invoke_agent(sessionId="s1", sessionState={"returnControlInvocationResults": [{}]})
+
+
+def test_fake_runtime_rejects_unsupported_calls():
+    with pytest.raises(NotImplementedError):
+        FakeBedrockAgentRuntime(text_turn()).invoke_inline_agent()
+
+
+def test_in_memory_s3_round_trip():
+    s3 = InMemoryS3()
+    s3.put_object(Bucket="b", Key="k", Body=b"data")
+    assert s3.get_object(Bucket="b", Key="k")["Body"].read() == b"data"
+    s3.delete_object(Bucket="b", Key="k")
+    with pytest.raises(Exception):
+        s3.head_object(Bucket="b", Key="k")
+
+
+def test_percentile_interpolates():
+    assert percentile([], 95) == 0.0
+    assert percentile([10.0, 20.0], 50) == 15.0
+    assert percentile([1.0, 2.0, 3.0, 4.0, 5.0], 100) == 5.0
+
+
+def test_compare_flags_regressions_in_both_directions():
+    baseline = {"chat_stream": {"p95_ms": 100.0, "throughput_rps": 10.0, "errors": 0, "db_statements_per_request": 8.0}}
+    current = {"chat_stream": {"p95_ms": 105.0, "throughput_rps": 8.0, "errors": 1, "db_statements_per_request": 12.0}}
+
+    regressions = {metric for _, metric, _, _ in compare(current, baseline, tolerance=0.10)}
+    assert regressions == {"throughput_rps", "errors", "db_statements_per_request"}
+
+
+def test_compare_ignores_new_scenarios_and_improvements():
+    baseline = {"chat_stream": {"p95_ms": 100.0, "throughput_rps": 10.0}}
+    current = {
+        "chat_stream": {"p95_ms": 50.0, "throughput_rps": 20.0},
+        "large_upload": {"p95_ms": 999.0},
+    }
+    assert compare(current, baseline, tolerance=0.10) == []
+
+
+def test_scrubber_masks_pii_and_blanks_file_bytes():
+    scrubber = PiiScrubber(extra_terms=["Acme Corp"])
+    event = {
+        "chunk": {"bytes": "Mail jane.doe@example.com or call 555-123-4567 about Acme Corp".encode()},
+        "files": {"files": [{"name": "report.pdf", "bytes": b"%PDF secret"}]},
+    }
+
+    scrubbed = scrubber.scrub_event(event)
+
+    text = scrubbed["chunk"]["bytes"].decode()
+    assert "jane.doe" not in text and "555-123-4567" not in text and "Acme" not in text
+    assert "[EMAIL]" in text and "[PHONE]" in text
+    assert scrubbed["files"]["files"][0]["bytes"] == bytes(len(b"%PDF secret"))
+
+
+def test_recorder_writes_one_file_per_turn_including_continuations(tmp_path):
+    source = tool_turn("abc123", tool_calls=2)
+    recorder = RecordingAgentRuntime(FakeBedrockAgentRuntime(source, latency_scale=0), str(tmp_path))
+
+    list(recorder.invoke_agent(sessionId="s1", agentId="AGENT1")["completion"])
+    for _ in range(2):
+        continuation = {"returnControlInvocationResults": [{"apiResult": {"responseBody": {
+            "application/json": {"body": json.dumps({"result": "owner bob@example.com"})}}}}]}
+        list(recorder.invoke_agent(sessionId="s1", agentId="AGENT1", sessionState=continuation)["completion"])
+
+    files = list(tmp_path.iterdir())
+    assert len(files) == 1
+    recorded = read_recording(str(files[0]))
+    assert recorded.metadata["agent_id"] == "AGENT1"
+    assert len(recorded.invocations) == 3
+    assert recorded.invocations[0].tool_results == []
+    assert recorded.invocations[1].tool_results == ["owner [EMAIL]"]
+    assert [e.event for e in recorded.invocations[-1].events] == [e.event for e in source.invocations[-1].events]
@@ -2,6 +2,7 @@ import logging
 LOGGER = logging.getLogger(__name__)
 
 from bondable.bond.broker import Broker, BondMessage
+from bondable.bond.broker_backends import InMemoryBrokerBackend, SqlBrokerBackend
 from bondable.bond.cache import bond_cache_clear
 import os
 import sys
@@ -238,3 +239,190 @@ class TestBroker:
     message = listener_2.messages[1]
     assert message is not None
     assert message.clob.get_content() == 'goodbye jumbo'
+
+
+def _publish_message(broker, thread_id, message_id, text, is_done=False):
+  message = BondMessage(thread_id=thread_id, message_id=message_id, agent_id='test_agent', type='text', role='assistant', is_done=is_done)
+  broker.publish(thread_id, message=message.to_start_xml())
+  for chunk in text.split(' '):
+    broker.publish(thread_id, chunk + ' ')
+  return broker.publish(thread_id, message=message.to_end_xml())
+
+
+class TestBrokerEventLog:
+
+  def setup_method(self):
+    bond_cache_clear()
+
+  def test_sequence_numbers_increase(self):
+    broker = Broker(backend=InMemoryBrokerBackend())
+    first = broker.publish('t', '<_bondmessage id="m" thread_id="t">')
+    second = broker.publish('t', 'body')
+    assert second == first + 1
+    assert broker.backend.last_seq('t') == second
+
+  def test_resume_after_complete_message(self):
+    broker = Broker(backend=InMemoryBrokerBackend())
+    conn = broker.connect(thread_id='t', subscriber_id='client')
+    _publish_message(broker, 't', 'm1', 'first answer')
+    received = conn.wait_for_message()
+    assert received.clob.get_content() == 'first answer '
+    broker.disconnect('t', 'client')
+
+    _publish_message(broker, 't', 'm2', 'second answer')
+
+    resumed = broker.connect(thread_id='t', subscriber_id='client', last_event_id=received.event_id)
+    message = resumed.wait_for_message(timeout=1)
+    assert message.message_id == 'm2'
+    assert message.clob.get_content() == 'second answer '
+    assert resumed.msg_queue.empty()
+
+  def test_resume_mid_message_replays_whole_message(self):
+    broker = Broker(backend=InMemoryBrokerBackend())
+    message = BondMessage(thread_id='t', message_id='m1', agent_id='a', type='text', role='assistant')
+    broker.publish('t', message.to_start_xml())
+    seen = broker.publish('t', 'hello ')
+    broker.publish('t', 'world')
+    broker.publish('t', message.to_end_xml())
+
+    conn = broker.connect(thread_id='t', subscriber_id='client', last_event_id=seen)
+    replayed = conn.wait_for_message(timeout=1)
+    assert replayed.message_id == 'm1'
+    assert replayed.clob.get_content() == 'hello world'
+
+  def test_slow_append_does_not_block_other_threads(self):
+    import threading
+
+    class SlowBackend(InMemoryBrokerBackend):
+      def __init__(self):
+        super().__init__()
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+      def append(self, thread_id, message):
+        if thread_id == 'slow':
+          self.entered.set()
+          assert self.release.wait(timeout=5)
+        return super().append(thread_id, message)
+
+    backend = SlowBackend()
+    broker = Broker(backend=backend)
+    # Threads that share a lock stripe would wait on each other by design
+    fast = next(f'fast-{i}' for i in range(1000)
+                if broker._thread_lock(f'fast-{i}') is not broker._thread_lock('slow'))
+    slow_publish = threading.Thread(target=broker.publish, args=('slow', 'body'))
+    slow_publish.start()
+    assert backend.entered.wait(timeout=5)
+    try:
+      conn = broker.connect(thread_id=fast, subscriber_id='client')
+      _publish_message(broker, fast, 'm1', 'not blocked')
+      assert conn.wait_for_message(timeout=1).clob.get_content() == 'not blocked '
+    finally:
+      backend.release.set()
+      slow_publish.join(timeout=5)
+
+  def test_new_connection_without_last_event_id_gets_only_new_messages(self):
+    broker = Broker(backend=InMemoryBrokerBackend())
+    _publish_message(broker, 't', 'old', 'old text')
+    conn = broker.connect(thread_id='t', subscriber_id='client')
+    _publish_message(broker, 't', 'new', 'new text')
+    assert conn.wait_for_message(timeout=1).message_id == 'new'
+
+  def test_log_is_bounded(self):
+    broker = Broker(backend=InMemoryBrokerBackend(max_events=6))
+    for i in range(5):
+      last = _publish_message(broker, 't', f'm{i}', 'a b')
+    events = broker.backend.read('t')
+    assert len(events) == 6
+    assert events[-1].seq == last
+
+    # Resuming from before the retained window skips the partial message at its start
+    conn = broker.connect(thread_id='t', subscriber_id='late', last_event_id=0)
+    ids = []
+    while not conn.msg_queue.empty():
+      ids.append(conn.wait_for_message(timeout=1).message_id)
+    assert ids == ['m4']
+
+  def test_idle_logs_expire(self):
+    backend = InMemoryBrokerBackend(ttl_seconds=0)
+    backend.append('old', 'x')
+    backend.append('new', 'y')
+    assert backend.read('old') == []
+
+
+class TestSqlBrokerBackend:
+
+  @pytest.fixture
+  def db_url(self, tmp_path):
+    return f"sqlite:///{tmp_path / 'broker.db'}"
+
+  def test_fan_out_across_brokers(self, db_url):
+    # Two brokers on one database stand in for two uvicorn workers
+    publisher = Broker(backend=SqlBrokerBackend(db_url))
+    subscriber = Broker(backend=SqlBrokerBackend(db_url))
+    try:
+      conn = subscriber.connect(thread_id='t', subscriber_id='client')
+      _publish_message(publisher, 't', 'm1', 'from another worker')
+      assert subscriber.poll() == 3 + 2
+      message = conn.wait_for_message(timeout=1)
+      assert message.clob.get_content() == 'from another worker '
+      # Nothing is delivered twice
+      assert subscriber.poll() == 0
+    finally:
+      publisher.stop()
+      subscriber.stop()
+
+  def test_background_poller_delivers(self, db_url):
+    publisher = Broker(backend=SqlBrokerBackend(db_url))
+    subscriber = Broker(backend=SqlBrokerBackend(db_url))
+    subscriber.poll_interval = 0.02
+    try:
+      conn = subscriber.connect(thread_id='t', subscriber_id='client')
+      listener = MessageListener(conn)
+      listener.start()
+      _publish_message(publisher, 't', 'm1', 'streamed', is_done=True)
+      listener.join()
+      assert [m.message_id for m in listener.messages] == ['m1']
+      assert listener.messages[0].clob.get_content() == 'streamed '
+    finally:
+      publisher.stop()
+      subscriber.stop()
+
+  def test_resume_on_another_worker(self, db_url):
+    first_worker = Broker(backend=SqlBrokerBackend(db_url))
+    second_worker = Broker(backend=SqlBrokerBackend(db_url))
+    try:
+      conn = first_worker.connect(thread_id='t', subscriber_id='client')
+      _publish_message(first_worker, 't', 'm1', 'one')
+      done = conn.wait_for_message(timeout=1)
+      _publish_message(first_worker, 't', 'm2', 'two')
+
+      resumed = second_worker.connect(thread_id='t', subscriber_id='client', last_event_id=done.event_id)
+      assert resumed.wait_for_message(timeout=1).message_id == 'm2'
+    finally:
+      first_worker.stop()
+      second_worker.stop()
+
+  def test_log_is_bounded_and_sequences_survive_reopen(self, db_url):
+    backend = SqlBrokerBackend(db_url, max_events=3)
+    seqs = [backend.append('t', str(i)) for i in range(5)]
+    assert seqs == list(range(seqs[0], seqs[0] + 5))
+    assert [e.message for e in backend.read('t')] == ['2', '3', '4']
+    assert [e.message for e in backend.read('t', after_seq=seqs[3])] == ['4']
+    backend.close()
+
+    reopened = SqlBrokerBackend(db_url, max_events=3)
+    assert reopened.last_seq('t') == seqs[-1]
+    assert reopened.append('t', 'next') == seqs[-1] + 1
+    reopened.close()
+
+  def test_backend_selected_from_env(self, db_url, monkeypatch):
+    bond_cache_clear()
+    monkeypatch.setenv('BROKER_BACKEND_CLASS', 'bondable.bond.broker_backends.SqlBrokerBackend')
+    monkeypatch.setenv('BROKER_DB_URL', db_url)
+    broker = Broker.broker()
+    try:
+      assert isinstance(broker.backend, SqlBrokerBackend)
+    finally:
+      broker.stop()
+      bond_cache_clear()
@@ -0,0 +1,256 @@
+"""
+Tests for set-based purges used when a user is offboarded.
+
+Thread and file purges run against a real SQLite DB with a mocked S3 client so
+the number of DELETE statements and delete_objects calls can be checked; agent
+deletes and the background DELETE /users/{email} route use mocks.
+"""
+import pytest
+import os
+import tempfile
+import threading
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+# --- Test Database Setup ---
+_test_db_file = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+TEST_DB_URL = f"sqlite:///{_test_db_file.name}"
+os.environ.setdefault('METADATA_DB_URL', TEST_DB_URL)
+os.environ.setdefault('OAUTH2_ENABLED_PROVIDERS', 'cognito')
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker, scoped_session
+from bondable.bond.providers.metadata import Base, Thread, FileRecord, AgentRecord
+from bondable.bond.providers.bedrock import BedrockFiles
+from bondable.bond.providers.bedrock.BedrockMetadata import BedrockMessage
+from bondable.bond.providers.bedrock.BedrockThreads import BedrockThreadsProvider
+from bondable.bond.providers.bedrock.BedrockFiles import BedrockFilesProvider
+from bondable.bond.providers.bedrock.BedrockAgent import BedrockAgentProvider
+from bondable.bond.background_jobs import BackgroundJobs
+from bondable.bond.providers.provider import Provider
+from bondable.bond.users import Users
+from bondable.rest.main import app, create_access_token, get_bond_provider
+
+USER = "offboard-user"
+OTHER = "other-user"
+BUCKET = "files-bucket"
+
+
+class FakeMetadata:
+    """Minimal Metadata-like object backed by a real SQLite DB."""
+    def __init__(self, db_url):
+        self.engine = create_engine(db_url, echo=False, connect_args={"check_same_thread": False})
+        Base.metadata.create_all(self.engine)
+        self._session_factory = scoped_session(sessionmaker(bind=self.engine))
+
+    def get_db_session(self):
+        return self._session_factory()
+
+
+@pytest.fixture(scope="module")
+def db():
+    metadata = FakeMetadata(TEST_DB_URL)
+    yield metadata
+    metadata.engine.dispose()
+    db_path = TEST_DB_URL.replace("sqlite:///", "")
+    if os.path.exists(db_path):
+        try:
+            os.remove(db_path)
+        except Exception:
+            pass
+
+
+@pytest.fixture(autouse=True)
+def clear_tables(db):
+    session = db.get_db_session()
+    for model in (BedrockMessage, Thread, FileRecord, AgentRecord):
+        session.query(model).delete()
+    session.commit()
+    session.close()
+
+
+@pytest.fixture
+def delete_statements(db):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("DELETE"):
+            statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(db.engine, "before_cursor_execute", record)
+
+
+def _add_thread(session, thread_id, user_ids, messages_per_user=2):
+    for user_id in user_ids:
+        session.add(Thread(thread_id=thread_id, user_id=user_id))
+        for i in range(messages_per_user):
+            session.add(BedrockMessage(thread_id=thread_id, user_id=user_id, role="user", type="text",
+                                       content={"text": "hi"}, message_index=i))
+
+
+class TestThreadPurge:
+
+    def test_user_threads_purged_in_bulk(self, db, delete_statements):
+        session = db.get_db_session()
+        for i in range(5):
+            _add_thread(session, f"thread_{i}", [USER])
+        _add_thread(session, "thread_shared", [USER, OTHER])
+        _add_thread(session, "thread_other", [OTHER])
+        session.commit()
+        session.close()
+
+        threads = BedrockThreadsProvider(bedrock_agent_runtime_client=MagicMock(), provider=MagicMock(), metadata=db)
+        threads.delete_threads_for_user(USER)
+
+        # One DELETE for the messages of all six threads, one for the user's thread rows
+        assert len(delete_statements) == 2
+        session = db.get_db_session()
+        try:
+            assert {t.thread_id for t in session.query(Thread).all()} == {"thread_shared", "thread_other"}
+            assert {m.thread_id for m in session.query(BedrockMessage).all()} == {"thread_other"}
+        finally:
+            session.close()
+
+    def test_single_thread_resource(self, db):
+        session = db.get_db_session()
+        _add_thread(session, "thread_1", [USER, OTHER])
+        session.commit()
+        session.close()
+
+        threads = BedrockThreadsProvider(bedrock_agent_runtime_client=MagicMock(), provider=MagicMock(), metadata=db)
+        assert threads.delete_thread_resource("thread_1") is True
+
+        session = db.get_db_session()
+        try:
+            assert session.query(BedrockMessage).count() == 0
+        finally:
+            session.close()
+
+
+class TestFilePurge:
+
+    @pytest.fixture
+    def files(self, db, monkeypatch):
+        monkeypatch.setenv("BEDROCK_S3_BUCKET", BUCKET)
+        s3_client = MagicMock()
+        s3_client.delete_objects.return_value = {}
+        return BedrockFilesProvider(s3_client=s3_client, provider=MagicMock(), metadata=db)
+
+    def _add_files(self, db, owner, count, bucket=BUCKET):
+        session = db.get_db_session()
+        for i in range(count):
+            session.add(FileRecord(file_id=f"s3://{bucket}/files/{owner}/{i}", file_path=f"{i}.txt",
+                                   file_hash=f"hash-{i}", owner_user_id=owner))
+        session.commit()
+        session.close()
+
+    def test_files_deleted_with_batched_delete_objects(self, db, files, monkeypatch):
+        monkeypatch.setattr(BedrockFiles, "S3_DELETE_BATCH_SIZE", 2)
+        self._add_files(db, USER, 5)
+        self._add_files(db, OTHER, 1)
+
+        files.delete_files_for_user(USER)
+
+        files.s3_client.head_object.assert_not_called()
+        files.s3_client.delete_object.assert_not_called()
+        batches = [c.kwargs["Delete"]["Objects"] for c in files.s3_client.delete_objects.call_args_list]
+        assert [len(b) for b in batches] == [2, 2, 1]
+        session = db.get_db_session()
+        try:
+            assert [f.owner_user_id for f in session.query(FileRecord).all()] == [OTHER]
+        finally:
+            session.close()
+
+    def test_resources_grouped_by_bucket(self, files):
+        files.s3_client.delete_objects.return_value = {"Errors": [{"Key": "b", "Message": "denied"}]}
+
+        deleted = files.delete_file_resources([
+            f"s3://{BUCKET}/a", f"s3://{BUCKET}/b", "s3://other-bucket/c", "not-an-s3-uri"
+        ])
+
+        buckets = sorted(c.kwargs["Bucket"] for c in files.s3_client.delete_objects.call_args_list)
+        assert buckets == [BUCKET, "other-bucket"]
+        # Each call reports one error, so one of the two in BUCKET and the one in other-bucket fail
+        assert deleted == 1
+
+
+class TestAgentPurge:
+
+    def test_agents_deleted_concurrently(self, db):
+        session = db.get_db_session()
+        for i in range(4):
+            session.add(AgentRecord(agent_id=f"agent_{i}", name=f"Agent {i}", owner_user_id=USER))
+        session.add(AgentRecord(agent_id="agent_other", name="Other", owner_user_id=OTHER))
+        session.commit()
+        session.close()
+
+        agents = BedrockAgentProvider(bedrock_client=MagicMock(), bedrock_agent_client=MagicMock(), metadata=db)
+        barrier = threading.Barrier(4, timeout=5)
+        deleted = []
+
+        def delete_agent(agent_id):
+            # Every delete must be in flight at once for the barrier to release
+            barrier.wait()
+            deleted.append(agent_id)
+            if agent_id == "agent_3":
+                raise RuntimeError("bedrock error")
+            return True
+
+        agents.delete_agent = delete_agent
+        agents.delete_agents_for_user(USER)
+
+        assert sorted(deleted) == [f"agent_{i}" for i in range(4)]
+
+
+class TestBackgroundOffboarding:
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        from bondable.bond.config import Config
+        monkeypatch.setattr(Config.config(), "get_admin_users", lambda: ["admin@example.com"])
+        monkeypatch.setattr(Config.config(), "is_admin_user", lambda email: email == "admin@example.com")
+
+        provider = MagicMock(spec=Provider)
+        provider.jobs = MagicMock(spec=BackgroundJobs)
+        provider.jobs.submit.return_value = "job_1"
+        provider.users = MagicMock(spec=Users)
+        app.dependency_overrides[get_bond_provider] = lambda: provider
+
+        token = create_access_token(data={
+            "sub": "admin@example.com",
+            "name": "admin",
+            "provider": "cognito",
+            "user_id": "admin",
+        }, expires_delta=timedelta(minutes=15))
+        yield TestClient(app), {"Authorization": f"Bearer {token}"}, provider
+        app.dependency_overrides.pop(get_bond_provider, None)
+
+    def test_background_returns_job(self, client):
+        test_client, headers, provider = client
+
+        response = test_client.delete("/users/heavy@example.com?background=true", headers=headers)
+
+        assert response.status_code == 202
+        assert response.json()["job_id"] == "job_1"
+        assert response.json()["kind"] == "user_offboard"
+        provider.users.delete_user_by_email.assert_not_called()
+
+        # The submitted work deletes the user and fails the job if they are gone
+        work = provider.jobs.submit.call_args.kwargs["work"]
+        provider.users.delete_user_by_email.return_value = True
+        assert work("job_1") == {"email": "heavy@example.com"}
+        provider.users.delete_user_by_email.return_value = False
+        with pytest.raises(ValueError):
+            work("job_1")
+
+    def test_inline_delete_unchanged(self, client):
+        test_client, headers, provider = client
+        provider.users.delete_user_by_email.return_value = True
+
+        response = test_client.delete("/users/heavy@example.com", headers=headers)
+
+        assert response.status_code == 204
+        provider.jobs.submit.assert_not_called()
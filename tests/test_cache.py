@@ -1,7 +1,13 @@
 import logging
 LOGGER = logging.getLogger(__name__)
 
-from bondable.bond.cache import configure_cache, bond_cache_clear, bond_cache, CacheType
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bondable.bond.cache import configure_cache, bond_cache_clear, bond_cache, CacheType, CacheNamespace, \
+  SharedCacheTier, cache_stats
+from bondable.bond.metrics import CACHE_LOOKUPS
 import pytest
 
 
@@ -75,3 +81,143 @@ class TestCache:
     assert MyClass.increment() == 1
     assert MyClass.increment() == 1
     assert MyClass.increment() == 1
+
+  def test_cache_invalidate(self, setup):
+    @bond_cache
+    def increment(step):
+        global count
+        count += step
+        return count
+
+    assert increment(1) == 1
+    assert increment(1) == 1
+    assert increment.cache_invalidate(1)
+    assert increment(1) == 2
+    bond_cache_clear()
+    assert increment(1) == 3
+
+
+class TestCacheNamespace:
+
+  def test_lru_eviction(self):
+    cache = CacheNamespace("test-lru", max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get_or_load("a", lambda: pytest.fail("a is cached")) == 1
+    cache.set("c", 3)
+    assert cache.get_or_load("b", lambda: "reloaded") == "reloaded"
+    assert cache.stats()["lru"] == 2
+    assert len(cache) == 2
+
+  def test_ttl_expiry(self):
+    cache = CacheNamespace("test-ttl", ttl_seconds=0.05)
+    assert cache.get_or_load("k", lambda: 1) == 1
+    assert cache.get_or_load("k", lambda: 2) == 1
+    time.sleep(0.06)
+    assert cache.get_or_load("k", lambda: 3) == 3
+    assert cache.stats()["expired"] == 1
+
+  def test_disabled_policy_stores_nothing(self):
+    cache = CacheNamespace("test-off", ttl_seconds=0)
+    assert cache.get_or_load("k", lambda: 1) == 1
+    assert cache.get_or_load("k", lambda: 2) == 2
+
+  def test_single_flight(self):
+    cache = CacheNamespace("test-flight")
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def loader():
+        calls.append(1)
+        started.set()
+        release.wait(2)
+        return "value"
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+      first = pool.submit(cache.get_or_load, "k", loader)
+      started.wait(2)
+      others = [pool.submit(cache.get_or_load, "k", loader) for _ in range(4)]
+      time.sleep(0.05)
+      release.set()
+      assert [f.result() for f in [first] + others] == ["value"] * 5
+    assert len(calls) == 1
+
+  def test_errors_are_not_cached(self):
+    cache = CacheNamespace("test-errors")
+
+    def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+      cache.get_or_load("k", fail)
+    assert cache.get_or_load("k", lambda: "ok") == "ok"
+
+  def test_reentrant_load_does_not_deadlock(self):
+    cache = CacheNamespace("test-reentrant")
+    assert cache.get_or_load("k", lambda: cache.get_or_load("k", lambda: "inner")) == "inner"
+
+  def test_invalidation_hooks(self):
+    cache = CacheNamespace("test-hooks")
+    seen = []
+    cache.on_invalidate(seen.append)
+    cache.set("k", 1)
+    assert cache.invalidate("k")
+    assert not cache.invalidate("k")
+    cache.clear()
+    assert seen == ["k", "k", None]
+
+  def test_invalidate_during_load_is_not_overwritten(self):
+    cache = CacheNamespace("test-stale")
+
+    def loader():
+        cache.invalidate("k")
+        return "stale"
+
+    assert cache.get_or_load("k", loader) == "stale"
+    assert cache.get_or_load("k", lambda: "fresh") == "fresh"
+
+  def test_metrics(self):
+    cache = CacheNamespace("test-metrics")
+    hits = CACHE_LOOKUPS.value(namespace="test-metrics", result="hit")
+    misses = CACHE_LOOKUPS.value(namespace="test-metrics", result="miss")
+    cache.get_or_load("k", lambda: 1)
+    cache.get_or_load("k", lambda: 1)
+    assert CACHE_LOOKUPS.value(namespace="test-metrics", result="miss") == misses + 1
+    assert CACHE_LOOKUPS.value(namespace="test-metrics", result="hit") == hits + 1
+    assert any(s["namespace"] == "test-metrics" and s["size"] == 1 for s in cache_stats())
+
+
+class TestSharedCacheTier:
+
+  @pytest.fixture
+  def tier(self, tmp_path):
+    tier = SharedCacheTier(f"sqlite:///{tmp_path / 'cache.db'}")
+    yield tier
+    tier.close()
+
+  def test_entries_are_shared_between_workers(self, tier):
+    worker1 = CacheNamespace("test-shared", ttl_seconds=60, shared_tier=tier)
+    worker2 = CacheNamespace("test-shared", ttl_seconds=60, shared_tier=tier)
+    assert worker1.get_or_load("k", lambda: {"answer": [1, 2]}) == {"answer": [1, 2]}
+    assert worker2.get_or_load("k", lambda: pytest.fail("should come from the shared tier")) == {"answer": [1, 2]}
+    assert worker2.stats()["shared_hit"] == 1
+
+  def test_invalidate_removes_shared_copy(self, tier):
+    worker1 = CacheNamespace("test-shared", ttl_seconds=60, shared_tier=tier)
+    worker2 = CacheNamespace("test-shared", ttl_seconds=60, shared_tier=tier)
+    worker1.get_or_load("k", lambda: 1)
+    worker1.invalidate("k")
+    assert worker2.get_or_load("k", lambda: 2) == 2
+
+  def test_unserializable_values_stay_local(self, tier):
+    worker1 = CacheNamespace("test-shared", shared_tier=tier)
+    worker2 = CacheNamespace("test-shared", shared_tier=tier)
+    value = object()
+    assert worker1.get_or_load("k", lambda: value) is value
+    assert worker2.get_or_load("k", lambda: "local") == "local"
+
+  def test_expired_shared_entries_are_ignored(self, tier):
+    tier.set("test-shared", repr("k"), "1", time.time() - 1)
+    cache = CacheNamespace("test-shared", shared_tier=tier)
+    assert cache.get_or_load("k", lambda: 2) == 2
@@ -5,6 +5,21 @@ Tests for CommonToolsMCP - web tools available to all users.
 import json
 from unittest.mock import patch, MagicMock
 
+import pytest
+
+from bondable.bond.providers.bedrock.web_fetch import _Download
+
+_DOWNLOAD = "bondable.bond.providers.bedrock.web_fetch.UrlFetcher._download"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_web_tools(monkeypatch):
+    """Each test gets a fresh fetcher (with the on-disk cache off) and an empty search cache."""
+    import bondable.bond.providers.bedrock.CommonToolsMCP as common_tools
+    monkeypatch.setenv("URL_CACHE_ENABLED", "false")
+    monkeypatch.setattr(common_tools, "_url_fetcher", None)
+    monkeypatch.setattr(common_tools, "_web_searcher", None)
+
 
 # =============================================================================
 # CommonToolsMCP Unit Tests
@@ -62,11 +77,11 @@ class TestFetchUrls:
     """Tests for the fetch_urls handler."""
 
     @patch("trafilatura.extract")
-    @patch("trafilatura.fetch_url")
+    @patch(_DOWNLOAD)
     def test_fetch_single_url(self, mock_fetch, mock_extract):
         from bondable.bond.providers.bedrock.CommonToolsMCP import execute_common_tool
 
-        mock_fetch.return_value = "<html><body>Hello World</body></html>"
+        mock_fetch.return_value = _Download(200, b"<html><body>Hello World</body></html>")
         mock_extract.return_value = "# Hello World\n\nSome content here."
 
         result = execute_common_tool("fetch_urls", {"urls": "https://example.com"})
@@ -78,11 +93,11 @@ class TestFetchUrls:
         assert mock_fetch.call_args[0][0] == "https://example.com"
 
     @patch("trafilatura.extract")
-    @patch("trafilatura.fetch_url")
+    @patch(_DOWNLOAD)
     def test_fetch_comma_separated_urls(self, mock_fetch, mock_extract):
         from bondable.bond.providers.bedrock.CommonToolsMCP import execute_common_tool
 
-        mock_fetch.return_value = "<html>test</html>"
+        mock_fetch.return_value = _Download(200, b"<html>test</html>")
         mock_extract.return_value = "content"
 
         result = execute_common_tool("fetch_urls", {"urls": "https://a.com, https://b.com"})
@@ -91,11 +106,11 @@ class TestFetchUrls:
         assert mock_fetch.call_count == 2
 
     @patch("trafilatura.extract")
-    @patch("trafilatura.fetch_url")
+    @patch(_DOWNLOAD)
     def test_fetch_json_array_urls(self, mock_fetch, mock_extract):
         from bondable.bond.providers.bedrock.CommonToolsMCP import execute_common_tool
 
-        mock_fetch.return_value = "<html>test</html>"
+        mock_fetch.return_value = _Download(200, b"<html>test</html>")
         mock_extract.return_value = "content"
 
         urls = json.dumps(["https://a.com", "https://b.com"])
@@ -142,11 +157,11 @@ class TestFetchUrls:
         assert result["success"] is False
 
     @patch("trafilatura.extract")
-    @patch("trafilatura.fetch_url")
+    @patch(_DOWNLOAD)
     def test_fetch_max_5_urls(self, mock_fetch, mock_extract):
         from bondable.bond.providers.bedrock.CommonToolsMCP import execute_common_tool
 
-        mock_fetch.return_value = "<html>test</html>"
+        mock_fetch.return_value = _Download(200, b"<html>test</html>")
         mock_extract.return_value = "content"
 
         urls = ",".join([f"https://example{i}.com" for i in range(8)])
@@ -157,12 +172,16 @@ class TestFetchUrls:
         assert "first 5" in result["result"].lower()
 
     @patch("trafilatura.extract")
-    @patch("trafilatura.fetch_url")
+    @patch(_DOWNLOAD)
     def test_fetch_network_error_per_url(self, mock_fetch, mock_extract):
         from bondable.bond.providers.bedrock.CommonToolsMCP import execute_common_tool
 
-        # First URL fails (returns None), second succeeds
-        mock_fetch.side_effect = [None, "<html>ok</html>"]
+        # First URL fails, second succeeds
+        def download(url, cached):
+            if "bad.com" in url:
+                raise ConnectionError("connection refused")
+            return _Download(200, b"<html>ok</html>")
+        mock_fetch.side_effect = download
         mock_extract.return_value = "good content"
 
         result = execute_common_tool("fetch_urls", {"urls": "https://bad.com, https://good.com"})
@@ -172,11 +191,11 @@ class TestFetchUrls:
         assert "good content" in result["result"]
 
     @patch("trafilatura.extract")
-    @patch("trafilatura.fetch_url")
+    @patch(_DOWNLOAD)
     def test_fetch_empty_extraction(self, mock_fetch, mock_extract):
         from bondable.bond.providers.bedrock.CommonToolsMCP import execute_common_tool
 
-        mock_fetch.return_value = "<html>test</html>"
+        mock_fetch.return_value = _Download(200, b"<html>test</html>")
         mock_extract.return_value = None
 
         result = execute_common_tool("fetch_urls", {"urls": "https://example.com"})
@@ -185,11 +204,11 @@ class TestFetchUrls:
         assert "No extractable content" in result["result"]
 
     @patch("trafilatura.extract")
-    @patch("trafilatura.fetch_url")
+    @patch(_DOWNLOAD)
     def test_fetch_content_truncation(self, mock_fetch, mock_extract):
         from bondable.bond.providers.bedrock.CommonToolsMCP import execute_common_tool
 
-        mock_fetch.return_value = "<html>test</html>"
+        mock_fetch.return_value = _Download(200, b"<html>test</html>")
         mock_extract.return_value = "x" * 20000  # Exceeds MAX_CONTENT_PER_URL
 
         result = execute_common_tool("fetch_urls", {"urls": "https://example.com"})
@@ -200,12 +219,12 @@ class TestFetchUrls:
         assert len(result["result"]) < 15000
 
     @patch("trafilatura.extract")
-    @patch("trafilatura.fetch_url")
+    @patch(_DOWNLOAD)
     def test_fetch_extract_exception(self, mock_fetch, mock_extract):
         """P3-4: Test that an exception during trafilatura.extract() is handled gracefully."""
         from bondable.bond.providers.bedrock.CommonToolsMCP import execute_common_tool
 
-        mock_fetch.return_value = "<html>test</html>"
+        mock_fetch.return_value = _Download(200, b"<html>test</html>")
         mock_extract.side_effect = Exception("Extraction failed unexpectedly")
 
         result = execute_common_tool("fetch_urls", {"urls": "https://example.com"})
@@ -247,6 +266,20 @@ class TestWebSearch:
         assert "https://r1.com" in result["result"]
         mock_ddgs.text.assert_called_once_with("test query", max_results=5)
 
+    @patch("duckduckgo_search.DDGS")
+    def test_search_repeated_query_is_cached(self, mock_ddgs_cls):
+        from bondable.bond.providers.bedrock.CommonToolsMCP import execute_common_tool
+
+        mock_ddgs = MagicMock()
+        mock_ddgs_cls.return_value = mock_ddgs
+        mock_ddgs.text.return_value = [{"title": "Result 1", "body": "Body 1", "href": "https://r1.com"}]
+
+        first = execute_common_tool("web_search", {"query": "test query"})
+        second = execute_common_tool("web_search", {"query": "Test  Query"})
+
+        assert first == second
+        mock_ddgs.text.assert_called_once()
+
     @patch("duckduckgo_search.DDGS")
     def test_search_max_results_clamped(self, mock_ddgs_cls):
         from bondable.bond.providers.bedrock.CommonToolsMCP import execute_common_tool
@@ -44,6 +44,17 @@ def _make_agent(**overrides):
     return agent
 
 
+def _stored_session_state(agent, session_state):
+    """Apply the agent's update_thread_session_state() calls to session_state."""
+    session_state = {} if session_state is None else session_state
+
+    def update(thread_id, user_id, update_fn):
+        return update_fn(session_state, 'session-1') is not False
+
+    agent.bond_provider.threads.update_thread_session_state.side_effect = update
+    return session_state
+
+
 class TestGetContextWindowSize:
     """Tests for _get_context_window_size model lookup."""
 
@@ -111,15 +122,12 @@ class TestUpdateContextUsage:
     def test_with_trace_tokens(self):
         """Uses real trace tokens when available."""
         agent = _make_agent()
-        agent.bond_provider.threads.get_thread_session_state.return_value = {}
-        agent.bond_provider.threads.get_thread_session_id.return_value = 'session-1'
+        session_state = _stored_session_state(agent, {})
 
         agent._update_context_usage('thread-1', 'user-1',
                                     trace_input_tokens=5000, trace_output_tokens=1000,
                                     input_chars=100, output_chars=200)
 
-        call_args = agent.bond_provider.threads.update_thread_session.call_args
-        session_state = call_args[1]['session_state'] if 'session_state' in call_args[1] else call_args[0][3]
         usage = session_state['context_usage']
         assert usage['total_tokens'] == 6000
         assert usage['estimated_tokens'] == 6000
@@ -129,15 +137,12 @@ class TestUpdateContextUsage:
     def test_fallback_estimation(self):
         """Falls back to char estimation when no trace data."""
         agent = _make_agent()
-        agent.bond_provider.threads.get_thread_session_state.return_value = {}
-        agent.bond_provider.threads.get_thread_session_id.return_value = 'session-1'
+        session_state = _stored_session_state(agent, {})
 
         agent._update_context_usage('thread-1', 'user-1',
                                     trace_input_tokens=0, trace_output_tokens=0,
                                     input_chars=400, output_chars=800)
 
-        call_args = agent.bond_provider.threads.update_thread_session.call_args
-        session_state = call_args[1]['session_state'] if 'session_state' in call_args[1] else call_args[0][3]
         usage = session_state['context_usage']
         assert usage['total_chars'] == 1200
         assert usage['estimated_tokens'] == 300  # 1200 / 4
@@ -146,7 +151,7 @@ class TestUpdateContextUsage:
     def test_increments_existing_usage(self):
         """Correctly increments cumulative counters."""
         agent = _make_agent()
-        agent.bond_provider.threads.get_thread_session_state.return_value = {
+        session_state = _stored_session_state(agent, {
             'context_usage': {
                 'total_tokens': 5000,
                 'total_chars': 0,
@@ -154,15 +159,12 @@ class TestUpdateContextUsage:
                 'message_count': 4,
                 'compaction_count': 0,
             }
-        }
-        agent.bond_provider.threads.get_thread_session_id.return_value = 'session-1'
+        })
 
         agent._update_context_usage('thread-1', 'user-1',
                                     trace_input_tokens=3000, trace_output_tokens=1000,
                                     input_chars=100, output_chars=200)
 
-        call_args = agent.bond_provider.threads.update_thread_session.call_args
-        session_state = call_args[1]['session_state'] if 'session_state' in call_args[1] else call_args[0][3]
         usage = session_state['context_usage']
         assert usage['total_tokens'] == 9000
         assert usage['message_count'] == 6
@@ -170,15 +172,12 @@ class TestUpdateContextUsage:
     def test_initializes_missing_usage(self):
         """Creates usage dict if missing from session_state."""
         agent = _make_agent()
-        agent.bond_provider.threads.get_thread_session_state.return_value = None
-        agent.bond_provider.threads.get_thread_session_id.return_value = 'session-1'
+        session_state = _stored_session_state(agent, None)
 
         agent._update_context_usage('thread-1', 'user-1',
                                     trace_input_tokens=1000, trace_output_tokens=500,
                                     input_chars=100, output_chars=200)
 
-        call_args = agent.bond_provider.threads.update_thread_session.call_args
-        session_state = call_args[1]['session_state'] if 'session_state' in call_args[1] else call_args[0][3]
         usage = session_state['context_usage']
         assert usage['total_tokens'] == 1500
         assert usage['message_count'] == 2
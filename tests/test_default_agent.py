@@ -68,7 +68,7 @@ class MockAgentProvider(AgentProvider):
             return True
         return False
 
-    def create_or_update_agent_resource(self, agent_def, owner_user_id):
+    def create_or_update_agent_resource(self, agent_def, owner_user_id, on_prepare=None):
         # Simulate provider assigning an ID when none is provided
         agent_id = agent_def.id or f"default-home-agent"
         agent_def.id = agent_id
@@ -263,6 +263,47 @@ class TestDefaultAgent:
         # Verify None is returned
         assert result is None
 
+    def test_get_default_agent_id_is_cached(self, agent_provider, mock_session):
+        """Default agent id and summary are served from cache after the first lookup."""
+        default_agent_record = Mock(spec=AgentRecord)
+        default_agent_record.agent_id = "existing-default-agent"
+        mock_session.query.return_value.filter.return_value.first.return_value = default_agent_record
+        agent_provider.get_agent_summaries = Mock(
+            return_value={"existing-default-agent": {"agent_id": "existing-default-agent", "name": "Home"}}
+        )
+
+        assert agent_provider.get_default_agent_id() == "existing-default-agent"
+        assert agent_provider.get_default_agent_id() == "existing-default-agent"
+        assert agent_provider.get_default_agent_summary()["name"] == "Home"
+
+        assert mock_session.query.call_count == 1
+        agent_provider.get_agent_summaries.assert_called_once_with(["existing-default-agent"])
+
+    def test_get_default_agent_id_missing_is_not_cached(self, agent_provider, mock_session):
+        """A missing default is re-checked so one created later is picked up."""
+        first = mock_session.query.return_value.filter.return_value.first
+        first.return_value = None
+        agent_provider.get_agent_summaries = Mock(return_value={})
+
+        assert agent_provider.get_default_agent_id() is None
+
+        default_agent_record = Mock(spec=AgentRecord)
+        default_agent_record.agent_id = "new-default-agent"
+        first.return_value = default_agent_record
+        assert agent_provider.get_default_agent_id() == "new-default-agent"
+
+    def test_get_default_agent_id_expires(self, agent_provider, mock_session, monkeypatch):
+        """Cached default agent id is re-read once the TTL has passed."""
+        monkeypatch.setattr('bondable.bond.providers.agent._DEFAULT_AGENT_CACHE_TTL', 0)
+        default_agent_record = Mock(spec=AgentRecord)
+        default_agent_record.agent_id = "existing-default-agent"
+        mock_session.query.return_value.filter.return_value.first.return_value = default_agent_record
+        agent_provider.get_agent_summaries = Mock(return_value={})
+
+        agent_provider.get_default_agent_id()
+        agent_provider.get_default_agent_id()
+        assert mock_session.query.call_count == 2
+
     def test_get_default_model(self, agent_provider):
         """Test getting the default model from available models."""
         # Test with default model marked
@@ -291,6 +332,8 @@ class TestDefaultAgentEndpoint:
         """Create a mock provider with agent provider."""
         provider = Mock()
         provider.agents = Mock()
+        # No cached default agent unless a test sets one
+        provider.agents.get_default_agent_summary.return_value = None
         return provider
 
     @pytest.fixture
@@ -341,6 +384,17 @@ class TestDefaultAgentEndpoint:
         # Verify get_default_agent was called
         mock_provider.agents.get_default_agent.assert_called_once()
 
+    def test_get_default_agent_from_cached_summary(self, client, mock_provider):
+        """An existing default agent is served from the cached summary without building it."""
+        mock_provider.agents.get_default_agent_summary.return_value = {
+            "agent_id": "default-home-agent", "name": "Home"}
+
+        response = client.get("/agents/default")
+
+        assert response.status_code == 200
+        assert response.json() == {"agent_id": "default-home-agent", "name": "Home"}
+        mock_provider.agents.get_default_agent.assert_not_called()
+
     def test_get_default_agent_creates_new(self, client, mock_provider, mock_agent):
         """Test that endpoint creates a new default agent if none exists."""
         # Simulate creating a new agent by returning the mock after "creation"
@@ -1,13 +1,13 @@
 """Integration tests for empty thread detection with hidden message support.
 
-Tests the _user_message_exists_clause() SQL logic against a real SQLite database
-to verify that hidden user messages (agent introductions) are correctly excluded
-when determining whether a thread is "empty".
+Tests the thread activity columns (has_user_message, message_count, ...)
+maintained as messages are written, against a real SQLite database, to verify
+that hidden user messages (agent introductions) are correctly excluded when
+determining whether a thread is "empty".
 """
 
 import json
 import uuid
-from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 
@@ -16,7 +16,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import scoped_session, sessionmaker
 
 from bondable.bond.broker import BondMessage
-from bondable.bond.providers.bedrock.BedrockMetadata import BedrockMessage
+from bondable.bond.providers.bedrock.BedrockMetadata import BedrockMessage, refresh_thread_activity
 from bondable.bond.providers.metadata import Base, Thread, User
 from bondable.bond.providers.threads import ThreadsProvider
 
@@ -44,13 +44,9 @@ class StubMetadata:
         self._engine = engine
         self._session_factory = session_factory
 
-    @contextmanager
     def get_db_session(self):
-        session = self._session_factory()
-        try:
-            yield session
-        finally:
-            session.close()
+        # Like Metadata.get_db_session(): usable directly or as a context manager
+        return self._session_factory()
 
 
 TEST_USER_ID = "test-user-001"
@@ -114,7 +110,7 @@ def _make_message(session, thread_id: str, role: str = "user",
 
 
 class TestEmptyThreadDetection:
-    """Tests for _user_message_exists_clause() and dependent methods."""
+    """Tests for has_user_message and the methods that filter on it."""
 
     def test_visible_user_message_is_not_empty(self, provider):
         """Thread with a normal visible user message should NOT be empty."""
@@ -312,3 +308,101 @@ class TestDeleteEmptyThreads:
         thread_ids = [t["thread_id"] for t in threads]
         assert "t-visible" in thread_ids
         assert "t-hidden" not in thread_ids
+
+
+class TestThreadActivity:
+    """Tests for the activity columns kept on threads as messages are written."""
+
+    def _thread(self, session, thread_id, user_id=TEST_USER_ID):
+        session.expire_all()
+        return session.query(Thread).filter_by(thread_id=thread_id, user_id=user_id).one()
+
+    def test_counts(self, provider):
+        with provider.metadata.get_db_session() as session:
+            _make_thread(session, "t1")
+            _make_message(session, "t1", role="user", metadata={"agent_id": "a1", "hidden": True})
+            _make_message(session, "t1", role="assistant", metadata={"agent_id": "a2"})
+            session.commit()
+            thread = self._thread(session, "t1")
+            assert thread.message_count == 2
+            assert thread.has_user_message is False
+            assert thread.last_message_at is not None
+
+            _make_message(session, "t1", role="user", metadata={"agent_id": "a2"})
+            session.commit()
+            thread = self._thread(session, "t1")
+            assert thread.message_count == 3
+            assert thread.has_user_message is True
+
+    def test_forwarded_response_keeps_last_agent(self, provider):
+        """A response from the agent a message was forwarded to leaves the user's chosen agent current."""
+        with provider.metadata.get_db_session() as session:
+            _make_thread(session, "t1")
+            session.commit()
+        provider.update_thread_last_agent("t1", TEST_USER_ID, "a1")
+
+        with provider.metadata.get_db_session() as session:
+            _make_message(session, "t1", role="user", metadata={"agent_id": "a1"})
+            _make_message(session, "t1", role="assistant", metadata={"agent_id": "a2"})
+            session.commit()
+            thread = self._thread(session, "t1")
+            assert thread.last_agent_id == "a1"
+            assert thread.message_count == 2
+
+    def test_rolled_back_messages_are_not_counted(self, provider):
+        with provider.metadata.get_db_session() as session:
+            _make_thread(session, "t1")
+            session.commit()
+            _make_message(session, "t1", role="user")
+            session.rollback()
+            assert self._thread(session, "t1").message_count == 0
+
+    def test_shared_thread(self, provider):
+        with provider.metadata.get_db_session() as session:
+            session.add(User(id="other-user", email="other@example.com", sign_in_method="test"))
+            _make_thread(session, "t1")
+            _make_message(session, "t1", role="user")
+            session.commit()
+
+        provider.grant_thread("t1", "other-user")
+        with provider.metadata.get_db_session() as session:
+            granted = self._thread(session, "t1", user_id="other-user")
+            assert (granted.message_count, granted.has_user_message) == (1, True)
+
+            _make_message(session, "t1", role="assistant", user_id="other-user")
+            session.commit()
+            assert self._thread(session, "t1").message_count == 2
+            assert self._thread(session, "t1", user_id="other-user").message_count == 2
+
+    def test_refresh_after_messages_are_removed(self, provider):
+        with provider.metadata.get_db_session() as session:
+            _make_thread(session, "t1")
+            visible = _make_message(session, "t1", role="user")
+            _make_message(session, "t1", role="user", metadata={"hidden": "true"})
+            session.commit()
+
+            session.query(BedrockMessage).filter_by(id=visible.id).delete()
+            refresh_thread_activity(session, ["t1"])
+            session.commit()
+            thread = self._thread(session, "t1")
+            assert (thread.message_count, thread.has_user_message) == (1, False)
+
+        assert provider.get_empty_thread_ids(user_id=TEST_USER_ID) == ["t1"]
+
+    def test_retention_cleanup_refreshes_activity(self, provider, monkeypatch):
+        from unittest.mock import MagicMock
+        from bondable.bond.scheduler import JobScheduler
+
+        with provider.metadata.get_db_session() as session:
+            _make_thread(session, "t1")
+            expired = _make_message(session, "t1", role="user")
+            expired.created_at = datetime.now() - timedelta(days=100)
+            _make_message(session, "t1", role="user", metadata={"hidden": "true"})
+            session.commit()
+
+        monkeypatch.setenv("MESSAGE_RETENTION_DAYS", "90")
+        JobScheduler(metadata=provider.metadata, provider=MagicMock())._run_data_retention_cleanup()
+
+        with provider.metadata.get_db_session() as session:
+            thread = self._thread(session, "t1")
+            assert (thread.message_count, thread.has_user_message) == (1, False)
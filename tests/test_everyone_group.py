@@ -44,6 +44,8 @@ class FakeAgentProvider:
     Minimal AgentProvider that exposes only the three access-control methods
     under test, using real SQL queries against a test database.
     """
+    access_index = None
+
     def __init__(self, metadata):
         self.metadata = metadata
 
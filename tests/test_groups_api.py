@@ -411,3 +411,55 @@ class TestRemoveGroupMember:
         response = client.delete("/groups/group-1/members/member-1", headers=headers)
         assert response.status_code == 404
         assert "not a member" in response.json()["detail"]
+
+
+class TestBatchGroupMembers:
+    def test_batch_returns_diff(self, authenticated_client):
+        client, headers, provider = authenticated_client
+        provider.groups.apply_member_changes.return_value = {
+            "added": [{"group_id": "group-1", "user_id": "member-1"}],
+            "removed": [],
+            "skipped": [{"group_id": "group-2", "user_id": "member-1", "reason": "forbidden"}],
+        }
+
+        response = client.post("/groups/members/batch", json={"changes": [
+            {"group_id": "group-1", "user_id": "member-1", "action": "add"},
+            {"group_id": "group-2", "user_id": "member-1", "action": "add"},
+        ]}, headers=headers)
+
+        assert response.status_code == 200
+        assert response.json()["added"] == [{"group_id": "group-1", "user_id": "member-1", "reason": None}]
+        assert response.json()["skipped"][0]["reason"] == "forbidden"
+        assert provider.groups.apply_member_changes.call_args.kwargs["user_id"] == TEST_USER_ID
+
+    def test_batch_rejects_unknown_action(self, authenticated_client):
+        client, headers, provider = authenticated_client
+        response = client.post("/groups/members/batch", json={"changes": [
+            {"group_id": "group-1", "user_id": "member-1", "action": "promote"},
+        ]}, headers=headers)
+        assert response.status_code == 422
+
+
+class TestBatchAgentGroups:
+    def test_only_editable_agents_are_changed(self, authenticated_client):
+        client, headers, provider = authenticated_client
+        provider.agents.get_user_agent_permission.side_effect = (
+            lambda user_id, agent_id: "owner" if agent_id == "agent-mine" else "can_use"
+        )
+        provider.groups.apply_agent_group_changes.return_value = {
+            "added": [{"agent_id": "agent-mine", "group_id": "group-1", "permission": "can_use"}],
+            "removed": [], "updated": [], "skipped": [],
+        }
+
+        response = client.post("/groups/agents/batch", json={"changes": [
+            {"agent_id": "agent-mine", "group_id": "group-1", "action": "add"},
+            {"agent_id": "agent-shared", "group_id": "group-1", "action": "remove"},
+        ]}, headers=headers)
+
+        assert response.status_code == 200
+        applied = provider.groups.apply_agent_group_changes.call_args.kwargs["changes"]
+        assert [c["agent_id"] for c in applied] == ["agent-mine"]
+        assert provider.groups.apply_agent_group_changes.call_args.kwargs["user_id"] == TEST_USER_ID
+        assert response.json()["skipped"] == [
+            {"agent_id": "agent-shared", "group_id": "group-1", "permission": None, "reason": "forbidden"}
+        ]
@@ -0,0 +1,275 @@
+"""
+Tests for batched group membership and agent-group changes.
+
+Runs Groups against a real SQLite DB to check that a batch is applied in one
+transaction, returns the diff it applied and invalidates cached agent access
+only for the users it affects.
+"""
+import pytest
+import os
+import tempfile
+from unittest.mock import MagicMock
+
+# --- Test Database Setup ---
+_test_db_file = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+TEST_DB_URL = f"sqlite:///{_test_db_file.name}"
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker, scoped_session
+from bondable.bond.providers.metadata import (
+    Base, User, Group, AgentRecord, AgentGroup, GroupUser, EVERYONE_GROUP_ID,
+)
+from bondable.bond.agent_access import AgentAccessIndex
+from bondable.bond.groups import Groups
+
+OWNER = "bulk-owner"
+MEMBERS = [f"bulk-member-{i}" for i in range(5)]
+OUTSIDER = "bulk-outsider"
+GROUP_A = "grp_bulk_a"
+GROUP_B = "grp_bulk_b"
+FOREIGN_GROUP = "grp_bulk_foreign"
+
+
+class FakeMetadata:
+    """Minimal Metadata-like object with a real SQLite DB that records write statements."""
+    def __init__(self, db_url):
+        self.engine = create_engine(db_url, echo=False)
+        Base.metadata.create_all(self.engine)
+        self._session_factory = scoped_session(sessionmaker(bind=self.engine))
+        self.writes = []
+
+        @event.listens_for(self.engine, "before_cursor_execute")
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE")):
+                self.writes.append(statement)
+
+    def get_db_session(self):
+        return self._session_factory()
+
+
+@pytest.fixture(scope="module")
+def db():
+    metadata = FakeMetadata(TEST_DB_URL)
+    session = metadata.get_db_session()
+    for uid in [OWNER, OUTSIDER] + MEMBERS:
+        session.add(User(id=uid, email=f"{uid}@test.com", sign_in_method="test"))
+    session.add(Group(id=EVERYONE_GROUP_ID, name="Everyone", owner_user_id=OWNER))
+    session.add(Group(id=GROUP_A, name="A", owner_user_id=OWNER))
+    session.add(Group(id=GROUP_B, name="B", owner_user_id=OWNER))
+    session.add(Group(id=FOREIGN_GROUP, name="Foreign", owner_user_id=OUTSIDER))
+    session.add(AgentRecord(agent_id="agent_1", name="agent_1", owner_user_id=OWNER))
+    session.add(AgentRecord(agent_id="agent_2", name="agent_2", owner_user_id=OWNER))
+    session.add(AgentRecord(agent_id="agent_3", name="agent_3", owner_user_id=OWNER, default_group_id=GROUP_B))
+    session.commit()
+    session.close()
+    yield metadata
+    metadata.engine.dispose()
+    db_path = TEST_DB_URL.replace("sqlite:///", "")
+    if os.path.exists(db_path):
+        try:
+            os.remove(db_path)
+        except Exception:
+            pass
+
+
+@pytest.fixture(autouse=True)
+def clear_links(db):
+    session = db.get_db_session()
+    session.query(AgentGroup).delete()
+    session.query(GroupUser).delete()
+    session.commit()
+    session.close()
+    db.writes.clear()
+
+
+@pytest.fixture
+def index(db):
+    return AgentAccessIndex(db, ttl_seconds=300)
+
+
+@pytest.fixture
+def groups(db, index):
+    return Groups(db, access_index=index)
+
+
+def _rows(db, model, *columns):
+    session = db.get_db_session()
+    try:
+        return {tuple(getattr(row, c) for c in columns) for row in session.query(model).all()}
+    finally:
+        session.close()
+
+
+def _add_members(db, group_id, user_ids):
+    session = db.get_db_session()
+    session.add_all([GroupUser(group_id=group_id, user_id=u) for u in user_ids])
+    session.commit()
+    session.close()
+
+
+def _link(db, agent_id, group_id, permission):
+    session = db.get_db_session()
+    session.add(AgentGroup(agent_id=agent_id, group_id=group_id, permission=permission))
+    session.commit()
+    session.close()
+
+
+class TestMemberChanges:
+
+    def test_batch_add_and_remove(self, db, groups):
+        _add_members(db, GROUP_B, [MEMBERS[0]])
+        db.writes.clear()
+
+        diff = groups.apply_member_changes(OWNER, [
+            *[{"group_id": GROUP_A, "user_id": u, "action": "add"} for u in MEMBERS],
+            {"group_id": GROUP_B, "user_id": MEMBERS[0], "action": "remove"},
+        ])
+
+        assert len(diff["added"]) == 5
+        assert diff["removed"] == [{"group_id": GROUP_B, "user_id": MEMBERS[0]}]
+        assert diff["skipped"] == []
+        assert _rows(db, GroupUser, "group_id", "user_id") == {(GROUP_A, u) for u in MEMBERS}
+        # One multi-row INSERT and one DELETE, not a statement per member
+        assert len(db.writes) == 2
+
+    def test_invalid_changes_are_skipped(self, db, groups):
+        _add_members(db, GROUP_A, [MEMBERS[0]])
+
+        diff = groups.apply_member_changes(OWNER, [
+            {"group_id": GROUP_A, "user_id": MEMBERS[0], "action": "add"},
+            {"group_id": GROUP_A, "user_id": "ghost", "action": "add"},
+            {"group_id": GROUP_A, "user_id": MEMBERS[1], "action": "remove"},
+            {"group_id": FOREIGN_GROUP, "user_id": MEMBERS[1], "action": "add"},
+            {"group_id": "grp_missing", "user_id": MEMBERS[1], "action": "add"},
+            {"group_id": GROUP_A, "user_id": MEMBERS[2], "action": "add"},
+        ])
+
+        assert [s["reason"] for s in diff["skipped"]] == [
+            "already_member", "user_not_found", "not_member", "forbidden", "group_not_found"
+        ]
+        assert diff["added"] == [{"group_id": GROUP_A, "user_id": MEMBERS[2]}]
+
+    def test_only_changed_members_invalidated(self, db, groups, index):
+        for user_id in MEMBERS[:3]:
+            index.get_user_access(user_id)
+
+        groups.apply_member_changes(OWNER, [{"group_id": GROUP_A, "user_id": MEMBERS[0], "action": "add"}])
+
+        assert MEMBERS[0] not in index._entries
+        assert MEMBERS[1] in index._entries
+
+
+class TestAgentGroupChanges:
+
+    def test_sync_returns_diff_and_updates_in_one_statement(self, db, groups):
+        _link(db, "agent_1", GROUP_A, "can_use")
+        _link(db, "agent_1", GROUP_B, "can_use")
+        _link(db, "agent_1", EVERYONE_GROUP_ID, "can_use")
+        db.writes.clear()
+
+        diff = groups.sync_agent_groups(
+            "agent_1", desired_group_ids=[GROUP_A, GROUP_B, FOREIGN_GROUP],
+            preserve_group_ids=[EVERYONE_GROUP_ID],
+            group_permissions={GROUP_A: "can_edit", GROUP_B: "can_edit", FOREIGN_GROUP: "can_use_read_only"},
+        )
+
+        assert diff == {"added": [FOREIGN_GROUP], "removed": [], "updated": [GROUP_A, GROUP_B]}
+        assert len([w for w in db.writes if w.lstrip().upper().startswith("UPDATE")]) == 1
+        assert _rows(db, AgentGroup, "group_id", "permission") == {
+            (GROUP_A, "can_edit"), (GROUP_B, "can_edit"),
+            (FOREIGN_GROUP, "can_use_read_only"), (EVERYONE_GROUP_ID, "can_use"),
+        }
+
+    def test_sync_invalidates_group_members_only(self, db, groups, index):
+        _add_members(db, GROUP_A, [MEMBERS[0]])
+        _link(db, "agent_1", GROUP_A, "can_use")
+        for user_id in MEMBERS[:2]:
+            index.get_user_access(user_id)
+
+        diff = groups.sync_agent_groups("agent_1", desired_group_ids=[])
+
+        assert diff["removed"] == [GROUP_A]
+        assert MEMBERS[0] not in index._entries
+        assert MEMBERS[1] in index._entries
+
+    def test_everyone_group_change_invalidates_all(self, db, groups, index):
+        index.get_user_access(MEMBERS[1])
+        groups.sync_agent_groups("agent_1", desired_group_ids=[EVERYONE_GROUP_ID])
+        assert index._entries == {}
+
+    def test_unchanged_sync_does_not_invalidate(self, db, groups, index):
+        _link(db, "agent_1", GROUP_A, "can_use")
+        index.get_user_access(MEMBERS[1])
+        diff = groups.sync_agent_groups("agent_1", desired_group_ids=[GROUP_A], group_permissions={GROUP_A: "can_use"})
+        assert diff == {"added": [], "removed": [], "updated": []}
+        assert MEMBERS[1] in index._entries
+
+    def test_apply_agent_group_changes(self, db, groups):
+        _link(db, "agent_1", GROUP_A, "can_use")
+        _link(db, "agent_2", GROUP_A, "can_use")
+        _link(db, "agent_2", GROUP_B, "can_use")
+
+        diff = groups.apply_agent_group_changes(OWNER, [
+            {"agent_id": "agent_1", "group_id": GROUP_A, "action": "set_permission", "permission": "can_edit"},
+            {"agent_id": "agent_2", "group_id": GROUP_A, "action": "add", "permission": "can_use_read_only"},
+            {"agent_id": "agent_2", "group_id": GROUP_B, "action": "remove"},
+            {"agent_id": "agent_1", "group_id": GROUP_B, "action": "add"},
+            {"agent_id": "agent_1", "group_id": "grp_missing", "action": "add"},
+            {"agent_id": "agent_2", "group_id": FOREIGN_GROUP, "action": "set_permission", "permission": "can_edit"},
+        ])
+
+        assert diff["added"] == [{"agent_id": "agent_1", "group_id": GROUP_B, "permission": "can_use"}]
+        assert diff["removed"] == [{"agent_id": "agent_2", "group_id": GROUP_B}]
+        assert {(u["agent_id"], u["permission"]) for u in diff["updated"]} == {
+            ("agent_1", "can_edit"), ("agent_2", "can_use_read_only")
+        }
+        assert [s["reason"] for s in diff["skipped"]] == ["group_not_found", "forbidden"]
+        assert _rows(db, AgentGroup, "agent_id", "group_id", "permission") == {
+            ("agent_1", GROUP_A, "can_edit"), ("agent_1", GROUP_B, "can_use"),
+            ("agent_2", GROUP_A, "can_use_read_only"),
+        }
+
+    def test_agent_group_changes_need_group_membership(self, db, groups):
+        _add_members(db, FOREIGN_GROUP, [OWNER])
+
+        diff = groups.apply_agent_group_changes(OUTSIDER, [
+            {"agent_id": "agent_1", "group_id": GROUP_A, "action": "add"},
+        ])
+        assert diff["skipped"] == [{"agent_id": "agent_1", "group_id": GROUP_A, "reason": "forbidden"}]
+
+        diff = groups.apply_agent_group_changes(OWNER, [
+            {"agent_id": "agent_1", "group_id": FOREIGN_GROUP, "action": "add"},
+        ])
+        assert diff["added"] == [{"agent_id": "agent_1", "group_id": FOREIGN_GROUP, "permission": "can_use"}]
+        assert _rows(db, AgentGroup, "agent_id", "group_id") == {("agent_1", FOREIGN_GROUP)}
+
+    def test_everyone_and_default_groups_are_forbidden(self, db, groups):
+        _link(db, "agent_3", GROUP_B, "can_use")
+
+        diff = groups.apply_agent_group_changes(OWNER, [
+            {"agent_id": "agent_1", "group_id": EVERYONE_GROUP_ID, "action": "add"},
+            {"agent_id": "agent_3", "group_id": GROUP_B, "action": "remove"},
+            {"agent_id": "agent_3", "group_id": GROUP_B, "action": "set_permission", "permission": "can_edit"},
+            {"agent_id": "agent_1", "group_id": GROUP_B, "action": "add"},
+        ])
+
+        assert [(s["agent_id"], s["group_id"], s["reason"]) for s in diff["skipped"]] == [
+            ("agent_1", EVERYONE_GROUP_ID, "forbidden"),
+            ("agent_3", GROUP_B, "forbidden"),
+            ("agent_3", GROUP_B, "forbidden"),
+        ]
+        assert diff["added"] == [{"agent_id": "agent_1", "group_id": GROUP_B, "permission": "can_use"}]
+        assert _rows(db, AgentGroup, "agent_id", "group_id", "permission") == {
+            ("agent_3", GROUP_B, "can_use"), ("agent_1", GROUP_B, "can_use"),
+        }
+
+    def test_postgres_permission_update_uses_values(self, groups):
+        session = MagicMock()
+        session.get_bind.return_value.dialect.name = "postgresql"
+
+        groups._update_agent_group_permissions(session, [("agent_1", GROUP_A, "can_edit")])
+
+        sql = str(session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "FROM (VALUES" in sql
+        assert "SET permission=permission_changes.permission" in sql
@@ -0,0 +1,182 @@
+"""
+Tests for the Knowledge Base ingestion monitor.
+
+Drives IngestionMonitor.poll_once() directly against a real SQLite DB and a
+mocked Bedrock client, so backoff, bulk status updates and waiter futures are
+checked without a background thread or sleeps.
+"""
+import pytest
+import os
+import tempfile
+import time
+from unittest.mock import MagicMock
+
+from botocore.exceptions import ClientError
+
+# --- Test Database Setup ---
+_test_db_file = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+TEST_DB_URL = f"sqlite:///{_test_db_file.name}"
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker, scoped_session
+from bondable.bond.providers.metadata import Base
+from bondable.bond.providers.bedrock.BedrockMetadata import KnowledgeBaseFile
+from bondable.bond.providers.bedrock.BedrockVectorStores import BedrockVectorStoresProvider
+
+
+class FakeMetadata:
+    """Minimal Metadata-like object backed by a real SQLite DB."""
+    def __init__(self, db_url):
+        self.engine = create_engine(db_url, echo=False, connect_args={"check_same_thread": False})
+        Base.metadata.create_all(self.engine)
+        self._session_factory = scoped_session(sessionmaker(bind=self.engine))
+
+    def get_db_session(self):
+        return self._session_factory()
+
+
+@pytest.fixture(scope="module")
+def db():
+    metadata = FakeMetadata(TEST_DB_URL)
+    yield metadata
+    metadata.engine.dispose()
+    db_path = TEST_DB_URL.replace("sqlite:///", "")
+    if os.path.exists(db_path):
+        try:
+            os.remove(db_path)
+        except Exception:
+            pass
+
+
+@pytest.fixture(autouse=True)
+def clear_kb_files(db):
+    session = db.get_db_session()
+    session.query(KnowledgeBaseFile).delete()
+    session.commit()
+    session.close()
+
+
+@pytest.fixture
+def vectorstores(db):
+    provider = BedrockVectorStoresProvider(db, s3_client=MagicMock(), bedrock_agent_client=MagicMock())
+    provider.knowledge_base_id = "kb-1"
+    provider.data_source_id = "ds-1"
+    provider.kb_enabled = True
+    monitor = provider.ingestion_monitor
+    # Tests call poll_once() themselves
+    monitor.start = lambda: None
+    monitor._min_interval = 2
+    monitor._max_interval = 16
+    yield provider
+
+
+def _add_files(db, job_id, count, status="in_progress"):
+    session = db.get_db_session()
+    for i in range(count):
+        session.add(KnowledgeBaseFile(file_id=f"{job_id}-f{i}", agent_id="agent", s3_key=f"k/{job_id}/{i}",
+                                      ingestion_job_id=job_id, ingestion_status=status))
+    session.commit()
+    session.close()
+
+
+def _statuses(db):
+    session = db.get_db_session()
+    try:
+        return {f.file_id: f.ingestion_status for f in session.query(KnowledgeBaseFile).all()}
+    finally:
+        session.close()
+
+
+def _job(job_id, status):
+    return {"ingestionJob": {"ingestionJobId": job_id, "status": status, "statistics": {"numberOfNewDocumentsIndexed": 1}}}
+
+
+def _make_due(monitor):
+    for job in monitor._jobs.values():
+        job.next_poll_at = time.monotonic() - 1
+
+
+class TestIngestionMonitor:
+
+    def test_finished_jobs_update_rows_and_resolve_futures(self, db, vectorstores):
+        _add_files(db, "job-ok", 3)
+        _add_files(db, "job-bad", 2)
+        statuses = {"job-ok": "COMPLETE", "job-bad": "FAILED"}
+        vectorstores.bedrock_agent_client.get_ingestion_job.side_effect = (
+            lambda **kw: _job(kw["ingestionJobId"], statuses[kw["ingestionJobId"]])
+        )
+        monitor = vectorstores.ingestion_monitor
+        ok_future = vectorstores.track_ingestion_job("job-ok")
+
+        monitor.poll_once()
+
+        assert ok_future.done()
+        assert ok_future.result()["status"] == "COMPLETE"
+        # job-bad was adopted from its in_progress rows even though nobody tracked it
+        assert set(_statuses(db).values()) == {"completed", "failed"}
+        assert all(v == "completed" for k, v in _statuses(db).items() if k.startswith("job-ok"))
+        assert all(v == "failed" for k, v in _statuses(db).items() if k.startswith("job-bad"))
+        assert monitor.tracked_job_ids() == []
+
+    def test_backoff_while_status_unchanged(self, vectorstores):
+        vectorstores.bedrock_agent_client.get_ingestion_job.return_value = _job("job-1", "IN_PROGRESS")
+        monitor = vectorstores.ingestion_monitor
+        monitor.track("job-1")
+
+        intervals = []
+        for _ in range(5):
+            _make_due(monitor)
+            monitor.poll_once()
+            intervals.append(monitor._jobs["job-1"].interval)
+
+        # First observation counts as a change; after that the interval doubles up to the cap
+        assert intervals == [2, 4, 8, 16, 16]
+
+        vectorstores.bedrock_agent_client.get_ingestion_job.return_value = _job("job-1", "STARTING")
+        _make_due(monitor)
+        monitor.poll_once()
+        assert monitor._jobs["job-1"].interval == 2
+
+    def test_jobs_not_due_are_not_polled(self, vectorstores):
+        vectorstores.bedrock_agent_client.get_ingestion_job.return_value = _job("job-1", "IN_PROGRESS")
+        monitor = vectorstores.ingestion_monitor
+        monitor.track("job-1")
+        monitor.poll_once()
+        monitor.poll_once()
+        assert vectorstores.bedrock_agent_client.get_ingestion_job.call_count == 1
+
+    def test_missing_job_marked_failed(self, db, vectorstores):
+        _add_files(db, "job-gone", 1)
+        vectorstores.bedrock_agent_client.get_ingestion_job.side_effect = ClientError(
+            {"Error": {"Code": "ResourceNotFoundException", "Message": "gone"}}, "GetIngestionJob"
+        )
+        future = vectorstores.track_ingestion_job("job-gone")
+        vectorstores.ingestion_monitor.poll_once()
+        assert future.result(timeout=0)["status"] == "FAILED"
+        assert _statuses(db) == {"job-gone-f0": "failed"}
+
+    def test_transient_error_keeps_tracking(self, vectorstores):
+        vectorstores.bedrock_agent_client.get_ingestion_job.side_effect = Exception("throttled")
+        monitor = vectorstores.ingestion_monitor
+        future = monitor.track("job-1")
+        monitor.poll_once()
+        assert not future.done()
+        assert monitor.tracked_job_ids() == ["job-1"]
+
+    def test_wait_times_out_without_polling_in_caller(self, vectorstores):
+        result = vectorstores.wait_for_ingestion_job("job-1", timeout_seconds=0)
+        assert result is None
+        vectorstores.bedrock_agent_client.get_ingestion_job.assert_not_called()
+
+    def test_trigger_tracks_started_job(self, db, vectorstores):
+        session = db.get_db_session()
+        session.add(KnowledgeBaseFile(file_id="f1", agent_id="agent", s3_key="k", ingestion_status="pending"))
+        session.commit()
+        session.close()
+        vectorstores.bedrock_agent_client.start_ingestion_job.return_value = _job("job-new", "STARTING")
+
+        result = vectorstores.trigger_ingestion_job(agent_id="agent")
+
+        assert result == {"job_id": "job-new", "status": "STARTING"}
+        assert vectorstores.ingestion_monitor.tracked_job_ids() == ["job-new"]
+        assert _statuses(db) == {"f1": "in_progress"}
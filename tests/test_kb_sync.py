@@ -0,0 +1,216 @@
+"""
+Tests for Knowledge Base file sync.
+
+Runs BedrockVectorStoresProvider against a real SQLite DB with a mocked S3
+client to verify that files already in S3 are copied server-side, removals go
+through batched delete_objects, and an agent save uploads new files in one
+pass without re-reading them through the API process.
+"""
+import pytest
+import os
+import tempfile
+from unittest.mock import MagicMock, patch
+
+# --- Test Database Setup ---
+_test_db_file = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+TEST_DB_URL = f"sqlite:///{_test_db_file.name}"
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker, scoped_session
+from bondable.bond.providers.metadata import Base
+from bondable.bond.providers.files import FileDetails
+from bondable.bond.providers.bedrock import BedrockVectorStores
+from bondable.bond.providers.bedrock.BedrockMetadata import KnowledgeBaseFile
+from bondable.bond.providers.bedrock.BedrockVectorStores import BedrockVectorStoresProvider
+from bondable.bond.providers.bedrock.BedrockAgent import BedrockAgentProvider
+
+AGENT_ID = "agent_kb"
+KB_BUCKET = "kb-bucket"
+
+
+class FakeMetadata:
+    """Minimal Metadata-like object backed by a real SQLite DB."""
+    def __init__(self, db_url):
+        self.engine = create_engine(db_url, echo=False, connect_args={"check_same_thread": False})
+        Base.metadata.create_all(self.engine)
+        self._session_factory = scoped_session(sessionmaker(bind=self.engine))
+
+    def get_db_session(self):
+        return self._session_factory()
+
+
+@pytest.fixture(scope="module")
+def db():
+    metadata = FakeMetadata(TEST_DB_URL)
+    yield metadata
+    metadata.engine.dispose()
+    db_path = TEST_DB_URL.replace("sqlite:///", "")
+    if os.path.exists(db_path):
+        try:
+            os.remove(db_path)
+        except Exception:
+            pass
+
+
+@pytest.fixture(autouse=True)
+def clear_kb_files(db):
+    session = db.get_db_session()
+    session.query(KnowledgeBaseFile).delete()
+    session.commit()
+    session.close()
+
+
+@pytest.fixture
+def s3_client():
+    client = MagicMock()
+    client.meta.region_name = "us-west-2"
+    client.delete_objects.return_value = {}
+    return client
+
+
+@pytest.fixture
+def vectorstores(db, s3_client):
+    provider = BedrockVectorStoresProvider(db, s3_client=s3_client, bedrock_agent_client=MagicMock())
+    provider.knowledge_base_id = "kb-1"
+    provider.kb_enabled = True
+    provider.s3_bucket_name = KB_BUCKET
+    return provider
+
+
+def _kb_keys(db):
+    session = db.get_db_session()
+    try:
+        return {f.file_id: f.s3_key for f in session.query(KnowledgeBaseFile).all()}
+    finally:
+        session.close()
+
+
+class TestCopyToKnowledgeBase:
+
+    def test_same_bucket_copies_server_side(self, db, vectorstores, s3_client):
+        s3_key = vectorstores.copy_file_to_knowledge_base(
+            file_id="s3://kb-bucket/files/f1", agent_id=AGENT_ID,
+            source_bucket=KB_BUCKET, source_key="files/f1",
+            file_name="report.pdf", mime_type="application/pdf"
+        )
+
+        assert s3_key.startswith(f"knowledge-base/{AGENT_ID}/")
+        s3_client.copy.assert_called_once()
+        copy_kwargs = s3_client.copy.call_args.kwargs
+        assert copy_kwargs["CopySource"] == {"Bucket": KB_BUCKET, "Key": "files/f1"}
+        assert copy_kwargs["Key"] == s3_key
+        assert copy_kwargs["ExtraArgs"]["ContentType"] == "application/pdf"
+        s3_client.get_object.assert_not_called()
+        # Only the metadata sidecar is written with put_object
+        assert [c.kwargs["Key"] for c in s3_client.put_object.call_args_list] == [f"{s3_key}.metadata.json"]
+        assert _kb_keys(db) == {"s3://kb-bucket/files/f1": s3_key}
+
+    def test_other_region_reads_and_uploads(self, db, vectorstores, s3_client):
+        s3_client.get_bucket_location.return_value = {"LocationConstraint": "eu-west-1"}
+        body = MagicMock()
+        body.read.return_value = b"content"
+        s3_client.get_object.return_value = {"Body": body}
+
+        s3_key = vectorstores.copy_file_to_knowledge_base(
+            file_id="s3://far-bucket/files/f2", agent_id=AGENT_ID,
+            source_bucket="far-bucket", source_key="files/f2",
+            file_name="notes.txt", mime_type="text/plain"
+        )
+
+        assert s3_key is not None
+        s3_client.copy.assert_not_called()
+        assert s3_client.put_object.call_args_list[0].kwargs["Body"] == b"content"
+        # Region lookups are cached per bucket
+        vectorstores.copy_file_to_knowledge_base(
+            file_id="s3://far-bucket/files/f3", agent_id=AGENT_ID,
+            source_bucket="far-bucket", source_key="files/f3",
+            file_name="more.txt", mime_type="text/plain"
+        )
+        s3_client.get_bucket_location.assert_called_once()
+
+    def test_existing_record_skips_copy(self, db, vectorstores, s3_client):
+        first = vectorstores.copy_file_to_knowledge_base(
+            "s3://kb-bucket/files/f1", AGENT_ID, KB_BUCKET, "files/f1", "a.pdf", "application/pdf"
+        )
+        second = vectorstores.copy_file_to_knowledge_base(
+            "s3://kb-bucket/files/f1", AGENT_ID, KB_BUCKET, "files/f1", "a.pdf", "application/pdf"
+        )
+        assert first == second
+        s3_client.copy.assert_called_once()
+
+
+class TestRemoveFromKnowledgeBase:
+
+    def _add(self, vectorstores, count):
+        for i in range(count):
+            vectorstores.copy_file_to_knowledge_base(
+                f"s3://kb-bucket/files/f{i}", AGENT_ID, KB_BUCKET, f"files/f{i}", f"f{i}.pdf", "application/pdf"
+            )
+
+    def test_batched_delete(self, db, vectorstores, s3_client):
+        self._add(vectorstores, 3)
+        keys = _kb_keys(db)
+
+        removed = vectorstores.remove_files_from_knowledge_base(
+            ["s3://kb-bucket/files/f0", "s3://kb-bucket/files/f1", "s3://kb-bucket/files/missing"], AGENT_ID
+        )
+
+        assert removed == 2
+        s3_client.delete_objects.assert_called_once()
+        deleted = {o["Key"] for o in s3_client.delete_objects.call_args.kwargs["Delete"]["Objects"]}
+        expected = {keys["s3://kb-bucket/files/f0"], keys["s3://kb-bucket/files/f1"]}
+        assert deleted == expected | {f"{k}.metadata.json" for k in expected}
+        assert set(_kb_keys(db)) == {"s3://kb-bucket/files/f2"}
+
+    def test_delete_split_by_batch_size(self, db, vectorstores, s3_client, monkeypatch):
+        monkeypatch.setattr(BedrockVectorStores, "S3_DELETE_BATCH_SIZE", 4)
+        self._add(vectorstores, 3)
+
+        removed = vectorstores.remove_files_from_knowledge_base([f"s3://kb-bucket/files/f{i}" for i in range(3)], AGENT_ID)
+
+        assert removed == 3
+        assert [len(c.kwargs["Delete"]["Objects"]) for c in s3_client.delete_objects.call_args_list] == [4, 2]
+
+    def test_single_file_wrapper(self, db, vectorstores, s3_client):
+        self._add(vectorstores, 1)
+        assert vectorstores.remove_file_from_knowledge_base("s3://kb-bucket/files/f0", AGENT_ID) is True
+        assert vectorstores.remove_file_from_knowledge_base("s3://kb-bucket/files/f0", AGENT_ID) is True
+        assert _kb_keys(db) == {}
+
+
+class TestAgentKnowledgeBaseSync:
+
+    def _file(self, file_id):
+        return FileDetails(
+            file_id=file_id,
+            file_path=file_id.rsplit("/", 1)[-1] + ".pdf",
+            file_hash="hash",
+            mime_type="application/pdf",
+            owner_user_id="owner",
+            file_size=10,
+        )
+
+    def test_new_files_copied_in_one_pass(self, db, vectorstores, s3_client):
+        vectorstores.copy_file_to_knowledge_base(
+            "s3://kb-bucket/files/old", AGENT_ID, KB_BUCKET, "files/old", "old.pdf", "application/pdf"
+        )
+        s3_client.copy.reset_mock()
+
+        file_ids = [f"s3://kb-bucket/files/new{i}" for i in range(12)]
+        provider = MagicMock()
+        provider.vectorstores = vectorstores
+        provider.files.get_file_details.side_effect = lambda ids: [self._file(i) for i in ids]
+        provider.files._get_key_from_file_id.side_effect = lambda fid: tuple(fid[5:].split("/", 1))
+        vectorstores.trigger_ingestion_job = MagicMock(return_value={"job_id": "job-1"})
+
+        agents = BedrockAgentProvider(bedrock_client=MagicMock(), bedrock_agent_client=MagicMock(), metadata=db)
+        with patch("bondable.bond.providers.bedrock.BedrockAgent.Config") as config:
+            config.config.return_value.get_provider.return_value = provider
+            agents._upload_files_to_knowledge_base(AGENT_ID, file_ids)
+
+        provider.files.get_file_details.assert_called_once()
+        provider.files.get_file_bytes.assert_not_called()
+        assert s3_client.copy.call_count == 12
+        assert set(_kb_keys(db)) == set(file_ids)
+        s3_client.delete_objects.assert_called_once()
+        vectorstores.trigger_ingestion_job.assert_called_once_with(agent_id=AGENT_ID)
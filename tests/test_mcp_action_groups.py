@@ -291,6 +291,216 @@ class TestCreateMcpActionGroups:
             # Should not have called the Bedrock client
             mock_client.assert_not_called()
 
+    def test_existing_action_group_updated_in_place(self, mock_mcp_config):
+        """An existing MCPTools group is updated with one call, not deleted and recreated."""
+        from bondable.bond.providers.bedrock.BedrockMCP import create_mcp_action_groups
+
+        mock_tool_defs = [{'name': 'getJiraIssue', 'description': 'Get a Jira issue', 'parameters': {}}]
+
+        with patch('bondable.bond.providers.bedrock.BedrockMCP.Config') as mock_config, \
+             patch('bondable.bond.providers.bedrock.BedrockMCP._get_bedrock_agent_client') as mock_client, \
+             patch('bondable.bond.providers.bedrock.BedrockMCP._get_mcp_tool_definitions_sync') as mock_get_defs:
+
+            mock_config.config.return_value.get_mcp_config.return_value = mock_mcp_config
+            mock_get_defs.return_value = mock_tool_defs
+            mock_bedrock = Mock()
+            mock_client.return_value = mock_bedrock
+
+            create_mcp_action_groups(
+                bedrock_agent_id="test-agent-id",
+                mcp_tools=["getJiraIssue"],
+                mcp_resources=[],
+                user_id=MOCK_USER_ID,
+                existing_action_group_id="existing-mcp-id"
+            )
+
+            mock_bedrock.update_agent_action_group.assert_called_once()
+            call_kwargs = mock_bedrock.update_agent_action_group.call_args.kwargs
+            assert call_kwargs['actionGroupId'] == 'existing-mcp-id'
+            assert call_kwargs['actionGroupName'] == 'MCPTools'
+            mock_bedrock.delete_agent_action_group.assert_not_called()
+            mock_bedrock.create_agent_action_group.assert_not_called()
+
+    def test_failed_update_falls_back_to_recreate(self, mock_mcp_config):
+        """If the in-place update is rejected, the old group is deleted and a new one created."""
+        from bondable.bond.providers.bedrock.BedrockMCP import create_mcp_action_groups
+
+        mock_tool_defs = [{'name': 'getJiraIssue', 'description': 'Get a Jira issue', 'parameters': {}}]
+
+        with patch('bondable.bond.providers.bedrock.BedrockMCP.Config') as mock_config, \
+             patch('bondable.bond.providers.bedrock.BedrockMCP._get_bedrock_agent_client') as mock_client, \
+             patch('bondable.bond.providers.bedrock.BedrockMCP._get_mcp_tool_definitions_sync') as mock_get_defs:
+
+            mock_config.config.return_value.get_mcp_config.return_value = mock_mcp_config
+            mock_get_defs.return_value = mock_tool_defs
+            mock_bedrock = Mock()
+            mock_bedrock.update_agent_action_group.side_effect = Exception("ValidationException")
+            mock_bedrock.create_agent_action_group.return_value = {
+                'agentActionGroup': {'actionGroupId': 'new-mcp-id'}
+            }
+            mock_client.return_value = mock_bedrock
+
+            create_mcp_action_groups(
+                bedrock_agent_id="test-agent-id",
+                mcp_tools=["getJiraIssue"],
+                mcp_resources=[],
+                existing_action_group_id="existing-mcp-id"
+            )
+
+            assert mock_bedrock.delete_agent_action_group.call_args.kwargs['actionGroupId'] == 'existing-mcp-id'
+            mock_bedrock.create_agent_action_group.assert_called_once()
+
+
+class TestParallelToolDiscovery:
+    """Tool listing fans out across servers under one shared deadline."""
+
+    @staticmethod
+    def _tool(name):
+        tool = Mock()
+        tool.name = name
+        tool.description = f"{name} description"
+        tool.inputSchema = {}
+        return tool
+
+    @staticmethod
+    def _config(*server_names):
+        return {"mcpServers": {
+            name: {"url": f"https://{name}.example.com/mcp", "auth_type": "static"}
+            for name in server_names
+        }}
+
+    def _client_factory(self, tools_by_url, delay_by_url):
+        import asyncio
+
+        def make_client(transport):
+            url = transport.url
+
+            async def list_tools():
+                await asyncio.sleep(delay_by_url.get(url, 0))
+                return [self._tool(n) for n in tools_by_url[url]]
+
+            client = AsyncMock()
+            client.list_tools = list_tools
+            client.__aenter__ = AsyncMock(return_value=client)
+            client.__aexit__ = AsyncMock(return_value=None)
+            return client
+        return make_client
+
+    def _transport(self, url, headers=None):
+        transport = Mock()
+        transport.url = url
+        return transport
+
+    @pytest.mark.asyncio
+    async def test_servers_listed_concurrently_with_first_match_order(self):
+        import time
+        from bondable.bond.providers.bedrock.BedrockMCP import _get_mcp_tool_definitions
+
+        config = self._config("first", "second", "third")
+        tools_by_url = {
+            "https://first.example.com/mcp": ["shared"],
+            "https://second.example.com/mcp": ["shared", "only_second"],
+            "https://third.example.com/mcp": ["only_third"],
+        }
+        delays = {url: 0.2 for url in tools_by_url}
+
+        with patch('bondable.bond.providers.bedrock.BedrockMCP.StreamableHttpTransport', side_effect=self._transport), \
+             patch('bondable.bond.providers.bedrock.BedrockMCP.Client', side_effect=self._client_factory(tools_by_url, delays)):
+            start = time.monotonic()
+            result = await _get_mcp_tool_definitions(config, ["shared", "only_second", "only_third"])
+            elapsed = time.monotonic() - start
+
+        assert elapsed < 0.5, f"servers were queried serially ({elapsed:.2f}s)"
+        by_name = {t['name']: t['server_name'] for t in result}
+        assert by_name == {"shared": "first", "only_second": "second", "only_third": "third"}
+
+    @pytest.mark.asyncio
+    async def test_qualified_names_only_query_their_server(self):
+        from bondable.bond.providers.bedrock.BedrockMCP import _get_mcp_tool_definitions
+
+        config = self._config("first", "second")
+        tools_by_url = {
+            "https://first.example.com/mcp": ["a"],
+            "https://second.example.com/mcp": ["b"],
+        }
+        with patch('bondable.bond.providers.bedrock.BedrockMCP.StreamableHttpTransport', side_effect=self._transport) as transport_cls, \
+             patch('bondable.bond.providers.bedrock.BedrockMCP.Client', side_effect=self._client_factory(tools_by_url, {})):
+            result = await _get_mcp_tool_definitions(config, ["second:b"])
+
+        assert [t['name'] for t in result] == ["b"]
+        assert [c.args[0] for c in transport_cls.call_args_list] == ["https://second.example.com/mcp"]
+
+    @pytest.mark.asyncio
+    async def test_slow_server_skipped_after_shared_timeout(self):
+        from bondable.bond.providers.bedrock.BedrockMCP import _get_mcp_tool_definitions
+
+        config = self._config("slow", "fast")
+        tools_by_url = {
+            "https://slow.example.com/mcp": ["slow_tool"],
+            "https://fast.example.com/mcp": ["fast_tool"],
+        }
+        delays = {"https://slow.example.com/mcp": 5}
+        with patch('bondable.bond.providers.bedrock.BedrockMCP.MCP_TOOL_DISCOVERY_TIMEOUT', 0.2), \
+             patch('bondable.bond.providers.bedrock.BedrockMCP.StreamableHttpTransport', side_effect=self._transport), \
+             patch('bondable.bond.providers.bedrock.BedrockMCP.Client', side_effect=self._client_factory(tools_by_url, delays)):
+            result = await _get_mcp_tool_definitions(config, ["slow_tool", "fast_tool"])
+
+        assert [t['name'] for t in result] == ["fast_tool"]
+
+    def test_sync_callers_share_one_event_loop(self):
+        import threading
+        from bondable.bond.providers.bedrock.BedrockMCP import _run_on_background_loop
+
+        async def current_thread():
+            return threading.current_thread()
+
+        first = _run_on_background_loop(current_thread())
+        second = _run_on_background_loop(current_thread())
+        assert first is second
+        assert first is not threading.current_thread()
+
+    def test_auth_lookup_runs_off_the_shared_loop(self):
+        import threading
+        from bondable.bond.providers.bedrock.BedrockMCP import _get_mcp_tool_definitions_sync
+
+        config = self._config("slow_auth", "fast")
+        tools_by_url = {
+            "https://slow_auth.example.com/mcp": ["a"],
+            "https://fast.example.com/mcp": ["b"],
+        }
+        auth_threads = []
+        release = threading.Event()
+
+        def auth_headers(server_name, server_config, current_user=None, jwt_token=None):
+            auth_threads.append(threading.current_thread())
+            if server_name == "slow_auth":
+                # Blocks until the other server's tools were listed, which only
+                # happens if this lookup is not holding the event loop
+                assert release.wait(timeout=2)
+            return {}
+
+        make_client = self._client_factory(tools_by_url, {})
+
+        def client(transport):
+            c = make_client(transport)
+            if transport.url == "https://fast.example.com/mcp":
+                list_tools = c.list_tools
+
+                async def release_after_listing():
+                    result = await list_tools()
+                    release.set()
+                    return result
+                c.list_tools = release_after_listing
+            return c
+
+        with patch('bondable.bond.providers.bedrock.BedrockMCP._get_auth_headers_for_server', side_effect=auth_headers), \
+             patch('bondable.bond.providers.bedrock.BedrockMCP.StreamableHttpTransport', side_effect=self._transport), \
+             patch('bondable.bond.providers.bedrock.BedrockMCP.Client', side_effect=client):
+            result = _get_mcp_tool_definitions_sync(config, ["a", "b"])
+
+        assert sorted(t['name'] for t in result) == ["a", "b"]
+        assert all(t.name != "mcp-event-loop" for t in auth_threads)
+
 
 class TestBedrockCRUDWithMCP:
     """Tests for BedrockCRUD functions passing user_id for MCP."""
@@ -0,0 +1,120 @@
+"""
+Tests for the versioned MCP config snapshot and its lookup indexes.
+"""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from bondable.bond.config import Config
+from bondable.bond.mcp_snapshot import USER_SERVER_INDEX, hash_server_name, latest_snapshot, user_servers_by_hash
+from bondable.bond.providers.bedrock.AdminMCP import ADMIN_SERVER_NAME
+from bondable.bond.providers.bedrock.CommonToolsMCP import COMMON_SERVER_NAME
+from bondable.bond.providers.bedrock.BedrockMCP import _resolve_server_from_hash
+from bondable.bond.providers.metadata import Base, UserMcpServer
+
+STATIC = '{"mcpServers": {"weather": {"url": "https://weather.example.com/mcp"}, "hello": {"command": "python"}}}'
+
+
+@pytest.fixture
+def config():
+    Config._app_config_cache = {}
+    cfg = Config.__new__(Config)
+    with patch.dict(os.environ, {"BOND_MCP_CONFIG": STATIC}), \
+         patch("bondable.bond.mcp_discovery.get_discovered_mcps", return_value=[]):
+        yield cfg
+    Config._app_config_cache = None
+
+
+class TestMcpConfigSnapshot:
+
+    def test_snapshot_is_reused_until_a_source_changes(self, config):
+        first = config.get_mcp_snapshot()
+        assert config.get_mcp_snapshot() is first
+        assert config.get_mcp_config() is first.config
+
+        with patch.dict(os.environ, {"BOND_MCP_CONFIG": '{"mcpServers": {"other": {"url": "https://o"}}}'}):
+            second = config.get_mcp_snapshot()
+        assert second is not first
+        assert second.version > first.version
+        assert list(second.servers) == ["other"]
+
+        third = config.get_mcp_snapshot()
+        assert third.version > second.version
+        assert latest_snapshot() is third
+
+    def test_discovery_change_rebuilds(self, config):
+        first = config.get_mcp_snapshot()
+        discovered = [{"name": "github", "display_name": "GitHub", "url": "http://localhost:18002/mcp"}]
+        with patch("bondable.bond.mcp_discovery.get_discovered_mcps", return_value=discovered):
+            second = config.get_mcp_snapshot()
+            assert config.get_mcp_snapshot() is second
+        assert second is not first
+        assert second.servers["github"]["auth_type"] == "bond_jwt"
+
+    def test_server_by_hash(self, config):
+        snapshot = config.get_mcp_snapshot()
+        assert snapshot.server_by_hash[hash_server_name("weather")] == "weather"
+        assert snapshot.server_by_hash[hash_server_name("hello")] == "hello"
+
+    def test_builtin_tool_schemas(self, config):
+        schemas = config.get_mcp_snapshot().tool_schemas
+        assert "inputSchema" in schemas[COMMON_SERVER_NAME]["web_search"]
+        assert schemas[ADMIN_SERVER_NAME]
+
+    def test_resolve_uses_the_snapshot_index(self, config):
+        mcp_config = config.get_mcp_config()
+        with patch("bondable.bond.providers.bedrock.BedrockMCP._hash_server_name") as hash_fn:
+            assert _resolve_server_from_hash(hash_server_name("weather"), mcp_config) == "weather"
+        hash_fn.assert_not_called()
+
+    def test_resolve_with_a_plain_config_dict(self):
+        mcp_config = {"mcpServers": {"adhoc": {"url": "https://a"}}}
+        assert _resolve_server_from_hash(hash_server_name("adhoc"), mcp_config) == "adhoc"
+        assert _resolve_server_from_hash("000000", mcp_config) is None
+
+
+class TestUserServerIndex:
+
+    @pytest.fixture
+    def session(self, tmp_path):
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        engine = create_engine(f"sqlite:///{tmp_path / 'meta.db'}")
+        Base.metadata.create_all(engine, tables=[UserMcpServer.__table__])
+        session = sessionmaker(bind=engine)()
+        USER_SERVER_INDEX.clear()
+        yield session
+        session.close()
+        engine.dispose()
+
+    def test_index_is_cached_and_dropped_on_commit(self, session):
+        loads = []
+
+        def load():
+            loads.append(1)
+            return {"abc123": "server-1"}
+
+        assert user_servers_by_hash("user-1", load)["abc123"] == "server-1"
+        assert user_servers_by_hash("user-1", load)["abc123"] == "server-1"
+        assert len(loads) == 1
+
+        session.add(UserMcpServer(id="server-2", owner_user_id="user-1", server_name="mine",
+                                  display_name="Mine", url="https://mine.example.com/mcp"))
+        session.flush()
+        # Not visible to other sessions yet, so the index is kept
+        user_servers_by_hash("user-1", load)
+        assert len(loads) == 1
+
+        session.commit()
+        user_servers_by_hash("user-1", load)
+        assert len(loads) == 2
+
+    def test_rollback_keeps_the_index(self, session):
+        user_servers_by_hash("user-1", lambda: {})
+        session.add(UserMcpServer(id="server-3", owner_user_id="user-1", server_name="tmp",
+                                  display_name="Tmp", url="https://tmp.example.com/mcp"))
+        session.flush()
+        session.rollback()
+        assert user_servers_by_hash("user-1", lambda: pytest.fail("index should be cached")) == {}
@@ -83,6 +83,15 @@ def test_connection_name():
     return "test_connection"
 
 
+@pytest.fixture(autouse=True)
+def clear_aws_secrets():
+    """Resolved Secrets Manager values are cached per process; start each test without them."""
+    from bondable.bond.aws_clients import clear_clients
+    clear_clients()
+    yield
+    clear_clients()
+
+
 # --- MCPTokenData Tests ---
 
 class TestMCPTokenData:
@@ -691,14 +700,14 @@ class TestResolveClientSecret:
             'SecretString': '{"client_secret": "resolved-from-arn"}'
         }
 
-        with patch('boto3.client', return_value=mock_client) as mock_boto:
+        with patch('bondable.bond.aws_clients.aws_client', return_value=mock_client) as mock_boto:
             config = {
                 'client_secret_arn': 'arn:aws:secretsmanager:us-east-1:123456789:secret:my-secret'
             }
             result = resolve_client_secret(config)
 
             assert result == 'resolved-from-arn'
-            mock_boto.assert_called_once_with('secretsmanager', region_name='us-east-1')
+            mock_boto.assert_called_once_with('secretsmanager', 'us-east-1')
             mock_client.get_secret_value.assert_called_once_with(
                 SecretId='arn:aws:secretsmanager:us-east-1:123456789:secret:my-secret'
             )
@@ -713,13 +722,13 @@ class TestResolveClientSecret:
             'SecretString': '{"client_secret": "resolved-from-name"}'
         }
 
-        with patch('boto3.client', return_value=mock_client) as mock_boto:
+        with patch('bondable.bond.aws_clients.aws_client', return_value=mock_client) as mock_boto:
             with patch.dict(os.environ, {'AWS_REGION': 'us-west-2'}):
                 config = {'client_secret_arn': 'my-secret-name'}
                 result = resolve_client_secret(config)
 
                 assert result == 'resolved-from-name'
-                mock_boto.assert_called_once_with('secretsmanager', region_name='us-west-2')
+                mock_boto.assert_called_once_with('secretsmanager', 'us-west-2')
 
     def test_returns_none_when_neither_key_present(self):
         """Returns None when neither client_secret nor client_secret_arn is in config"""
@@ -733,7 +742,7 @@ class TestResolveClientSecret:
         from unittest.mock import patch, MagicMock
         from bondable.bond.auth.oauth_utils import resolve_client_secret
 
-        with patch('boto3.client') as mock_boto:
+        with patch('bondable.bond.aws_clients.aws_client') as mock_boto:
             mock_boto.side_effect = Exception("AWS connection error")
             config = {
                 'client_secret_arn': 'arn:aws:secretsmanager:us-east-1:123456789:secret:my-secret'
@@ -762,7 +771,7 @@ class TestResolveClientSecret:
             'SecretString': '{"client_secret": "from-arn"}'
         }
 
-        with patch('boto3.client', return_value=mock_client):
+        with patch('bondable.bond.aws_clients.aws_client', return_value=mock_client):
             config = {
                 'client_secret': '',
                 'client_secret_arn': 'arn:aws:secretsmanager:us-east-1:123456789:secret:test'
@@ -787,7 +796,7 @@ class TestResolveClientSecret:
             'SecretString': '{"api_key": "something-else"}'
         }
 
-        with patch('boto3.client', return_value=mock_client):
+        with patch('bondable.bond.aws_clients.aws_client', return_value=mock_client):
             config = {
                 'client_secret_arn': 'arn:aws:secretsmanager:us-east-1:123456789:secret:test'
             }
@@ -848,7 +857,7 @@ class TestTokenRefresh:
 
         with patch('bondable.bond.config.Config') as mock_config_cls, \
              patch('requests.post', return_value=mock_response) as mock_post, \
-             patch('boto3.client', return_value=mock_sm_client):
+             patch('bondable.bond.aws_clients.aws_client', return_value=mock_sm_client):
 
             mock_config_cls.config.return_value.get_mcp_config.return_value = mock_mcp_config
 
@@ -936,7 +945,7 @@ class TestTokenRefresh:
         }
 
         with patch('bondable.bond.config.Config') as mock_config_cls, \
-             patch('boto3.client') as mock_boto:
+             patch('bondable.bond.aws_clients.aws_client') as mock_boto:
 
             mock_config_cls.config.return_value.get_mcp_config.return_value = mock_mcp_config
             mock_boto.side_effect = Exception("AWS unavailable")
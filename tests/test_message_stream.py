@@ -0,0 +1,140 @@
+"""
+Tests for BondMessageParser, the incremental <_bondmessage> tokenizer.
+"""
+
+import random
+
+import pytest
+
+from bondable.bond.broker import Broker
+from bondable.bond.broker_backends import InMemoryBrokerBackend
+from bondable.bond.message_stream import (
+    MAX_TAG_LENGTH, BondMessageParser, MessageEnd, MessageStart, MessageText,
+)
+
+STREAM = (
+    '<_bondmessage id="m1" thread_id="t1" agent_id="a1" type="text" role="assistant" '
+    'is_error="false" is_done="false">'
+    'Compare a < b and b > c, see <b>bold</b> and </_bond not a tag.'
+    '</_bondmessage>'
+    '<_bondmessage id="m2" thread_id="t1" agent_id="a1" type="text" role="system" '
+    'is_error="false" is_done="true">Done.</_bondmessage>'
+)
+
+
+def _parse(chunks):
+    parser = BondMessageParser()
+    events = []
+    for chunk in chunks:
+        events.extend(parser.feed(chunk))
+    events.extend(parser.close())
+    return _merge_text(events)
+
+
+def _merge_text(events):
+    merged = []
+    for event in events:
+        if isinstance(event, MessageText) and merged and isinstance(merged[-1], MessageText):
+            merged[-1] = MessageText(merged[-1].text + event.text)
+        else:
+            merged.append(event)
+    return merged
+
+
+class TestBondMessageParser:
+
+    def test_whole_tags(self):
+        events = _parse([STREAM])
+        assert [type(e) for e in events] == [
+            MessageStart, MessageText, MessageEnd, MessageStart, MessageText, MessageEnd,
+        ]
+        assert events[0].attributes["id"] == "m1"
+        assert events[0].attributes["role"] == "assistant"
+        assert not events[0].flag("is_done")
+        assert events[1].text == 'Compare a < b and b > c, see <b>bold</b> and </_bond not a tag.'
+        assert events[3].flag("is_done")
+        assert events[4].text == "Done."
+
+    def test_every_split_point_gives_the_same_events(self):
+        expected = _parse([STREAM])
+        for i in range(1, len(STREAM)):
+            assert _parse([STREAM[:i], STREAM[i:]]) == expected, f"split at {i}"
+
+    def test_random_chunking_gives_the_same_events(self):
+        expected = _parse([STREAM])
+        rng = random.Random(7)
+        for _ in range(200):
+            chunks, pos = [], 0
+            while pos < len(STREAM):
+                size = rng.randint(1, 12)
+                chunks.append(STREAM[pos:pos + size])
+                pos += size
+            assert _parse(chunks) == expected
+
+    def test_body_text_is_not_held_back(self):
+        parser = BondMessageParser()
+        parser.feed('<_bondmessage id="m">')
+        assert parser.feed("hello ") == [MessageText("hello ")]
+        assert parser.in_message
+
+    def test_partial_tag_is_held_until_complete(self):
+        parser = BondMessageParser()
+        assert parser.feed('text <_bondmess') == [MessageText("text ")]
+        assert parser.has_pending
+        assert parser.feed('age id="x">') == [MessageStart({"id": "x"})]
+        assert not parser.has_pending
+
+    def test_non_tag_angle_bracket_at_chunk_end_is_released(self):
+        parser = BondMessageParser()
+        assert parser.feed("a <") == [MessageText("a ")]
+        assert parser.feed("b") == [MessageText("<b")]
+
+    def test_close_flushes_held_text(self):
+        parser = BondMessageParser()
+        parser.feed("tail </_bondme")
+        assert parser.close() == [MessageText("</_bondme")]
+
+    def test_attributes_are_unescaped(self):
+        events = _parse(['<_bondmessage id="m" agent_id="a&amp;b" title="say &quot;hi&quot; &lt;x&gt;">'])
+        assert events[0].attributes == {"id": "m", "agent_id": "a&b", "title": 'say "hi" <x>'}
+
+    def test_self_closing_tag(self):
+        assert _parse(['<_bondmessage id="m" />']) == [MessageStart({"id": "m"}), MessageEnd()]
+
+    def test_whitespace_inside_tags(self):
+        events = _parse(['< _bondmessage  id="m"\n role="user" >x</ _bondmessage >'])
+        assert events == [MessageStart({"id": "m", "role": "user"}), MessageText("x"), MessageEnd()]
+
+    def test_overlong_partial_tag_becomes_text(self):
+        parser = BondMessageParser()
+        text = '<_bondmessage id="' + "x" * MAX_TAG_LENGTH
+        assert parser.feed(text) == [MessageText(text)]
+
+    @pytest.mark.parametrize("chunk", [None, ""])
+    def test_empty_chunks(self, chunk):
+        assert BondMessageParser().feed(chunk) == []
+
+
+class TestBrokerConnectionParsing:
+
+    def test_tags_split_across_publishes(self):
+        broker = Broker(backend=InMemoryBrokerBackend())
+        conn = broker.connect(thread_id="t1", subscriber_id="s")
+        for i in range(0, len(STREAM), 7):
+            broker.publish("t1", STREAM[i:i + 7])
+
+        first = conn.wait_for_message(timeout=1)
+        second = conn.wait_for_message(timeout=1)
+        assert first.message_id == "m1" and first.role == "assistant"
+        assert first.clob.get_content().startswith("Compare a < b")
+        assert second.is_done and second.clob.get_content() == "Done."
+        assert first.event_id < second.event_id
+
+    def test_resume_inside_split_start_tag(self):
+        broker = Broker(backend=InMemoryBrokerBackend())
+        seqs = [broker.publish("t1", STREAM[i:i + 7]) for i in range(0, len(STREAM), 7)]
+
+        # Resume from the middle of the first start tag: the whole first message is replayed
+        conn = broker.connect(thread_id="t1", subscriber_id="s", last_event_id=seqs[2])
+        assert conn.wait_for_message(timeout=1).message_id == "m1"
+        assert conn.wait_for_message(timeout=1).message_id == "m2"
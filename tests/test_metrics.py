@@ -0,0 +1,175 @@
+"""
+Tests for the in-process metrics registry, the request metrics middleware and
+the /metrics endpoint.
+"""
+import pytest
+import os
+import tempfile
+
+os.environ.setdefault('OAUTH2_ENABLED_PROVIDERS', 'cognito')
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from bondable.bond import metrics
+from bondable.bond.metrics import MetricsRegistry, MetricsFileWriter, track_request_db_time
+from bondable.bond.providers.bedrock.BedrockAgent import BedrockAgent
+from bondable.rest.middleware.metrics import MetricsMiddleware
+from bondable.rest.main import app
+
+
+@pytest.fixture(autouse=True)
+def reset_registry():
+    metrics.REGISTRY.reset()
+    yield
+    metrics.REGISTRY.reset()
+
+
+class TestRegistry:
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        latency = registry.histogram("test_seconds", "Test latency", labels=("agent_id",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.7, 5.0):
+            latency.observe(value, agent_id="a1")
+
+        rendered = registry.render_prometheus()
+
+        assert "# TYPE test_seconds histogram" in rendered
+        assert 'test_seconds_bucket{agent_id="a1",le="0.1"} 1' in rendered
+        assert 'test_seconds_bucket{agent_id="a1",le="1"} 3' in rendered
+        assert 'test_seconds_bucket{agent_id="a1",le="+Inf"} 4' in rendered
+        assert 'test_seconds_count{agent_id="a1"} 4' in rendered
+        assert latency.sum(agent_id="a1") == pytest.approx(6.25)
+
+    def test_labels_must_match(self):
+        registry = MetricsRegistry()
+        latency = registry.histogram("test_seconds", "Test latency", labels=("agent_id",))
+        with pytest.raises(ValueError):
+            latency.observe(1.0, tool="x")
+        with pytest.raises(ValueError):
+            registry.histogram("test_seconds", "Test latency", labels=("tool",))
+        assert registry.histogram("test_seconds", "Test latency", labels=("agent_id",)) is latency
+
+    def test_counter_and_label_escaping(self):
+        registry = MetricsRegistry()
+        calls = registry.counter("test_calls", "Test calls", labels=("tool",))
+        calls.inc(tool='say "hi"')
+        calls.inc(2, tool='say "hi"')
+        assert 'test_calls_total{tool="say \\"hi\\""} 3' in registry.render_prometheus()
+
+    def test_time_observes_on_error(self):
+        registry = MetricsRegistry()
+        latency = registry.histogram("test_seconds", "Test latency")
+        with pytest.raises(RuntimeError):
+            with latency.time():
+                raise RuntimeError("boom")
+        assert latency.count() == 1
+
+    def test_listener_receives_observations(self):
+        registry = MetricsRegistry()
+        latency = registry.histogram("test_seconds", "Test latency", labels=("agent_id",))
+        received = []
+        registry.add_listener(lambda metric: lambda name, value, attrs: received.append((name, value, attrs)))
+        latency.observe(0.5, agent_id="a1")
+        assert received == [("test_seconds", 0.5, {"agent_id": "a1"})]
+
+    def test_file_writer(self):
+        registry = MetricsRegistry()
+        registry.counter("test_calls", "Test calls").inc()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "metrics.prom")
+            writer = MetricsFileWriter(path, interval_seconds=3600, registry=registry)
+            writer.start()
+            writer.stop()
+            with open(path) as f:
+                assert "test_calls_total 1" in f.read()
+            assert os.listdir(tmp) == ["metrics.prom"]
+
+
+class TestRequestMetrics:
+
+    @pytest.fixture
+    def client(self):
+        metrics.instrument_sqlalchemy()
+        engine = create_engine("sqlite://")
+        test_app = FastAPI()
+        test_app.add_middleware(MetricsMiddleware)
+
+        @test_app.get("/items/{item_id}")
+        def get_item(item_id: str):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 2"))
+            return {"id": item_id}
+
+        @test_app.get("/stream")
+        def stream():
+            def body():
+                yield "a"
+                with engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+                yield "b"
+            return StreamingResponse(body())
+
+        yield TestClient(test_app)
+        engine.dispose()
+
+    def test_route_template_and_db_time(self, client):
+        client.get("/items/1")
+        client.get("/items/2")
+
+        labels = {"method": "GET", "route": "/items/{item_id}"}
+        assert metrics.HTTP_REQUEST_DURATION.count(status="200", **labels) == 2
+        assert metrics.HTTP_REQUEST_DB_TIME.count(**labels) == 2
+        assert metrics.HTTP_REQUEST_DB_TIME.sum(**labels) > 0
+        assert metrics.HTTP_REQUEST_DB_STATEMENTS.value(**labels) == 4
+
+    def test_streamed_body_counted(self, client):
+        assert client.get("/stream").text == "ab"
+        assert metrics.HTTP_REQUEST_DB_STATEMENTS.value(method="GET", route="/stream") == 1
+
+    def test_statements_outside_requests_ignored(self):
+        metrics.instrument_sqlalchemy()
+        engine = create_engine("sqlite://")
+        with track_request_db_time() as db_time:
+            pass
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        assert db_time.statements == 0
+        engine.dispose()
+
+
+class TestMetricsEndpoint:
+
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("METRICS_ENABLED", raising=False)
+        assert TestClient(app).get("/metrics").status_code == 404
+
+    def test_token_required_when_configured(self, monkeypatch):
+        monkeypatch.setenv("METRICS_ENABLED", "true")
+        monkeypatch.setenv("METRICS_AUTH_TOKEN", "scrape-secret")
+        metrics.MCP_TOOL_LATENCY.observe(0.2, agent_id="a1", tool="search", outcome="success")
+        client = TestClient(app)
+
+        assert client.get("/metrics").status_code == 401
+        assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+        response = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'bond_mcp_tool_seconds_count{agent_id="a1",tool="search",outcome="success"} 1' in response.text
+
+
+class TestChatInstrumentation:
+
+    def test_first_chunk_observes_time_to_first_token_once(self):
+        agent = BedrockAgent.__new__(BedrockAgent)
+        agent.agent_id = "agent_1"
+        agent._turn_started_at = 0.0
+
+        assert agent._handle_chunk_event({"bytes": b"Hello"}) == "Hello"
+        assert agent._handle_chunk_event({"bytes": b" world"}) == " world"
+
+        assert metrics.CHAT_TIME_TO_FIRST_TOKEN.count(agent_id="agent_1") == 1
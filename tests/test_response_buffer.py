@@ -0,0 +1,106 @@
+"""
+Tests for ResponseBuffer, the append-only buffer shared by the streaming paths.
+"""
+
+import random
+
+import pytest
+
+from bondable.bond.broker import BondMessageClob
+from bondable.bond.response_buffer import ResponseBuffer
+from bondable.rest.routers.chat import _FORWARD_MARKER, _FORWARD_PATTERN
+
+
+def _chunked(text, sizes):
+    chunks, i = [], 0
+    while i < len(text):
+        size = sizes[len(chunks) % len(sizes)]
+        chunks.append(text[i:i + size])
+        i += size
+    return chunks
+
+
+class TestResponseBuffer:
+
+    def test_append_and_getvalue(self):
+        buffer = ResponseBuffer()
+        assert not buffer and buffer.getvalue() == ""
+        for chunk in ["Hello", ", ", "", "world"]:
+            buffer.append(chunk)
+        assert len(buffer) == 12
+        assert buffer.getvalue() == "Hello, world"
+        buffer.append("!")
+        assert str(buffer) == "Hello, world!"
+
+    def test_emit_returns_text(self):
+        buffer = ResponseBuffer()
+        assert buffer.emit("abc") == "abc"
+        assert buffer.getvalue() == "abc"
+
+    def test_clear_resets_content_and_marker(self):
+        buffer = ResponseBuffer("see bond://forward/X", marker=_FORWARD_MARKER)
+        assert buffer.marker_seen
+        buffer.clear()
+        assert not buffer and not buffer.marker_seen and buffer.getvalue() == ""
+
+    def test_marker_split_across_chunks_is_seen(self):
+        buffer = ResponseBuffer(marker=_FORWARD_MARKER)
+        for chunk in ["Ask [Billing](bond:", "//for", "ward/Billing)"]:
+            buffer.append(chunk)
+        assert buffer.marker_seen
+        match = buffer.search(_FORWARD_PATTERN)
+        assert match.group(1) == "Billing" and match.group(2) == "Billing"
+
+    def test_search_skips_join_without_marker(self):
+        buffer = ResponseBuffer(marker=_FORWARD_MARKER)
+        buffer.append("no links here [x](https://example.com)")
+        buffer.append(" more text")
+        assert buffer.search(_FORWARD_PATTERN) is None
+        # Chunks were never joined
+        assert len(buffer._chunks) == 2
+
+    @pytest.mark.parametrize("text", [
+        "Let me hand you over: [Billing Agent](bond://forward/Billing Agent)",
+        "[a [nested](bond://forward/Target) label",
+        "broken bond://forward/Nope then [Real](bond://forward/Real)",
+        "]](bond://forward/NoLabel) and [Ok](bond://forward/Ok)",
+        "bond://forward/ at start, no link",
+        "[multi\nline](bond://forward/Agent)",
+        "plain text",
+    ])
+    def test_search_matches_full_scan_for_any_chunking(self, text):
+        expected = _FORWARD_PATTERN.search(text)
+        rng = random.Random(len(text))
+        for _ in range(20):
+            buffer = ResponseBuffer(marker=_FORWARD_MARKER)
+            for chunk in _chunked(text, [rng.randint(1, 7) for _ in range(5)]):
+                buffer.append(chunk)
+            match = buffer.search(_FORWARD_PATTERN)
+            if expected is None:
+                assert match is None
+            else:
+                assert match is not None and match.span() == expected.span()
+
+
+class TestBondMessageClob:
+
+    def test_streamed_content_accumulates(self):
+        clob = BondMessageClob()
+        for text in ["one ", "two ", "three"]:
+            clob.put(text)
+        clob.close()
+        assert clob.get_content() == "one two three"
+
+    def test_generate_then_close(self):
+        clob = BondMessageClob()
+        clob.put("a")
+        clob.put("b")
+        clob.put(None)
+        assert list(clob.generate()) == ["a", "b"]
+        clob.close()
+        assert clob.content == "ab"
+
+    def test_fixed_content(self):
+        clob = BondMessageClob(content="stored text")
+        assert clob.is_closed()
+        assert clob.get_content() == "stored text"
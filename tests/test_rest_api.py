@@ -53,6 +53,10 @@ def mock_provider():
     """Mock provider with all sub-providers."""
     provider = MagicMock(spec=Provider)
     provider.agents = MagicMock(spec=AgentProvider)
+    # Summaries come from the base implementation so tests can keep mocking get_agent
+    provider.agents.get_agent_summaries.side_effect = (
+        lambda agent_ids: AgentProvider.get_agent_summaries(provider.agents, agent_ids)
+    )
     provider.threads = MagicMock(spec=ThreadsProvider)
     provider.files = MagicMock(spec=FilesProvider)
     provider.files.bucket_name = "bond-bedrock-files-000000000000"
@@ -700,6 +704,57 @@ class TestThreads:
         assert data["has_more"] is True
         assert data["total"] == 50
 
+    def test_get_threads_by_cursor(self, authenticated_client):
+        """GET /threads?cursor= pages with get_threads_page and returns the next cursor."""
+        from bondable.bond.providers.threads import encode_thread_cursor
+        client, auth_headers, mock_provider = authenticated_client
+
+        cursor = encode_thread_cursor(datetime(2026, 1, 2, 3, 4, 5), "thread_20")
+        mock_provider.threads.get_threads_page.return_value = (
+            [{"thread_id": "thread_21", "name": "Thread 21"}], "next-page")
+        mock_provider.threads.estimate_thread_count.return_value = (1000, False)
+
+        response = client.get(f"/threads?cursor={cursor}&limit=1&estimate_total=true", headers=auth_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["threads"][0]["id"] == "thread_21"
+        assert data["next_cursor"] == "next-page"
+        assert data["has_more"] is True
+        assert data["total"] == 1000
+        assert data["total_is_estimate"] is True
+        mock_provider.threads.get_threads_page.assert_called_with(
+            user_id=TEST_USER_ID, count=1, cursor=cursor, exclude_empty=True
+        )
+        mock_provider.threads.get_current_threads.assert_not_called()
+        mock_provider.threads.get_thread_count.assert_not_called()
+
+    def test_get_threads_offset_page_returns_cursor(self, authenticated_client):
+        """An offset page with more results carries the cursor of its last thread."""
+        from bondable.bond.providers.threads import decode_thread_cursor
+        client, auth_headers, mock_provider = authenticated_client
+
+        updated_at = datetime(2026, 1, 2, 3, 4, 5)
+        mock_provider.threads.get_current_threads.return_value = [
+            {"thread_id": "thread_1", "name": "Thread 1", "updated_at": updated_at}
+        ]
+        mock_provider.threads.get_thread_count.return_value = 5
+
+        response = client.get("/threads?limit=1", headers=auth_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert decode_thread_cursor(data["next_cursor"]) == (updated_at, "thread_1")
+        assert data["total_is_estimate"] is False
+
+    def test_get_threads_invalid_cursor(self, authenticated_client):
+        client, auth_headers, mock_provider = authenticated_client
+
+        response = client.get("/threads?cursor=not-a-cursor", headers=auth_headers)
+
+        assert response.status_code == 400
+        mock_provider.threads.get_threads_page.assert_not_called()
+
     def test_update_thread_success(self, authenticated_client):
         """Test renaming a thread successfully."""
         client, auth_headers, mock_provider = authenticated_client
@@ -2091,7 +2146,7 @@ class TestAgentPermissions:
         mock_agent.get_agent_id.return_value = "agent_1"
         mock_agent.get_name.return_value = "Test Agent"
         mock_provider.agents.get_agent.return_value = mock_agent
-        mock_provider.agents.get_default_agent.return_value = None
+        mock_provider.agents.get_default_agent_id.return_value = None
         mock_provider.agents.can_user_access_agent.return_value = True
         mock_provider.agents.get_user_agent_permission.return_value = 'can_edit'
 
@@ -2217,7 +2272,7 @@ class TestAgentPermissions:
         mock_agent.get_agent_id.return_value = "agent_1"
         mock_agent.get_name.return_value = "Test Agent"
         mock_provider.agents.get_agent.return_value = mock_agent
-        mock_provider.agents.get_default_agent.return_value = None
+        mock_provider.agents.get_default_agent_id.return_value = None
         mock_provider.agents.can_user_access_agent.return_value = True
         mock_provider.agents.get_user_agent_permission.return_value = 'owner'
 
@@ -2263,7 +2318,7 @@ class TestAgentPermissions:
         mock_agent.get_agent_id.return_value = "agent_1"
         mock_agent.get_name.return_value = "Test Agent"
         mock_provider.agents.get_agent.return_value = mock_agent
-        mock_provider.agents.get_default_agent.return_value = None
+        mock_provider.agents.get_default_agent_id.return_value = None
         mock_provider.agents.can_user_access_agent.return_value = True
         # No agent_record in metadata DB
         mock_provider.agents.get_agent_record.return_value = None
@@ -0,0 +1,143 @@
+"""
+Tests for the opt-in SQL profiler: per-request attribution, N+1 flagging,
+Server-Timing headers and the admin slow-query endpoint.
+"""
+import pytest
+import os
+from datetime import timedelta
+
+os.environ.setdefault('OAUTH2_ENABLED_PROVIDERS', 'cognito')
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from bondable.bond import sql_profiler
+from bondable.bond.sql_profiler import SqlProfiler
+from bondable.rest.middleware.sql_profiler import SqlProfilerMiddleware
+from bondable.rest.main import app, create_access_token
+
+
+@pytest.fixture
+def profiler(monkeypatch):
+    profiler = SqlProfiler(slow_query_ms=0, buffer_size=3, n_plus_one_threshold=3)
+    profiler.install()
+    monkeypatch.setattr(sql_profiler, "_profiler", profiler)
+    yield profiler
+    profiler.uninstall()
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    yield engine
+    engine.dispose()
+
+
+def _load_items(conn, count):
+    # Stands in for a helper that queries once per item
+    for i in range(count):
+        conn.execute(text("SELECT :i"), {"i": i})
+
+
+class TestSqlProfiler:
+
+    def test_statements_attributed_to_profile(self, profiler, engine):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            with profiler.profile("GET /items") as profile:
+                conn.execute(text("SELECT 2"))
+                conn.execute(text("SELECT 3"))
+
+        assert profile.statements == 2
+        assert profile.seconds > 0
+        assert profile.n_plus_one() == []
+
+    def test_repeated_statement_flagged_with_call_site(self, profiler, engine):
+        with profiler.profile("GET /items") as profile, engine.connect() as conn:
+            _load_items(conn, 4)
+
+        [repeated] = profile.n_plus_one()
+        assert repeated["count"] == 4
+        assert repeated["statement"] == "SELECT ?"
+        # No bondable frame issued the statement from a test
+        assert repeated["call_site"] == "unknown"
+
+    def test_slow_queries_ring_buffer(self, profiler, engine):
+        with profiler.profile("GET /items"), engine.connect() as conn:
+            _load_items(conn, 5)
+
+        queries = profiler.slow_queries()
+        assert len(queries) == 3
+        assert [q["parameters"] for q in queries] == ["(4,)", "(3,)", "(2,)"]
+        assert queries[0]["request"] == "GET /items"
+
+        profiler.clear_slow_queries()
+        assert profiler.slow_queries() == []
+
+    def test_fast_statements_not_sampled(self, engine):
+        profiler = SqlProfiler(slow_query_ms=60_000)
+        profiler.install()
+        try:
+            with profiler.profile("GET /items"), engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            assert profiler.slow_queries() == []
+        finally:
+            profiler.uninstall()
+
+
+class TestSqlProfilerMiddleware:
+
+    def test_server_timing_and_n_plus_one_warning(self, profiler, engine, caplog):
+        test_app = FastAPI()
+        test_app.add_middleware(SqlProfilerMiddleware)
+
+        @test_app.get("/items")
+        def list_items():
+            with engine.connect() as conn:
+                _load_items(conn, 3)
+            return []
+
+        with caplog.at_level("WARNING", logger="bondable.rest.middleware.sql_profiler"):
+            response = TestClient(test_app).get("/items")
+
+        assert response.headers["server-timing"].startswith("db;dur=")
+        assert response.headers["server-timing"].endswith('desc="3 queries"')
+        assert any("SQL_N_PLUS_ONE" in r.message and "count=3" in r.message for r in caplog.records)
+
+
+class TestSlowQueryEndpoint:
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        from bondable.bond.config import Config
+        monkeypatch.setattr(Config.config(), "is_admin_user", lambda email: email == "admin@example.com")
+
+        def headers(email):
+            token = create_access_token(data={
+                "sub": email,
+                "name": email,
+                "provider": "cognito",
+                "user_id": email.split("@")[0],
+            }, expires_delta=timedelta(minutes=15))
+            return {"Authorization": f"Bearer {token}"}
+
+        return TestClient(app), headers
+
+    def test_admin_reads_and_clears_buffer(self, client, profiler, engine):
+        test_client, headers = client
+        with profiler.profile("GET /items"), engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+        response = test_client.get("/metrics/slow-queries", headers=headers("admin@example.com"))
+        assert response.status_code == 200
+        assert [q["statement"] for q in response.json()["queries"]] == ["SELECT 1"]
+
+        response = test_client.delete("/metrics/slow-queries", headers=headers("admin@example.com"))
+        assert response.status_code == 204
+        assert profiler.slow_queries() == []
+
+    def test_non_admin_forbidden(self, client, profiler):
+        test_client, headers = client
+        response = test_client.get("/metrics/slow-queries", headers=headers("user@example.com"))
+        assert response.status_code == 403
@@ -0,0 +1,130 @@
+"""Tests for cursor pagination and bounded counting of thread listings.
+
+Runs ThreadsProvider's queries against a real SQLite database.
+"""
+
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+from bondable.bond.broker import BondMessage
+from bondable.bond.providers.metadata import Base, Thread, User
+from bondable.bond.providers.threads import ThreadsProvider, decode_thread_cursor, encode_thread_cursor
+
+TEST_USER_ID = "test-user-001"
+
+
+class StubThreadsProvider(ThreadsProvider):
+
+    def delete_thread_resource(self, thread_id: str) -> bool:
+        return True
+
+    def create_thread_resource(self) -> str:
+        return str(uuid.uuid4())
+
+    def has_messages(self, thread_id, last_message_id=None) -> bool:
+        return False
+
+    def get_messages(self, thread_id, limit=100, user_id=None) -> Dict[str, BondMessage]:
+        return {}
+
+
+class StubMetadata:
+
+    def __init__(self, session_factory):
+        self._session_factory = session_factory
+
+    def get_db_session(self):
+        return self._session_factory()
+
+
+@pytest.fixture
+def provider():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    Session = scoped_session(sessionmaker(bind=engine))
+    session = Session()
+    session.add(User(id=TEST_USER_ID, email="test@example.com", sign_in_method="test"))
+    session.commit()
+    session.close()
+    yield StubThreadsProvider(StubMetadata(Session))
+    Session.remove()
+    engine.dispose()
+
+
+def _add_threads(provider, count, start=datetime(2026, 1, 1), has_user_message=True, same_time=False):
+    with provider.metadata.get_db_session() as session:
+        for i in range(count):
+            updated_at = start if same_time else start + timedelta(minutes=i)
+            session.add(Thread(thread_id=f"t{i:03d}", user_id=TEST_USER_ID, name=f"Thread {i}",
+                               created_at=start, updated_at=updated_at, has_user_message=has_user_message))
+        session.commit()
+
+
+def _all_pages(provider, count, **kwargs):
+    pages, cursor = [], None
+    while True:
+        threads, cursor = provider.get_threads_page(TEST_USER_ID, count=count, cursor=cursor, **kwargs)
+        pages.append([t["thread_id"] for t in threads])
+        if cursor is None:
+            return pages
+
+
+class TestThreadCursor:
+
+    def test_round_trip(self):
+        updated_at = datetime(2026, 3, 4, 5, 6, 7, 890)
+        assert decode_thread_cursor(encode_thread_cursor(updated_at, "thread_x")) == (updated_at, "thread_x")
+
+    @pytest.mark.parametrize("cursor", ["", "not-base64!", "W10", "WyJub3QgYSBkYXRlIiwgIngiXQ"])
+    def test_malformed(self, cursor):
+        with pytest.raises(ValueError):
+            decode_thread_cursor(cursor)
+
+
+class TestThreadsPage:
+
+    def test_pages_match_offset_listing(self, provider):
+        _add_threads(provider, 7)
+        pages = _all_pages(provider, 3)
+        assert [len(p) for p in pages] == [3, 3, 1]
+        expected = [t["thread_id"] for t in provider.get_current_threads(TEST_USER_ID, count=100)]
+        assert sum(pages, []) == expected
+        assert expected[0] == "t006"
+
+    def test_ties_on_updated_at_are_broken_by_thread_id(self, provider):
+        _add_threads(provider, 5, same_time=True)
+        assert sum(_all_pages(provider, 2), []) == ["t004", "t003", "t002", "t001", "t000"]
+
+    def test_new_threads_do_not_shift_later_pages(self, provider):
+        _add_threads(provider, 6)
+        first, cursor = provider.get_threads_page(TEST_USER_ID, count=3)
+        with provider.metadata.get_db_session() as session:
+            session.add(Thread(thread_id="t-new", user_id=TEST_USER_ID, name="New",
+                               updated_at=datetime(2027, 1, 1), has_user_message=True))
+            session.commit()
+        second, cursor = provider.get_threads_page(TEST_USER_ID, count=3, cursor=cursor)
+        assert [t["thread_id"] for t in second] == ["t002", "t001", "t000"]
+        assert cursor is None
+
+    def test_exclude_empty(self, provider):
+        _add_threads(provider, 4, has_user_message=False)
+        threads, cursor = provider.get_threads_page(TEST_USER_ID, count=10, exclude_empty=True)
+        assert (threads, cursor) == ([], None)
+
+
+class TestEstimateThreadCount:
+
+    def test_exact_below_cap(self, provider):
+        _add_threads(provider, 5)
+        assert provider.estimate_thread_count(TEST_USER_ID, cap=10) == (5, True)
+        assert provider.estimate_thread_count(TEST_USER_ID, cap=5) == (5, True)
+
+    def test_capped(self, provider):
+        _add_threads(provider, 5)
+        assert provider.estimate_thread_count(TEST_USER_ID, cap=3) == (3, False)
+        assert provider.get_thread_count(TEST_USER_ID) == 5
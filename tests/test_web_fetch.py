@@ -0,0 +1,238 @@
+"""
+Tests for the concurrent, cached URL fetcher behind the fetch_urls common tool.
+
+Pages are served by a local http.server, so these exercise real HTTP
+(conditional requests, redirects, connection limits) without network access.
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from bondable.bond.providers.bedrock.web_fetch import UrlCache, UrlFetcher, cache_key
+
+PAGE = "<html><body><article><h1>Title</h1><p>{}</p></article></body></html>"
+
+
+class _Site:
+    """Routes and request log shared by the handler threads."""
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.delay = 0.0
+        self.aborted = 0
+
+
+def _make_handler(site):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            with site.lock:
+                site.requests.append((self.path, dict(self.headers)))
+                site.active += 1
+                site.max_active = max(site.max_active, site.active)
+            try:
+                if site.delay:
+                    time.sleep(site.delay)
+                status, headers, body = site.routes[self.path](self.headers)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    with site.lock:
+                        site.aborted += 1
+            finally:
+                with site.lock:
+                    site.active -= 1
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+@pytest.fixture
+def site():
+    site = _Site()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(site))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    site.base = f"http://127.0.0.1:{server.server_address[1]}"
+    yield site
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return UrlCache(str(tmp_path / "cache.sqlite3"), max_bytes=1024 * 1024, default_ttl=900)
+
+
+def _page(text, **headers):
+    return lambda request_headers: (200, headers, PAGE.format(text).encode())
+
+
+def _paths(site):
+    return [path for path, _ in site.requests]
+
+
+class TestUrlCache:
+
+    def test_fresh_entry_is_served_without_a_request(self, site, cache):
+        site.routes["/a"] = _page("first version", **{"Cache-Control": "max-age=60"})
+        fetcher = UrlFetcher(lambda url: False, cache=cache)
+
+        first = fetcher.fetch(f"{site.base}/a")
+        second = fetcher.fetch(f"{site.base}/a")
+
+        assert "first version" in first.content and not first.from_cache
+        assert second.content == first.content and second.from_cache
+        assert _paths(site) == ["/a"]
+
+    def test_stale_entry_is_revalidated_with_etag(self, site, cache):
+        def route(headers):
+            if headers.get("If-None-Match") == '"v1"':
+                return 304, {"ETag": '"v1"', "Cache-Control": "max-age=0"}, b""
+            return 200, {"ETag": '"v1"', "Cache-Control": "max-age=0"}, PAGE.format("etag body").encode()
+        site.routes["/e"] = route
+        fetcher = UrlFetcher(lambda url: False, cache=cache)
+
+        first = fetcher.fetch(f"{site.base}/e")
+        second = fetcher.fetch(f"{site.base}/e")
+
+        assert "etag body" in first.content
+        assert second.from_cache and second.content == first.content
+        assert site.requests[1][1].get("If-None-Match") == '"v1"'
+
+    def test_last_modified_is_sent_as_if_modified_since(self, site, cache):
+        stamp = "Wed, 01 Jan 2025 00:00:00 GMT"
+        site.routes["/m"] = _page("dated", **{"Last-Modified": stamp, "Cache-Control": "no-cache"})
+        fetcher = UrlFetcher(lambda url: False, cache=cache)
+
+        fetcher.fetch(f"{site.base}/m")
+        fetcher.fetch(f"{site.base}/m")
+
+        assert site.requests[1][1].get("If-Modified-Since") == stamp
+
+    def test_no_store_is_not_cached(self, site, cache):
+        site.routes["/n"] = _page("private", **{"Cache-Control": "no-store"})
+        fetcher = UrlFetcher(lambda url: False, cache=cache)
+
+        fetcher.fetch(f"{site.base}/n")
+        fetcher.fetch(f"{site.base}/n")
+
+        assert _paths(site) == ["/n", "/n"]
+        assert cache.get(cache_key(f"{site.base}/n")) is None
+
+    def test_least_recently_used_entries_are_evicted(self, tmp_path):
+        cache = UrlCache(str(tmp_path / "small.sqlite3"), max_bytes=250, default_ttl=900)
+        for name in ("a", "b", "c"):
+            cache.put(cache_key(name), name, name * 100, None, None, ttl=900)
+            time.sleep(0.01)
+
+        assert cache.get(cache_key("a")) is None
+        assert cache.get(cache_key("b")) is not None
+        assert cache.get(cache_key("c")) is not None
+
+
+class TestUrlFetcher:
+
+    def test_results_keep_input_order(self, site):
+        for name in ("one", "two", "three"):
+            site.routes[f"/{name}"] = _page(f"page {name}")
+        fetcher = UrlFetcher(lambda url: False)
+
+        results = fetcher.fetch_all([f"{site.base}/{name}" for name in ("one", "two", "three")])
+
+        assert [r.url.rsplit("/", 1)[1] for r in results] == ["one", "two", "three"]
+        assert all(f"page {r.url.rsplit('/', 1)[1]}" in r.content for r in results)
+
+    def test_per_host_connection_limit(self, site):
+        site.delay = 0.1
+        for i in range(6):
+            site.routes[f"/p{i}"] = _page(f"page {i}")
+        fetcher = UrlFetcher(lambda url: False, concurrency=6, per_host=2)
+
+        started = time.monotonic()
+        results = fetcher.fetch_all([f"{site.base}/p{i}" for i in range(6)])
+        elapsed = time.monotonic() - started
+
+        assert all(r.content for r in results)
+        assert site.max_active == 2
+        # Three rounds of two, not six sequential requests
+        assert elapsed < 0.5
+
+    def test_http_error_status_is_a_fetch_error(self, site):
+        site.routes["/missing"] = lambda headers: (404, {}, b"not found")
+        fetcher = UrlFetcher(lambda url: False)
+
+        result = fetcher.fetch(f"{site.base}/missing")
+
+        assert result.fetch_error == "HTTP 404" and result.content is None
+
+    def test_redirect_is_followed(self, site):
+        site.routes["/old"] = lambda headers: (301, {"Location": "/new"}, b"")
+        site.routes["/new"] = _page("moved here")
+        fetcher = UrlFetcher(lambda url: False)
+
+        result = fetcher.fetch(f"{site.base}/old")
+
+        assert "moved here" in result.content
+        assert _paths(site) == ["/old", "/new"]
+
+    def test_redirect_to_blocked_url_is_refused(self, site):
+        site.routes["/public"] = lambda headers: (302, {"Location": "http://169.254.169.254/latest/"}, b"")
+        fetcher = UrlFetcher(lambda url: "169.254" in url)
+
+        result = fetcher.fetch(f"{site.base}/public")
+
+        assert "disallowed" in result.fetch_error
+        assert _paths(site) == ["/public"]
+
+    def test_body_is_capped_at_max_bytes(self, site, monkeypatch):
+        site.routes["/big"] = _page("y" * 10000)
+        seen = []
+        import trafilatura
+        monkeypatch.setattr(trafilatura, "extract", lambda html, **kwargs: seen.append(len(html)) or "ok")
+        fetcher = UrlFetcher(lambda url: False, max_bytes=1000)
+
+        assert fetcher.fetch(f"{site.base}/big").content == "ok"
+        assert seen == [1000]
+
+    def test_truncated_body_is_not_downloaded_in_full(self, site, monkeypatch):
+        site.routes["/huge"] = lambda headers: (200, {}, b"z" * (64 * 1024 * 1024))
+        site.routes["/small"] = _page("after")
+        import trafilatura
+        monkeypatch.setattr(trafilatura, "extract", lambda html, **kwargs: "ok")
+        fetcher = UrlFetcher(lambda url: False, max_bytes=1000, per_host=1)
+
+        assert fetcher.fetch(f"{site.base}/huge").content == "ok"
+        deadline = time.monotonic() + 5
+        while site.active and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert site.aborted == 1
+        # The dropped connection's pool slot is usable again
+        assert fetcher.fetch(f"{site.base}/small").content == "ok"
+
+    def test_extraction_timeout(self, site, monkeypatch):
+        site.routes["/slow"] = _page("slow")
+        import trafilatura
+        monkeypatch.setattr(trafilatura, "extract", lambda html, **kwargs: time.sleep(0.5) or "late")
+        fetcher = UrlFetcher(lambda url: False, extract_timeout=0.05)
+
+        result = fetcher.fetch(f"{site.base}/slow")
+
+        assert "timed out" in result.extract_error
@@ -0,0 +1,185 @@
+"""
+Tests for the cached, coalescing, rate-limited web search front end.
+"""
+
+import threading
+import time
+
+import pytest
+
+from bondable.bond.providers.bedrock.web_search import (
+    RateLimiter, SearchBackend, SearchRateLimitError, WebSearcher,
+)
+
+
+class StubBackend(SearchBackend):
+
+    name = "stub"
+
+    def __init__(self, delay=0.0, error=None):
+        self.calls = []
+        self.delay = delay
+        self.error = error
+        self._lock = threading.Lock()
+
+    def search(self, query, region, max_results):
+        with self._lock:
+            self.calls.append((query, region, max_results))
+        if self.delay:
+            time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return [{"title": f"{query} {i}", "body": "", "href": f"https://r{i}.com"} for i in range(max_results)]
+
+
+def _searcher(backend, **kwargs):
+    kwargs.setdefault("rate_limiter", RateLimiter(rate_per_second=100, burst=100, max_wait=1))
+    return WebSearcher(backend, **kwargs)
+
+
+class TestWebSearcherCache:
+
+    def test_repeated_query_is_served_from_cache(self):
+        backend = StubBackend()
+        searcher = _searcher(backend)
+
+        first = searcher.search("python asyncio", 5)
+        second = searcher.search("python asyncio", 5)
+
+        assert first == second
+        assert len(backend.calls) == 1
+
+    def test_query_is_normalized(self):
+        backend = StubBackend()
+        searcher = _searcher(backend)
+
+        searcher.search("Python  AsyncIO", 5)
+        searcher.search("  python asyncio ", 5)
+
+        assert len(backend.calls) == 1
+
+    def test_result_count_and_region_are_part_of_the_key(self):
+        backend = StubBackend()
+        searcher = _searcher(backend, region="us-en")
+
+        searcher.search("q", 5)
+        searcher.search("q", 3)
+
+        assert backend.calls == [("q", "us-en", 5), ("q", "us-en", 3)]
+
+    def test_expired_entries_are_refetched(self):
+        backend = StubBackend()
+        searcher = _searcher(backend, ttl_seconds=0.05)
+
+        searcher.search("q", 5)
+        time.sleep(0.1)
+        searcher.search("q", 5)
+
+        assert len(backend.calls) == 2
+
+    def test_least_recently_used_entry_is_evicted(self):
+        backend = StubBackend()
+        searcher = _searcher(backend, max_entries=2)
+
+        searcher.search("a", 1)
+        searcher.search("b", 1)
+        searcher.search("a", 1)
+        searcher.search("c", 1)
+        searcher.search("a", 1)
+        searcher.search("b", 1)
+
+        assert [call[0] for call in backend.calls] == ["a", "b", "c", "b"]
+
+    def test_errors_are_not_cached(self):
+        backend = StubBackend(error=ConnectionError("down"))
+        searcher = _searcher(backend)
+
+        with pytest.raises(ConnectionError):
+            searcher.search("q", 5)
+        backend.error = None
+        assert len(searcher.search("q", 5)) == 5
+
+    def test_cached_results_cannot_be_mutated_by_callers(self):
+        searcher = _searcher(StubBackend())
+
+        searcher.search("q", 2).clear()
+
+        assert len(searcher.search("q", 2)) == 2
+
+
+class TestSingleFlight:
+
+    def test_concurrent_identical_searches_share_one_call(self):
+        backend = StubBackend(delay=0.2)
+        searcher = _searcher(backend)
+        results = []
+
+        threads = [threading.Thread(target=lambda: results.append(searcher.search("Same Query", 5)))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(backend.calls) == 1
+        assert len(results) == 8 and all(r == results[0] for r in results)
+
+    def test_waiters_see_the_leaders_error(self):
+        backend = StubBackend(delay=0.2, error=ConnectionError("down"))
+        searcher = _searcher(backend)
+        errors = []
+
+        def run():
+            try:
+                searcher.search("q", 5)
+            except ConnectionError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=run) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(backend.calls) == 1
+        assert len(errors) == 4
+
+
+class TestRateLimiting:
+
+    def test_burst_then_throttled(self):
+        limiter = RateLimiter(rate_per_second=0.1, burst=2, max_wait=0)
+
+        assert limiter.acquire() and limiter.acquire()
+        assert not limiter.acquire()
+
+    def test_waits_for_a_token(self):
+        limiter = RateLimiter(rate_per_second=20, burst=1, max_wait=1)
+        limiter.acquire()
+
+        started = time.monotonic()
+        assert limiter.acquire()
+        assert 0.03 < time.monotonic() - started < 0.5
+
+    def test_local_limit_raises_rate_limit_error(self):
+        backend = StubBackend()
+        searcher = _searcher(backend, rate_limiter=RateLimiter(rate_per_second=0.1, burst=1, max_wait=0))
+
+        searcher.search("a", 1)
+        with pytest.raises(SearchRateLimitError):
+            searcher.search("b", 1)
+        # Cached results are still served while throttled
+        assert searcher.search("a", 1)
+        assert len(backend.calls) == 1
+
+    def test_backend_throttling_starts_a_cooldown(self):
+        backend = StubBackend(error=SearchRateLimitError("429"))
+        searcher = _searcher(backend, cooldown_seconds=60)
+
+        with pytest.raises(SearchRateLimitError):
+            searcher.search("a", 1)
+        backend.error = None
+        with pytest.raises(SearchRateLimitError):
+            searcher.search("b", 1)
+
+        assert len(backend.calls) == 1